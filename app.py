@@ -169,11 +169,14 @@ def render_optimized_analyze_tab():
         
         status = task_queue.get_task_status(task_id)
         
-        if status == TaskStatus.RUNNING:
-            st.info("🔄 분석이 진행 중입니다...")
-            
-            # 진행률 표시
-            progress_placeholder = st.empty()
+        if status in (TaskStatus.PENDING, TaskStatus.RUNNING):
+            # 진행률 표시 (별도 워커 프로세스가 실행 중이어도 저장소에서 조회)
+            progress = task_queue.get_task_progress(task_id) or {}
+            if status == TaskStatus.PENDING:
+                st.info("⏳ 분석 대기 중입니다...")
+            else:
+                st.info(f"🔄 분석이 진행 중입니다... {progress.get('message') or ''}")
+                st.progress(min(max(int(progress.get('progress') or 0), 0), 100) / 100)
             
             # 5초마다 상태 확인
             time.sleep(5)
@@ -193,6 +196,13 @@ def render_optimized_analyze_tab():
             st.error(f"❌ 분석 실패: {error_msg}")
             st.session_state.analysis_state = 'idle'
             del st.session_state.current_task_id
+            
+        elif status == TaskStatus.CANCELLED:
+            # 결과 조회 시 (다른 워커가 취소한 영속 작업이면) 완료 콜백이 실행되어 세션 작업 슬롯 반환
+            task_queue.get_task_result(task_id)
+            st.warning("⏹️ 분석이 취소되었습니다.")
+            st.session_state.analysis_state = 'idle'
+            del st.session_state.current_task_id
 
 
 def handle_optimized_video_analysis(video_url: str, model_name: str = "gpt-4o"):
@@ -208,7 +218,8 @@ def handle_optimized_video_analysis(video_url: str, model_name: str = "gpt-4o"):
         
         # 캐시 확인
         cache_manager = get_cache_manager()
-        cached_result = cache_manager.get_video_analysis(video_url)
+        identity = cache_manager.get_url_identity(video_url)
+        cached_result = cache_manager.get_video_analysis(identity['video_id']) if identity else None
         
         if cached_result:
             st.success("✅ 캐시된 분석 결과를 사용합니다.")
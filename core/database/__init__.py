@@ -1,6 +1,6 @@
 # core/database/__init__.py
 """데이터베이스 관리"""
 
-from .repository import VideoAnalysisDB as VideoRepository
+from .repository import VideoAnalysisDB as VideoRepository, get_repository
 
-__all__ = ['VideoRepository']
\ No newline at end of file
+__all__ = ['VideoRepository', 'get_repository']
\ No newline at end of file
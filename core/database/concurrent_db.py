@@ -9,10 +9,12 @@ import threading
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from contextlib import contextmanager
 import queue
 import time
+import bisect
+from collections import deque
 from dataclasses import dataclass, asdict
 
 from utils.logger import get_logger
@@ -21,6 +23,19 @@ from config.settings import Settings
 logger = get_logger(__name__)
 
 
+# 집계 차원별 버킷 계산식 ({row}는 NEW/OLD/videos 로 치환)
+STAT_DIMENSIONS = {
+    "total": "''",
+    "genre": "COALESCE({row}.genre, '')",
+    "platform": "COALESCE({row}.platform, '')",
+    "model": (
+        "CASE WHEN json_valid({row}.analysis_result) "
+        "THEN COALESCE(json_extract({row}.analysis_result, '$.model_used'), '') "
+        "ELSE '' END"
+    ),
+}
+
+
 @dataclass
 class VideoRecord:
     """비디오 레코드 데이터 클래스"""
@@ -52,48 +67,236 @@ class VideoRecord:
             self.updated_at = datetime.now().isoformat()
 
 
+# 지연시간 히스토그램 버킷 경계 (ms)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# 이 시간(ms) 이상 커넥션을 점유한 쿼리는 느린 쿼리로 기록
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+
+class LatencyHistogram:
+    """고정 버킷 지연시간 히스토그램 (ms 단위)"""
+    
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, value_ms: float):
+        self.buckets[bisect.bisect_left(self.bounds, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+    
+    def percentile(self, p: float) -> float:
+        """p 분위수가 속한 버킷의 상한 (마지막 버킷은 최대값)"""
+        if self.count == 0:
+            return 0.0
+        target = self.count * p
+        cumulative = 0
+        for index, bucket_count in enumerate(self.buckets):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return float(self.bounds[index]) if index < len(self.bounds) else self.max_ms
+        return self.max_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"≤{bound}ms" for bound in self.bounds] + [f">{self.bounds[-1]}ms"]
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class QueryMetrics:
+    """작업별 쿼리 실행/커넥션 대기 시간 수집기"""
+    
+    def __init__(self, slow_threshold_ms: float = SLOW_QUERY_THRESHOLD_MS):
+        self.slow_threshold_ms = slow_threshold_ms
+        self.query_time = LatencyHistogram()
+        self.wait_time = {"read": LatencyHistogram(), "write": LatencyHistogram()}
+        self.operations: Dict[str, LatencyHistogram] = {}
+        self.slow_queries = deque(maxlen=50)
+        self.slow_count = 0
+        self._lock = threading.Lock()
+    
+    def record(self, operation: str, pool_name: str, wait_ms: float, query_ms: float):
+        with self._lock:
+            self.query_time.observe(query_ms)
+            self.wait_time[pool_name].observe(wait_ms)
+            if operation not in self.operations:
+                self.operations[operation] = LatencyHistogram()
+            self.operations[operation].observe(query_ms)
+            
+            is_slow = query_ms >= self.slow_threshold_ms
+            if is_slow:
+                self.slow_count += 1
+                self.slow_queries.append({
+                    "operation": operation,
+                    "pool": pool_name,
+                    "query_ms": round(query_ms, 1),
+                    "wait_ms": round(wait_ms, 1),
+                    "at": datetime.now().isoformat(timespec="seconds"),
+                })
+        
+        if is_slow:
+            logger.warning(
+                f"느린 쿼리: {operation} {query_ms:.1f}ms "
+                f"(커넥션 대기 {wait_ms:.1f}ms, {pool_name} 풀)"
+            )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "query_time": self.query_time.to_dict(),
+                "wait_time": {name: hist.to_dict() for name, hist in self.wait_time.items()},
+                "operations": {name: hist.to_dict() for name, hist in self.operations.items()},
+                "slow_query_threshold_ms": self.slow_threshold_ms,
+                "slow_query_count": self.slow_count,
+                "recent_slow_queries": list(self.slow_queries),
+            }
+
+
 class ConnectionPool:
-    """SQLite 커넥션 풀"""
+    """SQLite 커넥션 풀 (필요할 때 커넥션 생성)"""
     
-    def __init__(self, db_path: str, max_connections: int = 10):
+    def __init__(self, db_path: str, max_connections: int = 10,
+                 name: str = "read", read_only: bool = False, timeout: float = 10.0):
         self.db_path = db_path
         self.max_connections = max_connections
-        self.pool = queue.Queue(maxsize=max_connections)
+        self.name = name
+        self.read_only = read_only
+        self.timeout = timeout
+        self.pool = queue.Queue()
         self.lock = threading.Lock()
-        self._create_connections()
-    
-    def _create_connections(self):
-        """커넥션 풀 초기화"""
-        for _ in range(self.max_connections):
-            conn = sqlite3.connect(
-                self.db_path,
-                check_same_thread=False,
-                timeout=30.0,  # 30초 타임아웃
-                isolation_level=None  # 자동 커밋 활성화
-            )
-            conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
-            # WAL 모드 활성화 (동시 읽기/쓰기 성능 향상)
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")  # 성능 향상
-            conn.execute("PRAGMA cache_size=10000")    # 캐시 크기 증가
+        
+        # 풀 사용량 통계
+        self._created = 0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._timeouts = 0
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """새 커넥션 생성"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            timeout=30.0,  # 30초 타임아웃
+            isolation_level=None  # 자동 커밋 활성화
+        )
+        conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 결과 반환
+        # WAL 모드 활성화 (동시 읽기/쓰기 성능 향상)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # 성능 향상
+        conn.execute("PRAGMA cache_size=10000")    # 캐시 크기 증가
+        if self.read_only:
+            conn.execute("PRAGMA query_only=ON")   # 읽기 풀에서 쓰기 방지
+        return conn
+    
+    def acquire(self) -> Tuple[sqlite3.Connection, float]:
+        """
+        커넥션 획득
+        
+        유휴 커넥션이 없고 상한에 도달하지 않았으면 새로 만들고,
+        상한에 도달했으면 반환될 때까지 대기합니다.
+        
+        Returns:
+            (커넥션, 대기 시간 ms)
+        """
+        start = time.perf_counter()
+        conn = None
+        try:
+            conn = self.pool.get_nowait()
+        except queue.Empty:
+            with self.lock:
+                should_create = self._created < self.max_connections
+                if should_create:
+                    self._created += 1
+            
+            if should_create:
+                try:
+                    conn = self._open_connection()
+                except Exception:
+                    with self.lock:
+                        self._created -= 1
+                    raise
+            else:
+                try:
+                    conn = self.pool.get(timeout=self.timeout)
+                except queue.Empty:
+                    with self.lock:
+                        self._timeouts += 1
+                    raise RuntimeError("데이터베이스 연결 풀이 가득참 - 잠시 후 다시 시도해주세요")
+        
+        with self.lock:
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+        
+        return conn, (time.perf_counter() - start) * 1000
+    
+    def release(self, conn: sqlite3.Connection):
+        """커넥션 반환 (풀이 축소되었으면 초과분은 닫음)"""
+        with self.lock:
+            self._in_use -= 1
+            surplus = self._created > self.max_connections
+            if surplus:
+                self._created -= 1
+        
+        if surplus:
+            conn.close()
+        else:
             self.pool.put(conn)
     
     @contextmanager
     def get_connection(self):
         """커넥션 가져오기 (컨텍스트 매니저)"""
-        conn = None
+        conn, _ = self.acquire()
         try:
-            conn = self.pool.get(timeout=10)  # 10초 대기
             yield conn
-        except queue.Empty:
-            raise RuntimeError("데이터베이스 연결 풀이 가득참 - 잠시 후 다시 시도해주세요")
-        except Exception as e:
-            if conn:
+        except Exception:
+            if conn.in_transaction:
                 conn.rollback()
             raise
         finally:
-            if conn:
-                self.pool.put(conn)
+            self.release(conn)
+    
+    def resize(self, max_connections: int):
+        """풀 상한 조정 (축소 시 사용 중인 커넥션은 반환될 때 닫힘)"""
+        max_connections = max(1, max_connections)
+        with self.lock:
+            self.max_connections = max_connections
+        
+        while True:
+            with self.lock:
+                if self._created <= self.max_connections:
+                    break
+                try:
+                    conn = self.pool.get_nowait()
+                except queue.Empty:
+                    break
+                self._created -= 1
+            conn.close()
+        
+        logger.info(f"{self.name} 커넥션 풀 상한 변경: {max_connections}")
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 사용량 통계"""
+        with self.lock:
+            return {
+                "name": self.name,
+                "max_connections": self.max_connections,
+                "created": self._created,
+                "idle": self.pool.qsize(),
+                "in_use": self._in_use,
+                "peak_in_use": self._peak_in_use,
+                "timeouts": self._timeouts,
+            }
     
     def close_all(self):
         """모든 커넥션 종료"""
@@ -101,6 +304,8 @@ class ConnectionPool:
             try:
                 conn = self.pool.get_nowait()
                 conn.close()
+                with self.lock:
+                    self._created -= 1
             except queue.Empty:
                 break
 
@@ -114,21 +319,28 @@ class ConcurrentVideoDatabase:
         self.db_path = db_path
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
-        # 커넥션 풀 초기화
-        self.pool = ConnectionPool(db_path, max_connections)
-        
-        # 테이블 생성
-        self._create_tables()
+        # 커넥션 풀 초기화 (WAL: 쓰기 1개 + 읽기 N개, 커넥션은 필요할 때 생성)
+        self.write_pool = ConnectionPool(db_path, 1, name="write", timeout=30.0)
+        self.read_pool = ConnectionPool(
+            db_path, max(1, max_connections - 1), name="read", read_only=True
+        )
         
         # 성능 카운터
         self._query_count = 0
         self._lock = threading.Lock()
+        self.metrics = QueryMetrics()
         
-        logger.info(f"ConcurrentVideoDatabase 초기화: {db_path} (커넥션 풀: {max_connections})")
+        # 테이블 생성
+        self._create_tables()
+        
+        logger.info(
+            f"ConcurrentVideoDatabase 초기화: {db_path} "
+            f"(쓰기 커넥션 1, 읽기 커넥션 최대 {self.read_pool.max_connections})"
+        )
     
     def _create_tables(self):
         """테이블 생성"""
-        with self.pool.get_connection() as conn:
+        with self.write_pool.get_connection() as conn:
             # videos 테이블
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS videos (
@@ -158,90 +370,228 @@ class ConcurrentVideoDatabase:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_genre ON videos(genre)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_videos_created_at ON videos(created_at)")
             
+            # 집계 테이블 (장르/플랫폼/모델별 카운터)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS video_stats (
+                    dimension TEXT NOT NULL,
+                    bucket TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (dimension, bucket)
+                )
+            """)
+            
+            # 트리거로 videos 쓰기와 같은 트랜잭션에서 집계 갱신
+            # (차원이 바뀌었을 수 있으므로 매번 다시 만들고, 없어진 차원의 버킷은 삭제)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for event, sql in self._stats_trigger_bodies().items():
+                    conn.execute(f"DROP TRIGGER IF EXISTS trg_videos_stats_{event.lower()}")
+                    conn.execute(f"""
+                        CREATE TRIGGER trg_videos_stats_{event.lower()}
+                        AFTER {event} ON videos
+                        BEGIN
+                            {sql}
+                        END
+                    """)
+                conn.execute(
+                    f"DELETE FROM video_stats WHERE dimension NOT IN ({', '.join('?' * len(STAT_DIMENSIONS))})",
+                    list(STAT_DIMENSIONS)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            
             conn.commit()
+            
+            # 기존 데이터가 있는데 집계가 비어 있으면 최초 1회 재구축
+            has_videos = conn.execute("SELECT 1 FROM videos LIMIT 1").fetchone()
+            has_stats = conn.execute("SELECT 1 FROM video_stats LIMIT 1").fetchone()
+            if has_videos and not has_stats:
+                self._rebuild_statistics(conn)
+    
+    @staticmethod
+    def _stats_trigger_bodies() -> Dict[str, str]:
+        """INSERT/UPDATE/DELETE 트리거 본문 생성"""
+        def increment(row: str) -> str:
+            return "\n".join(
+                f"INSERT INTO video_stats (dimension, bucket, count) "
+                f"VALUES ('{dim}', {expr.format(row=row)}, 1) "
+                f"ON CONFLICT(dimension, bucket) DO UPDATE SET count = count + 1;"
+                for dim, expr in STAT_DIMENSIONS.items()
+            )
+        
+        def decrement(row: str) -> str:
+            return "\n".join(
+                f"UPDATE video_stats SET count = count - 1 "
+                f"WHERE dimension = '{dim}' AND bucket = {expr.format(row=row)};"
+                for dim, expr in STAT_DIMENSIONS.items()
+            ) + "\nDELETE FROM video_stats WHERE count <= 0;"
+        
+        return {
+            "INSERT": increment("NEW"),
+            "DELETE": decrement("OLD"),
+            "UPDATE": decrement("OLD") + "\n" + increment("NEW"),
+        }
+    
+    def _rebuild_statistics(self, conn: sqlite3.Connection):
+        """videos 테이블 전체로부터 집계 테이블 재계산 (단일 트랜잭션)"""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM video_stats")
+            for dim, expr in STAT_DIMENSIONS.items():
+                conn.execute(f"""
+                    INSERT INTO video_stats (dimension, bucket, count)
+                    SELECT '{dim}', {expr.format(row='videos')} AS bucket, COUNT(*)
+                    FROM videos
+                    GROUP BY bucket
+                """)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        
+        logger.info("집계 통계 재구축 완료")
+    
+    def rebuild_statistics(self):
+        """집계 통계 재구축 (집계가 어긋났을 때 사용)"""
+        with self._connection("rebuild_statistics", write=True) as conn:
+            self._rebuild_statistics(conn)
     
     def add_video(self, video: VideoRecord) -> int:
         """비디오 추가 또는 업데이트"""
-        with self._query_context():
-            with self.pool.get_connection() as conn:
-                try:
-                    # JSON 직렬화
-                    tags_json = json.dumps(video.tags, ensure_ascii=False)
-                    analysis_json = json.dumps(video.analysis_result, ensure_ascii=False)
+        with self._connection("add_video", write=True) as conn:
+            try:
+                # JSON 직렬화
+                tags_json = json.dumps(video.tags, ensure_ascii=False)
+                analysis_json = json.dumps(video.analysis_result, ensure_ascii=False)
                     
-                    # 중복 체크 및 업데이트/삽입
-                    existing = conn.execute(
-                        "SELECT id FROM videos WHERE url = ?",
-                        (video.url,)
-                    ).fetchone()
+                # 중복 체크 및 업데이트/삽입
+                existing = conn.execute(
+                    "SELECT id FROM videos WHERE url = ?",
+                    (video.url,)
+                ).fetchone()
                     
-                    if existing:
-                        # 업데이트
-                        video.updated_at = datetime.now().isoformat()
-                        conn.execute("""
-                            UPDATE videos SET
-                                title = ?, platform = ?, video_id = ?, duration = ?,
-                                view_count = ?, upload_date = ?, genre = ?, mood = ?,
-                                tags = ?, analysis_result = ?, thumbnail_path = ?,
-                                scenes_count = ?, updated_at = ?
-                            WHERE url = ?
-                        """, (
-                            video.title, video.platform, video.video_id, video.duration,
-                            video.view_count, video.upload_date, video.genre, video.mood,
-                            tags_json, analysis_json, video.thumbnail_path,
-                            video.scenes_count, video.updated_at, video.url
-                        ))
+                if existing:
+                    # 업데이트
+                    video.updated_at = datetime.now().isoformat()
+                    conn.execute("""
+                        UPDATE videos SET
+                            title = ?, platform = ?, video_id = ?, duration = ?,
+                            view_count = ?, upload_date = ?, genre = ?, mood = ?,
+                            tags = ?, analysis_result = ?, thumbnail_path = ?,
+                            scenes_count = ?, updated_at = ?
+                        WHERE url = ?
+                    """, (
+                        video.title, video.platform, video.video_id, video.duration,
+                        video.view_count, video.upload_date, video.genre, video.mood,
+                        tags_json, analysis_json, video.thumbnail_path,
+                        video.scenes_count, video.updated_at, video.url
+                    ))
                         
-                        video_id = existing['id']
-                        logger.info(f"비디오 업데이트: {video.title} (ID: {video_id})")
-                    else:
-                        # 삽입
-                        cursor = conn.execute("""
-                            INSERT INTO videos (
-                                url, title, platform, video_id, duration, view_count,
-                                upload_date, genre, mood, tags, analysis_result,
-                                thumbnail_path, scenes_count, created_at, updated_at
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            video.url, video.title, video.platform, video.video_id,
-                            video.duration, video.view_count, video.upload_date,
-                            video.genre, video.mood, tags_json, analysis_json,
-                            video.thumbnail_path, video.scenes_count,
-                            video.created_at, video.updated_at
-                        ))
+                    video_id = existing['id']
+                    logger.info(f"비디오 업데이트: {video.title} (ID: {video_id})")
+                else:
+                    # 삽입
+                    cursor = conn.execute("""
+                        INSERT INTO videos (
+                            url, title, platform, video_id, duration, view_count,
+                            upload_date, genre, mood, tags, analysis_result,
+                            thumbnail_path, scenes_count, created_at, updated_at
+                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (
+                        video.url, video.title, video.platform, video.video_id,
+                        video.duration, video.view_count, video.upload_date,
+                        video.genre, video.mood, tags_json, analysis_json,
+                        video.thumbnail_path, video.scenes_count,
+                        video.created_at, video.updated_at
+                    ))
                         
-                        video_id = cursor.lastrowid
-                        logger.info(f"새 비디오 추가: {video.title} (ID: {video_id})")
+                    video_id = cursor.lastrowid
+                    logger.info(f"새 비디오 추가: {video.title} (ID: {video_id})")
                     
-                    conn.commit()
-                    return video_id
+                conn.commit()
+                return video_id
                     
-                except Exception as e:
-                    conn.rollback()
-                    logger.error(f"비디오 추가/업데이트 실패: {e}")
-                    raise
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"비디오 추가/업데이트 실패: {e}")
+                raise
+    
+    def add_videos_bulk(self, videos: List[VideoRecord]) -> int:
+        """
+        여러 비디오를 단일 트랜잭션으로 추가 또는 업데이트
+        
+        add_video와 같은 의미(URL 기준 upsert, created_at 유지)이지만
+        SELECT 없이 INSERT ... ON CONFLICT(url) DO UPDATE 를 executemany로 실행합니다.
+        
+        Returns:
+            처리된 레코드 수
+        """
+        if not videos:
+            return 0
+        
+        now = datetime.now().isoformat()
+        params = [
+            (
+                video.url, video.title, video.platform, video.video_id,
+                video.duration, video.view_count, video.upload_date,
+                video.genre, video.mood,
+                json.dumps(video.tags, ensure_ascii=False),
+                json.dumps(video.analysis_result, ensure_ascii=False),
+                video.thumbnail_path, video.scenes_count,
+                video.created_at, now
+            )
+            for video in videos
+        ]
+        
+        with self._connection("add_videos_bulk", write=True) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany("""
+                    INSERT INTO videos (
+                        url, title, platform, video_id, duration, view_count,
+                        upload_date, genre, mood, tags, analysis_result,
+                        thumbnail_path, scenes_count, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(url) DO UPDATE SET
+                        title = excluded.title, platform = excluded.platform,
+                        video_id = excluded.video_id, duration = excluded.duration,
+                        view_count = excluded.view_count, upload_date = excluded.upload_date,
+                        genre = excluded.genre, mood = excluded.mood,
+                        tags = excluded.tags, analysis_result = excluded.analysis_result,
+                        thumbnail_path = excluded.thumbnail_path,
+                        scenes_count = excluded.scenes_count,
+                        updated_at = excluded.updated_at
+                """, params)
+                conn.execute("COMMIT")
+            except Exception as e:
+                conn.execute("ROLLBACK")
+                logger.error(f"비디오 일괄 추가/업데이트 실패: {e}")
+                raise
+        
+        logger.info(f"비디오 일괄 추가/업데이트: {len(params)}개")
+        return len(params)
     
     def get_video_by_url(self, url: str) -> Optional[VideoRecord]:
         """URL로 비디오 조회"""
-        with self._query_context():
-            with self.pool.get_connection() as conn:
-                row = conn.execute(
-                    "SELECT * FROM videos WHERE url = ?",
-                    (url,)
-                ).fetchone()
+        with self._connection("get_video_by_url") as conn:
+            row = conn.execute(
+                "SELECT * FROM videos WHERE url = ?",
+                (url,)
+            ).fetchone()
                 
-                return self._row_to_video_record(row) if row else None
+            return self._row_to_video_record(row) if row else None
     
     def get_video_by_id(self, video_id: int) -> Optional[VideoRecord]:
         """ID로 비디오 조회"""
-        with self._query_context():
-            with self.pool.get_connection() as conn:
-                row = conn.execute(
-                    "SELECT * FROM videos WHERE id = ?",
-                    (video_id,)
-                ).fetchone()
+        with self._connection("get_video_by_id") as conn:
+            row = conn.execute(
+                "SELECT * FROM videos WHERE id = ?",
+                (video_id,)
+            ).fetchone()
                 
-                return self._row_to_video_record(row) if row else None
+            return self._row_to_video_record(row) if row else None
     
     def search_videos(self, 
                      genre: Optional[str] = None,
@@ -250,100 +600,114 @@ class ConcurrentVideoDatabase:
                      limit: int = 50,
                      offset: int = 0) -> List[VideoRecord]:
         """고급 비디오 검색"""
-        with self._query_context():
-            with self.pool.get_connection() as conn:
-                where_clauses = []
-                params = []
+        with self._connection("search_videos") as conn:
+            where_clauses = []
+            params = []
                 
-                # 장르 필터
-                if genre:
-                    where_clauses.append("genre = ?")
-                    params.append(genre)
+            # 장르 필터
+            if genre:
+                where_clauses.append("genre = ?")
+                params.append(genre)
                 
-                # 키워드 검색 (제목)
-                if keyword:
-                    where_clauses.append("title LIKE ?")
-                    params.append(f"%{keyword}%")
+            # 키워드 검색 (제목)
+            if keyword:
+                where_clauses.append("title LIKE ?")
+                params.append(f"%{keyword}%")
                 
-                # 태그 검색 (JSON 포함 검색)
-                if tags:
-                    for tag in tags:
-                        where_clauses.append("tags LIKE ?")
-                        params.append(f"%{tag}%")
+            # 태그 검색 (JSON 포함 검색)
+            if tags:
+                for tag in tags:
+                    where_clauses.append("tags LIKE ?")
+                    params.append(f"%{tag}%")
                 
-                # SQL 구성
-                where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
-                sql = f"""
-                    SELECT * FROM videos 
-                    WHERE {where_sql}
-                    ORDER BY created_at DESC
-                    LIMIT ? OFFSET ?
-                """
-                params.extend([limit, offset])
+            # SQL 구성
+            where_sql = " AND ".join(where_clauses) if where_clauses else "1=1"
+            sql = f"""
+                SELECT * FROM videos 
+                WHERE {where_sql}
+                ORDER BY created_at DESC
+                LIMIT ? OFFSET ?
+            """
+            params.extend([limit, offset])
                 
-                rows = conn.execute(sql, params).fetchall()
-                return [self._row_to_video_record(row) for row in rows]
+            rows = conn.execute(sql, params).fetchall()
+            return [self._row_to_video_record(row) for row in rows]
     
     def get_recent_videos(self, limit: int = 20) -> List[VideoRecord]:
         """최근 비디오 조회"""
-        with self._query_context():
-            with self.pool.get_connection() as conn:
-                rows = conn.execute(
-                    "SELECT * FROM videos ORDER BY created_at DESC LIMIT ?",
-                    (limit,)
-                ).fetchall()
+        with self._connection("get_recent_videos") as conn:
+            rows = conn.execute(
+                "SELECT * FROM videos ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
                 
-                return [self._row_to_video_record(row) for row in rows]
+            return [self._row_to_video_record(row) for row in rows]
     
     def get_statistics(self) -> Dict[str, Any]:
-        """데이터베이스 통계"""
-        with self._query_context():
-            with self.pool.get_connection() as conn:
-                # 전체 비디오 수
-                total_count = conn.execute("SELECT COUNT(*) as count FROM videos").fetchone()['count']
-                
-                # 장르별 통계
-                genre_stats = conn.execute("""
-                    SELECT genre, COUNT(*) as count 
-                    FROM videos 
-                    WHERE genre != '' 
-                    GROUP BY genre 
-                    ORDER BY count DESC
-                """).fetchall()
-                
-                # 플랫폼별 통계
-                platform_stats = conn.execute("""
-                    SELECT platform, COUNT(*) as count 
-                    FROM videos 
-                    GROUP BY platform 
-                    ORDER BY count DESC
-                """).fetchall()
-                
-                return {
-                    "total_videos": total_count,
-                    "genres": [{"genre": row["genre"], "count": row["count"]} for row in genre_stats],
-                    "platforms": [{"platform": row["platform"], "count": row["count"]} for row in platform_stats],
-                    "query_count": self._query_count
-                }
+        """데이터베이스 통계 (집계 테이블 조회 - videos 테이블 스캔 없음)"""
+        with self._connection("get_statistics") as conn:
+            rows = conn.execute("""
+                SELECT dimension, bucket, count
+                FROM video_stats
+                WHERE dimension IN ('total', 'genre', 'platform', 'model')
+                ORDER BY count DESC
+            """).fetchall()
+        
+        total_count = 0
+        genre_stats, platform_stats, model_stats = [], [], []
+        for row in rows:
+            dimension = row["dimension"]
+            if dimension == "total":
+                total_count = row["count"]
+            elif dimension == "genre" and row["bucket"] != "":
+                genre_stats.append({"genre": row["bucket"], "count": row["count"]})
+            elif dimension == "platform":
+                platform_stats.append({"platform": row["bucket"], "count": row["count"]})
+            elif dimension == "model" and row["bucket"] != "":
+                model_stats.append({"model": row["bucket"], "count": row["count"]})
+        
+        return {
+            "total_videos": total_count,
+            "genres": genre_stats,
+            "platforms": platform_stats,
+            "models": model_stats,
+            "query_count": self._query_count
+        }
+    
+    def get_stat_counts(self, dimension: str) -> Dict[str, int]:
+        """
+        특정 차원의 집계 조회
+        
+        Args:
+            dimension: STAT_DIMENSIONS 키 (total, genre, platform, model)
+        """
+        if dimension not in STAT_DIMENSIONS:
+            raise ValueError(f"알 수 없는 집계 차원: {dimension}")
+        
+        with self._connection("get_stat_counts") as conn:
+            rows = conn.execute(
+                "SELECT bucket, count FROM video_stats WHERE dimension = ?", (dimension,)
+            ).fetchall()
+        
+        return {row["bucket"]: row["count"] for row in rows}
     
     def delete_video(self, video_id: int) -> bool:
         """비디오 삭제"""
-        with self._query_context():
-            with self.pool.get_connection() as conn:
-                try:
-                    result = conn.execute("DELETE FROM videos WHERE id = ?", (video_id,))
-                    conn.commit()
+        with self._connection("delete_video", write=True) as conn:
+            try:
+                result = conn.execute("DELETE FROM videos WHERE id = ?", (video_id,))
+                conn.commit()
                     
-                    deleted = result.rowcount > 0
-                    if deleted:
-                        logger.info(f"비디오 삭제됨: ID {video_id}")
+                deleted = result.rowcount > 0
+                if deleted:
+                    logger.info(f"비디오 삭제됨: ID {video_id}")
                     
-                    return deleted
+                return deleted
                     
-                except Exception as e:
-                    conn.rollback()
-                    logger.error(f"비디오 삭제 실패: {e}")
-                    raise
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"비디오 삭제 실패: {e}")
+                raise
     
     def _row_to_video_record(self, row: sqlite3.Row) -> VideoRecord:
         """데이터베이스 행을 VideoRecord로 변환"""
@@ -377,15 +741,76 @@ class ConcurrentVideoDatabase:
         )
     
     @contextmanager
-    def _query_context(self):
-        """쿼리 실행 컨텍스트 (통계 수집)"""
+    def _connection(self, operation: str, write: bool = False):
+        """
+        쿼리 실행 컨텍스트 (커넥션 획득 + 통계 수집)
+        
+        쓰기는 단일 쓰기 커넥션으로 직렬화하고 읽기는 읽기 풀을 사용합니다.
+        커넥션 대기 시간과 점유 시간을 작업별로 기록합니다.
+        """
         with self._lock:
             self._query_count += 1
-        yield
+        
+        pool = self.write_pool if write else self.read_pool
+        conn, wait_ms = pool.acquire()
+        start = time.perf_counter()
+        try:
+            yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            query_ms = (time.perf_counter() - start) * 1000
+            pool.release(conn)
+            self.metrics.record(operation, pool.name, wait_ms, query_ms)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """커넥션 풀 사용량과 쿼리 지연시간 통계"""
+        stats = self.metrics.get_stats()
+        stats["query_count"] = self._query_count
+        stats["pools"] = {
+            "read": self.read_pool.get_stats(),
+            "write": self.write_pool.get_stats(),
+        }
+        stats["suggested_read_pool_size"] = self._suggest_read_pool_size(
+            stats["pools"]["read"], stats["wait_time"]["read"]
+        )
+        return stats
+    
+    @staticmethod
+    def _suggest_read_pool_size(pool_stats: Dict[str, Any], wait_stats: Dict[str, Any]) -> int:
+        """관측된 대기 시간과 최대 동시 사용량으로 읽기 풀 크기 제안"""
+        size = pool_stats["max_connections"]
+        
+        # 커넥션이 모자라 대기가 발생함 → 확대
+        if pool_stats["timeouts"] or (
+            pool_stats["peak_in_use"] >= size and wait_stats["p95_ms"] >= 10
+        ):
+            return min(size * 2, 32)
+        
+        # 최대 사용량이 상한의 절반 미만 → 축소
+        if wait_stats["count"] and pool_stats["peak_in_use"] < size // 2:
+            return max(pool_stats["peak_in_use"] + 1, 2)
+        
+        return size
+    
+    def resize_read_pool(self, max_connections: Optional[int] = None) -> int:
+        """
+        읽기 풀 크기 조정
+        
+        Args:
+            max_connections: 새 상한 (None이면 get_pool_stats의 제안값)
+        """
+        if max_connections is None:
+            max_connections = self.get_pool_stats()["suggested_read_pool_size"]
+        self.read_pool.resize(max_connections)
+        return self.read_pool.max_connections
     
     def close(self):
         """데이터베이스 연결 종료"""
-        self.pool.close_all()
+        self.read_pool.close_all()
+        self.write_pool.close_all()
         logger.info("데이터베이스 연결 종료")
 
 
@@ -0,0 +1,46 @@
+# core/database/rebuild_stats.py
+"""
+집계 통계 재구축 명령
+
+사용법:
+    python -m core.database.rebuild_stats            # TinyDB + SQLite 모두
+    python -m core.database.rebuild_stats --tinydb   # TinyDB(분석 저장소)만
+    python -m core.database.rebuild_stats --sqlite   # SQLite(대시보드)만
+"""
+
+import argparse
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def rebuild_all(tinydb: bool = True, sqlite: bool = True):
+    """저장소별 집계 통계 재구축"""
+    if tinydb:
+        from core.database.repository import VideoAnalysisDB
+        db = VideoAnalysisDB()
+        stats = db.rebuild_statistics()
+        db.close()
+        logger.info(f"TinyDB 집계 재구축: 영상 {stats['total_videos']}개, 분석 {stats['total_analyses']}개")
+    
+    if sqlite:
+        from core.database.concurrent_db import get_database
+        db = get_database()
+        db.rebuild_statistics()
+        logger.info(f"SQLite 집계 재구축: 영상 {db.get_statistics()['total_videos']}개")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="집계 통계 재구축")
+    parser.add_argument("--tinydb", action="store_true", help="TinyDB 분석 저장소만 재구축")
+    parser.add_argument("--sqlite", action="store_true", help="SQLite 데이터베이스만 재구축")
+    args = parser.parse_args()
+    
+    # 둘 다 지정하지 않으면 전체 재구축
+    run_all = not (args.tinydb or args.sqlite)
+    rebuild_all(tinydb=run_all or args.tinydb, sqlite=run_all or args.sqlite)
+
+
+if __name__ == "__main__":
+    main()
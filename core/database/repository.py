@@ -2,16 +2,128 @@
 
 from tinydb import TinyDB, Query
 from tinydb.operations import set as tdb_set
+from tinydb.table import Document
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple, Callable
 import json
 import re
+import threading
 from dataclasses import asdict
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 집계 통계 문서 ID (stats 테이블에 단일 문서로 유지)
+STATS_DOC_ID = 1
+
+# 시간대별 집계 보관 기간 (대시보드 타임라인용)
+HOURLY_STATS_RETENTION_DAYS = 7
+
+# 같은 파일을 공유하는 인스턴스 간 읽기/쓰기 + 집계 갱신 직렬화
+# (TinyDB 파일 핸들은 스레드 안전하지 않음)
+_db_lock = threading.RLock()
+
+# 읽기 캐시 최대 엔트리 수 (초과 시 전체 비움)
+READ_CACHE_MAX_ENTRIES = 512
+
+
+class _ReadCache:
+    """
+    DB 파일별 조회 결과 캐시
+    
+    쓰기 메서드가 버전을 올리면 전체가 무효화되고, 다른 프로세스의 쓰기는
+    파일 mtime/크기 변화로 감지합니다.
+    """
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.version = 0
+        self.file_signature = None
+        self.entries: Dict[Tuple, Any] = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0
+        }
+    
+    def _current_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.db_path.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def get(self, key: Tuple) -> Tuple[bool, Any]:
+        """(hit 여부, 값) 반환"""
+        signature = self._current_signature()
+        with self.lock:
+            if signature != self.file_signature:
+                # 외부 쓰기 감지 - 전체 무효화
+                if self.entries:
+                    self.stats["invalidations"] += 1
+                self.entries.clear()
+                self.file_signature = signature
+            
+            if key in self.entries:
+                self.stats["hits"] += 1
+                return True, self.entries[key]
+            
+            self.stats["misses"] += 1
+            return False, None
+    
+    def put(self, key: Tuple, value: Any, version: int):
+        """조회 시작 시점의 버전이 그대로일 때만 저장"""
+        with self.lock:
+            if version != self.version:
+                return
+            if len(self.entries) >= READ_CACHE_MAX_ENTRIES:
+                self.entries.clear()
+            self.entries[key] = value
+    
+    def invalidate(self):
+        """쓰기 발생 - 버전 증가 및 전체 무효화"""
+        with self.lock:
+            self.version += 1
+            if self.entries:
+                self.stats["invalidations"] += 1
+            self.entries.clear()
+            self.file_signature = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            total_requests = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries_count": len(self.entries),
+                "version": self.version,
+                "hit_rate": self.stats["hits"] / total_requests if total_requests else 0.0
+            }
+
+
+_read_caches: Dict[str, _ReadCache] = {}
+
+
+def _get_read_cache(db_path: Path) -> _ReadCache:
+    """DB 파일 경로별 읽기 캐시 (같은 파일을 여는 인스턴스끼리 공유)"""
+    key = str(db_path.resolve())
+    with _db_lock:
+        if key not in _read_caches:
+            _read_caches[key] = _ReadCache(db_path)
+        return _read_caches[key]
+
+
+def _copy_result(value: Any) -> Any:
+    """캐시된 결과를 호출자가 수정해도 캐시가 오염되지 않도록 복사"""
+    if isinstance(value, Document):
+        return Document({k: _copy_result(v) for k, v in value.items()}, doc_id=value.doc_id)
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    return value
+
 
 class VideoAnalysisDB:
     """TinyDB를 사용한 영상 분석 결과 저장소"""
@@ -32,6 +144,10 @@ class VideoAnalysisDB:
         # 테이블 생성
         self.videos_table = self.db.table('videos')
         self.analyses_table = self.db.table('analyses')
+        self.stats_table = self.db.table('stats')
+        
+        # 조회 결과 캐시 (쓰기 시 무효화)
+        self._read_cache = _get_read_cache(self.db_path)
         
         logger.info(f"Database initialized at: {self.db_path}")
     
@@ -51,13 +167,27 @@ class VideoAnalysisDB:
         Analysis = Query()
         
         try:
-            # 영상 정보 삭제
-            removed_videos = self.videos_table.remove(Video.video_id == video_id)
-            logger.info(f"Removed {len(removed_videos)} video records for video_id: {video_id}")
-            
-            # 관련 분석 결과 삭제
-            removed_analyses = self.analyses_table.remove(Analysis.video_id == video_id)
-            logger.info(f"Removed {len(removed_analyses)} analysis records for video_id: {video_id}")
+            with _db_lock:
+                videos = self.videos_table.search(Video.video_id == video_id)
+                analyses = self.analyses_table.search(Analysis.video_id == video_id)
+                
+                # 영상 정보 삭제
+                removed_videos = self.videos_table.remove(Video.video_id == video_id)
+                logger.info(f"Removed {len(removed_videos)} video records for video_id: {video_id}")
+                
+                # 관련 분석 결과 삭제
+                removed_analyses = self.analyses_table.remove(Analysis.video_id == video_id)
+                logger.info(f"Removed {len(removed_analyses)} analysis records for video_id: {video_id}")
+                
+                # 집계 통계 차감
+                self._apply_stats_delta(
+                    self._merge_stat_keys(
+                        [self._video_stat_keys(v) for v in videos] +
+                        [self._analysis_stat_keys(a) for a in analyses]
+                    ),
+                    sign=-1,
+                    totals={'total_videos': -len(videos), 'total_analyses': -len(analyses)}
+                )
             
             return len(removed_videos) > 0 or len(removed_analyses) > 0
         except Exception as e:
@@ -78,8 +208,17 @@ class VideoAnalysisDB:
         Analysis = Query()
         
         try:
-            removed = self.analyses_table.remove(Analysis.video_id == video_id)
-            logger.info(f"Removed {len(removed)} analysis records for video_id: {video_id}")
+            with _db_lock:
+                analyses = self.analyses_table.search(Analysis.video_id == video_id)
+                removed = self.analyses_table.remove(Analysis.video_id == video_id)
+                logger.info(f"Removed {len(removed)} analysis records for video_id: {video_id}")
+                
+                # 집계 통계 차감
+                self._apply_stats_delta(
+                    self._merge_stat_keys([self._analysis_stat_keys(a) for a in analyses]),
+                    sign=-1,
+                    totals={'total_analyses': -len(analyses)}
+                )
             return len(removed) > 0
         except Exception as e:
             logger.error(f"Error deleting analyses for video {video_id}: {str(e)}")
@@ -115,11 +254,168 @@ class VideoAnalysisDB:
         """
         Video = Query()
         
-        # 기존 데이터 확인
-        existing = self.videos_table.search(Video.video_id == video_data['video_id'])
-        
         # 확장된 메타데이터를 포함한 레코드 생성
-        video_record = {
+        video_record = self._build_video_record(video_data)
+        
+        with _db_lock:
+            # 기존 데이터 확인
+            existing = self.videos_table.search(Video.video_id == video_data['video_id'])
+            
+            if existing:
+                # 업데이트
+                doc_id = existing[0].doc_id
+                self.videos_table.update(
+                    video_record,
+                    doc_ids=[doc_id]
+                )
+                logger.info(f"Updated video info for: {video_data['video_id']}")
+                
+                # 집계 변화가 없어도 레코드는 바뀌었으므로 읽기 캐시는 항상 무효화
+                self._read_cache.invalidate()
+                
+                # 플랫폼이 바뀐 경우에만 집계 이동
+                old_platform = existing[0].get('platform', 'unknown')
+                if old_platform != video_record['platform']:
+                    self._apply_stats_delta({'platforms': [old_platform]}, sign=-1)
+                    self._apply_stats_delta(self._video_stat_keys(video_record), sign=1)
+            else:
+                # 새로 삽입
+                doc_id = self.videos_table.insert(video_record)
+                logger.info(f"Saved new video info for: {video_data['video_id']}")
+                
+                self._apply_stats_delta(
+                    self._video_stat_keys(video_record),
+                    sign=1,
+                    totals={'total_videos': 1}
+                )
+        
+        return doc_id
+    
+    def save_analysis_result(self, video_id: str, analysis_data: Dict[str, Any]) -> int:
+        """AI 분석 결과 저장 - 확장된 씬 정보 포함"""
+        Analysis = Query()
+        
+        analysis_record = self._build_analysis_record(video_id, analysis_data)
+        with _db_lock:
+            # 기존 분석 결과가 있는지 확인
+            existing = self.analyses_table.search(
+                (Analysis.video_id == video_id) & 
+                (Analysis.version == '1.0')
+            )
+            
+            if existing:
+                # 기존 분석을 히스토리로 보관하고 새로 삽입
+                doc_id = self.analyses_table.insert(analysis_record)
+                logger.info(f"Saved new analysis for video: {video_id}")
+            else:
+                doc_id = self.analyses_table.insert(analysis_record)
+                logger.info(f"Saved first analysis for video: {video_id}")
+            
+            # 집계 통계 갱신 (분석 저장과 같은 잠금 구간에서 수행)
+            self._apply_stats_delta(
+                self._analysis_stat_keys(analysis_record),
+                sign=1,
+                totals={'total_analyses': 1}
+            )
+        
+        return doc_id
+    
+    def add_videos_bulk(self, video_data_list: List[Dict[str, Any]]) -> int:
+        """
+        여러 영상 정보를 한 번에 저장 (save_video_info의 배치 버전)
+        
+        기존 레코드 조회 1회, 업데이트/삽입 각 1회 쓰기로 처리하여
+        레코드마다 파일 전체를 다시 쓰지 않습니다.
+        
+        Args:
+            video_data_list: save_video_info와 같은 형식의 딕셔너리 리스트
+        
+        Returns:
+            저장된 레코드 수
+        """
+        if not video_data_list:
+            return 0
+        
+        Video = Query()
+        
+        # 같은 video_id가 여러 번 나오면 마지막 값 사용
+        records = {}
+        for video_data in video_data_list:
+            records[video_data['video_id']] = self._build_video_record(video_data)
+        
+        with _db_lock:
+            existing = {
+                doc['video_id']: doc
+                for doc in self.videos_table.search(Video.video_id.one_of(list(records)))
+            }
+            
+            if existing:
+                self.videos_table.update(
+                    lambda doc: doc.update(records[doc['video_id']]),
+                    Video.video_id.one_of(list(existing))
+                )
+            
+            new_records = [r for vid, r in records.items() if vid not in existing]
+            if new_records:
+                self.videos_table.insert_multiple(new_records)
+            
+            # 집계 통계는 배치 전체에 대해 한 번만 갱신
+            removed = [
+                {'platforms': [doc.get('platform', 'unknown')]}
+                for vid, doc in existing.items()
+                if doc.get('platform', 'unknown') != records[vid]['platform']
+            ]
+            added = [
+                self._video_stat_keys(records[vid])
+                for vid in records
+                if vid not in existing or
+                existing[vid].get('platform', 'unknown') != records[vid]['platform']
+            ]
+            if removed:
+                self._apply_stats_delta(self._merge_stat_keys(removed), sign=-1)
+            self._apply_stats_delta(
+                self._merge_stat_keys(added),
+                sign=1,
+                totals={'total_videos': len(new_records)}
+            )
+        
+        logger.info(f"Bulk saved video info: {len(new_records)} new, {len(existing)} updated")
+        return len(records)
+    
+    def save_analyses_bulk(self, analyses: List[Tuple[str, Dict[str, Any]]]) -> List[int]:
+        """
+        여러 분석 결과를 한 번에 저장 (save_analysis_result의 배치 버전)
+        
+        Args:
+            analyses: (video_id, analysis_data) 튜플 리스트
+        
+        Returns:
+            저장된 문서 ID 리스트
+        """
+        if not analyses:
+            return []
+        
+        records = [
+            self._build_analysis_record(video_id, analysis_data)
+            for video_id, analysis_data in analyses
+        ]
+        
+        with _db_lock:
+            doc_ids = self.analyses_table.insert_multiple(records)
+            
+            self._apply_stats_delta(
+                self._merge_stat_keys([self._analysis_stat_keys(r) for r in records]),
+                sign=1,
+                totals={'total_analyses': len(records)}
+            )
+        
+        logger.info(f"Bulk saved {len(records)} analyses")
+        return doc_ids
+    
+    @staticmethod
+    def _build_video_record(video_data: Dict[str, Any]) -> Dict[str, Any]:
+        """영상 정보 딕셔너리를 저장용 레코드로 변환"""
+        return {
             'video_id': video_data['video_id'],
             'url': video_data['url'],
             'title': video_data.get('title', ''),
@@ -143,27 +439,11 @@ class VideoAnalysisDB:
             'upload_date': video_data.get('upload_date', ''),
             'age_limit': video_data.get('age_limit', 0),
         }
-        
-        if existing:
-            # 업데이트
-            doc_id = existing[0].doc_id
-            self.videos_table.update(
-                video_record,
-                doc_ids=[doc_id]
-            )
-            logger.info(f"Updated video info for: {video_data['video_id']}")
-        else:
-            # 새로 삽입
-            doc_id = self.videos_table.insert(video_record)
-            logger.info(f"Saved new video info for: {video_data['video_id']}")
-        
-        return doc_id
     
-    def save_analysis_result(self, video_id: str, analysis_data: Dict[str, Any]) -> int:
-        """AI 분석 결과 저장 - 확장된 씬 정보 포함"""
-        Analysis = Query()
-        
-        analysis_record = {
+    @staticmethod
+    def _build_analysis_record(video_id: str, analysis_data: Dict[str, Any]) -> Dict[str, Any]:
+        """분석 결과 딕셔너리를 저장용 레코드로 변환"""
+        return {
             'video_id': video_id,
             'genre': analysis_data.get('genre', ''),
             'reasoning': analysis_data.get('reasoning', ''),
@@ -181,21 +461,6 @@ class VideoAnalysisDB:
             'analysis_date': datetime.now().isoformat(),
             'version': '1.0'
         }
-        # 기존 분석 결과가 있는지 확인
-        existing = self.analyses_table.search(
-            (Analysis.video_id == video_id) & 
-            (Analysis.version == '1.0')
-        )
-        
-        if existing:
-            # 기존 분석을 히스토리로 보관하고 새로 삽입
-            doc_id = self.analyses_table.insert(analysis_record)
-            logger.info(f"Saved new analysis for video: {video_id}")
-        else:
-            doc_id = self.analyses_table.insert(analysis_record)
-            logger.info(f"Saved first analysis for video: {video_id}")
-        
-        return doc_id
     
     def get_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -207,9 +472,12 @@ class VideoAnalysisDB:
         Returns:
             영상 정보 딕셔너리 또는 None
         """
-        Video = Query()
-        result = self.videos_table.search(Video.video_id == video_id)
-        return result[0] if result else None
+        def load():
+            Video = Query()
+            result = self.videos_table.search(Video.video_id == video_id)
+            return result[0] if result else None
+        
+        return self._cached(('video_info', video_id), load)
     
     def get_latest_analysis(self, video_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -221,15 +489,18 @@ class VideoAnalysisDB:
         Returns:
             분석 결과 딕셔너리 또는 None
         """
-        Analysis = Query()
-        results = self.analyses_table.search(Analysis.video_id == video_id)
-        
-        if not results:
-            return None
+        def load():
+            Analysis = Query()
+            results = self.analyses_table.search(Analysis.video_id == video_id)
+            
+            if not results:
+                return None
+            
+            # 가장 최근 분석 결과 반환
+            sorted_results = sorted(results, key=lambda x: x['analysis_date'], reverse=True)
+            return sorted_results[0]
         
-        # 가장 최근 분석 결과 반환
-        sorted_results = sorted(results, key=lambda x: x['analysis_date'], reverse=True)
-        return sorted_results[0]
+        return self._cached(('latest_analysis', video_id), load)
     
     def get_all_analyses(self, video_id: str) -> List[Dict[str, Any]]:
         """
@@ -241,9 +512,12 @@ class VideoAnalysisDB:
         Returns:
             분석 결과 리스트 (최신순)
         """
-        Analysis = Query()
-        results = self.analyses_table.search(Analysis.video_id == video_id)
-        return sorted(results, key=lambda x: x['analysis_date'], reverse=True)
+        def load():
+            Analysis = Query()
+            results = self.analyses_table.search(Analysis.video_id == video_id)
+            return sorted(results, key=lambda x: x['analysis_date'], reverse=True)
+        
+        return self._cached(('all_analyses', video_id), load)
     
     def search_by_genre(self, genre: str) -> List[Dict[str, Any]]:
         """
@@ -256,7 +530,8 @@ class VideoAnalysisDB:
             해당 장르의 분석 결과 리스트
         """
         Analysis = Query()
-        results = self.analyses_table.search(Analysis.genre.matches(genre, flags=re.IGNORECASE))
+        with _db_lock:
+            results = self.analyses_table.search(Analysis.genre.matches(genre, flags=re.IGNORECASE))
         return results
     
     def search_by_tags(self, tags: List[str]) -> List[Dict[str, Any]]:
@@ -272,11 +547,12 @@ class VideoAnalysisDB:
         Analysis = Query()
         results = []
         
-        for tag in tags:
-            tag_results = self.analyses_table.search(
-                Analysis.tags.any(lambda x: tag.lower() in x.lower())
-            )
-            results.extend(tag_results)
+        with _db_lock:
+            for tag in tags:
+                tag_results = self.analyses_table.search(
+                    Analysis.tags.any(lambda x: tag.lower() in x.lower())
+                )
+                results.extend(tag_results)
         
         # 중복 제거
         unique_results = {r.doc_id: r for r in results}
@@ -286,35 +562,149 @@ class VideoAnalysisDB:
         """
         데이터베이스 통계 정보 조회
         
+        분석 테이블을 순회하지 않고 저장 시점에 갱신되는 집계 문서를 읽습니다.
+        집계 문서가 없으면 한 번 재구축합니다.
+        
         Returns:
             통계 정보 딕셔너리
         """
-        total_videos = len(self.videos_table)
-        total_analyses = len(self.analyses_table)
+        stats = self._cached(('statistics',), lambda: self.stats_table.get(doc_id=STATS_DOC_ID))
+        if stats is None:
+            stats = self.rebuild_statistics()
         
-        # 장르별 통계
-        genre_stats = {}
-        for analysis in self.analyses_table.all():
-            genre = analysis.get('genre', 'Unknown')
-            genre_stats[genre] = genre_stats.get(genre, 0) + 1
-        
-        # 태그 통계
-        tag_stats = {}
-        for analysis in self.analyses_table.all():
-            for tag in analysis.get('tags', []):
-                tag_stats[tag] = tag_stats.get(tag, 0) + 1
+        tag_stats = stats.get('tags', {})
         
         # 상위 10개 태그
         top_tags = sorted(tag_stats.items(), key=lambda x: x[1], reverse=True)[:10]
         
         return {
-            'total_videos': total_videos,
-            'total_analyses': total_analyses,
-            'genre_distribution': genre_stats,
+            'total_videos': stats.get('total_videos', 0),
+            'total_analyses': stats.get('total_analyses', 0),
+            'genre_distribution': dict(stats.get('genres', {})),
+            'platform_distribution': dict(stats.get('platforms', {})),
+            'model_distribution': dict(stats.get('models', {})),
+            'daily_analyses': dict(stats.get('days', {})),
+            'hourly_analyses': dict(stats.get('hours', {})),
             'top_tags': top_tags,
+            'stats_updated_at': stats.get('updated_at'),
             'db_size_bytes': self.db_path.stat().st_size if self.db_path.exists() else 0
         }
     
+    def rebuild_statistics(self) -> Dict[str, Any]:
+        """
+        집계 통계를 전체 데이터로부터 다시 계산
+        
+        집계가 어긋났거나(수동 편집, 이전 버전 데이터) 처음 도입될 때 사용합니다.
+        
+        Returns:
+            재구축된 집계 문서
+        """
+        with _db_lock:
+            videos = self.videos_table.all()
+            analyses = self.analyses_table.all()
+            
+            stats = {
+                'total_videos': len(videos),
+                'total_analyses': len(analyses),
+                'genres': {}, 'platforms': {}, 'models': {},
+                'days': {}, 'hours': {}, 'tags': {}
+            }
+            keys = self._merge_stat_keys(
+                [self._video_stat_keys(v) for v in videos] +
+                [self._analysis_stat_keys(a) for a in analyses]
+            )
+            self._update_stats_doc(stats, keys, sign=1, totals={})
+            
+            self.stats_table.upsert(Document(stats, doc_id=STATS_DOC_ID))
+            self._read_cache.invalidate()
+        
+        logger.info(f"Statistics rebuilt: {len(videos)} videos, {len(analyses)} analyses")
+        return stats
+    
+    @staticmethod
+    def _video_stat_keys(video: Dict[str, Any]) -> Dict[str, List[str]]:
+        """영상 레코드가 기여하는 집계 키"""
+        return {'platforms': [video.get('platform', 'unknown')]}
+    
+    @staticmethod
+    def _analysis_stat_keys(analysis: Dict[str, Any]) -> Dict[str, List[str]]:
+        """분석 레코드가 기여하는 집계 키"""
+        analysis_date = analysis.get('analysis_date', '')
+        return {
+            'genres': [analysis.get('genre', 'Unknown')],
+            'models': [analysis.get('model_used', 'unknown')],
+            'days': [analysis_date[:10]] if analysis_date else [],
+            'hours': [analysis_date[:13]] if analysis_date else [],
+            'tags': list(analysis.get('tags', []))
+        }
+    
+    @staticmethod
+    def _merge_stat_keys(key_sets: List[Dict[str, List[str]]]) -> Dict[str, List[str]]:
+        """여러 레코드의 집계 키를 하나로 병합"""
+        merged: Dict[str, List[str]] = {}
+        for keys in key_sets:
+            for field, values in keys.items():
+                merged.setdefault(field, []).extend(values)
+        return merged
+    
+    @staticmethod
+    def _update_stats_doc(doc: Dict[str, Any], keys: Dict[str, List[str]],
+                          sign: int, totals: Dict[str, int]):
+        """집계 문서에 증감 반영 (제자리 수정)"""
+        for field, values in keys.items():
+            bucket = doc.setdefault(field, {})
+            for value in values:
+                count = bucket.get(value, 0) + sign
+                if count > 0:
+                    bucket[value] = count
+                else:
+                    bucket.pop(value, None)
+        
+        for field, delta in totals.items():
+            doc[field] = max(0, doc.get(field, 0) + delta)
+        
+        # 오래된 시간대별 집계 정리
+        hours = doc.get('hours', {})
+        cutoff = (datetime.now() - timedelta(days=HOURLY_STATS_RETENTION_DAYS)).isoformat()[:13]
+        for hour in [h for h in hours if h < cutoff]:
+            del hours[hour]
+        
+        doc['updated_at'] = datetime.now().isoformat()
+    
+    def _apply_stats_delta(self, keys: Dict[str, List[str]], sign: int,
+                           totals: Optional[Dict[str, int]] = None):
+        """
+        집계 문서에 증감 반영
+        
+        호출 측에서 _db_lock을 잡은 상태로, 원본 레코드 쓰기 직후에 호출합니다.
+        집계 문서가 없으면 방금 쓴 레코드까지 포함해 재구축합니다.
+        """
+        if not self.stats_table.contains(doc_id=STATS_DOC_ID):
+            self.rebuild_statistics()
+            return
+        
+        self.stats_table.update(
+            lambda doc: self._update_stats_doc(doc, keys, sign, totals or {}),
+            doc_ids=[STATS_DOC_ID]
+        )
+        
+        # 집계 문서도 캐시된 읽기 결과이므로 무효화 (집계가 바뀌지 않는 쓰기는 호출 측에서 직접 무효화)
+        self._read_cache.invalidate()
+    
+    def _cached(self, key: Tuple, loader: Callable[[], Any]) -> Any:
+        """읽기 캐시 조회, 없으면 loader 실행 후 저장 (반환값은 복사본)"""
+        hit, value = self._read_cache.get(key)
+        if not hit:
+            version = self._read_cache.version
+            with _db_lock:
+                value = loader()
+            self._read_cache.put(key, value, version)
+        return _copy_result(value)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """읽기 캐시 적중/미스 통계"""
+        return self._read_cache.get_stats()
+    
     def export_to_json(self, output_path: str) -> None:
         """
         전체 데이터베이스를 JSON으로 내보내기
@@ -333,6 +723,104 @@ class VideoAnalysisDB:
         
         logger.info(f"Database exported to: {output_path}")
     
+    # 스냅샷 증분 기준 필드 (테이블별 갱신 시각)
+    SNAPSHOT_TIMESTAMP_FIELDS = {
+        'videos': 'updated_at',
+        'analyses': 'analysis_date'
+    }
+    
+    def snapshot_records(self, since: Optional[str] = None) -> Tuple[Dict[str, List[Dict[str, Any]]], str]:
+        """
+        스냅샷 대상 테이블을 한 시점 기준으로 읽기 (스냅샷 내보내기용)
+        
+        모든 테이블을 같은 락 안에서 읽고 그 데이터에서 증분 기준 시각을 계산하므로,
+        테이블 사이에 끼어든 쓰기가 기준 시각보다 앞선 채 누락되지 않습니다.
+        
+        Args:
+            since: 이 시각(ISO 문자열)보다 이후에 갱신된 레코드만
+        
+        Returns:
+            ({테이블명: 레코드 리스트}, 읽은 레코드의 최대 갱신 시각 - 없으면 since 또는 '')
+        """
+        with _db_lock:
+            documents = {
+                table_name: self.db.table(table_name).all()
+                for table_name in self.SNAPSHOT_TIMESTAMP_FIELDS
+            }
+        
+        records: Dict[str, List[Dict[str, Any]]] = {}
+        watermark = since or ''
+        for table_name, table_docs in documents.items():
+            timestamp_field = self.SNAPSHOT_TIMESTAMP_FIELDS[table_name]
+            records[table_name] = [
+                dict(doc) for doc in table_docs
+                if since is None or doc.get(timestamp_field, '') > since
+            ]
+            for record in records[table_name]:
+                watermark = max(watermark, record.get(timestamp_field, ''))
+        return records, watermark
+    
+    def import_records(self,
+                       videos: Optional[List[Dict[str, Any]]] = None,
+                       analyses: Optional[List[Dict[str, Any]]] = None,
+                       rebuild_stats: bool = True) -> Dict[str, int]:
+        """
+        스냅샷 레코드를 원본 필드 그대로 가져오기
+        
+        영상은 video_id 기준으로 덮어쓰고, 분석은 (video_id, analysis_date)가
+        이미 있으면 건너뜁니다.
+        
+        Args:
+            videos: 영상 레코드 리스트
+            analyses: 분석 레코드 리스트
+            rebuild_stats: 완료 후 집계 통계 재구축 여부 (청크 단위 호출 시 마지막에만)
+        
+        Returns:
+            {'videos': 반영 수, 'analyses': 추가 수}
+        """
+        Video = Query()
+        Analysis = Query()
+        imported = {'videos': 0, 'analyses': 0}
+        
+        with _db_lock:
+            if videos:
+                by_id = {video['video_id']: video for video in videos}
+                existing_ids = {
+                    doc['video_id']
+                    for doc in self.videos_table.search(Video.video_id.one_of(list(by_id)))
+                }
+                if existing_ids:
+                    self.videos_table.update(
+                        lambda doc: doc.update(by_id[doc['video_id']]),
+                        Video.video_id.one_of(list(existing_ids))
+                    )
+                self.videos_table.insert_multiple(
+                    [video for vid, video in by_id.items() if vid not in existing_ids]
+                )
+                imported['videos'] = len(by_id)
+            
+            if analyses:
+                video_ids = list({analysis['video_id'] for analysis in analyses})
+                seen = {
+                    (doc['video_id'], doc.get('analysis_date'))
+                    for doc in self.analyses_table.search(Analysis.video_id.one_of(video_ids))
+                }
+                new_analyses = []
+                for analysis in analyses:
+                    key = (analysis['video_id'], analysis.get('analysis_date'))
+                    if key not in seen:
+                        seen.add(key)
+                        new_analyses.append(analysis)
+                self.analyses_table.insert_multiple(new_analyses)
+                imported['analyses'] = len(new_analyses)
+            
+            if rebuild_stats:
+                self.rebuild_statistics()
+            else:
+                self._read_cache.invalidate()
+        
+        return imported
+    
     def get_all_videos(self) -> List[Dict[str, Any]]:
         """
         모든 비디오 정보를 분석 결과와 함께 반환
@@ -340,16 +828,26 @@ class VideoAnalysisDB:
         Returns:
             비디오 정보 리스트 (분석 결과 포함)
         """
-        videos = self.videos_table.all()
-        
-        # 각 비디오에 대한 최신 분석 결과 추가
-        for video in videos:
-            video_id = video.get('video_id')
-            if video_id:
-                analysis = self.get_latest_analysis(video_id)
-                video['analysis_result'] = analysis
+        def load():
+            videos = self.videos_table.all()
+            
+            # 영상별 최신 분석 결과 (분석 테이블 1회 조회)
+            latest: Dict[str, Dict[str, Any]] = {}
+            for analysis in self.analyses_table.all():
+                vid = analysis.get('video_id')
+                current = latest.get(vid)
+                if current is None or analysis['analysis_date'] > current['analysis_date']:
+                    latest[vid] = analysis
+            
+            # 각 비디오에 대한 최신 분석 결과 추가
+            for video in videos:
+                video_id = video.get('video_id')
+                if video_id:
+                    video['analysis_result'] = latest.get(video_id)
+            
+            return videos
         
-        return videos
+        return self._cached(('all_videos',), load)
     
     def close(self):
         """데이터베이스 연결 종료"""
@@ -357,6 +855,20 @@ class VideoAnalysisDB:
         logger.info("Database connection closed")
 
 
+# 프로세스 전역 저장소 인스턴스
+_repository_instance = None
+
+
+def get_repository() -> VideoAnalysisDB:
+    """저장소 싱글톤 인스턴스 반환 (Streamlit 재실행마다 새로 열지 않도록)"""
+    global _repository_instance
+    if _repository_instance is None:
+        with _db_lock:
+            if _repository_instance is None:
+                _repository_instance = VideoAnalysisDB()
+    return _repository_instance
+
+
 # 사용 예시
 if __name__ == "__main__":
     # 데이터베이스 초기화
@@ -0,0 +1,348 @@
+# core/database/snapshot.py
+"""
+분석 아카이브 스냅샷 (내보내기/가져오기)
+
+레코드를 청크 단위로 스트리밍하여 전체 DB를 하나의 문자열로 만들지 않습니다.
+- pyarrow가 있으면 Parquet(기본) 또는 Arrow IPC
+- 없으면 NDJSON 청크 (zstandard가 있으면 .zst, 없으면 .gz)
+
+증분 스냅샷은 videos.updated_at / analyses.analysis_date 기준으로 이전
+스냅샷 이후 변경분만 담습니다. 삭제는 증분에 반영되지 않으므로 주기적으로
+전체 스냅샷을 만드는 것을 권장합니다.
+
+사용법:
+    python -m core.database.snapshot export backups/           # 전체 스냅샷
+    python -m core.database.snapshot export backups/ --incremental
+    python -m core.database.snapshot import backups/            # 전체 + 증분 순서대로 적용
+"""
+
+import argparse
+import gzip
+import io
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from core.database.repository import VideoAnalysisDB, get_repository
+from utils.logger import get_logger
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+SNAPSHOT_TABLES = ("videos", "analyses")
+DEFAULT_CHUNK_SIZE = 1000
+
+# 포맷별 파일 확장자
+FORMAT_EXTENSIONS = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+    "ndjson": ".ndjson.zst" if ZSTD_AVAILABLE else ".ndjson.gz",
+}
+
+
+def default_format() -> str:
+    """사용 가능한 가장 압축률 좋은 포맷"""
+    return "parquet" if PYARROW_AVAILABLE else "ndjson"
+
+
+def _chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """레코드 스트림을 청크로 분할"""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ===== 컬럼 변환 (Arrow) =====
+
+def _column_kind(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, (int, float)):
+        return "number"
+    if isinstance(value, str):
+        return "string"
+    return "json"
+
+
+def _records_to_table(records: List[Dict[str, Any]]) -> "pa.Table":
+    """
+    레코드 청크를 Arrow 테이블로 변환
+
+    스칼라 타입이 일정한 컬럼은 그대로, 중첩(dict/list)이거나 타입이 섞인
+    컬럼은 JSON 문자열로 저장하고 스키마 메타데이터에 기록합니다.
+    """
+    columns: Dict[str, List[Any]] = {}
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns[key] = []
+    for key in columns:
+        columns[key] = [record.get(key) for record in records]
+
+    json_columns = []
+    for key, values in columns.items():
+        kinds = {_column_kind(value) for value in values} - {None}
+        if len(kinds) > 1 or "json" in kinds:
+            json_columns.append(key)
+            columns[key] = [
+                None if value is None else json.dumps(value, ensure_ascii=False)
+                for value in values
+            ]
+
+    table = pa.table(columns)
+    return table.replace_schema_metadata({"json_columns": json.dumps(json_columns)})
+
+
+def _table_to_records(table: "pa.Table") -> Iterator[Dict[str, Any]]:
+    """Arrow 테이블을 레코드로 복원 (None 값은 키 생략)"""
+    metadata = table.schema.metadata or {}
+    json_columns = set(json.loads(metadata.get(b"json_columns", b"[]")))
+
+    for row in table.to_pylist():
+        record = {}
+        for key, value in row.items():
+            if value is None:
+                continue
+            record[key] = json.loads(value) if key in json_columns else value
+        yield record
+
+
+# ===== 청크 파일 읽기/쓰기 =====
+
+def _open_ndjson(path: Path, mode: str):
+    """압축 NDJSON 파일 열기 (텍스트 모드)"""
+    if path.suffix == ".zst":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError(f"zstandard 라이브러리가 필요합니다: {path.name}")
+        if "w" in mode:
+            stream = zstandard.ZstdCompressor(level=10).stream_writer(open(path, "wb"))
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return gzip.open(path, mode + "t", encoding="utf-8")
+
+
+def _write_chunk(fmt: str, path: Path, records: List[Dict[str, Any]]):
+    """청크 하나를 파일로 기록"""
+    if fmt == "parquet":
+        pq.write_table(_records_to_table(records), path, compression="zstd")
+    elif fmt == "arrow":
+        table = _records_to_table(records)
+        options = pa_ipc.IpcWriteOptions(compression="zstd")
+        with pa.OSFile(str(path), "wb") as sink:
+            with pa_ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+    else:
+        with _open_ndjson(path, "w") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+
+
+def _read_chunk(path: Path) -> Iterator[Dict[str, Any]]:
+    """청크 파일 하나를 레코드로 읽기 (확장자로 포맷 판별)"""
+    name = path.name
+    if name.endswith(".parquet") or name.endswith(".arrow"):
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError(f"pyarrow 라이브러리가 필요합니다: {name}")
+        if name.endswith(".parquet"):
+            table = pq.read_table(path)
+        else:
+            with pa.memory_map(str(path), "r") as source:
+                table = pa_ipc.open_file(source).read_all()
+        yield from _table_to_records(table)
+    else:
+        with _open_ndjson(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+# ===== 스냅샷 =====
+
+def _list_snapshots(root: Path) -> List[Path]:
+    """루트 아래 스냅샷 디렉토리 목록 (생성 순)"""
+    if (root / MANIFEST_NAME).exists():
+        return [root]
+    if not root.exists():
+        return []
+    return sorted(p for p in root.iterdir() if (p / MANIFEST_NAME).exists())
+
+
+def _load_manifest(snapshot_dir: Path) -> Dict[str, Any]:
+    with open(snapshot_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_snapshot(root_dir: str,
+                    db: Optional[VideoAnalysisDB] = None,
+                    incremental: bool = False,
+                    fmt: Optional[str] = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    스냅샷 내보내기
+
+    Args:
+        root_dir: 스냅샷 루트 디렉토리 (하위에 스냅샷별 디렉토리 생성)
+        db: 대상 저장소 (기본: 프로세스 공유 저장소)
+        incremental: 마지막 스냅샷 이후 변경분만 내보내기
+        fmt: 'parquet' | 'arrow' | 'ndjson' (기본: 사용 가능한 최선)
+        chunk_size: 청크당 레코드 수
+
+    Returns:
+        작성된 manifest
+    """
+    db = db or get_repository()
+    fmt = fmt or default_format()
+    if fmt in ("parquet", "arrow") and not PYARROW_AVAILABLE:
+        raise RuntimeError(f"{fmt} 포맷에는 pyarrow가 필요합니다")
+    if fmt not in FORMAT_EXTENSIONS:
+        raise ValueError(f"지원하지 않는 스냅샷 포맷: {fmt}")
+
+    root = Path(root_dir)
+    since = None
+    base = None
+    if incremental:
+        previous = _list_snapshots(root)
+        if previous:
+            base = previous[-1].name
+            since = _load_manifest(previous[-1])["until"]
+        else:
+            logger.info("이전 스냅샷이 없어 전체 스냅샷으로 진행")
+
+    created_at = datetime.now()
+    kind = "incr" if since else "full"
+    root.mkdir(parents=True, exist_ok=True)
+    while True:
+        # 이름순이 생성순이 되도록 마이크로초까지, 같은 이름이 있으면 시각을 밀어서 재시도
+        snapshot_dir = root / f"{created_at.strftime('%Y%m%dT%H%M%S.%f')}_{kind}"
+        try:
+            snapshot_dir.mkdir()
+            break
+        except FileExistsError:
+            created_at += timedelta(microseconds=1)
+
+    manifest = {
+        "format": fmt,
+        "kind": kind,
+        "created_at": created_at.isoformat(),
+        "base": base,
+        "since": since,
+        "until": since or "",
+        "files": {},
+        "counts": {}
+    }
+
+    # 두 테이블과 다음 증분 기준 시각을 같은 시점에서 읽음
+    records, manifest["until"] = db.snapshot_records(since)
+
+    for table_name in SNAPSHOT_TABLES:
+        files, count = [], 0
+
+        for index, chunk in enumerate(_chunked(records.pop(table_name), chunk_size)):
+            filename = f"{table_name}-{index:05d}{FORMAT_EXTENSIONS[fmt]}"
+            _write_chunk(fmt, snapshot_dir / filename, chunk)
+            files.append(filename)
+            count += len(chunk)
+
+        manifest["files"][table_name] = files
+        manifest["counts"][table_name] = count
+
+    # manifest는 마지막에 기록 (중단된 스냅샷은 목록에서 제외됨)
+    with open(snapshot_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    logger.info(
+        f"스냅샷 내보내기 완료: {snapshot_dir} "
+        f"({fmt}, 영상 {manifest['counts']['videos']}개, 분석 {manifest['counts']['analyses']}개)"
+    )
+    return manifest
+
+
+def import_snapshot(path: str, db: Optional[VideoAnalysisDB] = None) -> Dict[str, int]:
+    """
+    스냅샷 가져오기
+
+    Args:
+        path: 스냅샷 디렉토리 또는 스냅샷 루트 (루트면 전체 + 증분을 순서대로 적용)
+        db: 대상 저장소 (기본: 프로세스 공유 저장소)
+
+    Returns:
+        {'videos': 반영 수, 'analyses': 추가 수}
+    """
+    db = db or get_repository()
+    snapshots = _list_snapshots(Path(path))
+    if not snapshots:
+        raise FileNotFoundError(f"스냅샷을 찾을 수 없습니다: {path}")
+
+    # 루트에서는 마지막 전체 스냅샷부터 적용
+    full_indexes = [i for i, s in enumerate(snapshots) if _load_manifest(s)["kind"] == "full"]
+    if full_indexes:
+        snapshots = snapshots[full_indexes[-1]:]
+
+    totals = {"videos": 0, "analyses": 0}
+    for snapshot_dir in snapshots:
+        manifest = _load_manifest(snapshot_dir)
+        for table_name in SNAPSHOT_TABLES:
+            records = (
+                record
+                for filename in manifest["files"].get(table_name, [])
+                for record in _read_chunk(snapshot_dir / filename)
+            )
+            for chunk in _chunked(records, DEFAULT_CHUNK_SIZE):
+                imported = db.import_records(**{table_name: chunk}, rebuild_stats=False)
+                totals[table_name] += imported[table_name]
+
+        logger.info(f"스냅샷 적용: {snapshot_dir.name}")
+
+    db.rebuild_statistics()
+    logger.info(f"스냅샷 가져오기 완료: 영상 {totals['videos']}개, 분석 {totals['analyses']}개")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분석 아카이브 스냅샷")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="스냅샷 내보내기")
+    export_parser.add_argument("root", help="스냅샷 루트 디렉토리")
+    export_parser.add_argument("--incremental", action="store_true", help="마지막 스냅샷 이후 변경분만")
+    export_parser.add_argument("--format", choices=sorted(FORMAT_EXTENSIONS), default=None)
+    export_parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+
+    import_parser = subparsers.add_parser("import", help="스냅샷 가져오기")
+    import_parser.add_argument("path", help="스냅샷 디렉토리 또는 루트")
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_snapshot(args.root, incremental=args.incremental,
+                        fmt=args.format, chunk_size=args.chunk_size)
+    else:
+        import_snapshot(args.path)
+
+
+if __name__ == "__main__":
+    main()
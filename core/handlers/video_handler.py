@@ -1,14 +1,18 @@
 # core/handlers/video_handler.py
 """향상된 비디오 처리 핸들러 - Pipeline 기반"""
 
+import threading
+import uuid
 import streamlit as st
 from typing import Optional, Callable
 from utils.logger import get_logger
+from utils.cancellation import CancellationToken, TaskCancelledError
+from utils.progress_bus import get_progress_bus
 
 logger = get_logger(__name__)
 
 
-def handle_video_analysis_enhanced(video_url: str, precision_level: int, console_callback: Callable, model_name: str = "gpt-4o", progress_callback: Callable = None, custom_prompt: str = None):
+def handle_video_analysis_enhanced(video_url: str, precision_level: int, console_callback: Callable, model_name: str = "gpt-4o", progress_callback: Callable = None, custom_prompt: str = None, cancel_token: Optional[CancellationToken] = None):
     """향상된 비디오 분석 - Pipeline 기반 실시간 콘솔 출력
     
     Args:
@@ -18,6 +22,10 @@ def handle_video_analysis_enhanced(video_url: str, precision_level: int, console
         model_name: 사용할 AI 모델명 (기본값: gpt-4o)
         progress_callback: 진행률 콜백 함수 (stage, progress, message, detailed_message)
         custom_prompt: 사용자 맞춤형 분석 프롬프트 (선택사항)
+        cancel_token: 작업 취소 토큰 (작업 큐에서 전달)
+
+    파이프라인은 백그라운드 스레드에서 실행되고 진행 이벤트는 진행 버스에만 기록됩니다.
+    콜백(= Streamlit 위젯/세션 상태 갱신)은 호출한 스크립트 스레드에서만 실행됩니다.
     """
     
     try:
@@ -36,12 +44,15 @@ def handle_video_analysis_enhanced(video_url: str, precision_level: int, console
         
         video_service = st.session_state.video_service
         
-        # 정밀도 레벨 환경변수 설정
-        import os
-        os.environ["SCENE_PRECISION_LEVEL"] = str(precision_level)
+        # 작업별 설정 (os.environ을 바꾸지 않으므로 동시 작업 간 간섭 없음)
+        from core.workflow.pipeline import JobSettings
+        job_settings = JobSettings.from_env(
+            precision_level=int(precision_level),
+            model_name=model_name
+        )
         
-        # 콘솔 업데이트를 위한 래퍼 함수
-        def progress_callback_wrapper(stage: str, progress: int, message: str):
+        # 진행 이벤트를 콘솔/진행률 콜백으로 전달 (호출 스레드에서만 실행)
+        def dispatch_progress(stage: str, progress: int, message: str):
             # 콘솔에 메시지 출력
             console_callback(message)
             
@@ -159,16 +170,43 @@ def handle_video_analysis_enhanced(video_url: str, precision_level: int, console
         if progress_callback:
             progress_callback("init", 0, "🎬 영상 분석 시작", f"Starting analysis with precision level: {precision_level}")
         
-        # 모델명을 환경변수로 설정
-        os.environ["AI_MODEL_NAME"] = model_name
-        
-        # Pipeline 기반 VideoProcessor 호출
-        video = video_service.process(
-            url=video_url,
-            force_reanalyze=False,
-            progress_callback=progress_callback_wrapper,
-            custom_prompt=custom_prompt
-        )
+        # Pipeline 기반 VideoProcessor 호출 (스테이지 스레드는 버스에만 기록)
+        bus = get_progress_bus()
+        job_id = f"handler-{uuid.uuid4()}"
+        stream = bus.stream(job_id)
+        outcome = {}
+
+        def run_pipeline():
+            try:
+                outcome['video'] = video_service.process(
+                    url=video_url,
+                    force_reanalyze=False,
+                    progress_callback=stream.publish,
+                    custom_prompt=custom_prompt,
+                    cancel_token=cancel_token,
+                    settings=job_settings
+                )
+            except BaseException as e:
+                outcome['error'] = e
+            finally:
+                stream.close()
+
+        worker = threading.Thread(target=run_pipeline, name=f"VideoAnalysis-{job_id[8:16]}", daemon=True)
+        worker.start()
+
+        offset = 0
+        while True:
+            stream.wait(offset, timeout=0.5)
+            events, offset = stream.read(offset)
+            for event in events:
+                dispatch_progress(event.stage, event.progress, event.message)
+            if stream.closed and stream.read(offset)[1] == offset:
+                break
+        worker.join()
+
+        if 'error' in outcome:
+            raise outcome['error']
+        video = outcome.get('video')
         
         # 분석 완료 후 결과 요약
         if video:
@@ -218,6 +256,10 @@ def handle_video_analysis_enhanced(video_url: str, precision_level: int, console
         
         return video
         
+    except TaskCancelledError:
+        console_callback("⏹️ 분석이 취소되었습니다")
+        raise
+        
     except Exception as e:
         error_msg = f"❌ 오류 발생: {str(e)}"
         console_callback(error_msg)
@@ -0,0 +1,480 @@
+# core/queue/job_store.py
+"""
+SQLite 기반 영속 작업 저장소
+작업 큐의 대기/실행/완료 상태를 WAL 모드 SQLite 테이블에 보관합니다.
+실행 중인 작업은 임대(lease)를 갖고 주기적으로 하트비트로 연장하며,
+프로세스가 죽어 임대가 만료되면 다른 워커(또는 재시작된 프로세스)가
+마지막 체크포인트부터 이어서 실행합니다.
+"""
+
+import os
+import json
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+from config.settings import Settings
+
+logger = get_logger(__name__)
+
+# 임대 시간 (초) - 하트비트가 이 시간 동안 없으면 다른 워커가 가져감
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# 임대 만료로 재시도할 최대 횟수 (넘으면 실패 처리)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# 완료/실패/취소 작업 보관 기간 (시간)
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "168"))
+
+# 에이징: 대기 시간 이 값(초)마다 우선순위 한 단계만큼 앞당겨짐 (TaskQueue와 동일)
+PRIORITY_AGING_SECONDS = 30.0
+
+# 진행률 기록 최소 간격 (초) - 스테이지가 바뀌거나 100%면 바로 기록
+PROGRESS_WRITE_INTERVAL = 0.5
+
+# 이전 버전 테이블에 추가할 컬럼
+_ADDED_COLUMNS = {
+    "progress_stage": "TEXT",
+    "progress": "INTEGER",
+    "progress_message": "TEXT",
+    "progress_at": "REAL",
+    "coalesce_key": "TEXT",
+}
+
+# 작업 상태 값 (TaskStatus.value 와 동일)
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+FINISHED_STATUSES = (STATUS_COMPLETED, STATUS_FAILED, STATUS_CANCELLED)
+
+
+@dataclass
+class JobRecord:
+    """저장된 작업 한 건"""
+    id: str
+    job_type: str
+    name: str
+    payload: Dict[str, Any]
+    priority: int
+    session_id: str
+    status: str
+    created_at: float
+    started_at: Optional[float] = None
+    completed_at: Optional[float] = None
+    lease_owner: Optional[str] = None
+    lease_expires: Optional[float] = None
+    attempts: int = 0
+    cancel_requested: bool = False
+    checkpoint: Optional[Dict[str, Any]] = None
+    result: Any = None
+    error: Optional[str] = None
+    progress_stage: Optional[str] = None
+    progress: int = 0
+    progress_message: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'JobRecord':
+        return cls(
+            id=row["id"],
+            job_type=row["job_type"],
+            name=row["name"],
+            payload=json.loads(row["payload"]) if row["payload"] else {},
+            priority=row["priority"],
+            session_id=row["session_id"] or "",
+            status=row["status"],
+            created_at=row["created_at"],
+            started_at=row["started_at"],
+            completed_at=row["completed_at"],
+            lease_owner=row["lease_owner"],
+            lease_expires=row["lease_expires"],
+            attempts=row["attempts"],
+            cancel_requested=bool(row["cancel_requested"]),
+            checkpoint=json.loads(row["checkpoint"]) if row["checkpoint"] else None,
+            result=json.loads(row["result"]) if row["result"] else None,
+            error=row["error"],
+            progress_stage=row["progress_stage"],
+            progress=row["progress"] or 0,
+            progress_message=row["progress_message"]
+        )
+
+
+def make_worker_id() -> str:
+    """워커 식별자 (호스트:PID:난수) - 재시작된 프로세스와 구분되도록 난수 포함"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class DurableJobStore:
+    """SQLite 작업 테이블 (여러 스레드/프로세스에서 공유 가능)"""
+
+    def __init__(self, db_path: str = None):
+        if db_path is None:
+            db_path = os.path.join(Settings.paths.data_dir, "database", "jobs.db")
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        # 작업 상태 변경은 짧은 쿼리뿐이므로 연결 하나를 락으로 보호
+        self._conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            timeout=30.0,
+            isolation_level=None  # 트랜잭션은 _transaction에서 명시적으로
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+
+        self._init_schema()
+        logger.info(f"DurableJobStore 초기화: {db_path}")
+
+    def _init_schema(self):
+        with self._transaction() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    job_type TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    payload TEXT,
+                    priority INTEGER NOT NULL,
+                    session_id TEXT,
+                    status TEXT NOT NULL,
+                    dispatch_key REAL NOT NULL,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    completed_at REAL,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    heartbeat_at REAL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    checkpoint TEXT,
+                    result TEXT,
+                    error TEXT,
+                    progress_stage TEXT,
+                    progress INTEGER,
+                    progress_message TEXT,
+                    progress_at REAL,
+                    coalesce_key TEXT
+                )
+            """)
+            
+            # 진행률/합치기 컬럼이 없는 이전 테이블 보완
+            existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, column_type in _ADDED_COLUMNS.items():
+                if column not in existing:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_dispatch ON jobs(status, dispatch_key)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs(status, lease_expires)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_session ON jobs(session_id)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_coalesce ON jobs(coalesce_key, status)"
+            )
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 트랜잭션 (BEGIN IMMEDIATE로 다른 프로세스와의 경합 방지)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def enqueue(self, job_type: str, payload: Dict[str, Any], name: str = "",
+                priority: int = 2, session_id: str = "", job_id: str = None) -> str:
+        """작업 추가"""
+        return self.enqueue_or_join(job_type, payload, name=name, priority=priority,
+                                    session_id=session_id, job_id=job_id)[0]
+
+    def enqueue_or_join(self, job_type: str, payload: Dict[str, Any], name: str = "",
+                        priority: int = 2, session_id: str = "", job_id: str = None,
+                        coalesce_key: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        작업 추가 (같은 coalesce_key의 대기/실행 중 작업이 있으면 그 작업에 합류)
+
+        여러 프로세스가 동시에 제출해도 BEGIN IMMEDIATE 안에서 확인하므로 하나만 생성됩니다.
+
+        Returns:
+            (작업 ID, 새로 생성했는지 여부)
+        """
+        job_id = job_id or str(uuid.uuid4())
+        now = time.time()
+        with self._transaction() as conn:
+            if coalesce_key is not None:
+                row = conn.execute(
+                    """
+                    SELECT id FROM jobs
+                    WHERE coalesce_key = ? AND status IN (?, ?) AND cancel_requested = 0
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (coalesce_key, STATUS_PENDING, STATUS_RUNNING)
+                ).fetchone()
+                if row is not None:
+                    return row["id"], False
+
+            conn.execute(
+                """
+                INSERT INTO jobs (id, job_type, name, payload, priority, session_id,
+                                  status, dispatch_key, created_at, coalesce_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (job_id, job_type, name or job_type, json.dumps(payload, ensure_ascii=False),
+                 priority, session_id, STATUS_PENDING,
+                 now - priority * PRIORITY_AGING_SECONDS, now, coalesce_key)
+            )
+        return job_id, True
+
+    def claim(self, owner: str, lease_seconds: float = JOB_LEASE_SECONDS,
+              before: Optional[float] = None) -> Optional[JobRecord]:
+        """
+        다음 작업을 임대해 실행 상태로 전환
+
+        대기 작업과 임대가 만료된 실행 작업(죽은 워커의 작업) 중 dispatch_key가
+        가장 작은 것을 가져옵니다. 재시도 한도를 넘긴 만료 작업은 실패, 취소 요청된
+        만료 작업은 취소 처리합니다.
+
+        Args:
+            before: 주어지면 dispatch_key가 이 값보다 작은 작업만 임대 (메모리 큐와 순서 비교)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # 재시도 한도를 넘긴 만료 작업 정리
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, completed_at = ?, lease_owner = NULL,
+                       error = '워커 응답 없음 (재시도 한도 초과)'
+                WHERE status = ? AND lease_expires < ? AND attempts >= ?
+                """,
+                (STATUS_FAILED, now, STATUS_RUNNING, now, JOB_MAX_ATTEMPTS)
+            )
+
+            # 취소 요청 후 워커가 죽은 작업은 다시 실행하지 않고 취소 처리
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, completed_at = ?, lease_owner = NULL, lease_expires = NULL,
+                       error = '작업 취소됨 (워커 응답 없음)'
+                WHERE status = ? AND lease_expires < ? AND cancel_requested = 1
+                """,
+                (STATUS_CANCELLED, now, STATUS_RUNNING, now)
+            )
+
+            row = conn.execute(
+                """
+                SELECT id, status FROM jobs
+                WHERE ((status = ? AND cancel_requested = 0)
+                       OR (status = ? AND lease_expires < ? AND cancel_requested = 0))
+                  AND dispatch_key < ?
+                ORDER BY dispatch_key
+                LIMIT 1
+                """,
+                (STATUS_PENDING, STATUS_RUNNING, now, float("inf") if before is None else before)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if row["status"] == STATUS_RUNNING:
+                logger.warning(f"임대 만료 작업 회수: {row['id'][:8]}")
+
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?,
+                       heartbeat_at = ?, started_at = COALESCE(started_at, ?),
+                       attempts = attempts + 1
+                WHERE id = ?
+                """,
+                (STATUS_RUNNING, owner, now + lease_seconds, now, now, row["id"])
+            )
+            job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+
+        return JobRecord.from_row(job)
+
+    def heartbeat(self, job_ids: List[str], owner: str,
+                  lease_seconds: float = JOB_LEASE_SECONDS) -> Dict[str, bool]:
+        """
+        임대 연장
+
+        Returns:
+            {작업 ID: 계속 실행해도 되는지} - 임대를 잃었거나 취소 요청된 작업은 False
+        """
+        if not job_ids:
+            return {}
+
+        now = time.time()
+        placeholders = ",".join("?" * len(job_ids))
+        with self._transaction() as conn:
+            conn.execute(
+                f"""
+                UPDATE jobs SET lease_expires = ?, heartbeat_at = ?
+                WHERE id IN ({placeholders}) AND lease_owner = ? AND status = ?
+                """,
+                (now + lease_seconds, now, *job_ids, owner, STATUS_RUNNING)
+            )
+            rows = conn.execute(
+                f"""
+                SELECT id FROM jobs
+                WHERE id IN ({placeholders}) AND lease_owner = ? AND status = ?
+                      AND cancel_requested = 0
+                """,
+                (*job_ids, owner, STATUS_RUNNING)
+            ).fetchall()
+
+        alive = {row["id"] for row in rows}
+        return {job_id: job_id in alive for job_id in job_ids}
+
+    def save_checkpoint(self, job_id: str, owner: str, checkpoint: Dict[str, Any]) -> bool:
+        """체크포인트 저장 (임대를 가진 워커만)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET checkpoint = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (json.dumps(checkpoint, ensure_ascii=False, default=str), job_id, owner, STATUS_RUNNING)
+            )
+            return cursor.rowcount > 0
+
+    def update_progress(self, job_id: str, owner: str, stage: str,
+                        progress: int, message: str) -> bool:
+        """진행 상황 기록 (다른 프로세스의 UI가 조회)"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET progress_stage = ?, progress = ?, progress_message = ?, progress_at = ?
+                WHERE id = ? AND lease_owner = ? AND status = ?
+                """,
+                (stage, int(progress), message, time.time(), job_id, owner, STATUS_RUNNING)
+            )
+            return cursor.rowcount > 0
+
+    def finish(self, job_id: str, owner: str, status: str,
+               result: Any = None, error: Optional[str] = None) -> bool:
+        """작업 종료 기록 (완료/실패/취소). 임대를 잃은 워커의 결과는 무시"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = ?, completed_at = ?, result = ?, error = ?,
+                       lease_owner = NULL, lease_expires = NULL, checkpoint = NULL
+                WHERE id = ? AND lease_owner = ? AND status = ?
+                """,
+                (status, time.time(),
+                 json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                 error, job_id, owner, STATUS_RUNNING)
+            )
+            return cursor.rowcount > 0
+
+    def release(self, job_id: str, owner: str):
+        """실행하지 않고 반납 (종료 중인 워커) - 체크포인트는 유지"""
+        with self._transaction() as conn:
+            conn.execute(
+                """
+                UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL,
+                       attempts = MAX(attempts - 1, 0)
+                WHERE id = ? AND lease_owner = ? AND status = ?
+                """,
+                (STATUS_PENDING, job_id, owner, STATUS_RUNNING)
+            )
+
+    def cancel(self, job_id: str) -> Optional[str]:
+        """
+        작업 취소
+
+        대기 중이면 바로 취소 상태로, 실행 중이면 취소 요청 표시만 남기고
+        담당 워커가 다음 하트비트에서 중단합니다.
+
+        Returns:
+            취소 전 상태 (없거나 이미 끝난 작업이면 None)
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row["status"] in FINISHED_STATUSES:
+                return None
+
+            if row["status"] == STATUS_PENDING:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, completed_at = ?, cancel_requested = 1 WHERE id = ?",
+                    (STATUS_CANCELLED, now, job_id)
+                )
+            else:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return row["status"]
+
+    def get(self, job_id: str) -> Optional[JobRecord]:
+        """작업 조회"""
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return JobRecord.from_row(rows[0]) if rows else None
+
+    def list_jobs(self, status: Optional[str] = None, session_id: Optional[str] = None,
+                  limit: int = 100) -> List[JobRecord]:
+        """작업 목록 (최신순)"""
+        conditions, params = [], []
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if session_id:
+            conditions.append("session_id = ?")
+            params.append(session_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._query(
+            f"SELECT * FROM jobs {where} ORDER BY created_at DESC LIMIT ?",
+            (*params, limit)
+        )
+        return [JobRecord.from_row(row) for row in rows]
+
+    def count_by_status(self) -> Dict[str, int]:
+        """상태별 작업 수"""
+        rows = self._query("SELECT status, COUNT(*) AS cnt FROM jobs GROUP BY status")
+        counts = {status: 0 for status in
+                  (STATUS_PENDING, STATUS_RUNNING, *FINISHED_STATUSES)}
+        counts.update({row["status"]: row["cnt"] for row in rows})
+        return counts
+
+    def purge_finished(self, older_than_hours: float = JOB_RETENTION_HOURS) -> int:
+        """보관 기간이 지난 종료 작업 삭제"""
+        cutoff = time.time() - older_than_hours * 3600
+        placeholders = ",".join("?" * len(FINISHED_STATUSES))
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND completed_at < ?",
+                (*FINISHED_STATUSES, cutoff)
+            )
+            deleted = cursor.rowcount
+        if deleted:
+            logger.info(f"오래된 작업 기록 {deleted}개 삭제")
+        return deleted
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# 싱글톤 인스턴스
+_job_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store() -> DurableJobStore:
+    """작업 저장소 싱글톤 인스턴스 반환"""
+    global _job_store
+    if _job_store is None:
+        with _store_lock:
+            if _job_store is None:
+                _job_store = DurableJobStore(os.getenv("JOB_STORE_PATH") or None)
+    return _job_store
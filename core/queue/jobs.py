@@ -0,0 +1,116 @@
+# core/queue/jobs.py
+"""
+영속 작업 타입 레지스트리
+저장소에는 함수 대신 작업 타입 이름과 JSON payload만 저장하고,
+실행하는 프로세스가 이 레지스트리에서 핸들러를 찾아 실행합니다.
+핸들러 반환값은 JSON으로 저장되며, decode_result로 원래 객체로 되돌립니다.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Optional
+
+from utils.logger import get_logger
+from utils.cancellation import CancellationToken
+
+logger = get_logger(__name__)
+
+# 기본 작업 타입
+VIDEO_ANALYSIS_JOB = "video_analysis"
+
+
+@dataclass
+class JobHandler:
+    """작업 타입별 핸들러"""
+    func: Callable  # func(payload, cancel_token=..., checkpoint=..., checkpoint_callback=..., progress_callback=...)
+    decode_result: Optional[Callable[[Any], Any]] = None
+
+    def decode(self, result: Any) -> Any:
+        """저장된 JSON 결과를 호출자가 쓰는 형태로 변환"""
+        if result is None or self.decode_result is None:
+            return result
+        return self.decode_result(result)
+
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def register_job_handler(job_type: str, func: Callable,
+                         decode_result: Optional[Callable[[Any], Any]] = None):
+    """작업 타입 등록 (워커와 제출 측 모두 같은 이름으로 등록되어 있어야 함)"""
+    _handlers[job_type] = JobHandler(func=func, decode_result=decode_result)
+
+
+def get_job_handler(job_type: str) -> Optional[JobHandler]:
+    """작업 타입 핸들러 조회"""
+    return _handlers.get(job_type)
+
+
+# ---------------------------------------------------------------------------
+# 영상 분석 작업
+# ---------------------------------------------------------------------------
+
+_processors: Dict[str, Any] = {}
+_processor_lock = threading.Lock()
+
+
+def _get_video_processor(provider: str):
+    """Provider별 VideoProcessor (작업별 상태는 PipelineContext에 두므로 동시 작업이 공유해도 안전)"""
+    if provider not in _processors:
+        with _processor_lock:
+            if provider not in _processors:
+                from core.workflow import VideoProcessor
+                _processors[provider] = VideoProcessor(ai_provider=provider)
+    return _processors[provider]
+
+
+def encode_video(video) -> Optional[Dict[str, Any]]:
+    """Video 객체를 JSON 저장용 딕셔너리로 변환 (메타데이터 전체 포함)"""
+    if video is None:
+        return None
+    data = video.to_dict()
+    data['metadata'] = asdict(video.metadata) if video.metadata else None
+    return data
+
+
+def decode_video(data: Dict[str, Any]):
+    """encode_video 결과를 Video 객체로 복원"""
+    from core.video.models import Video
+    return Video.from_dict(data)
+
+
+def run_video_analysis_job(payload: Dict[str, Any],
+                           cancel_token: Optional[CancellationToken] = None,
+                           checkpoint: Optional[Dict[str, Any]] = None,
+                           checkpoint_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           progress_callback: Optional[Callable] = None) -> Optional[Dict[str, Any]]:
+    """
+    영상 분석 작업 실행
+
+    payload: url, precision_level, model_name, provider, custom_prompt, force_reanalyze
+    checkpoint가 있으면 마지막으로 완료된 스테이지 다음부터 이어서 실행합니다.
+    """
+    from core.workflow.pipeline import JobSettings
+
+    settings = JobSettings.from_env(
+        precision_level=payload.get('precision_level'),
+        model_name=payload.get('model_name')
+    )
+    # 제공자가 없는 이전 작업은 현재 설정(AI_PROVIDER)을 따름
+    processor = _get_video_processor(payload.get('provider') or os.getenv("AI_PROVIDER", "openai"))
+
+    video = processor.process(
+        url=payload['url'],
+        force_reanalyze=payload.get('force_reanalyze', False),
+        progress_callback=progress_callback,
+        custom_prompt=payload.get('custom_prompt'),
+        cancel_token=cancel_token,
+        settings=settings,
+        checkpoint=checkpoint,
+        checkpoint_callback=checkpoint_callback
+    )
+    return encode_video(video)
+
+
+register_job_handler(VIDEO_ANALYSIS_JOB, run_video_analysis_job, decode_result=decode_video)
@@ -2,23 +2,51 @@
 """
 비동기 작업 큐 시스템
 동시 처리 제한 및 우선순위 관리
+작업 타입으로 제출한 작업(submit_job)은 SQLite 저장소에 보관되어
+프로세스가 재시작되어도 마지막 체크포인트부터 이어서 실행됩니다.
 """
 
 import asyncio
 import threading
-import queue
 import time
 import uuid
+import heapq
+import itertools
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import Callable, Dict, Any, Optional, List
 from datetime import datetime, timedelta
 import concurrent.futures
+import inspect
+import os
 
-from utils.logger import get_logger
+from utils.logger import get_logger, get_recent_logs, log_stream
+from utils.cancellation import CancellationToken, TaskCancelledError
+from utils.progress_bus import get_progress_bus
+from utils.video_url import video_key
+from .job_store import (
+    DurableJobStore, JobRecord, get_job_store, make_worker_id, JOB_LEASE_SECONDS, PROGRESS_WRITE_INTERVAL
+)
+from .jobs import get_job_handler, VIDEO_ANALYSIS_JOB
 
 logger = get_logger(__name__)
 
+# 에이징: 대기 시간 이 값(초)마다 우선순위 한 단계만큼 앞당겨짐 (LOW 작업 기아 방지)
+PRIORITY_AGING_SECONDS = 30.0
+
+# 작업 큐 백엔드 - "sqlite": 영속 저장소 사용, "memory": 프로세스 메모리만 사용
+TASK_QUEUE_BACKEND = os.getenv("TASK_QUEUE_BACKEND", "sqlite").lower()
+
+# 프로세스 역할 - "all": 제출과 실행 모두 (기본), "submit": 제출/조회만 하고 실행은
+# 별도 워커 프로세스(python -m core.queue.worker)에 맡김 (sqlite 백엔드 필요)
+TASK_QUEUE_ROLE = os.getenv("TASK_QUEUE_ROLE", "all").lower()
+
+# 영속 작업 하트비트 주기 (초) - 임대 시간의 1/4
+HEARTBEAT_INTERVAL = JOB_LEASE_SECONDS / 4
+
+# 영속 저장소의 오래된 작업 기록 정리 주기 (초)
+JOB_PURGE_INTERVAL = 3600
+
 
 class TaskPriority(Enum):
     """작업 우선순위"""
@@ -60,9 +88,41 @@ class Task:
     progress_callback: Optional[Callable] = None
     completion_callback: Optional[Callable] = None
     
+    # 큐 진입 시각 (에이징 계산용, monotonic)
+    enqueued_at: float = field(default_factory=time.monotonic)
+    
+    # 협력적 취소 토큰 (func가 cancel_token 인자를 받으면 전달)
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    
+    # 영속 작업 정보 (submit_job으로 제출된 작업만)
+    job_type: Optional[str] = None
+    checkpoint: Optional[Dict[str, Any]] = None
+    
+    # 마지막 진행 상황 (stage, progress, message)
+    last_progress: Optional[tuple] = None
+    
+    # 중복 제출 합치기 키와 합류한 제출자의 콜백 [(progress_callback, completion_callback)]
+    coalesce_key: Optional[str] = None
+    followers: List[tuple] = field(default_factory=list)
+    
+    @property
+    def is_durable(self) -> bool:
+        return self.job_type is not None
+    
+    @property
+    def dispatch_key(self) -> float:
+        """
+        디스패치 순서 키 (작을수록 먼저)
+        
+        진입 시각에서 우선순위 × PRIORITY_AGING_SECONDS 를 뺀 값이므로
+        높은 우선순위가 먼저 나가고, 오래 기다린 낮은 우선순위 작업은
+        대기 시간만큼 앞당겨집니다. 값이 변하지 않아 힙에 그대로 둘 수 있습니다.
+        """
+        return self.enqueued_at - self.priority.value * PRIORITY_AGING_SECONDS
+    
     def __lt__(self, other):
-        """우선순위 비교 (높은 우선순위가 먼저)"""
-        return self.priority.value > other.priority.value
+        """우선순위 비교 (높은 우선순위가 먼저, 오래 기다린 작업 우대)"""
+        return self.dispatch_key < other.dispatch_key
 
 
 @dataclass
@@ -79,14 +139,27 @@ class TaskResult:
 class TaskQueue:
     """작업 큐 관리자"""
     
-    def __init__(self, max_workers: int = 8, max_queue_size: int = 100):
+    def __init__(self, max_workers: int = 8, max_queue_size: int = 100,
+                 job_store: Optional[DurableJobStore] = None):
         self.max_workers = max_workers
         self.max_queue_size = max_queue_size
         
-        # 우선순위 큐
-        self.task_queue = queue.PriorityQueue(maxsize=max_queue_size)
+        # 영속 저장소 (None이면 submit_job도 메모리 큐 사용)
+        self.job_store = job_store
+        self.worker_id = make_worker_id()
+        
+        # 이 프로세스에서 제출한 영속 작업의 콜백 목록 (재시작 후에는 없음)
+        self._job_callbacks: Dict[str, List[tuple]] = {}
+        
+        # 합치기 키 → 대기/실행 중인 메모리 작업 ID
+        self._flights: Dict[str, str] = {}
         
-        # 실행 중인 작업 추적
+        # 우선순위 힙 (dispatch_key, 순번, 작업)
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+        
+        # 대기/실행 중인 작업 추적
+        self.pending_tasks: Dict[str, Task] = {}
         self.running_tasks: Dict[str, Task] = {}
         self.completed_tasks: Dict[str, TaskResult] = {}
         
@@ -96,19 +169,29 @@ class TaskQueue:
             thread_name_prefix="TaskWorker"
         )
         
+        # 빈 워커 슬롯이 있을 때만 힙에서 꺼내 실행기에 넘김
+        # (실행기 내부 FIFO에 작업이 쌓이면 우선순위가 무의미해짐)
+        self._worker_slots = threading.BoundedSemaphore(max_workers)
+        
         # 상태 관리
         self.is_running = False
+        self._processor: Optional[threading.Thread] = None
         self.lock = threading.RLock()
+        self._not_empty = threading.Condition(self.lock)
         
         # 통계
         self.stats = {
             "total_submitted": 0,
             "total_completed": 0,
             "total_failed": 0,
-            "total_cancelled": 0
+            "total_cancelled": 0,
+            "total_coalesced": 0
         }
         
-        logger.info(f"TaskQueue 초기화: 최대 워커 {max_workers}개, 큐 크기 {max_queue_size}")
+        logger.info(
+            f"TaskQueue 초기화: 최대 워커 {max_workers}개, 큐 크기 {max_queue_size}, "
+            f"백엔드 {'sqlite' if job_store else 'memory'}"
+        )
     
     def start(self):
         """큐 처리 시작"""
@@ -118,17 +201,36 @@ class TaskQueue:
         self.is_running = True
         
         # 백그라운드에서 작업 처리
-        threading.Thread(
+        self._processor = threading.Thread(
             target=self._process_queue, 
             daemon=True, 
             name="TaskQueueProcessor"
-        ).start()
+        )
+        self._processor.start()
+        
+        # 영속 작업 임대 연장
+        if self.job_store is not None:
+            threading.Thread(
+                target=self._heartbeat_loop,
+                daemon=True,
+                name="TaskQueueHeartbeat"
+            ).start()
         
-        logger.info("TaskQueue 시작됨")
+        logger.info(f"TaskQueue 시작됨 (워커 ID: {self.worker_id})")
     
     def stop(self):
-        """큐 처리 중지"""
-        self.is_running = False
+        """
+        큐 처리 중지
+        
+        처리 스레드가 끝나기를 기다린 뒤 실행기를 닫으므로, 중지 직전에 꺼낸 작업이
+        닫힌 실행기에 제출되어 실패로 기록되지 않습니다.
+        """
+        with self.lock:
+            self.is_running = False
+            self._not_empty.notify_all()
+        processor = self._processor
+        if processor is not None and processor is not threading.current_thread():
+            processor.join()
         self.executor.shutdown(wait=True)
         logger.info("TaskQueue 중지됨")
     
@@ -140,15 +242,17 @@ class TaskQueue:
                    priority: TaskPriority = TaskPriority.NORMAL,
                    session_id: str = "",
                    progress_callback: Optional[Callable] = None,
-                   completion_callback: Optional[Callable] = None) -> str:
-        """작업 제출"""
+                   completion_callback: Optional[Callable] = None,
+                   coalesce_key: Optional[str] = None) -> str:
+        """
+        작업 제출
+        
+        coalesce_key가 같은 작업이 대기/실행 중이면 새로 만들지 않고 그 작업에 콜백만
+        추가한 뒤 같은 작업 ID를 반환합니다.
+        """
         if kwargs is None:
             kwargs = {}
         
-        # 큐 크기 확인
-        if self.task_queue.qsize() >= self.max_queue_size:
-            raise RuntimeError(f"작업 큐가 가득함 (최대 {self.max_queue_size}개)")
-        
         # 작업 생성
         task = Task(
             id=str(uuid.uuid4()),
@@ -159,75 +263,281 @@ class TaskQueue:
             priority=priority,
             session_id=session_id,
             progress_callback=progress_callback,
-            completion_callback=completion_callback
+            completion_callback=completion_callback,
+            coalesce_key=coalesce_key
         )
         
         # 큐에 추가
-        try:
-            self.task_queue.put(task, timeout=1.0)
+        with self.lock:
+            if coalesce_key is not None:
+                leader = self._find_flight(coalesce_key)
+                if leader is not None:
+                    self._join(leader, progress_callback, completion_callback)
+                    return leader.id
             
-            with self.lock:
-                self.stats["total_submitted"] += 1
+            if len(self.pending_tasks) >= self.max_queue_size:
+                raise RuntimeError(f"작업 큐가 가득함 (최대 {self.max_queue_size}개)")
             
-            logger.info(f"작업 제출됨: {name} (ID: {task.id[:8]}, 우선순위: {priority.name})")
-            return task.id
+            heapq.heappush(self._heap, (task.dispatch_key, next(self._sequence), task))
+            self.pending_tasks[task.id] = task
+            if coalesce_key is not None:
+                self._flights[coalesce_key] = task.id
+            self.stats["total_submitted"] += 1
+            self._not_empty.notify()
+        
+        logger.info(f"작업 제출됨: {name} (ID: {task.id[:8]}, 우선순위: {priority.name})")
+        return task.id
+    
+    def submit_job(self,
+                   job_type: str,
+                   payload: Dict[str, Any],
+                   name: Optional[str] = None,
+                   priority: TaskPriority = TaskPriority.NORMAL,
+                   session_id: str = "",
+                   progress_callback: Optional[Callable] = None,
+                   completion_callback: Optional[Callable] = None,
+                   coalesce_key: Optional[str] = None) -> str:
+        """
+        작업 타입으로 제출 (영속 저장소가 있으면 재시작 후에도 유지)
+        
+        payload는 JSON 직렬화 가능해야 하며, 실행 프로세스는 jobs 레지스트리에서
+        job_type 핸들러를 찾아 실행합니다. 콜백은 제출한 프로세스에서 실행될 때만 호출됩니다.
+        coalesce_key가 같은 작업이 대기/실행 중이면 (다른 프로세스가 제출했어도) 그 작업 ID를
+        반환하므로, 진행 상황과 결과는 같은 작업 ID로 조회합니다.
+        """
+        handler = get_job_handler(job_type)
+        if handler is None:
+            raise ValueError(f"등록되지 않은 작업 타입: {job_type}")
+        name = name or job_type
+        
+        if self.job_store is None:
+            # 메모리 큐 - 결과를 바로 원래 형태로 변환
+            def run_inline(payload, cancel_token=None, progress_callback=None):
+                return handler.decode(handler.func(
+                    payload, cancel_token=cancel_token, progress_callback=progress_callback
+                ))
             
-        except queue.Full:
-            raise RuntimeError("작업 큐 추가 타임아웃")
+            return self.submit_task(
+                name=name, func=run_inline, args=(payload,), priority=priority,
+                session_id=session_id, progress_callback=progress_callback,
+                completion_callback=completion_callback, coalesce_key=coalesce_key
+            )
+        
+        if self.job_store.count_by_status()["pending"] >= self.max_queue_size:
+            raise RuntimeError(f"작업 큐가 가득함 (최대 {self.max_queue_size}개)")
+        
+        job_id, created = self.job_store.enqueue_or_join(
+            job_type, payload, name=name, priority=priority.value, session_id=session_id,
+            coalesce_key=coalesce_key
+        )
+        with self.lock:
+            if not created:
+                running = self.running_tasks.get(job_id)
+                if running is not None:
+                    self._join(running, progress_callback, completion_callback)
+                else:
+                    if progress_callback or completion_callback:
+                        self._job_callbacks.setdefault(job_id, []).append(
+                            (progress_callback, completion_callback)
+                        )
+                    self.stats["total_coalesced"] += 1
+                    logger.info(f"🔗 같은 영속 작업이 대기/실행 중 - 합류: {name} (ID: {job_id[:8]})")
+                return job_id
+            
+            if progress_callback or completion_callback:
+                self._job_callbacks.setdefault(job_id, []).append(
+                    (progress_callback, completion_callback)
+                )
+            self.stats["total_submitted"] += 1
+            self._not_empty.notify()
+        
+        logger.info(f"영속 작업 제출됨: {name} (ID: {job_id[:8]}, 우선순위: {priority.name})")
+        return job_id
+    
+    def _find_flight(self, coalesce_key: str) -> Optional[Task]:
+        """합치기 키로 대기/실행 중인 메모리 작업 찾기 (lock 보유 상태에서 호출)"""
+        task_id = self._flights.get(coalesce_key)
+        if task_id is None:
+            return None
+        task = self.pending_tasks.get(task_id) or self.running_tasks.get(task_id)
+        if task is None or task.status == TaskStatus.CANCELLED or task.cancel_token.is_cancelled:
+            return None
+        return task
+    
+    def _join(self, task: Task, progress_callback: Optional[Callable],
+              completion_callback: Optional[Callable]):
+        """진행 중인 작업에 콜백 추가 (lock 보유 상태에서 호출)"""
+        if progress_callback or completion_callback:
+            task.followers.append((progress_callback, completion_callback))
+        self.stats["total_coalesced"] += 1
+        logger.info(f"🔗 같은 작업이 대기/실행 중 - 합류: {task.name} (ID: {task.id[:8]})")
     
     def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """작업 상태 조회"""
         with self.lock:
-            if task_id in self.running_tasks:
+            if task_id in self.pending_tasks:
+                return self.pending_tasks[task_id].status
+            elif task_id in self.running_tasks:
                 return self.running_tasks[task_id].status
             elif task_id in self.completed_tasks:
                 return self.completed_tasks[task_id].status
-            else:
-                return None
+        
+        # 다른 프로세스가 실행 중이거나 재시작 전에 끝난 영속 작업
+        if self.job_store is not None:
+            record = self.job_store.get(task_id)
+            if record is not None:
+                self._deliver_stored_completion(record)
+                return TaskStatus(record.status)
+        return None
     
     def get_task_result(self, task_id: str) -> Optional[TaskResult]:
         """작업 결과 조회"""
         with self.lock:
-            return self.completed_tasks.get(task_id)
+            result = self.completed_tasks.get(task_id)
+        if result is not None or self.job_store is None:
+            return result
+        
+        record = self.job_store.get(task_id)
+        if record is None or record.status not in (
+            TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value
+        ):
+            return None
+        
+        self._deliver_stored_completion(record)
+        handler = get_job_handler(record.job_type)
+        execution_time = 0.0
+        if record.started_at and record.completed_at:
+            execution_time = record.completed_at - record.started_at
+        return TaskResult(
+            task_id=task_id,
+            status=TaskStatus(record.status),
+            result=handler.decode(record.result) if handler else record.result,
+            error=record.error,
+            execution_time=execution_time,
+            created_at=datetime.fromtimestamp(record.completed_at or record.created_at)
+        )
+    
+    def _deliver_stored_completion(self, record: JobRecord):
+        """
+        다른 프로세스(워커)가 끝낸 영속 작업의 완료 콜백을 제출한 프로세스에서 호출
+        
+        제출 전용 모드(TASK_QUEUE_ROLE=submit)에서는 작업이 이 프로세스에서 실행되지 않으므로,
+        상태/결과 조회에서 종료 상태를 처음 본 시점에 대기 중이던 콜백을 한 번만 실행합니다.
+        """
+        if record.status not in (
+            TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value
+        ):
+            return
+        
+        with self.lock:
+            callbacks = self._job_callbacks.pop(record.id, [])
+        if not callbacks:
+            return
+        
+        result, error = None, record.error
+        if record.status == TaskStatus.COMPLETED.value:
+            handler = get_job_handler(record.job_type)
+            result = handler.decode(record.result) if handler else record.result
+        elif not error:
+            error = "작업 취소됨" if record.status == TaskStatus.CANCELLED.value else "작업 실패"
+        
+        for _, completion_callback in callbacks:
+            if completion_callback is None:
+                continue
+            try:
+                completion_callback(record.id, result, error)
+            except Exception as e:
+                logger.error(f"완료 콜백 오류: {e}")
     
     def cancel_task(self, task_id: str) -> bool:
-        """작업 취소 (대기 중인 작업만 가능)"""
+        """
+        작업 취소
+        
+        대기 중인 작업은 취소 표시(tombstone)만 남기고 디스패처가 꺼낼 때 버립니다.
+        실행 중인 작업은 취소 토큰을 통해 다음 확인 지점에서 중단되고,
+        등록된 ffmpeg 등 자식 프로세스는 즉시 종료됩니다.
+        """
         with self.lock:
-            if task_id in self.running_tasks:
-                # 실행 중인 작업은 취소 불가
-                return False
-            
-            # 큐에서 제거 시도 (실제로는 어려움)
-            # 대신 완료된 작업으로 마킹
-            result = TaskResult(
-                task_id=task_id,
-                status=TaskStatus.CANCELLED
-            )
-            self.completed_tasks[task_id] = result
-            self.stats["total_cancelled"] += 1
+            task = self.pending_tasks.pop(task_id, None)
+            if task is not None:
+                # 힙에서는 지연 제거 (_next_task에서 건너뜀)
+                task.status = TaskStatus.CANCELLED
+                task.cancel_token.cancel("대기 중 취소")
+                self._release_flight(task)
+                self.completed_tasks[task_id] = TaskResult(
+                    task_id=task_id,
+                    status=TaskStatus.CANCELLED
+                )
+                self.stats["total_cancelled"] += 1
+                
+                # tombstone이 많이 쌓이면 힙 재구성
+                if len(self._heap) > 2 * len(self.pending_tasks) + 16:
+                    self._heap = [entry for entry in self._heap
+                                  if entry[2].status != TaskStatus.CANCELLED]
+                    heapq.heapify(self._heap)
+                
+                logger.info(f"대기 작업 취소됨: {task_id[:8]}")
+                return True
             
-            logger.info(f"작업 취소됨: {task_id[:8]}")
-            return True
+            task = self.running_tasks.get(task_id)
+        
+        if task is None:
+            return self._cancel_stored_job(task_id)
+        
+        # 실행 중인 작업 - 완료 처리는 _handle_task_completion에서
+        task.cancel_token.cancel("실행 중 취소")
+        logger.info(f"실행 중 작업 취소 요청: {task_id[:8]}")
+        return True
+    
+    def _cancel_stored_job(self, task_id: str) -> bool:
+        """이 프로세스에 없는 영속 작업 취소 (실행 중이면 담당 워커가 하트비트에서 중단)"""
+        if self.job_store is None:
+            return False
+        
+        previous = self.job_store.cancel(task_id)
+        if previous is None:
+            return False
+        
+        # 대기 중이던 작업은 바로 취소됨 → 완료 콜백 실행 (실행 중이면 워커가 끝낸 뒤 조회 시점에)
+        if previous == TaskStatus.PENDING.value:
+            with self.lock:
+                self.stats["total_cancelled"] += 1
+            record = self.job_store.get(task_id)
+            if record is not None:
+                self._deliver_stored_completion(record)
+        
+        logger.info(f"영속 작업 취소 요청: {task_id[:8]} (이전 상태: {previous})")
+        return True
     
     def get_queue_status(self) -> Dict[str, Any]:
         """큐 상태 정보"""
+        stored = self.job_store.count_by_status() if self.job_store is not None else None
+        
         with self.lock:
-            return {
-                "queue_size": self.task_queue.qsize(),
+            status = {
+                "queue_size": len(self.pending_tasks),
                 "max_queue_size": self.max_queue_size,
                 "running_tasks": len(self.running_tasks),
                 "max_workers": self.max_workers,
                 "is_running": self.is_running,
+                "backend": "sqlite" if stored is not None else "memory",
+                "worker_id": self.worker_id,
                 "stats": self.stats.copy()
             }
+        
+        if stored is not None:
+            # 영속 작업은 저장소 기준 (다른 워커 프로세스 포함)
+            status["queue_size"] += stored["pending"]
+            status["stored_jobs"] = stored
+        return status
     
     def get_session_tasks(self, session_id: str) -> List[Dict[str, Any]]:
         """특정 세션의 작업 목록"""
         with self.lock:
             tasks = []
             
-            # 실행 중인 작업
-            for task in self.running_tasks.values():
+            # 대기/실행 중인 작업
+            for task in list(self.pending_tasks.values()) + list(self.running_tasks.values()):
                 if task.session_id == session_id:
                     tasks.append({
                         "id": task.id,
@@ -236,41 +546,160 @@ class TaskQueue:
                         "created_at": task.created_at.isoformat(),
                         "started_at": task.started_at.isoformat() if task.started_at else None
                     })
-            
-            return tasks
+        
+        # 다른 프로세스가 가진 영속 작업
+        if self.job_store is not None:
+            known = {task["id"] for task in tasks}
+            for status in (TaskStatus.PENDING.value, TaskStatus.RUNNING.value):
+                for record in self.job_store.list_jobs(status=status, session_id=session_id):
+                    if record.id in known:
+                        continue
+                    tasks.append({
+                        "id": record.id,
+                        "name": record.name,
+                        "status": record.status,
+                        "created_at": datetime.fromtimestamp(record.created_at).isoformat(),
+                        "started_at": (datetime.fromtimestamp(record.started_at).isoformat()
+                                       if record.started_at else None)
+                    })
+        
+        return tasks
     
     def _process_queue(self):
         """큐 처리 루프"""
         logger.info("작업 큐 처리 시작")
         
         while self.is_running:
+            # 빈 워커 슬롯 확보 (1초마다 중지 여부 확인)
+            if not self._worker_slots.acquire(timeout=1.0):
+                continue
+            
+            task = None
             try:
-                # 큐에서 작업 가져오기 (1초 타임아웃)
-                task = self.task_queue.get(timeout=1.0)
-                
-                # 실행 중인 작업으로 이동
-                with self.lock:
-                    self.running_tasks[task.id] = task
+                task = self._next_task(timeout=1.0)
+                if task is None:
+                    self._worker_slots.release()
+                    continue
                 
-                # 스레드 풀에 작업 제출
+                # 스레드 풀에 작업 제출, 완료 처리는 Future 콜백으로
                 future = self.executor.submit(self._execute_task, task)
+                future.add_done_callback(
+                    lambda f, task=task: self._handle_task_completion(task, f)
+                )
                 
-                # 논블로킹으로 결과 처리
-                threading.Thread(
-                    target=self._handle_task_completion,
-                    args=(task, future),
-                    daemon=True
-                ).start()
-                
-            except queue.Empty:
-                # 타임아웃 - 계속 진행
-                continue
             except Exception as e:
                 logger.error(f"큐 처리 오류: {e}")
+                if task is not None and (task.is_durable or not self.is_running):
+                    # 영속 작업은 임대 반납, 중지 중이면 메모리 작업도 대기열로 되돌림
+                    self._return_unsubmitted_task(task)
+                elif task is not None:
+                    # 실행 목록에 올라간 작업은 실패로 정리 (슬롯도 여기서 반환)
+                    self._fail_unsubmitted_task(task, e)
+                else:
+                    self._worker_slots.release()
                 time.sleep(1)
         
         logger.info("작업 큐 처리 종료")
     
+    def _next_task(self, timeout: float) -> Optional[Task]:
+        """
+        다음 작업을 꺼내 실행 목록으로 이동 (없으면 timeout까지 대기)
+        
+        메모리 힙과 영속 저장소 중 dispatch_key가 작은 쪽을 먼저 꺼냅니다. 영속 작업은
+        메모리 힙 맨 앞 작업보다 앞설 때만 임대하므로, 낮은 우선순위 메모리 작업 뒤에서
+        높은 우선순위 영속 작업이 기다리지 않습니다 (같으면 메모리 작업 우선).
+        임대하는 사이 중지되었으면 임대를 반납하고 None을 반환합니다.
+        """
+        with self.lock:
+            if not self.is_running:
+                return None
+            head_key = self._memory_head_key()
+        
+        if self.job_store is not None:
+            task = self._claim_stored_job(before=head_key)
+            if task is not None and not self.is_running:
+                self._return_unsubmitted_task(task, release_slot=False)
+                return None
+            if task is not None:
+                return task
+        
+        with self.lock:
+            if head_key is None:
+                self._not_empty.wait(timeout)
+            if not self.is_running:
+                return None
+            return self._pop_memory_task()
+    
+    def _memory_head_key(self) -> Optional[float]:
+        """
+        힙 맨 앞 작업의 dispatch_key를 영속 저장소와 같은 벽시계 기준으로 (lock 보유 상태에서 호출)
+        
+        메모리 작업은 monotonic 시각, 영속 작업은 time.time() 기준이므로 현재 차이만큼 옮겨 비교합니다.
+        """
+        # 취소된 작업(tombstone)은 건너뜀
+        while self._heap and self._heap[0][2].status == TaskStatus.CANCELLED:
+            heapq.heappop(self._heap)
+        
+        if not self._heap:
+            return None
+        return self._heap[0][0] + (time.time() - time.monotonic())
+    
+    def _pop_memory_task(self) -> Optional[Task]:
+        """힙에서 작업 꺼내기 (lock 보유 상태에서 호출)"""
+        if self._memory_head_key() is None:
+            return None
+        
+        _, _, task = heapq.heappop(self._heap)
+        del self.pending_tasks[task.id]
+        self.running_tasks[task.id] = task
+        return task
+    
+    def _claim_stored_job(self, before: Optional[float] = None) -> Optional[Task]:
+        """영속 저장소에서 작업 임대 후 Task로 변환 (before가 있으면 dispatch_key가 그보다 작은 작업만)"""
+        try:
+            record = self.job_store.claim(self.worker_id, before=before)
+        except Exception as e:
+            logger.error(f"영속 작업 임대 실패: {e}")
+            return None
+        
+        if record is None:
+            return None
+        
+        handler = get_job_handler(record.job_type)
+        if handler is None:
+            self.job_store.finish(
+                record.id, self.worker_id, TaskStatus.FAILED.value,
+                error=f"등록되지 않은 작업 타입: {record.job_type}"
+            )
+            logger.error(f"등록되지 않은 작업 타입: {record.job_type} (ID: {record.id[:8]})")
+            return None
+        
+        with self.lock:
+            callbacks = self._job_callbacks.pop(record.id, [])
+            progress_callback, completion_callback = callbacks[0] if callbacks else (None, None)
+            task = Task(
+                id=record.id,
+                name=record.name,
+                func=handler.func,
+                args=(record.payload,),
+                priority=TaskPriority(record.priority),
+                session_id=record.session_id,
+                progress_callback=progress_callback,
+                completion_callback=completion_callback,
+                job_type=record.job_type,
+                checkpoint=record.checkpoint,
+                followers=callbacks[1:]
+            )
+            self.running_tasks[task.id] = task
+        
+        if record.checkpoint:
+            completed = record.checkpoint.get('completed_stages', [])
+            logger.info(
+                f"중단된 작업 재개: {record.name} (ID: {record.id[:8]}, "
+                f"시도 {record.attempts}회, 완료 스테이지 {len(completed)}개)"
+            )
+        return task
+    
     def _execute_task(self, task: Task) -> Any:
         """작업 실행"""
         task.status = TaskStatus.RUNNING
@@ -281,15 +710,38 @@ class TaskQueue:
         try:
             # 진행 상황 콜백 래퍼
             def wrapped_progress_callback(*args, **kwargs):
+                self._record_progress(task, *args)
                 if task.progress_callback:
                     task.progress_callback(*args, **kwargs)
+                # 합류한 제출자 (실행 중 합류하면 그 이후 진행 상황부터 받음)
+                for follower_progress, _ in list(task.followers):
+                    if follower_progress:
+                        try:
+                            follower_progress(*args, **kwargs)
+                        except Exception as e:
+                            logger.debug(f"합류 작업 진행 콜백 오류: {e}")
             
             # 작업 실행
-            if task.progress_callback:
-                # 진행 상황 콜백이 있는 경우, kwargs에 추가
+            if task.progress_callback or task.is_durable or task.coalesce_key is not None:
+                # 진행 상황 콜백이 있거나 영속/합치기 작업이면 (다른 프로세스 UI, 나중에 합류할
+                # 제출자용) kwargs에 추가
                 task.kwargs['progress_callback'] = wrapped_progress_callback
             
-            result = task.func(*task.args, **task.kwargs)
+            # 취소 토큰을 받을 수 있는 함수면 전달
+            if self._accepts_argument(task.func, 'cancel_token'):
+                task.kwargs['cancel_token'] = task.cancel_token
+            
+            # 영속 작업 - 체크포인트 전달 및 스테이지 완료마다 저장
+            if task.is_durable and self._accepts_argument(task.func, 'checkpoint'):
+                task.kwargs['checkpoint'] = task.checkpoint
+                task.kwargs['checkpoint_callback'] = (
+                    lambda checkpoint: self.job_store.save_checkpoint(task.id, self.worker_id, checkpoint)
+                )
+            
+            task.cancel_token.raise_if_cancelled()
+            # 작업 중 로그는 작업 ID 스트림에 모아 다른 세션의 로그 패널에 섞이지 않게 함
+            with log_stream(task.id):
+                result = task.func(*task.args, **task.kwargs)
             
             task.status = TaskStatus.COMPLETED
             task.result = result
@@ -298,6 +750,14 @@ class TaskQueue:
             logger.info(f"작업 완료: {task.name} (ID: {task.id[:8]})")
             return result
             
+        except TaskCancelledError as e:
+            task.status = TaskStatus.CANCELLED
+            task.error = str(e)
+            task.completed_at = datetime.now()
+            
+            logger.info(f"작업 취소됨: {task.name} (ID: {task.id[:8]})")
+            raise
+            
         except Exception as e:
             task.status = TaskStatus.FAILED
             task.error = str(e)
@@ -312,27 +772,40 @@ class TaskQueue:
             # 결과 대기
             result = future.result()
             
-            # 완료 콜백 호출
-            if task.completion_callback:
+            # 영속 작업은 JSON으로 저장된 결과를 원래 형태로 변환해 전달
+            if task.is_durable:
+                result = get_job_handler(task.job_type).decode(result)
+            
+            # 완료 콜백 호출 (합류한 제출자 포함)
+            for completion_callback in self._completion_callbacks(task):
                 try:
-                    task.completion_callback(task.id, result, None)
+                    completion_callback(task.id, result, None)
                 except Exception as e:
                     logger.error(f"완료 콜백 오류: {e}")
             
         except Exception as e:
             # 실패 콜백 호출
-            if task.completion_callback:
+            for completion_callback in self._completion_callbacks(task):
                 try:
-                    task.completion_callback(task.id, None, str(e))
+                    completion_callback(task.id, None, str(e))
                 except Exception as cb_error:
                     logger.error(f"실패 콜백 오류: {cb_error}")
         
         finally:
+            # 영속 작업 결과 기록 (임대를 잃었으면 다른 워커의 결과가 우선)
+            if task.is_durable:
+                self._finish_stored_job(task)
+            get_progress_bus().close(task.id)
+            
+            # 워커 슬롯 반환 → 디스패처가 다음 작업을 꺼냄
+            self._worker_slots.release()
+            
             # 작업 정리
             with self.lock:
                 # 실행 목록에서 제거
                 if task.id in self.running_tasks:
                     del self.running_tasks[task.id]
+                self._release_flight(task)
                 
                 # 완료 목록에 추가
                 execution_time = 0.0
@@ -342,7 +815,8 @@ class TaskQueue:
                 result = TaskResult(
                     task_id=task.id,
                     status=task.status,
-                    result=task.result,
+                    result=(get_job_handler(task.job_type).decode(task.result)
+                            if task.is_durable else task.result),
                     error=task.error,
                     execution_time=execution_time
                 )
@@ -354,10 +828,197 @@ class TaskQueue:
                     self.stats["total_completed"] += 1
                 elif task.status == TaskStatus.FAILED:
                     self.stats["total_failed"] += 1
+                elif task.status == TaskStatus.CANCELLED:
+                    self.stats["total_cancelled"] += 1
                 
                 # 오래된 완료 작업 정리 (메모리 절약)
                 self._cleanup_old_tasks()
     
+    def _return_unsubmitted_task(self, task: Task, release_slot: bool = True):
+        """
+        꺼냈지만 실행하지 않은 작업 되돌리기
+        
+        영속 작업은 임대를 반납해 다음 워커(또는 재시작한 이 워커)가 다시 임대하게 하고,
+        메모리 작업은 힙에 다시 넣습니다. 콜백은 다시 임대될 때 이어받도록 보관합니다.
+        """
+        if task.is_durable:
+            try:
+                self.job_store.release(task.id, self.worker_id)
+                logger.info(f"실행하지 않은 영속 작업 반납: {task.name} (ID: {task.id[:8]})")
+            except Exception as e:
+                # 반납에 실패해도 임대 만료 후 다른 워커가 회수
+                logger.error(f"영속 작업 반납 실패 ({task.id[:8]}): {e}")
+        
+        with self.lock:
+            self.running_tasks.pop(task.id, None)
+            if task.is_durable:
+                callbacks = [(task.progress_callback, task.completion_callback)] + task.followers
+                if any(p or c for p, c in callbacks):
+                    self._job_callbacks.setdefault(task.id, [])[:0] = callbacks
+            else:
+                heapq.heappush(self._heap, (task.dispatch_key, next(self._sequence), task))
+                self.pending_tasks[task.id] = task
+        
+        if release_slot:
+            self._worker_slots.release()
+    
+    def _fail_unsubmitted_task(self, task: Task, error: Exception):
+        """
+        스레드 풀 제출에 실패한 작업 정리
+        
+        꺼낸 시점에 이미 실행 목록(과 영속 작업 임대)에 올라가 있으므로, 실행된 작업과
+        같은 완료 처리를 거쳐 목록에서 빼고 실패로 기록합니다.
+        """
+        task.status = TaskStatus.FAILED
+        task.error = f"작업 제출 실패: {error}"
+        task.completed_at = datetime.now()
+        logger.error(f"작업 제출 실패: {task.name} (ID: {task.id[:8]}) - {error}")
+        
+        failed = concurrent.futures.Future()
+        failed.set_exception(RuntimeError(task.error))
+        self._handle_task_completion(task, failed)
+    
+    def _completion_callbacks(self, task: Task) -> List[Callable]:
+        """작업의 완료 콜백 목록 (제출자 + 합류한 제출자)"""
+        with self.lock:
+            callbacks = [task.completion_callback] + [c for _, c in task.followers]
+            if task.followers:
+                logger.info(f"🔗 작업 결과를 합류한 제출자 {len(task.followers)}명과 공유: {task.id[:8]}")
+        return [callback for callback in callbacks if callback]
+    
+    def _release_flight(self, task: Task):
+        """합치기 키 해제 - 이후 같은 키 제출은 새로 실행 (lock 보유 상태에서 호출)"""
+        if task.coalesce_key is not None and self._flights.get(task.coalesce_key) == task.id:
+            del self._flights[task.coalesce_key]
+    
+    def _record_progress(self, task: Task, stage: Any = None, progress: Any = 0,
+                         message: Any = "", *_):
+        """
+        진행 상황 기록 (파이프라인 콜백 형식: stage, progress, message)
+        
+        같은 프로세스의 UI는 진행 버스에서 읽고, 영속 작업은 저장소에도 기록합니다.
+        저장소에는 스테이지가 바뀌거나 100%일 때는 바로, 그 외에는
+        PROGRESS_WRITE_INTERVAL마다 기록합니다.
+        """
+        try:
+            progress = int(progress)
+        except (TypeError, ValueError):
+            return
+        
+        get_progress_bus().publish(task.id, str(stage), progress, str(message))
+        
+        previous = task.last_progress
+        now = time.monotonic()
+        written_at = previous[3] if previous else 0.0
+        should_write = task.is_durable and (
+            previous is None or previous[0] != stage or progress >= 100
+            or now - written_at >= PROGRESS_WRITE_INTERVAL
+        )
+        # (stage, progress, message, 마지막 저장 시각)
+        task.last_progress = (stage, progress, message, now if should_write else written_at)
+        
+        if not should_write:
+            return
+        try:
+            self.job_store.update_progress(task.id, self.worker_id, str(stage), progress, str(message))
+        except Exception as e:
+            logger.debug(f"진행 상황 기록 실패 ({task.id[:8]}): {e}")
+    
+    def get_task_progress(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 진행 상황 조회 (다른 워커 프로세스가 실행 중인 영속 작업 포함)
+        
+        Returns:
+            {"status", "stage", "progress", "message"} 또는 None
+        """
+        with self.lock:
+            task = self.running_tasks.get(task_id) or self.pending_tasks.get(task_id)
+            if task is not None and not task.is_durable:
+                event = get_progress_bus().latest(task_id)
+                return {"status": task.status.value,
+                        "stage": event.stage if event else None,
+                        "progress": event.progress if event else 0,
+                        "message": event.message if event else None}
+        
+        if self.job_store is None:
+            return None
+        record = self.job_store.get(task_id)
+        if record is None:
+            return None
+        return {
+            "status": record.status,
+            "stage": record.progress_stage,
+            "progress": record.progress,
+            "message": record.progress_message or record.error
+        }
+    
+    def read_task_events(self, task_id: str, offset: int = 0):
+        """
+        이 프로세스에서 실행 중인 작업의 진행 이벤트를 offset 이후부터 반환
+        
+        Returns:
+            (ProgressEvent 목록, 다음 offset) - UI 재실행마다 offset을 이어서 사용
+        """
+        return get_progress_bus().read(task_id, offset)
+    
+    def get_task_logs(self, task_id: str, count: int = 10) -> List[Dict[str, Any]]:
+        """이 프로세스에서 실행된 작업의 최근 INFO 로그 (작업 ID 스트림)"""
+        return get_recent_logs(count, stream=task_id)
+    
+    def _finish_stored_job(self, task: Task):
+        """영속 작업 종료 상태 저장"""
+        status = task.status if task.status in (
+            TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED
+        ) else TaskStatus.FAILED
+        try:
+            recorded = self.job_store.finish(
+                task.id, self.worker_id, status.value,
+                result=task.result if status == TaskStatus.COMPLETED else None,
+                error=task.error
+            )
+            if not recorded:
+                logger.warning(f"작업 임대를 잃어 결과를 기록하지 않음: {task.id[:8]}")
+        except Exception as e:
+            logger.error(f"영속 작업 결과 기록 실패 ({task.id[:8]}): {e}")
+    
+    def _heartbeat_loop(self):
+        """실행 중인 영속 작업의 임대 연장 및 취소 요청 확인"""
+        last_purge = 0.0
+        
+        while True:
+            time.sleep(HEARTBEAT_INTERVAL)
+            
+            with self.lock:
+                durable = {task_id: task for task_id, task in self.running_tasks.items()
+                           if task.is_durable}
+            
+            # 중지 후에도 실행 중인 작업이 끝날 때까지는 임대 유지
+            if not self.is_running and not durable:
+                break
+            
+            try:
+                if durable:
+                    alive = self.job_store.heartbeat(list(durable), self.worker_id)
+                    for task_id, ok in alive.items():
+                        if not ok:
+                            # 다른 곳에서 취소 요청되었거나 임대가 다른 워커로 넘어감
+                            durable[task_id].cancel_token.cancel("취소 요청 또는 임대 상실")
+                
+                if time.monotonic() - last_purge >= JOB_PURGE_INTERVAL:
+                    last_purge = time.monotonic()
+                    self.job_store.purge_finished()
+                    
+            except Exception as e:
+                logger.error(f"작업 하트비트 오류: {e}")
+    
+    @staticmethod
+    def _accepts_argument(func: Callable, name: str) -> bool:
+        """함수가 해당 이름의 인자를 받는지 확인"""
+        try:
+            return name in inspect.signature(func).parameters
+        except (TypeError, ValueError):
+            return False
+    
     def _cleanup_old_tasks(self):
         """오래된 완료 작업 정리"""
         cutoff_time = datetime.now() - timedelta(hours=1)  # 1시간 이전
@@ -385,8 +1046,18 @@ def get_task_queue() -> TaskQueue:
     if _task_queue is None:
         with _queue_lock:
             if _task_queue is None:
-                _task_queue = TaskQueue()
-                _task_queue.start()  # 자동 시작
+                job_store = None
+                if TASK_QUEUE_BACKEND == "sqlite":
+                    try:
+                        job_store = get_job_store()
+                    except Exception as e:
+                        logger.warning(f"영속 작업 저장소 사용 불가, 메모리 큐로 동작: {e}")
+                _task_queue = TaskQueue(job_store=job_store)
+                if TASK_QUEUE_ROLE == "submit" and job_store is not None:
+                    # 실행은 별도 워커 프로세스가 담당 - 제출/조회만
+                    logger.info("TaskQueue 제출 전용 모드 (워커: python -m core.queue.worker)")
+                else:
+                    _task_queue.start()  # 자동 시작
     return _task_queue
 
 
@@ -394,9 +1065,7 @@ def submit_video_analysis_task(url: str,
                               session_id: str,
                               model_name: str = "gpt-4o",
                               progress_callback: Optional[Callable] = None) -> str:
-    """비디오 분석 작업 제출"""
-    from core.handlers.video_handler import handle_video_analysis_enhanced
-    
+    """비디오 분석 작업 제출 (영속 작업 - 재시작 시 마지막 완료 스테이지부터 재개)"""
     queue = get_task_queue()
     
     # 완료 콜백 정의 - 세션 상태 업데이트
@@ -416,17 +1085,29 @@ def submit_video_analysis_task(url: str,
         except Exception as e:
             logger.error(f"완료 콜백 오류: {e}")
     
-    return queue.submit_task(
-        name=f"video_analysis_{url}",
-        func=handle_video_analysis_enhanced,
-        kwargs={
-            "video_url": url,
+    # 파이프라인 진행 콜백 (stage, progress, message) → 메시지만 전달
+    def forward_progress(stage: str, progress: int, message: str, *_):
+        progress_callback(message)
+    
+    # 워커 프로세스의 환경과 관계없이 제출 시점의 AI 제공자로 실행
+    provider = os.getenv("AI_PROVIDER", "openai")
+    
+    # 같은 영상/모델 분석이 이미 대기/실행 중이면 그 작업에 합류 (URL 형식이 달라도 같은 영상이면 합침)
+    key = video_key(url)
+    coalesce_key = f"{VIDEO_ANALYSIS_JOB}:{key}|p5|{provider}:{model_name}" if key else None
+    
+    return queue.submit_job(
+        VIDEO_ANALYSIS_JOB,
+        payload={
+            "url": url,
             "precision_level": 5,
-            "console_callback": progress_callback or (lambda x: None),
-            "model_name": model_name
+            "model_name": model_name,
+            "provider": provider
         },
+        name=f"video_analysis_{url}",
         priority=TaskPriority.NORMAL,
         session_id=session_id,
-        progress_callback=progress_callback,
-        completion_callback=completion_callback
+        progress_callback=forward_progress if progress_callback else None,
+        completion_callback=completion_callback,
+        coalesce_key=coalesce_key
     )
@@ -0,0 +1,133 @@
+# core/queue/worker.py
+"""
+독립 실행 파이프라인 워커
+
+Streamlit 앱과 분리된 프로세스에서 영속 작업 큐(SQLite)를 소비합니다.
+같은 jobs.db를 보는 워커를 여러 개(여러 호스트는 공유 볼륨) 띄우면
+처리량이 워커 수만큼 늘어나고, 앱은 TASK_QUEUE_ROLE=submit으로 제출/조회만 합니다.
+
+사용법:
+    python -m core.queue.worker                          # 워커 실행 (동시 작업 2개)
+    python -m core.queue.worker run --workers 4          # 동시 작업 수 지정
+    python -m core.queue.worker submit <URL> [--model gpt-4o] [--precision 5]
+    python -m core.queue.worker status <작업 ID>
+    python -m core.queue.worker list [--status running]
+
+로컬 테스트 (워커 2개 + 작업 제출):
+    JOB_STORE_PATH=/tmp/jobs.db python -m core.queue.worker run &
+    JOB_STORE_PATH=/tmp/jobs.db python -m core.queue.worker run &
+    JOB_STORE_PATH=/tmp/jobs.db python -m core.queue.worker submit https://vimeo.com/...
+"""
+
+import argparse
+import json
+import signal
+import threading
+from datetime import datetime
+
+from utils.logger import get_logger
+from .job_store import get_job_store
+from .jobs import VIDEO_ANALYSIS_JOB
+from .task_queue import TaskQueue, TaskPriority
+
+logger = get_logger(__name__)
+
+
+def run_worker(workers: int = 2, max_queue_size: int = 100):
+    """SIGTERM/SIGINT를 받을 때까지 작업 실행"""
+    queue = TaskQueue(max_workers=workers, max_queue_size=max_queue_size, job_store=get_job_store())
+    stop_event = threading.Event()
+
+    def handle_signal(signum, _frame):
+        logger.info(f"종료 신호 수신 ({signal.Signals(signum).name}) - 실행 중인 작업 완료 후 종료")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    queue.start()
+    logger.info(f"🛠️ 워커 시작: {queue.worker_id} (동시 작업 {workers}개)")
+
+    while not stop_event.wait(60):
+        status = queue.get_queue_status()
+        logger.info(
+            f"워커 상태 - 실행 중 {status['running_tasks']}개, "
+            f"대기 {status['stored_jobs']['pending']}개"
+        )
+
+    # 새 작업은 받지 않고 실행 중인 작업은 끝까지 (임대는 계속 연장)
+    queue.stop()
+    logger.info(f"워커 종료: {queue.worker_id}")
+
+
+def submit(url: str, model_name: str, precision_level: int, priority: str) -> str:
+    """영상 분석 작업 제출 (워커 없이 저장소에만 기록)"""
+    job_id = get_job_store().enqueue(
+        VIDEO_ANALYSIS_JOB,
+        {"url": url, "precision_level": precision_level, "model_name": model_name},
+        name=f"video_analysis_{url}",
+        priority=TaskPriority[priority].value
+    )
+    return job_id
+
+
+def _format_time(timestamp) -> str:
+    return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S") if timestamp else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 워커 / 작업 큐 명령")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="워커 실행 (기본)")
+    run_parser.add_argument("--workers", type=int, default=2, help="동시 실행 작업 수")
+
+    submit_parser = subparsers.add_parser("submit", help="영상 분석 작업 제출")
+    submit_parser.add_argument("url", help="분석할 영상 URL")
+    submit_parser.add_argument("--model", default="gpt-4o", help="AI 모델명")
+    submit_parser.add_argument("--precision", type=int, default=5, help="정밀도 레벨 (1-10)")
+    submit_parser.add_argument("--priority", default="NORMAL",
+                               choices=[p.name for p in TaskPriority], help="우선순위")
+
+    status_parser = subparsers.add_parser("status", help="작업 상태 조회")
+    status_parser.add_argument("job_id", help="작업 ID")
+
+    list_parser = subparsers.add_parser("list", help="작업 목록")
+    list_parser.add_argument("--status", default=None, help="상태 필터 (pending/running/completed/...)")
+    list_parser.add_argument("--limit", type=int, default=20, help="최대 개수")
+
+    args = parser.parse_args()
+
+    if args.command in (None, "run"):
+        run_worker(workers=getattr(args, "workers", 2))
+
+    elif args.command == "submit":
+        print(submit(args.url, args.model, args.precision, args.priority))
+
+    elif args.command == "status":
+        record = get_job_store().get(args.job_id)
+        if record is None:
+            print(f"작업 없음: {args.job_id}")
+            return
+        print(json.dumps({
+            "id": record.id,
+            "name": record.name,
+            "status": record.status,
+            "stage": record.progress_stage,
+            "progress": record.progress,
+            "message": record.progress_message,
+            "worker": record.lease_owner,
+            "attempts": record.attempts,
+            "error": record.error,
+        }, ensure_ascii=False, indent=2))
+
+    elif args.command == "list":
+        for record in get_job_store().list_jobs(status=args.status, limit=args.limit):
+            print(
+                f"{record.id[:8]}  {record.status:<10} {record.progress:>3}%  "
+                f"{_format_time(record.created_at)}  {record.lease_owner or '-':<30}  {record.name}"
+            )
+
+
+if __name__ == "__main__":
+    main()
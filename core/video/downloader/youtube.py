@@ -6,6 +6,7 @@ from typing import Dict, Any, Optional, List, Tuple, Callable
 from core.video.downloader.base import VideoFetcher
 from core.video.models import Video, VideoMetadata
 from utils.logger import get_logger
+from utils.cancellation import CancellationToken, TaskCancelledError, check_cancelled, ytdlp_cancel_hook
 from core.video.processor.download_options import DownloadOptions
 from core.video.processor.video_processor import VideoProcessor
 from core.video.processor.vimeo_patch import add_vimeo_fix, get_vimeo_player_url, extract_vimeo_id
@@ -110,7 +111,8 @@ class YouTubeDownloader(VideoFetcher):
 
 
 
-    def _download_with_fallback(self, url: str, output_template: str, quality_option: str) -> Tuple[str, Dict[str, Any]]:
+    def _download_with_fallback(self, url: str, output_template: str, quality_option: str,
+                                cancel_token: Optional[CancellationToken] = None) -> Tuple[str, Dict[str, Any]]:
         """순차적 다운로드 시도: curl_cffi 기반 브라우저 모방 우선"""
 
         # 다운로드 방법들 정의 (curl_cffi 우선)
@@ -127,8 +129,10 @@ class YouTubeDownloader(VideoFetcher):
         
         for method_name, get_options in download_methods:
             try:
+                check_cancelled(cancel_token)
                 self.logger.info(f"🔄 {method_name} 방식으로 시도 중...")
                 ydl_opts = get_options()
+                ydl_opts['progress_hooks'] = ydl_opts.get('progress_hooks', []) + [ytdlp_cancel_hook(cancel_token)]
                 
                 # Vimeo URL인 경우 OAuth 패치 적용 및 대안 URL 시도
                 if 'vimeo.com' in url:
@@ -166,6 +170,8 @@ class YouTubeDownloader(VideoFetcher):
                     raise FileNotFoundError("다운로드된 파일을 찾을 수 없음")
                     
             except Exception as e:
+                # 취소된 경우 다음 방식으로 넘어가지 않음
+                check_cancelled(cancel_token)
                 self.logger.warning(f"❌ {method_name} 방식 실패: {str(e)}")
                 # 마지막 방법 확인
                 if method_name == "최강 우회 모드":
@@ -174,7 +180,8 @@ class YouTubeDownloader(VideoFetcher):
         
         raise Exception("예상치 못한 오류: 모든 방법 시도 완료했으나 성공하지 못함")
 
-    def _download_vimeo_with_cffi(self, url: str, output_template: str, quality_option: str) -> Tuple[str, Dict[str, Any]]:
+    def _download_vimeo_with_cffi(self, url: str, output_template: str, quality_option: str,
+                                  cancel_token: Optional[CancellationToken] = None) -> Tuple[str, Dict[str, Any]]:
         """Vimeo curl_cffi 기반 다운로드 메서드 - Cloudflare 우회"""
         self.logger.info("🚀 Vimeo curl_cffi 다운로드 시작...")
         
@@ -199,6 +206,7 @@ class YouTubeDownloader(VideoFetcher):
             method_func = method_info['method']
             
             try:
+                check_cancelled(cancel_token)
                 self.logger.info(f"🔄 {method_name} ({impersonate}) 시도 중...")
                 
                 # 기본 옵션 생성
@@ -213,6 +221,7 @@ class YouTubeDownloader(VideoFetcher):
                 # Player URL 사용 (Vimeo OAuth 우회)
                 player_url = get_vimeo_player_url(video_id)
                 ydl_opts['http_headers']['Referer'] = f"https://vimeo.com/{video_id}"
+                ydl_opts['progress_hooks'] = ydl_opts.get('progress_hooks', []) + [ytdlp_cancel_hook(cancel_token)]
                 
                 self.logger.info(f"🎬 Player URL 사용 ({impersonate}): {player_url}")
                 
@@ -236,6 +245,7 @@ class YouTubeDownloader(VideoFetcher):
                     raise FileNotFoundError("다운로드된 파일을 찾을 수 없음")
                     
             except Exception as e:
+                check_cancelled(cancel_token)
                 error_msg = str(e)
                 
                 # curl_cffi 특화 오류 분석
@@ -269,12 +279,136 @@ class YouTubeDownloader(VideoFetcher):
         
         raise Exception("예상치 못한 오류: 모든 curl_cffi 방법 시도 실패")
 
-    def download(self, video: Video, progress_callback: Optional[Callable] = None) -> Tuple[str, VideoMetadata]:
+    def _extract_metadata(self, url: str) -> Tuple[Optional[Dict[str, Any]], str, str, float, int, int]:
+        """
+        다운로드 전 메타데이터 추출
+        
+        Returns:
+            (yt-dlp 정보 또는 None, 비디오 ID, 제목, 길이, 너비, 높이) 튜플
+        """
+        self.logger.info(f"📊 메타데이터 추출 중: {url}")
+        # progress_callback 제거 (너무 자주 호출됨)
+        # Vimeo의 경우 Docker/Linux 환경 대응 메타데이터 추출
+        if 'vimeo.com' in url:
+            self.logger.info("🔐 Vimeo 메타데이터 추출 - Docker 환경 최적화")
+            
+            # Docker 환경에서 사용 가능한 방법들
+            video_id = extract_vimeo_id(url)
+            auth_methods = [
+                {
+                    'name': 'Player API 직접 접근',
+                    'method': lambda opts: add_vimeo_fix(opts),
+                    'url_func': lambda vid: get_vimeo_player_url(vid) if vid else url
+                },
+                {
+                    'name': 'JSON API 강제 사용',
+                    'method': lambda opts: {**add_vimeo_fix(opts), 'force_json': True, 'dump_single_json': True},
+                    'url_func': lambda vid: url  # 원본 URL 사용
+                },
+                {
+                    'name': 'oEmbed API 사용',
+                    'method': lambda opts: add_vimeo_fix({**opts, 'extract_flat': False}),
+                    'url_func': lambda vid: f"https://vimeo.com/api/oembed.json?url={url}" if vid else url
+                },
+                {
+                    'name': '직접 스크래핑',
+                    'method': lambda opts: add_vimeo_fix({**opts, 'no_check_certificates': True}),
+                    'url_func': lambda vid: url
+                }
+            ]
+            
+            info = None
+            for method in auth_methods:
+                try:
+                    self.logger.info(f"🔄 {method['name']} 시도...")
+                    
+                    extract_opts = {
+                        'quiet': True,
+                        'no_warnings': True
+                    }
+                    extract_opts = method['method'](extract_opts)
+                    test_url = method['url_func'](video_id)
+                    
+                    # Referer 설정
+                    if video_id and 'player.vimeo.com' in test_url:
+                        extract_opts['http_headers']['Referer'] = f"https://vimeo.com/{video_id}"
+                    
+                    with yt_dlp.YoutubeDL(extract_opts) as ydl:
+                        info = ydl.extract_info(test_url, download=False)
+                        if info and info.get('id'):
+                            self.logger.info(f"✅ {method['name']} 성공!")
+                            break
+                            
+                except Exception as e:
+                    self.logger.warning(f"❌ {method['name']} 실패: {str(e)}")
+                    continue
+            
+            if not info:
+                # 최후의 방법: 공개 정보만 추출 시도
+                try:
+                    self.logger.info("🔄 최후 방법: 기본 정보 추출 시도...")
+                    basic_opts = {'quiet': True, 'no_warnings': True, 'skip_download': True}
+                    with yt_dlp.YoutubeDL(basic_opts) as ydl:
+                        info = ydl.extract_info(url, download=False)
+                except Exception as e:
+                    self.logger.error(f"❌ 모든 방법 실패: {str(e)}")
+            
+            if not info:
+                # 기본값으로 진행
+                self.logger.warning("⚠️ 메타데이터 추출 실패 - 기본값으로 진행")
+                video_id = extract_vimeo_id(url) or 'unknown'
+                video_title = 'Vimeo Video'
+                duration = 0
+                width = 1920
+                height = 1080
+            else:
+                video_id = info.get('id', '')
+                video_title = info.get('title', 'untitled') 
+                duration = info.get('duration', 0)
+                width = info.get('width', 0)
+                height = info.get('height', 0)
+            
+        else:
+            # YouTube 등 다른 플랫폼 - curl_cffi 사용
+            try:
+                # Chrome 브라우저 모방으로 메타데이터 추출
+                extract_opts = self.download_options.get_curl_cffi_options("/tmp/dummy", "chrome-110:windows-10")
+                extract_opts['quiet'] = True
+                extract_opts['no_warnings'] = True
+                with yt_dlp.YoutubeDL(extract_opts) as ydl:
+                    info = ydl.extract_info(url, download=False)
+                    video_id = info.get('id', '')
+                    video_title = info.get('title', 'untitled')
+                    duration = info.get('duration', 0)
+                    width = info.get('width', 0)
+                    height = info.get('height', 0)
+            except Exception as e:
+                self.logger.warning(f"curl_cffi 메타데이터 추출 실패, 기본 방식 시도: {str(e)}")
+                # 기본 방식으로 재시도
+                extract_opts = {'quiet': True, 'no_warnings': True}
+                with yt_dlp.YoutubeDL(extract_opts) as ydl:
+                    info = ydl.extract_info(url, download=False)
+                    video_id = info.get('id', '')
+                    video_title = info.get('title', 'untitled')
+                    duration = info.get('duration', 0)
+                    width = info.get('width', 0)
+                    height = info.get('height', 0)
+        
+        return info, video_id, video_title, duration, width, height
+    
+    def download(self, video: Video, progress_callback: Optional[Callable] = None,
+                 cancel_token: Optional[CancellationToken] = None,
+                 info_callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                 info: Optional[Dict[str, Any]] = None) -> Tuple[str, VideoMetadata]:
         """
         비디오 다운로드 - 메타데이터 추출 및 macOS 호환성 보장
         
         Args:
             video: Video 객체
+            cancel_token: 작업 취소 토큰 (다운로드 청크마다, 재인코딩 중 확인)
+            info_callback: 메타데이터 추출 직후, 다운로드 시작 전에 yt-dlp 정보로 호출
+                           (스트리밍 씬 검출 등 다운로드와 겹쳐 실행할 작업용)
+            info: 이미 추출된(캐시된) yt-dlp 정보 - 있으면 메타데이터 추출 생략
             
         Returns:
             (파일경로, 메타데이터) 튜플
@@ -282,114 +416,16 @@ class YouTubeDownloader(VideoFetcher):
         try:
             # URL 정규화
             url = self._normalize_url(video.url)
-            # 1. 먼저 정보만 추출
-            self.logger.info(f"📊 메타데이터 추출 중: {url}")
-            # progress_callback 제거 (너무 자주 호출됨)
-            # Vimeo의 경우 Docker/Linux 환경 대응 메타데이터 추출
-            if 'vimeo.com' in url:
-                self.logger.info("🔐 Vimeo 메타데이터 추출 - Docker 환경 최적화")
-                
-                # Docker 환경에서 사용 가능한 방법들
-                video_id = extract_vimeo_id(url)
-                auth_methods = [
-                    {
-                        'name': 'Player API 직접 접근',
-                        'method': lambda opts: add_vimeo_fix(opts),
-                        'url_func': lambda vid: get_vimeo_player_url(vid) if vid else url
-                    },
-                    {
-                        'name': 'JSON API 강제 사용',
-                        'method': lambda opts: {**add_vimeo_fix(opts), 'force_json': True, 'dump_single_json': True},
-                        'url_func': lambda vid: url  # 원본 URL 사용
-                    },
-                    {
-                        'name': 'oEmbed API 사용',
-                        'method': lambda opts: add_vimeo_fix({**opts, 'extract_flat': False}),
-                        'url_func': lambda vid: f"https://vimeo.com/api/oembed.json?url={url}" if vid else url
-                    },
-                    {
-                        'name': '직접 스크래핑',
-                        'method': lambda opts: add_vimeo_fix({**opts, 'no_check_certificates': True}),
-                        'url_func': lambda vid: url
-                    }
-                ]
-                
-                info = None
-                for method in auth_methods:
-                    try:
-                        self.logger.info(f"🔄 {method['name']} 시도...")
-                        
-                        extract_opts = {
-                            'quiet': True,
-                            'no_warnings': True
-                        }
-                        extract_opts = method['method'](extract_opts)
-                        test_url = method['url_func'](video_id)
-                        
-                        # Referer 설정
-                        if video_id and 'player.vimeo.com' in test_url:
-                            extract_opts['http_headers']['Referer'] = f"https://vimeo.com/{video_id}"
-                        
-                        with yt_dlp.YoutubeDL(extract_opts) as ydl:
-                            info = ydl.extract_info(test_url, download=False)
-                            if info and info.get('id'):
-                                self.logger.info(f"✅ {method['name']} 성공!")
-                                break
-                                
-                    except Exception as e:
-                        self.logger.warning(f"❌ {method['name']} 실패: {str(e)}")
-                        continue
-                
-                if not info:
-                    # 최후의 방법: 공개 정보만 추출 시도
-                    try:
-                        self.logger.info("🔄 최후 방법: 기본 정보 추출 시도...")
-                        basic_opts = {'quiet': True, 'no_warnings': True, 'skip_download': True}
-                        with yt_dlp.YoutubeDL(basic_opts) as ydl:
-                            info = ydl.extract_info(url, download=False)
-                    except Exception as e:
-                        self.logger.error(f"❌ 모든 방법 실패: {str(e)}")
-                
-                if not info:
-                    # 기본값으로 진행
-                    self.logger.warning("⚠️ 메타데이터 추출 실패 - 기본값으로 진행")
-                    video_id = extract_vimeo_id(url) or 'unknown'
-                    video_title = 'Vimeo Video'
-                    duration = 0
-                    width = 1920
-                    height = 1080
-                else:
-                    video_id = info.get('id', '')
-                    video_title = info.get('title', 'untitled') 
-                    duration = info.get('duration', 0)
-                    width = info.get('width', 0)
-                    height = info.get('height', 0)
-                
+            # 1. 먼저 정보만 추출 (호출자가 캐시된 정보를 넘기면 생략)
+            if info is not None:
+                self.logger.info(f"📊 캐시된 메타데이터 사용: {url}")
+                video_id = info.get('id', '')
+                video_title = info.get('title', 'untitled')
+                duration = info.get('duration', 0)
+                width = info.get('width', 0)
+                height = info.get('height', 0)
             else:
-                # YouTube 등 다른 플랫폼 - curl_cffi 사용
-                try:
-                    # Chrome 브라우저 모방으로 메타데이터 추출
-                    extract_opts = self.download_options.get_curl_cffi_options("/tmp/dummy", "chrome-110:windows-10")
-                    extract_opts['quiet'] = True
-                    extract_opts['no_warnings'] = True
-                    with yt_dlp.YoutubeDL(extract_opts) as ydl:
-                        info = ydl.extract_info(url, download=False)
-                        video_id = info.get('id', '')
-                        video_title = info.get('title', 'untitled')
-                        duration = info.get('duration', 0)
-                        width = info.get('width', 0)
-                        height = info.get('height', 0)
-                except Exception as e:
-                    self.logger.warning(f"curl_cffi 메타데이터 추출 실패, 기본 방식 시도: {str(e)}")
-                    # 기본 방식으로 재시도
-                    extract_opts = {'quiet': True, 'no_warnings': True}
-                    with yt_dlp.YoutubeDL(extract_opts) as ydl:
-                        info = ydl.extract_info(url, download=False)
-                        video_id = info.get('id', '')
-                        video_title = info.get('title', 'untitled')
-                        duration = info.get('duration', 0)
-                        width = info.get('width', 0)
-                        height = info.get('height', 0)
+                info, video_id, video_title, duration, width, height = self._extract_metadata(url)
             
             # Shorts 감지 (URL 패턴으로만)
             is_shorts = '/shorts/' in url
@@ -399,6 +435,13 @@ class YouTubeDownloader(VideoFetcher):
             if not video_id:
                 raise ValueError("비디오 ID를 추출할 수 없습니다.")
             
+            # 다운로드와 겹쳐 실행할 작업에 메타데이터 전달 (실패해도 다운로드는 계속)
+            if info_callback and info:
+                try:
+                    info_callback(info)
+                except Exception as e:
+                    self.logger.warning(f"info_callback 실패 (무시): {str(e)}")
+            
             # 2. 세션 디렉토리 준비
             output_dir = self.prepare_session_directory(video)
             
@@ -416,15 +459,15 @@ class YouTubeDownloader(VideoFetcher):
             # 5. Vimeo curl_cffi 처리 또는 일반 다운로드
             if 'vimeo.com' in video.url:  # 원본 URL 확인
                 self.logger.info("🚀 Vimeo 영상 감지 - curl_cffi 기반 다운로드 시작")
-                downloaded_file, info = self._download_vimeo_with_cffi(video.url, output_template, quality_option)
+                downloaded_file, info = self._download_vimeo_with_cffi(video.url, output_template, quality_option, cancel_token)
             else:
                 # 5. 순차적 다운로드 시도 (쿠키 없는 방법들)
-                downloaded_file, info = self._download_with_fallback(url, output_template, quality_option)
+                downloaded_file, info = self._download_with_fallback(url, output_template, quality_option, cancel_token)
             
             # 6. macOS 호환성 확인 및 필요시 재인코딩
             self.logger.info("🎥 macOS 호환성 확인 중...")
             # progress_callback 제거
-            processed_file = self.video_processor.process_video(downloaded_file)
+            processed_file = self.video_processor.process_video(downloaded_file, cancel_token)
             
             # 7. 파일 크기 확인
             file_size = os.path.getsize(processed_file) / (1024 * 1024)  # MB
@@ -489,17 +532,26 @@ class YouTubeDownloader(VideoFetcher):
             
             return processed_file, metadata
             
+        except TaskCancelledError:
+            self.logger.info("⏹️ 다운로드 취소됨")
+            raise
         except Exception as e:
             self.logger.error(f"다운로드 실패: {str(e)}")
             raise
     
-    def download_legacy(self, url: str, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    def download_legacy(self, url: str, progress_callback: Optional[Callable] = None,
+                        cancel_token: Optional[CancellationToken] = None,
+                        info_callback: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                        info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         레거시 다운로드 메소드 - Dict 형태로 반환
         
         Args:
             url: 다운로드할 비디오 URL
             progress_callback: 진행률 콜백 함수
+            cancel_token: 작업 취소 토큰
+            info_callback: 다운로드 시작 전 yt-dlp 정보로 호출 (download 참고)
+            info: 이미 추출된(캐시된) yt-dlp 정보 - 있으면 메타데이터 추출 생략
             
         Returns:
             다운로드 결과 딕셔너리
@@ -507,8 +559,14 @@ class YouTubeDownloader(VideoFetcher):
         # URL에서 video_id 추출
         normalized_url = self._normalize_url(url)
         
+        # download()에 넘겨 같은 정보를 다시 추출하지 않도록 함
+        prefetched_info = info
+        
+        if info is not None:
+            video_id = info.get('id') or 'temp'
+        
         # Vimeo의 경우 쿠키 없는 환경 대응
-        if 'vimeo.com' in normalized_url:
+        elif 'vimeo.com' in normalized_url:
             self.logger.info("🔐 Vimeo Legacy 메타데이터 추출 - 쿠키 없이")
             
             video_id = extract_vimeo_id(normalized_url)
@@ -555,13 +613,15 @@ class YouTubeDownloader(VideoFetcher):
             with yt_dlp.YoutubeDL(extract_opts) as ydl:
                 info = ydl.extract_info(normalized_url, download=False)
                 video_id = info.get('id', 'temp')
+            prefetched_info = info
         
         # Video 객체 생성 - 올바른 session_dir 사용
         video = Video(session_id=video_id, url=url, local_path="")
         video.session_dir = os.path.join(Settings.paths.temp_dir, video_id)
         
         # 다운로드 수행
-        filepath, metadata = self.download(video, progress_callback)
+        filepath, metadata = self.download(video, progress_callback, cancel_token, info_callback,
+                                           info=prefetched_info)
         
         # Dict 형태로 변환
         return {
@@ -1,5 +1,5 @@
 # src/models/video.py
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
@@ -55,6 +55,12 @@ class VideoMetadata:
             'webpage_url': self.webpage_url,
             'subtitle_files': self.subtitle_files,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'VideoMetadata':
+        """딕셔너리에서 생성 (알 수 없는 키는 무시)"""
+        names = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
 
 
 @dataclass
@@ -75,6 +81,17 @@ class Scene:
             'confidence': self.confidence,
             'grouped_path': self.grouped_path
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Scene':
+        """딕셔너리에서 생성"""
+        return cls(
+            timestamp=data.get('timestamp', 0.0),
+            frame_path=data.get('frame_path', ''),
+            scene_type=data.get('scene_type', 'mid'),
+            confidence=data.get('confidence', 0.0),
+            grouped_path=data.get('grouped_path')
+        )
 
 
 
@@ -105,6 +122,22 @@ class Video:
             'session_dir': self.session_dir
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Video':
+        """to_dict 결과에서 복원"""
+        created_at = data.get('created_at')
+        return cls(
+            session_id=data['session_id'],
+            url=data['url'],
+            local_path=data.get('local_path'),
+            metadata=VideoMetadata.from_dict(data['metadata']) if data.get('metadata') else None,
+            scenes=[Scene.from_dict(scene) for scene in data.get('scenes', [])],
+            grouped_scenes=[Scene.from_dict(scene) for scene in data.get('grouped_scenes', [])],
+            analysis_result=data.get('analysis_result'),
+            created_at=datetime.fromisoformat(created_at) if created_at else datetime.now(),
+            session_dir=data.get('session_dir')
+        )
+    
     def get_scene_count(self) -> int:
         """추출된 전체 씬 개수 반환"""
         return len(self.scenes)
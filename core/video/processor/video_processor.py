@@ -3,7 +3,10 @@
 
 import subprocess
 import os
+from contextlib import nullcontext
+from typing import Optional
 from utils.logger import get_logger
+from utils.cancellation import CancellationToken, TaskCancelledError
 
 class VideoProcessor:
     """비디오 후처리 - macOS 호환성 확인 및 재인코딩"""
@@ -71,7 +74,8 @@ class VideoProcessor:
         
         return needs_reencode
     
-    def reencode_to_h264(self, input_file: str, delete_original: bool = True) -> str:
+    def reencode_to_h264(self, input_file: str, delete_original: bool = True,
+                         cancel_token: Optional[CancellationToken] = None) -> str:
         """H.264로 재인코딩"""
         if not self.ffmpeg_path:
             self.logger.error("FFmpeg가 없어 재인코딩할 수 없습니다")
@@ -103,13 +107,21 @@ class VideoProcessor:
                 universal_newlines=True
             )
             
-            # 진행 상황 모니터링
-            for line in process.stderr:
-                if 'time=' in line:
-                    # 시간 정보 추출 (선택사항)
-                    pass
+            # 취소 토큰에 등록 (취소 시 ffmpeg 프로세스 종료)
+            tracker = cancel_token.track_process(process) if cancel_token else nullcontext()
+            with tracker:
+                # 진행 상황 모니터링
+                for line in process.stderr:
+                    if 'time=' in line:
+                        # 시간 정보 추출 (선택사항)
+                        pass
+                
+                process.wait()
             
-            process.wait()
+            if cancel_token is not None and cancel_token.is_cancelled:
+                if os.path.exists(output_file):
+                    os.remove(output_file)
+                cancel_token.raise_if_cancelled()
             
             if process.returncode == 0 and os.path.exists(output_file):
                 self.logger.info(f"✅ 재인코딩 완료: {output_file}")
@@ -129,18 +141,20 @@ class VideoProcessor:
                 self.logger.error("재인코딩 실패")
                 return input_file
                 
+        except TaskCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"재인코딩 중 오류: {e}")
             return input_file
     
-    def process_video(self, file_path: str) -> str:
+    def process_video(self, file_path: str, cancel_token: Optional[CancellationToken] = None) -> str:
         """비디오 처리 - 필요시 재인코딩"""
         if not os.path.exists(file_path):
             return file_path
         
         # 코덱 확인
         if self.needs_reencode(file_path):
-            return self.reencode_to_h264(file_path)
+            return self.reencode_to_h264(file_path, cancel_token=cancel_token)
         else:
             codec = self.get_video_codec(file_path)
             self.logger.info(f"✅ macOS 호환 코덱({codec}) - 재인코딩 불필요")
@@ -2,9 +2,10 @@
 """정밀도 레벨 기반 개선된 씬 추출 및 그룹화 모듈"""
 
 import os
+import multiprocessing
 import cv2
 import numpy as np
-from typing import List, Dict, Any, Tuple, Optional, Callable
+from typing import List, Dict, Any, Tuple, Optional, Callable, Sequence
 from pathlib import Path
 import subprocess
 import json
@@ -15,19 +16,115 @@ import imagehash
 from PIL import Image
 from collections import defaultdict
 from utils.logger import get_logger
+from utils.cancellation import (
+    CancellationToken, TaskCancelledError, check_cancelled, run_process, watch_cancel_file
+)
 from core.video.models import Scene
 
 logger = get_logger(__name__)
 
+# 프로세스 풀 워커에서 정밀도 레벨별로 재사용하는 추출기
+_worker_extractors: Dict[int, 'SceneExtractor'] = {}
+
+
+def extract_scenes_worker(video_path: str, session_id: str, is_short_form: bool,
+                          precision_level: int,
+                          scene_changes: Optional[List[float]] = None,
+                          cancel_token: Optional[CancellationToken] = None,
+                          cancel_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    프로세스 풀 워커 진입점
+    
+    Video 객체 대신 경로와 기본 타입만 받고, 씬은
+    (timestamp, frame_path, scene_type, grouped_path) 튜플 목록으로 반환합니다.
+    scene_changes가 있으면 (스트리밍 단계에서 검출된 전환점) 전환점 검출을 건너뜁니다.
+    
+    워커 프로세스에서는 cancel_file(요청 측이 취소 시 만드는 파일)로 취소를 받고,
+    현재 스레드에서 직접 실행될 때는 cancel_token을 그대로 사용합니다.
+    """
+    # 워커 프로세스는 한 번에 한 작업만 처리하므로 추출기를 재사용해도 안전
+    # (풀 없이 현재 프로세스에서 실행되면 다른 스레드와 겹치지 않도록 새로 생성)
+    precision_level = int(precision_level)
+    if multiprocessing.parent_process() is None:
+        extractor = SceneExtractor(precision_level=precision_level)
+    else:
+        if precision_level not in _worker_extractors:
+            _worker_extractors[precision_level] = SceneExtractor(precision_level=precision_level)
+        extractor = _worker_extractors[precision_level]
+    
+    with watch_cancel_file(None if cancel_token else cancel_file) as file_token:
+        result = extractor.extract_scenes(
+            video_path, session_id, None, is_short_form,
+            cancel_token=cancel_token or file_token, scene_changes=scene_changes
+        )
+    
+    def pack(scenes: List[Scene]) -> List[Tuple[float, str, str, Optional[str]]]:
+        return [(s.timestamp, s.frame_path, s.scene_type, s.grouped_path) for s in scenes]
+    
+    return {
+        'all_scenes': pack(result.get('all_scenes', [])),
+        'grouped_scenes': pack(result.get('grouped_scenes', [])),
+        'precision_level': result.get('precision_level'),
+        'target_count': result.get('target_count')
+    }
+
+
+def unpack_scenes(packed: List[Tuple[float, str, str, Optional[str]]]) -> List[Scene]:
+    """extract_scenes_worker 결과 튜플을 Scene 객체로 변환"""
+    return [
+        Scene(timestamp=timestamp, frame_path=frame_path, scene_type=scene_type, grouped_path=grouped_path)
+        for timestamp, frame_path, scene_type, grouped_path in packed
+    ]
+
+
+
+def build_scene_detect_command(source: str, threshold: float,
+                               input_options: Sequence[str] = ()) -> List[str]:
+    """씬 전환점 검출용 FFmpeg 명령 (source는 파일 경로 또는 스트림 URL)"""
+    return [
+        'ffmpeg',
+        *input_options,
+        '-i', source,
+        '-filter:v', f"select='gt(scene,{threshold})',showinfo",
+        '-f', 'null',
+        '-'
+    ]
+
+
+def parse_scene_timestamps(ffmpeg_stderr: str) -> List[float]:
+    """showinfo 출력에서 씬 전환 타임스탬프 추출 (시작점 포함)"""
+    timestamps = []
+    for line in ffmpeg_stderr.split('\n'):
+        if 'pts_time:' in line:
+            try:
+                pts_time = float(line.split('pts_time:')[1].split()[0])
+                timestamps.append(pts_time)
+            except:
+                continue
+    
+    # 시작점 추가
+    if timestamps and timestamps[0] > 1.0:
+        timestamps.insert(0, 0.0)
+    elif not timestamps:
+        timestamps = [0.0]
+    
+    return timestamps
 
 
 class SceneExtractor:
     """영상에서 주요 씬을 추출하고 정밀도 레벨에 따라 정교하게 그룹화"""
     
-    def __init__(self):
+    def __init__(self, precision_level: Optional[int] = None):
+        """
+        Args:
+            precision_level: 작업별 정밀도 레벨 (None이면 SCENE_PRECISION_LEVEL 환경변수)
+        """
         self.logger = get_logger(__name__)
         self.temp_dir = "data/temp"
         
+        # 작업별로 고정된 정밀도 레벨 (환경변수보다 우선)
+        self.fixed_precision_level = precision_level
+        
         # 기본값 설정 (load_settings 전에 초기화)
         self.precision_level = 5
         self.target_scene_count = 6  # 기본값 설정
@@ -42,16 +139,19 @@ class SceneExtractor:
     
     def load_settings(self):
         """환경변수에서 설정 로드"""
-        # 정밀도 레벨 (1-10) - 따옴표 처리 추가
-        precision_str = os.getenv("SCENE_PRECISION_LEVEL")
-        # 따옴표 제거
-        precision_str = precision_str.strip("'\"")
-        
-        try:
-            self.precision_level = int(precision_str)
-        except ValueError:
-            self.logger.warning(f"잘못된 SCENE_PRECISION_LEVEL 값: {precision_str}, 기본값 5 사용")
-            self.precision_level = 5
+        # 정밀도 레벨 (1-10) - 작업별 값이 있으면 환경변수 무시
+        if self.fixed_precision_level is not None:
+            self.precision_level = self.fixed_precision_level
+        else:
+            precision_str = os.getenv("SCENE_PRECISION_LEVEL", "5")
+            # 따옴표 제거
+            precision_str = precision_str.strip("'\"")
+            
+            try:
+                self.precision_level = int(precision_str)
+            except ValueError:
+                self.logger.warning(f"잘못된 SCENE_PRECISION_LEVEL 값: {precision_str}, 기본값 5 사용")
+                self.precision_level = 5
         
         # 씬 추출 설정
         self.scene_threshold = float(os.getenv("SCENE_THRESHOLD", "0.3"))
@@ -207,8 +307,15 @@ class SceneExtractor:
         self.logger.info(f"🎯 목표 씬 개수: {self.target_scene_count}개")
     
         
-    def extract_scenes(self, video_path: str, session_id: str, progress_callback: Optional[Callable] = None, is_short_form: bool = False) -> Dict[str, Any]:
-        """비디오에서 모든 씬 추출 후 정밀도에 따라 그룹화"""
+    def extract_scenes(self, video_path: str, session_id: str, progress_callback: Optional[Callable] = None, is_short_form: bool = False,
+                       cancel_token: Optional[CancellationToken] = None,
+                       scene_changes: Optional[List[float]] = None) -> Dict[str, Any]:
+        """
+        비디오에서 모든 씬 추출 후 정밀도에 따라 그룹화
+        
+        scene_changes가 주어지면 (다운로드 중 스트림에서 미리 검출한 전환점)
+        전환점 검출을 건너뛰고 프레임 추출부터 진행합니다.
+        """
         # 시작하기 전에 최신 설정 로드
         settings_changed = self.update_settings()
         if settings_changed:
@@ -221,8 +328,12 @@ class SceneExtractor:
             self.logger.info(f"🎬 씬 추출 시작")
             
             # 1. FFmpeg로 모든 씬 전환점 검출 (정밀도와 무관)
-            self.logger.info("🔍 씬 전환점 검출 중...")
-            scene_changes = self._detect_scene_changes(video_path)
+            if scene_changes:
+                self.logger.info(f"⚡ 스트리밍 단계에서 검출된 전환점 사용: {len(scene_changes)}개")
+                scene_changes = list(scene_changes)
+            else:
+                self.logger.info("🔍 씬 전환점 검출 중...")
+                scene_changes = self._detect_scene_changes(video_path, cancel_token)
             
             if not scene_changes:
                 self.logger.warning("씬 전환점을 찾을 수 없습니다")
@@ -247,7 +358,7 @@ class SceneExtractor:
             
             # 3. 모든 씬 중간점에서 프레임 추출
             all_scenes = self._extract_frames_at_midpoints(
-                video_path, scene_changes, output_dir, duration, progress_callback
+                video_path, scene_changes, output_dir, duration, progress_callback, cancel_token
             )
             
             self.logger.info(f"📸 총 {len(all_scenes)}개 씬 추출 완료")
@@ -256,7 +367,7 @@ class SceneExtractor:
             grouped_scenes = []
             if len(all_scenes) > 0:
                 self.logger.info(f"🔬 정밀도 레벨 {self.precision_level}로 씬 그룹화 시작...")
-                grouped_scenes = self._group_similar_scenes_precision(all_scenes.copy(), output_dir, progress_callback)
+                grouped_scenes = self._group_similar_scenes_precision(all_scenes.copy(), output_dir, progress_callback, cancel_token)
                 
                 # 그룹화된 씬들을 별도 디렉토리에 저장
                 grouped_scenes = self._save_grouped_scenes(grouped_scenes, session_id)
@@ -274,51 +385,38 @@ class SceneExtractor:
                 'target_count': self.target_scene_count
             }
             
+        except TaskCancelledError:
+            self.logger.info("⏹️ 씬 추출 취소됨")
+            raise
         except Exception as e:
             self.logger.error(f"씬 추출 중 오류: {str(e)}")
             return {'all_scenes': [], 'grouped_scenes': []}
         
-    def _detect_scene_changes(self, video_path: str) -> List[float]:
+    def _detect_scene_changes(self, video_path: str, cancel_token: Optional[CancellationToken] = None) -> List[float]:
         """FFmpeg를 사용한 모든 씬 전환점 검출 (정밀도와 무관)"""
         # 정밀도 레벨 조정 제거 - 항상 동일한 임계값 사용
         threshold = self.scene_threshold
         
-        cmd = [
-            'ffmpeg',
-            '-i', video_path,
-            '-filter:v', f"select='gt(scene,{threshold})',showinfo",
-            '-f', 'null',
-            '-'
-        ]
+        cmd = build_scene_detect_command(video_path, threshold)
         
         try:
-            result = subprocess.run(
+            result = run_process(
                 cmd,
+                cancel_token=cancel_token,
                 capture_output=True,
                 text=True,
                 check=False
             )
             
             # showinfo 출력에서 타임스탬프 추출
-            timestamps = []
-            for line in result.stderr.split('\n'):
-                if 'pts_time:' in line:
-                    try:
-                        pts_time = float(line.split('pts_time:')[1].split()[0])
-                        timestamps.append(pts_time)
-                    except:
-                        continue
-            
-            # 시작점 추가
-            if timestamps and timestamps[0] > 1.0:
-                timestamps.insert(0, 0.0)
-            elif not timestamps:
-                timestamps = [0.0]
+            timestamps = parse_scene_timestamps(result.stderr)
             
             self.logger.info(f"🎞️ {len(timestamps)}개 씬 전환점 검출 (임계값: {threshold:.3f})")
             
             return timestamps
             
+        except TaskCancelledError:
+            raise
         except Exception as e:
             self.logger.error(f"씬 검출 실패: {str(e)}")
             return []
@@ -329,7 +427,8 @@ class SceneExtractor:
         scene_changes: List[float], 
         output_dir: str,
         duration: float,
-        progress_callback: Optional[Callable] = None
+        progress_callback: Optional[Callable] = None,
+        cancel_token: Optional[CancellationToken] = None
     ) -> List[Scene]:
         """씬 중간점에서 프레임 추출"""
         scenes = []
@@ -349,6 +448,8 @@ class SceneExtractor:
         total_scenes = len(scene_changes) - 1
         
         for i in range(len(scene_changes) - 1):
+            check_cancelled(cancel_token)
+            
             start_time = scene_changes[i]
             end_time = scene_changes[i + 1]
             
@@ -378,7 +479,7 @@ class SceneExtractor:
             ]
             
             try:
-                subprocess.run(cmd, capture_output=True, check=True)
+                run_process(cmd, cancel_token=cancel_token, capture_output=True, check=True)
                 
                 if os.path.exists(output_path):
                     scene = Scene(
@@ -388,12 +489,15 @@ class SceneExtractor:
                     )
                     scenes.append(scene)
                     
+            except TaskCancelledError:
+                raise
             except Exception as e:
                 self.logger.error(f"프레임 추출 실패 ({mid_time:.1f}초): {str(e)}")
         
         return scenes
     
-    def _group_similar_scenes_precision(self, scenes: List[Scene], output_dir: str, progress_callback: Optional[Callable] = None) -> List[Scene]:
+    def _group_similar_scenes_precision(self, scenes: List[Scene], output_dir: str, progress_callback: Optional[Callable] = None,
+                                        cancel_token: Optional[CancellationToken] = None) -> List[Scene]:
         """정밀도 레벨 기반 씬 그룹화 알고리즘 (개선된 버전)"""
         if len(scenes) <= self.min_scenes_for_grouping:
             # 씬이 적은 경우 목표 개수에 맞춰 조정
@@ -408,6 +512,7 @@ class SceneExtractor:
         valid_scenes = []
         
         for i, scene in enumerate(scenes):
+            check_cancelled(cancel_token)
             try:
                 if self.precision_level <= 5:
                     # 빠른 처리를 위해 진행률 로깅 생략
@@ -486,10 +591,15 @@ class SceneExtractor:
             grouped_filename = f"grouped_{i:04d}.jpg"
             grouped_path = os.path.join(grouped_dir, grouped_filename)
             
-            # 이미지 복사
+            # 같은 내용이므로 복사 대신 하드 링크 (지원하지 않는 파일시스템이면 복사)
             try:
-                import shutil
-                shutil.copy2(original_path, grouped_path)
+                if os.path.lexists(grouped_path):
+                    os.remove(grouped_path)
+                try:
+                    os.link(original_path, grouped_path)
+                except OSError:
+                    import shutil
+                    shutil.copy2(original_path, grouped_path)
                 
                 # Scene 객체 업데이트 (grouped 경로 추가)
                 scene.grouped_path = grouped_path
@@ -0,0 +1,188 @@
+# core/video/stream_handoff.py
+"""
+다운로드 ↔ 씬 검출 스트리밍 핸드오프
+yt-dlp가 파일을 내려받는 동안 같은 영상 스트림을 FFmpeg로 직접 읽어 씬 전환점을
+미리 검출합니다. 다운로드(및 H.264 재인코딩)가 끝나면 씬 추출 스테이지는 검출된
+전환점으로 프레임 추출부터 시작하고, 스트림 검출이 실패하거나 스트림이 중간에
+끊기면 기존처럼 완성된 파일에서 다시 검출합니다.
+"""
+
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.logger import get_logger
+from utils.cancellation import CancellationToken, TaskCancelledError, run_process
+from core.video.scene_detector import build_scene_detect_command, parse_scene_timestamps
+
+logger = get_logger(__name__)
+
+# 스트리밍 핸드오프 사용 여부 / 적용할 최소 영상 길이 (초) - 짧은 영상은 이득보다 중복 전송 비용이 큼
+STREAMING_HANDOFF_ENABLED = os.getenv("SCENE_STREAMING_HANDOFF", "true").lower() == "true"
+STREAMING_MIN_DURATION = float(os.getenv("SCENE_STREAMING_MIN_DURATION", "120"))
+
+# 다운로드 완료 후 스트림 검출 결과를 기다리는 최대 시간 (초) - 넘으면 파일에서 검출
+STREAMING_WAIT_TIMEOUT = float(os.getenv("SCENE_STREAMING_WAIT_TIMEOUT", "300"))
+
+# 스트림 끝 판정: 처리된 길이가 영상 길이에서 이만큼 이상 모자라면 중간에 끊긴 것으로 간주
+END_OF_STREAM_TOLERANCE_RATIO = 0.02
+END_OF_STREAM_TOLERANCE_MIN = 2.0
+
+# FFmpeg가 직접 읽을 수 없는 yt-dlp 전송 방식
+UNSUPPORTED_PROTOCOLS = ("http_dash_segments", "f4m", "ism", "mhtml")
+
+_FFMPEG_TIME_PATTERN = re.compile(r"time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+def select_stream_source(info: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, str]]]:
+    """
+    yt-dlp 정보에서 FFmpeg가 직접 읽을 영상 스트림 선택
+
+    영상/음성이 분리된 포맷이면 영상 스트림만 사용합니다.
+
+    Returns:
+        (URL, HTTP 헤더) 튜플 또는 None (직접 읽을 수 없는 경우)
+    """
+    formats = info.get('requested_formats') or [info]
+
+    for fmt in formats:
+        # 분리 포맷의 음성 전용 스트림은 건너뜀
+        if len(formats) > 1 and fmt.get('vcodec') == 'none':
+            continue
+
+        url = fmt.get('url')
+        protocol = fmt.get('protocol') or ''
+        if not url or any(p in protocol for p in UNSUPPORTED_PROTOCOLS):
+            return None
+
+        headers = fmt.get('http_headers') or info.get('http_headers') or {}
+        return url, headers
+
+    return None
+
+
+def parse_processed_duration(ffmpeg_stderr: str) -> float:
+    """FFmpeg 진행 출력의 마지막 time= 값 (처리된 길이, 초)"""
+    matches = _FFMPEG_TIME_PATTERN.findall(ffmpeg_stderr)
+    if not matches:
+        return 0.0
+    hours, minutes, seconds = matches[-1]
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+class SceneStreamHandoff:
+    """다운로드 중 스트림에서 씬 전환점을 검출하고 씬 추출 스테이지에 넘겨줌 (작업당 1개)"""
+
+    def __init__(self, threshold: Optional[float] = None):
+        # SceneExtractor.load_settings와 같은 임계값 사용
+        self.threshold = threshold if threshold is not None else float(os.getenv("SCENE_THRESHOLD", "0.3"))
+
+        self._token = CancellationToken()
+        self._done = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._scene_changes: Optional[List[float]] = None
+        self.failure_reason: Optional[str] = None
+
+    @property
+    def started(self) -> bool:
+        return self._thread is not None
+
+    def start(self, info: Dict[str, Any]) -> bool:
+        """
+        yt-dlp 메타데이터를 받아 스트림 검출 시작 (다운로더의 info_callback)
+
+        Returns:
+            검출을 시작했는지 여부
+        """
+        if self.started:
+            return True
+
+        duration = float(info.get('duration') or 0)
+        if duration < STREAMING_MIN_DURATION:
+            logger.debug(f"스트리밍 검출 생략 - 짧은 영상 ({duration:.0f}초)")
+            return False
+
+        source = select_stream_source(info)
+        if source is None:
+            logger.info("스트리밍 검출 생략 - FFmpeg가 직접 읽을 수 없는 스트림")
+            return False
+
+        url, headers = source
+        self._thread = threading.Thread(
+            target=self._detect,
+            args=(url, headers, duration),
+            name="SceneStreamHandoff",
+            daemon=True
+        )
+        self._thread.start()
+        logger.info(f"⚡ 다운로드와 동시에 스트림에서 씬 전환점 검출 시작 (길이: {duration:.0f}초)")
+        return True
+
+    def abort(self, reason: str = "스트리밍 검출 중단"):
+        """검출 중단 (실행 중인 FFmpeg 종료)"""
+        if self.started and not self._done.is_set():
+            self._token.cancel(reason)
+
+    def result(self, cancel_token: Optional[CancellationToken] = None,
+               timeout: float = STREAMING_WAIT_TIMEOUT) -> Optional[List[float]]:
+        """
+        검출된 전환점 반환 (완료될 때까지 대기)
+
+        시작하지 않았거나, 실패했거나, timeout 안에 끝나지 않으면 None을 반환하며
+        이때 호출자는 완성된 파일에서 검출해야 합니다.
+        """
+        if not self.started:
+            return None
+
+        deadline = time.monotonic() + timeout
+        while not self._done.wait(0.5):
+            if cancel_token is not None and cancel_token.is_cancelled:
+                self.abort("작업 취소")
+                cancel_token.raise_if_cancelled()
+            if time.monotonic() >= deadline:
+                self.abort("대기 시간 초과")
+                logger.warning(f"스트리밍 검출 대기 시간 초과 ({timeout:.0f}초) - 파일에서 검출")
+                return None
+
+        if self._scene_changes is None:
+            logger.info(f"스트리밍 검출 결과 사용 불가 ({self.failure_reason}) - 파일에서 검출")
+        return self._scene_changes
+
+    def _detect(self, url: str, headers: Dict[str, str], duration: float):
+        """백그라운드 스레드: 스트림을 끝까지 읽으며 전환점 검출"""
+        input_options = ['-reconnect', '1', '-reconnect_streamed', '1', '-reconnect_delay_max', '5']
+        if headers:
+            input_options += ['-headers', ''.join(f"{k}: {v}\r\n" for k, v in headers.items())]
+
+        cmd = build_scene_detect_command(url, self.threshold, input_options)
+        started = time.time()
+
+        try:
+            result = run_process(cmd, cancel_token=self._token, capture_output=True, text=True, check=False)
+
+            if result.returncode != 0:
+                self.failure_reason = f"FFmpeg 종료 코드 {result.returncode}"
+                return
+
+            # 종료 코드가 0이어도 연결이 끊기면 스트림 중간에서 끝날 수 있으므로 처리 길이로 확인
+            processed = parse_processed_duration(result.stderr)
+            tolerance = max(END_OF_STREAM_TOLERANCE_MIN, duration * END_OF_STREAM_TOLERANCE_RATIO)
+            if processed < duration - tolerance:
+                self.failure_reason = f"스트림이 중간에 끊김 ({processed:.1f}/{duration:.1f}초)"
+                return
+
+            self._scene_changes = parse_scene_timestamps(result.stderr)
+            logger.info(
+                f"⚡ 스트림 씬 검출 완료: {len(self._scene_changes)}개 전환점 "
+                f"({time.time() - started:.1f}초, 임계값: {self.threshold:.3f})"
+            )
+
+        except TaskCancelledError:
+            self.failure_reason = self._token.reason or "중단됨"
+        except Exception as e:
+            self.failure_reason = str(e)
+            logger.warning(f"스트리밍 씬 검출 실패: {e}")
+        finally:
+            self._done.set()
@@ -1,7 +1,7 @@
 # core/workflow/__init__.py
 """영상 처리 워크플로우"""
 
-from .pipeline import VideoPipeline, PipelineContext, PipelineStage
+from .pipeline import VideoPipeline, PipelineContext, PipelineStage, JobSettings
 from .coordinator import VideoProcessor
 from .stages import *
 
@@ -10,25 +10,35 @@ def create_default_pipeline(provider: str = "openai") -> VideoPipeline:
     """기본 파이프라인 생성"""
     pipeline = VideoPipeline()
     
-    # 순서대로 스테이지 추가
+    # 의존 관계에 따라 스테이지 추가 (depends_on 생략 시 직전 스테이지에 의존)
     pipeline.add_stage(URLParseStage())
     pipeline.add_stage(CacheCheckStage())
     pipeline.add_stage(DownloadStage())
-    pipeline.add_stage(MetadataStage())
-    pipeline.add_stage(SceneExtractionStage())
-    pipeline.add_stage(AIAnalysisStage(provider_name=provider))
-    pipeline.add_stage(StorageUploadStage())
-    pipeline.add_stage(NotionUploadStage())
-    pipeline.add_stage(CleanupStage())
+    
+    # 다운로드 이후: 메타데이터 저장과 씬 추출은 서로 독립
+    pipeline.add_stage(MetadataStage(), depends_on=("download",))
+    pipeline.add_stage(SceneExtractionStage(), depends_on=("download",))
+    pipeline.add_stage(AIAnalysisStage(provider_name=provider),
+                       depends_on=("scene_extraction", "metadata"))
+    
+    # 영상/씬 이미지 업로드는 AI 분석 응답을 기다리는 동안 진행
+    pipeline.add_stage(StorageUploadStage(upload_analysis=False),
+                       depends_on=("scene_extraction",))
+    pipeline.add_stage(AnalysisUploadStage(), depends_on=("ai_analysis",))
+    pipeline.add_stage(NotionUploadStage(), depends_on=("ai_analysis",))
+    
+    # 정리는 모든 업로드가 끝난 뒤
+    pipeline.add_stage(CleanupStage(),
+                       depends_on=("storage_upload", "analysis_upload", "notion_upload"))
     
     return pipeline
 
 
 __all__ = [
-    'VideoPipeline', 'PipelineContext', 'PipelineStage', 
+    'VideoPipeline', 'PipelineContext', 'PipelineStage', 'JobSettings',
     'VideoProcessor', 'create_default_pipeline',
     # 스테이지들
     'URLParseStage', 'CacheCheckStage', 'DownloadStage',
     'MetadataStage', 'SceneExtractionStage', 'AIAnalysisStage',
-    'StorageUploadStage', 'NotionUploadStage', 'CleanupStage'
+    'StorageUploadStage', 'AnalysisUploadStage', 'NotionUploadStage', 'CleanupStage'
 ]
\ No newline at end of file
@@ -4,10 +4,30 @@
 """
 
 import os
+import hashlib
 from typing import Optional, Callable, List, Dict, Any
 
-from core.database import VideoRepository
+from core.database import get_repository
 from utils.logger import get_logger
+from utils.cancellation import CancellationToken, TaskCancelledError
+from utils.progress_bus import get_progress_bus
+from utils.single_flight import SingleFlight
+from utils.video_url import video_key
+from .pipeline import JobSettings
+
+# 같은 영상/설정의 동시 분석은 한 번만 실행 (세션마다 VideoProcessor가 달라도 프로세스 전체에서 공유)
+_analysis_flights = SingleFlight("video_analysis")
+
+
+def analysis_flight_key(url: str, force_reanalyze: bool = False, custom_prompt: Optional[str] = None,
+                        settings: Optional[JobSettings] = None) -> Optional[str]:
+    """분석 합치기 키 (영상 ID + 결과에 영향을 주는 설정), URL에서 ID를 못 찾으면 None"""
+    key = video_key(url)
+    if key is None:
+        return None
+    settings = settings or JobSettings.from_env()
+    prompt = hashlib.md5(custom_prompt.encode()).hexdigest()[:12] if custom_prompt else "-"
+    return f"{key}|p{settings.precision_level}|{settings.model_name}|{prompt}|{'force' if force_reanalyze else 'cache'}"
 
 
 class VideoProcessor:
@@ -22,7 +42,7 @@ class VideoProcessor:
         """
         self.logger = get_logger(__name__)
         self.ai_provider = ai_provider
-        self.db = VideoRepository()
+        self.db = get_repository()
         
         # Pipeline 초기화는 나중에 (순환 참조 방지)
         self._pipeline = None
@@ -44,7 +64,11 @@ class VideoProcessor:
                 url: str, 
                 force_reanalyze: bool = False,
                 progress_callback: Optional[Callable] = None,
-                custom_prompt: Optional[str] = None) -> Any:
+                custom_prompt: Optional[str] = None,
+                cancel_token: Optional[CancellationToken] = None,
+                settings: Optional[JobSettings] = None,
+                checkpoint: Optional[Dict[str, Any]] = None,
+                checkpoint_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Any:
         """
         영상 처리 실행
         
@@ -53,26 +77,98 @@ class VideoProcessor:
             force_reanalyze: 기존 분석 결과가 있어도 재분석 여부
             progress_callback: 진행 상황 콜백 (stage, progress, message)
             custom_prompt: 사용자 맞춤형 분석 프롬프트 (선택사항)
+            cancel_token: 작업 취소 토큰 (선택사항)
+            settings: 작업별 설정 (정밀도, 모델). None이면 환경변수 기본값
+            checkpoint: 중단된 작업의 체크포인트 (있으면 완료된 스테이지부터 재개)
+            checkpoint_callback: 스테이지 완료마다 새 체크포인트로 호출
             
         Returns:
             처리 완료된 Video 객체
+        
+        같은 영상을 같은 설정으로 이미 처리 중이면 새로 실행하지 않고 그 작업의
+        진행 상황과 결과(같은 Video 객체)를 함께 받습니다. 체크포인트 재개는 합치지 않습니다.
         """
+        flight_key = None
+        if checkpoint is None:
+            flight_key = analysis_flight_key(url, force_reanalyze, custom_prompt, settings)
+        
         try:
-            # Pipeline 실행
-            context = self.pipeline.execute(
-                url=url,
-                force_reanalyze=force_reanalyze,
-                progress_callback=progress_callback,
-                custom_prompt=custom_prompt
-            )
+            while flight_key is not None:
+                call, is_leader = _analysis_flights.begin(flight_key)
+                if is_leader:
+                    return self._lead(call, url, force_reanalyze, progress_callback, custom_prompt,
+                                      cancel_token, settings, checkpoint_callback)
+                try:
+                    return self._follow(call, progress_callback, cancel_token)
+                except TaskCancelledError:
+                    # 리더만 취소된 경우 - 이 요청은 계속 필요하므로 다시 시도 (새 리더가 됨)
+                    if cancel_token is not None and cancel_token.is_cancelled:
+                        raise
+                    self.logger.info("합쳐진 분석의 리더가 취소됨 - 다시 실행")
             
-            # Video 객체 반환
-            return context.video_object
+            return self._run_pipeline(url, force_reanalyze, progress_callback, custom_prompt,
+                                      cancel_token, settings, checkpoint, checkpoint_callback)
             
+        except TaskCancelledError:
+            self.logger.info("영상 처리가 취소되었습니다")
+            raise
         except Exception as e:
             self.logger.error(f"영상 처리 중 오류 발생: {str(e)}")
             raise
     
+    def _run_pipeline(self, url, force_reanalyze, progress_callback, custom_prompt,
+                      cancel_token, settings, checkpoint, checkpoint_callback):
+        """Pipeline 실행 후 Video 객체 반환"""
+        context = self.pipeline.execute(
+            url=url,
+            force_reanalyze=force_reanalyze,
+            progress_callback=progress_callback,
+            custom_prompt=custom_prompt,
+            cancel_token=cancel_token,
+            settings=settings,
+            checkpoint=checkpoint,
+            checkpoint_callback=checkpoint_callback
+        )
+        return context.video_object
+    
+    def _lead(self, call, url, force_reanalyze, progress_callback, custom_prompt,
+              cancel_token, settings, checkpoint_callback):
+        """리더로 실행 - 진행 상황을 팔로워용 스트림에도 기록"""
+        stream = get_progress_bus().stream(f"flight:{call.id}")
+        
+        def tee_progress(stage, progress, message, *args):
+            stream.publish(stage, progress, message)
+            if progress_callback:
+                progress_callback(stage, progress, message, *args)
+        
+        try:
+            video = self._run_pipeline(url, force_reanalyze, tee_progress, custom_prompt,
+                                       cancel_token, settings, None, checkpoint_callback)
+        except BaseException as e:
+            _analysis_flights.finish(call, error=e)
+            raise
+        finally:
+            stream.close()
+        _analysis_flights.finish(call, result=video)
+        return video
+    
+    def _follow(self, call, progress_callback, cancel_token):
+        """팔로워 - 리더의 진행 상황을 처음부터 전달받고 결과를 기다림"""
+        self.logger.info(f"🔗 같은 영상 분석이 진행 중 - 결과를 공유합니다: {call.key}")
+        stream = get_progress_bus().stream(f"flight:{call.id}")
+        offset = 0
+        
+        while True:
+            finished = call.wait(0.5)
+            if progress_callback:
+                events, offset = stream.read(offset)
+                for event in events:
+                    progress_callback(event.stage, event.progress, event.message)
+            if finished:
+                return call.result()
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+    
     def get_analysis_history(self, video_id: str) -> List[Dict[str, Any]]:
         """특정 영상의 분석 히스토리 조회"""
         return self.db.get_all_analyses(video_id)
@@ -94,8 +190,3 @@ class VideoProcessor:
         self.ai_provider = provider
         self._pipeline = None  # 재초기화를 위해 None으로 설정
         self.logger.info(f"✅ AI Provider 변경: {provider}")
-    
-    def __del__(self):
-        """소멸자: DB 연결 종료"""
-        if hasattr(self, 'db'):
-            self.db.close()
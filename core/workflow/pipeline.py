@@ -2,12 +2,17 @@
 """Pipeline 기본 구조"""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Callable
+from dataclasses import dataclass, field, replace, asdict
+from typing import Any, Dict, List, Optional, Callable, Tuple
 from enum import Enum
+import concurrent.futures
+import contextvars
+import os
 import time
 
 from utils.logger import get_logger
+from utils.cancellation import CancellationToken, TaskCancelledError
+from .process_pool import run_in_process
 
 
 class StageStatus(Enum):
@@ -17,6 +22,35 @@ class StageStatus(Enum):
     SUCCESS = "success"
     FAILED = "failed"
     SKIPPED = "skipped"
+    CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class JobSettings:
+    """
+    작업별 설정 (불변)
+    
+    프로세스 전역 os.environ 대신 PipelineContext에 실려 각 스테이지로 전달되므로
+    정밀도/모델이 다른 작업을 동시에 실행해도 서로 간섭하지 않습니다.
+    """
+    precision_level: int = 5
+    model_name: str = "gpt-4o"
+    
+    @classmethod
+    def from_env(cls, **overrides) -> 'JobSettings':
+        """환경변수 기본값에 작업별 값을 덮어써서 생성"""
+        precision_str = os.getenv("SCENE_PRECISION_LEVEL", "5").strip("'\"")
+        try:
+            precision_level = int(precision_str)
+        except ValueError:
+            precision_level = 5
+        
+        settings = cls(
+            precision_level=precision_level,
+            model_name=os.getenv("AI_MODEL_NAME", "gpt-4o")
+        )
+        overrides = {key: value for key, value in overrides.items() if value is not None}
+        return replace(settings, **overrides)
 
 
 @dataclass
@@ -35,6 +69,19 @@ class PipelineContext:
     scenes: Optional[List[Any]] = None
     analysis_result: Optional[Dict[str, Any]] = None
     
+    # 다운로드 중 스트림에서 씬 전환점을 검출하는 핸드오프 (SceneStreamHandoff)
+    scene_handoff: Optional[Any] = None
+    
+    # 작업별 설정 (정밀도, AI 모델)
+    settings: JobSettings = field(default_factory=JobSettings.from_env)
+    
+    # 작업 취소 토큰 (스테이지 사이와 긴 루프에서 확인)
+    cancel_token: CancellationToken = field(default_factory=CancellationToken)
+    
+    # 작업별 진행 콜백과 스테이지 상태 (스테이지/파이프라인 객체는 작업 간 공유되므로 여기에 보관)
+    progress_callback: Optional[Callable] = None
+    stage_status: Dict[str, StageStatus] = field(default_factory=dict)
+    
     # 메타데이터
     start_time: float = field(default_factory=time.time)
     stage_results: Dict[str, Any] = field(default_factory=dict)
@@ -47,16 +94,70 @@ class PipelineContext:
     def set_stage_result(self, stage: str, result: Any):
         """스테이지 결과 저장"""
         self.stage_results[stage] = result
+    
+    def to_checkpoint(self, completed_stages: List[str]) -> Dict[str, Any]:
+        """
+        재개용 체크포인트 (JSON 직렬화 가능)
+        
+        완료된 스테이지 이름과 이후 스테이지가 읽는 필드만 저장합니다.
+        취소 토큰, 스트리밍 핸드오프 같은 실행 중 객체는 제외됩니다.
+        """
+        video = self.video_object
+        video_data = None
+        if video is not None:
+            video_data = video.to_dict()
+            # to_dict는 일부 필드(해상도, 숏폼 여부)를 빼므로 메타데이터는 전체 저장
+            video_data['metadata'] = asdict(video.metadata) if video.metadata else None
+        
+        return {
+            'completed_stages': list(completed_stages),
+            'url': self.url,
+            'force_reanalyze': self.force_reanalyze,
+            'custom_prompt': self.custom_prompt,
+            'platform': self.platform,
+            'video_id': self.video_id,
+            'video': video_data,
+            'has_scenes': self.scenes is not None,
+            'download_result': self.download_result,
+            'analysis_result': self.analysis_result,
+            'settings': asdict(self.settings),
+            'stage_results': self.stage_results,
+            'errors': self.errors,
+        }
+    
+    @classmethod
+    def from_checkpoint(cls, data: Dict[str, Any],
+                        cancel_token: Optional[CancellationToken] = None) -> 'PipelineContext':
+        """to_checkpoint 결과에서 컨텍스트 복원 (완료 스테이지 목록은 data['completed_stages'])"""
+        from core.video.models import Video
+        
+        video = Video.from_dict(data['video']) if data.get('video') else None
+        return cls(
+            url=data['url'],
+            force_reanalyze=data.get('force_reanalyze', False),
+            custom_prompt=data.get('custom_prompt'),
+            platform=data.get('platform'),
+            video_id=data.get('video_id'),
+            video_object=video,
+            download_result=data.get('download_result'),
+            scenes=video.scenes if video is not None and data.get('has_scenes') else None,
+            analysis_result=data.get('analysis_result'),
+            settings=JobSettings(**data['settings']) if data.get('settings') else JobSettings.from_env(),
+            cancel_token=cancel_token or CancellationToken(),
+            stage_results=dict(data.get('stage_results') or {}),
+            errors=list(data.get('errors') or []),
+        )
 
 
 class PipelineStage(ABC):
     """Pipeline 스테이지 추상 클래스"""
     
+    # CPU 집약 스테이지 여부 (True면 run_cpu_bound가 공유 프로세스 풀 사용)
+    cpu_bound: bool = False
+    
     def __init__(self, name: str):
         self.name = name
         self.logger = get_logger(f"pipeline.{name}")
-        self.status = StageStatus.PENDING
-        self.progress_callback: Optional[Callable] = None
     
     @abstractmethod
     def execute(self, context: PipelineContext) -> PipelineContext:
@@ -67,23 +168,52 @@ class PipelineStage(ABC):
         """스테이지 스킵 가능 여부"""
         return False
     
+    def checkpoint_valid(self, context: PipelineContext) -> bool:
+        """
+        체크포인트에서 재개할 때 이 스테이지의 완료 결과를 그대로 써도 되는지
+        
+        디스크에 남긴 산출물(다운로드 파일, 씬 이미지)이 사라졌으면 False를 반환해
+        이 스테이지와 이후 스테이지를 다시 실행하게 합니다.
+        """
+        return True
+    
+    def run_cpu_bound(self, context: PipelineContext, func: Callable, *args) -> Any:
+        """
+        CPU 집약 작업 실행
+        
+        cpu_bound 스테이지는 공유 프로세스 풀에서, 그 외에는 현재 스레드에서 실행합니다.
+        func는 모듈 수준 함수여야 하고 인자/반환값은 경로와 기본 타입만 사용합니다.
+        """
+        if not self.cpu_bound:
+            return func(*args)
+        return run_in_process(func, *args, cancel_token=context.cancel_token)
+    
     def update_progress(self, progress: int, message: str, context: PipelineContext):
-        """진행 상황 업데이트"""
-        if self.progress_callback:
-            self.progress_callback(self.name, progress, message)
+        """진행 상황 업데이트 (작업별 콜백은 컨텍스트에서 읽음)"""
+        if context.progress_callback:
+            context.progress_callback(self.name, progress, message)
         # 로그 출력 제거 (중복 방지)
     
     def run(self, context: PipelineContext, 
             progress_callback: Optional[Callable] = None) -> PipelineContext:
-        """스테이지 실행 래퍼"""
-        self.progress_callback = progress_callback
-        self.status = StageStatus.RUNNING
+        """
+        스테이지 실행 래퍼
+        
+        스테이지 인스턴스는 동시 작업 간에 공유되므로 작업별 상태는 인스턴스가 아닌
+        context.stage_status에 기록합니다.
+        """
+        if progress_callback is not None:
+            context.progress_callback = progress_callback
+        context.stage_status[self.name] = StageStatus.RUNNING
         
         try:
+            # 취소 체크
+            context.cancel_token.raise_if_cancelled()
+            
             # 스킵 체크
             if self.can_skip(context):
                 self.logger.info(f"⏭️ {self.name} 스테이지 스킵")
-                self.status = StageStatus.SKIPPED
+                context.stage_status[self.name] = StageStatus.SKIPPED
                 return context
             
             # 실행
@@ -94,12 +224,17 @@ class PipelineStage(ABC):
             
             elapsed = time.time() - start_time
             self.logger.info(f"✅ {self.name} 스테이지 완료 ({elapsed:.2f}초)")
-            self.status = StageStatus.SUCCESS
+            context.stage_status[self.name] = StageStatus.SUCCESS
             
             return context
             
+        except TaskCancelledError:
+            context.stage_status[self.name] = StageStatus.CANCELLED
+            self.logger.info(f"⏹️ {self.name} 스테이지 취소됨")
+            raise
+            
         except Exception as e:
-            self.status = StageStatus.FAILED
+            context.stage_status[self.name] = StageStatus.FAILED
             error_msg = f"❌ {self.name} 스테이지 실패: {str(e)}"
             self.logger.error(error_msg)
             context.add_error(self.name, str(e))
@@ -107,49 +242,101 @@ class PipelineStage(ABC):
 
 
 class VideoPipeline:
-    """비디오 처리 파이프라인"""
+    """
+    비디오 처리 파이프라인
+    
+    스테이지는 의존성 그래프(DAG)로 실행됩니다. add_stage에 depends_on을 주지 않으면
+    직전에 추가된 스테이지에 의존하므로 기존처럼 순차 실행되고, 서로 독립인 스테이지는
+    스레드에서 동시에 실행됩니다. 모든 스테이지는 같은 PipelineContext를 공유하며
+    각자 다른 필드에 결과를 기록합니다.
+    """
     
-    def __init__(self):
+    def __init__(self, max_parallel_stages: int = None):
         self.logger = get_logger("pipeline")
         self.stages: List[PipelineStage] = []
-        self.progress_callback: Optional[Callable] = None
+        self.dependencies: Dict[str, Tuple[str, ...]] = {}
+        self.max_parallel_stages = max_parallel_stages or int(os.getenv("PIPELINE_PARALLEL_STAGES", "4"))
     
-    def add_stage(self, stage: PipelineStage) -> 'VideoPipeline':
-        """스테이지 추가"""
+    def add_stage(self, stage: PipelineStage,
+                  depends_on: Optional[Tuple[str, ...]] = None) -> 'VideoPipeline':
+        """
+        스테이지 추가
+        
+        Args:
+            stage: 추가할 스테이지
+            depends_on: 먼저 끝나야 하는 스테이지 이름들 (None이면 직전 스테이지)
+        """
+        if depends_on is None:
+            depends_on = (self.stages[-1].name,) if self.stages else ()
+        
+        known = {existing.name for existing in self.stages}
+        unknown = [name for name in depends_on if name not in known]
+        if unknown:
+            raise ValueError(f"{stage.name}: 알 수 없는 선행 스테이지 {unknown}")
+        
         self.stages.append(stage)
+        self.dependencies[stage.name] = tuple(depends_on)
         return self
     
     def execute(self, 
                url: str, 
                force_reanalyze: bool = False,
                progress_callback: Optional[Callable] = None,
-               custom_prompt: Optional[str] = None) -> PipelineContext:
-        """파이프라인 실행"""
-        self.progress_callback = progress_callback
-        
-        # 컨텍스트 생성
-        context = PipelineContext(
-            url=url,
-            force_reanalyze=force_reanalyze,
-            custom_prompt=custom_prompt
-        )
+               custom_prompt: Optional[str] = None,
+               cancel_token: Optional[CancellationToken] = None,
+               settings: Optional[JobSettings] = None,
+               checkpoint: Optional[Dict[str, Any]] = None,
+               checkpoint_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> PipelineContext:
+        """
+        파이프라인 실행
+        
+        checkpoint가 주어지면 컨텍스트를 복원하고 이미 완료된 스테이지는 건너뛰며,
+        checkpoint_callback은 스테이지가 끝날 때마다 새 체크포인트로 호출됩니다.
+        """
+        completed: List[str] = []
+        if checkpoint:
+            # 중단된 작업 재개
+            context = PipelineContext.from_checkpoint(checkpoint, cancel_token)
+            completed = self._resumable_stages(context, checkpoint.get('completed_stages', []))
+        else:
+            # 컨텍스트 생성
+            context = PipelineContext(
+                url=url,
+                force_reanalyze=force_reanalyze,
+                custom_prompt=custom_prompt,
+                settings=settings or JobSettings.from_env(),
+                cancel_token=cancel_token or CancellationToken()
+            )
+        context.progress_callback = progress_callback
         
         self.logger.info("=" * 60)
         self.logger.info(f"🚀 Pipeline 시작 - URL: {url}")
+        self.logger.info(
+            f"⚙️ 작업 설정 - 정밀도: {context.settings.precision_level}, "
+            f"모델: {context.settings.model_name}"
+        )
         self.logger.info(f"📊 총 {len(self.stages)}개 스테이지")
+        if completed:
+            self.logger.info(f"♻️ 체크포인트에서 재개 - 완료된 스테이지: {', '.join(completed)}")
         self.logger.info("=" * 60)
         
-        # 각 스테이지 실행
-        for i, stage in enumerate(self.stages):
-            try:
-                self.logger.info(f"\n[{i+1}/{len(self.stages)}] {stage.name}")
-                context = stage.run(context, progress_callback)
-                
-            except Exception as e:
-                self.logger.error(f"Pipeline 중단: {stage.name} 실패")
+        # 의존성 그래프에 따라 스테이지 실행
+        failed_stage, error = self._run_stages(context, completed, checkpoint_callback)
+        
+        if error is not None:
+            # 씬 추출 전에 중단되면 스트리밍 검출도 함께 중단
+            if context.scene_handoff is not None:
+                context.scene_handoff.abort("파이프라인 중단")
+            
+            if isinstance(error, TaskCancelledError):
+                self.logger.info(f"⏹️ Pipeline 취소: {failed_stage} 단계에서 중단")
+                if progress_callback:
+                    progress_callback("cancelled", 0, f"⏹️ 작업이 취소되었습니다 ({failed_stage})")
+            else:
+                self.logger.error(f"Pipeline 중단: {failed_stage} 실패")
                 if progress_callback:
-                    progress_callback("error", 0, f"❌ {stage.name} 실패: {str(e)}")
-                raise
+                    progress_callback("error", 0, f"❌ {failed_stage} 실패: {str(error)}")
+            raise error
         
         # 완료
         elapsed = time.time() - context.start_time
@@ -158,3 +345,97 @@ class VideoPipeline:
         self.logger.info("=" * 60)
         
         return context
+    
+    def _resumable_stages(self, context: PipelineContext, completed_stages: List[str]) -> List[str]:
+        """체크포인트의 완료 스테이지 중 결과를 그대로 쓸 수 있는 것만 (선행 스테이지도 유효해야 함)"""
+        completed = set(completed_stages)
+        valid: List[str] = []
+        for stage in self.stages:
+            if stage.name not in completed:
+                continue
+            if not all(dep in valid for dep in self.dependencies[stage.name]):
+                continue
+            if not stage.checkpoint_valid(context):
+                self.logger.info(f"♻️ {stage.name}: 체크포인트 산출물이 없어 다시 실행")
+                continue
+            valid.append(stage.name)
+        return valid
+    
+    def _save_checkpoint(self, context: PipelineContext, done: set,
+                         checkpoint_callback: Optional[Callable[[Dict[str, Any]], None]]):
+        """완료 스테이지 체크포인트 저장 (실패해도 파이프라인은 계속)"""
+        if checkpoint_callback is None:
+            return
+        try:
+            completed = [stage.name for stage in self.stages if stage.name in done]
+            checkpoint_callback(context.to_checkpoint(completed))
+        except Exception as e:
+            self.logger.warning(f"체크포인트 저장 실패: {e}")
+    
+    def _run_stages(self, context: PipelineContext,
+                    completed: Optional[List[str]] = None,
+                    checkpoint_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+                    ) -> Tuple[Optional[str], Optional[BaseException]]:
+        """
+        준비된 스테이지부터 실행
+        
+        준비된 스테이지가 하나뿐이고 실행 중인 것이 없으면 현재 스레드에서 바로 실행하고,
+        여러 개면 스레드 풀에서 동시에 실행합니다. 실패하면 새 스테이지는 시작하지 않고
+        실행 중인 스테이지가 끝나기를 기다린 뒤 (실패 스테이지 이름, 예외)를 반환합니다.
+        completed에 든 스테이지는 이미 끝난 것으로 보고 실행하지 않습니다.
+        """
+        order = {stage.name: i for i, stage in enumerate(self.stages)}
+        done: set = set(completed or ())
+        pending = [stage for stage in self.stages if stage.name not in done]
+        running: Dict[concurrent.futures.Future, PipelineStage] = {}
+        failed_stage, error = None, None
+        
+        def start_message(stage: PipelineStage) -> str:
+            return f"\n[{order[stage.name] + 1}/{len(self.stages)}] {stage.name}"
+        
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_parallel_stages,
+            thread_name_prefix="PipelineStage"
+        ) as executor:
+            while (pending and error is None) or running:
+                ready = [] if error is not None else [
+                    stage for stage in pending
+                    if all(dep in done for dep in self.dependencies[stage.name])
+                ]
+                
+                # 순차 구간: 현재 스레드에서 실행
+                if len(ready) == 1 and not running:
+                    stage = ready[0]
+                    pending.remove(stage)
+                    self.logger.info(start_message(stage))
+                    try:
+                        stage.run(context)
+                        done.add(stage.name)
+                        self._save_checkpoint(context, done, checkpoint_callback)
+                    except Exception as e:
+                        failed_stage, error = stage.name, e
+                    continue
+                
+                # 병렬 구간: 독립 스테이지 동시 실행
+                for stage in ready:
+                    pending.remove(stage)
+                    self.logger.info(start_message(stage) + " (병렬)")
+                    # 로그 스트림 등 호출 스레드의 컨텍스트를 그대로 넘김
+                    running[executor.submit(contextvars.copy_context().run, stage.run, context)] = stage
+                
+                if not running:
+                    break
+                
+                finished, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in finished:
+                    stage = running.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        done.add(stage.name)
+                        self._save_checkpoint(context, done, checkpoint_callback)
+                    elif error is None:
+                        failed_stage, error = stage.name, exc
+        
+        return failed_stage, error
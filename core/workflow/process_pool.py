@@ -0,0 +1,134 @@
+# core/workflow/process_pool.py
+"""
+CPU 집약 스테이지용 공유 프로세스 풀
+씬 그룹화처럼 GIL에 묶이는 작업을 별도 프로세스에서 실행해
+동시 작업 수가 늘어도 코어 수만큼 처리량이 늘어나도록 합니다.
+"""
+
+import os
+import uuid
+import inspect
+import tempfile
+import threading
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from utils.logger import get_logger
+from utils.cancellation import CancellationToken
+
+logger = get_logger(__name__)
+
+# 프로세스 풀 사용 여부 / 워커 수 (0이면 CPU 코어 수)
+PROCESS_POOL_ENABLED = os.getenv("PIPELINE_PROCESS_POOL", "true").lower() == "true"
+PROCESS_POOL_WORKERS = int(os.getenv("PIPELINE_PROCESS_WORKERS", "0")) or (os.cpu_count() or 2)
+
+# 결과 대기 중 취소 여부 확인 주기 (초)
+CANCEL_POLL_INTERVAL = 0.5
+
+_process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> Optional[concurrent.futures.ProcessPoolExecutor]:
+    """프로세스 풀 싱글톤 반환 (비활성화 시 None)"""
+    global _process_pool
+    if not PROCESS_POOL_ENABLED:
+        return None
+    if _process_pool is None:
+        with _pool_lock:
+            if _process_pool is None:
+                # 작업 스레드가 많은 프로세스에서 fork하면 락 상태가 복제되므로 spawn 사용
+                _process_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=PROCESS_POOL_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"프로세스 풀 시작: 워커 {PROCESS_POOL_WORKERS}개")
+    return _process_pool
+
+
+def shutdown_process_pool(wait: bool = True):
+    """프로세스 풀 종료"""
+    global _process_pool
+    with _pool_lock:
+        pool, _process_pool = _process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("프로세스 풀 종료")
+
+
+def _accepts_argument(func: Callable, name: str) -> bool:
+    """함수가 해당 이름의 인자를 받는지 확인"""
+    try:
+        return name in inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _signal_cancel(cancel_file: str):
+    """워커에 취소 신호 전달 (신호 파일 생성)"""
+    try:
+        with open(cancel_file, "w"):
+            pass
+    except OSError as e:
+        logger.warning(f"취소 신호 파일 생성 실패: {e}")
+
+
+def _remove_cancel_file(cancel_file: str):
+    try:
+        os.remove(cancel_file)
+    except OSError:
+        pass
+
+
+def run_in_process(func: Callable, *args,
+                   cancel_token: Optional[CancellationToken] = None) -> Any:
+    """
+    모듈 수준 함수를 프로세스 풀에서 실행하고 결과를 기다림
+
+    인자와 반환값은 pickle되므로 경로·숫자·튜플 같은 작은 값만 주고받아야 합니다.
+    풀이 비활성화되었거나 깨진 경우 현재 스레드에서 직접 실행합니다.
+
+    취소되면 결과를 기다리지 않고 TaskCancelledError를 발생시킵니다. func가
+    cancel_file 인자를 받으면 워커에 신호 파일 경로를 넘기고 취소 시 파일을 만들어
+    실행 중인 워커도 멈추게 합니다 (현재 스레드에서 실행할 때는 cancel_token을 그대로 전달).
+    """
+    def run_here():
+        if cancel_token is not None and _accepts_argument(func, 'cancel_token'):
+            return func(*args, cancel_token=cancel_token)
+        return func(*args)
+
+    pool = get_process_pool()
+    if pool is None:
+        return run_here()
+
+    kwargs = {}
+    cancel_file = None
+    if cancel_token is not None and _accepts_argument(func, 'cancel_file'):
+        cancel_file = os.path.join(tempfile.gettempdir(), f"pipeline-cancel-{uuid.uuid4().hex}")
+        kwargs['cancel_file'] = cancel_file
+
+    try:
+        future = pool.submit(func, *args, **kwargs)
+    except (BrokenProcessPool, RuntimeError) as e:
+        logger.warning(f"프로세스 풀 사용 불가, 현재 스레드에서 실행: {e}")
+        shutdown_process_pool(wait=False)
+        return run_here()
+
+    while True:
+        try:
+            return future.result(timeout=CANCEL_POLL_INTERVAL)
+        except concurrent.futures.TimeoutError:
+            if cancel_token is not None and cancel_token.is_cancelled:
+                if not future.cancel() and cancel_file:
+                    # 이미 실행 중 → 워커가 신호 파일을 보고 ffmpeg 등을 종료하고 끝냄
+                    # (신호 파일은 워커가 끝나면 정리, 이미 끝났으면 바로 정리)
+                    _signal_cancel(cancel_file)
+                    future.add_done_callback(lambda _: _remove_cancel_file(cancel_file))
+                cancel_token.raise_if_cancelled()
+        except BrokenProcessPool:
+            # 워커가 비정상 종료 (메모리 부족 등) → 풀 재생성 후 현재 스레드에서 실행
+            logger.error("프로세스 풀 워커 비정상 종료 - 현재 스레드에서 재실행")
+            shutdown_process_pool(wait=False)
+            return run_here()
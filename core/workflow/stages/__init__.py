@@ -7,7 +7,7 @@ from .downloader import DownloadStage
 from .metadata_saver import MetadataStage
 from .scene_extractor import SceneExtractionStage
 from .ai_analyzer import AIAnalysisStage
-from .storage_uploader import StorageUploadStage
+from .storage_uploader import StorageUploadStage, AnalysisUploadStage
 from .notion_syncer import NotionUploadStage
 from .cleaner import CleanupStage
 
@@ -19,6 +19,7 @@ __all__ = [
     'SceneExtractionStage',
     'AIAnalysisStage',
     'StorageUploadStage',
+    'AnalysisUploadStage',
     'NotionUploadStage',
     'CleanupStage'
 ]
\ No newline at end of file
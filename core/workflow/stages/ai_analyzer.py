@@ -2,9 +2,11 @@
 """AI 분석 스테이지"""
 
 import os
+from datetime import datetime
 from core.analysis import VideoAnalyzer
 from core.analysis.providers import OpenAIProvider, ClaudeProvider, GeminiProvider
-from core.database import VideoRepository
+from core.database import get_repository
+from utils.cache_manager import get_cache_manager
 
 from ..pipeline import PipelineStage, PipelineContext
 
@@ -14,12 +16,9 @@ class AIAnalysisStage(PipelineStage):
     
     def __init__(self, provider_name: str = "openai"):
         super().__init__("ai_analysis")
-        # 환경변수에서 모델명 확인
-        model_name = os.getenv("AI_MODEL_NAME", "gpt-4o")
-        self.model_name = model_name
-        self.provider_name = self._get_provider_from_model(model_name)
-        self.analyzer = self._create_analyzer_for_model(model_name)
-        self.db = VideoRepository()
+        # 모델은 작업마다 context.settings.model_name 으로 결정
+        self.db = get_repository()
+        self.cache = get_cache_manager()
     
     def _get_provider_from_model(self, model_name: str) -> str:
         """모델명에서 Provider 이름 추출"""
@@ -67,26 +66,31 @@ class AIAnalysisStage(PipelineStage):
             self.logger.warning("분석할 씬이 없습니다")
             return context
         
+        # 작업별 모델 (analyzer는 custom_prompt 등 상태를 가지므로 작업마다 생성)
+        model_name = context.settings.model_name
+        provider_name = self._get_provider_from_model(model_name)
+        analyzer = self._create_analyzer_for_model(model_name)
+        
         # 모델 표시명
         model_display = {
             "gemini-2.0-flash": "Google Gemini",
             "gpt-4o": "GPT-4o",
             "claude-sonnet-4-20250514": "Claude Sonnet 4"
-        }.get(self.model_name, self.model_name)
+        }.get(model_name, model_name)
         
         self.update_progress(0, f"🤖 {model_display} AI 분석 시작...", context)
         
         # custom_prompt가 있으면 analyzer에 전달
         if context.custom_prompt:
-            self.analyzer.custom_prompt = context.custom_prompt
+            analyzer.custom_prompt = context.custom_prompt
             self.logger.info(f"📝 맞춤형 분석 프롬프트 사용")
         
         # AI 분석 실행
-        analysis_result = self.analyzer.analyze_video(video)
+        analysis_result = analyzer.analyze_video(video)
         
         # 사용된 전체 프롬프트 저장
-        if hasattr(self.analyzer, 'last_full_prompt'):
-            context.full_prompt_used = self.analyzer.last_full_prompt
+        if hasattr(analyzer, 'last_full_prompt'):
+            context.full_prompt_used = analyzer.last_full_prompt
         
         if analysis_result:
             self.update_progress(70, f"✅ AI 분석 성공: {analysis_result.get('genre', 'Unknown')}", context)
@@ -110,10 +114,13 @@ class AIAnalysisStage(PipelineStage):
                 'target_audience': analysis_result.get('target_audience', ''),
                 'analyzed_scenes': [os.path.basename(scene.frame_path) for scene in video.scenes[:10]],
                 'token_usage': {},
-                'model_used': analysis_result.get('model_used', f'{self.provider_name}:unknown')
+                'model_used': analysis_result.get('model_used', f'{provider_name}:unknown')
             }
             
             self.db.save_analysis_result(context.video_id, analysis_data)
+            self.cache.set_video_analysis(
+                context.video_id, {**analysis_data, 'analysis_date': datetime.now().isoformat()}
+            )
             
             self.update_progress(100, "✅ AI 분석 완료", context)
         else:
@@ -1,8 +1,9 @@
 # src/pipeline/stages/cache_check_stage.py
 """캐시 확인 스테이지"""
 
-from core.database.repository import VideoAnalysisDB
+from core.database.repository import get_repository
 from core.video.models import Video, VideoMetadata
+from utils.cache_manager import get_cache_manager
 
 from ..pipeline import PipelineStage, PipelineContext
 
@@ -12,7 +13,8 @@ class CacheCheckStage(PipelineStage):
     
     def __init__(self):
         super().__init__("cache_check")
-        self.db = VideoAnalysisDB()
+        self.db = get_repository()
+        self.cache = get_cache_manager()
     
     def execute(self, context: PipelineContext) -> PipelineContext:
         """캐시 확인 실행"""
@@ -20,10 +22,15 @@ class CacheCheckStage(PipelineStage):
         
         if context.force_reanalyze:
             self.logger.info("강제 재분석 모드 - 캐시 무시")
+            self.cache.invalidate_video(context.url, context.video_id)
             return context
         
-        # 기존 분석 결과 확인
-        existing_analysis = self.db.get_latest_analysis(context.video_id)
+        # 기존 분석 결과 확인 (캐시 → DB)
+        existing_analysis = self.cache.get_video_analysis(context.video_id)
+        if existing_analysis is None:
+            existing_analysis = self.db.get_latest_analysis(context.video_id)
+            if existing_analysis:
+                self.cache.set_video_analysis(context.video_id, existing_analysis)
         
         if existing_analysis:
             self.update_progress(15, f"✅ 기존 분석 결과 발견: {context.video_id}", context)
@@ -43,10 +50,13 @@ class CacheCheckStage(PipelineStage):
     
     def _create_video_from_db(self, video_id: str, analysis_data: dict) -> Video:
         """DB에서 Video 객체 생성"""
-        # 영상 정보 조회
-        video_info = self.db.get_video_info(video_id)
-        if not video_info:
-            return None
+        # 영상 정보 조회 (캐시 → DB)
+        video_info = self.cache.get_video_metadata(video_id)
+        if video_info is None:
+            video_info = self.db.get_video_info(video_id)
+            if not video_info:
+                return None
+            self.cache.set_video_metadata(video_id, video_info)
         
         # Video 객체 생성
         video = Video(
@@ -5,7 +5,9 @@ import os
 from core.video.downloader.youtube import YouTubeDownloader
 from core.video.downloader.vimeo import VimeoDownloader
 from core.video.models import Video, VideoMetadata
+from core.video.stream_handoff import SceneStreamHandoff, STREAMING_HANDOFF_ENABLED
 from config.settings import Settings
+from utils.cache_manager import get_cache_manager
 
 from ..pipeline import PipelineStage, PipelineContext
 
@@ -17,11 +19,19 @@ class DownloadStage(PipelineStage):
         super().__init__("download")
         self.youtube_downloader = YouTubeDownloader()
         self.vimeo_downloader = VimeoDownloader()
+        self.cache = get_cache_manager()
     
     def can_skip(self, context: PipelineContext) -> bool:
         """캐시 히트 시 스킵"""
         return context.stage_results.get("cache_hit", False)
     
+    def checkpoint_valid(self, context: PipelineContext) -> bool:
+        """재개 시 다운로드 파일이 남아 있어야 재사용"""
+        if context.stage_results.get("cache_hit", False):
+            return True
+        video = context.video_object
+        return bool(video and video.local_path and os.path.exists(video.local_path))
+    
     def execute(self, context: PipelineContext) -> PipelineContext:
         """다운로드 실행"""
         self.update_progress(0, "📥 영상 다운로드 시작...", context)
@@ -29,8 +39,35 @@ class DownloadStage(PipelineStage):
         # YouTube 다운로더가 모든 플랫폼을 지원하므로 통합 사용
         self.logger.info(f"📥 {context.platform} 영상 다운로드 (통합 다운로더)")
         
+        # 긴 영상은 다운로드하는 동안 스트림에서 씬 전환점을 미리 검출
+        handoff = SceneStreamHandoff() if STREAMING_HANDOFF_ENABLED else None
+        
+        # 최근 추출한 yt-dlp 정보가 있으면 메타데이터 추출 요청 생략
+        cached_info = self.cache.get_video_info(context.video_id)
+        if cached_info:
+            self.logger.info(f"📦 캐시된 yt-dlp 정보 사용: {context.video_id}")
+        
+        def on_info(info):
+            if cached_info is None:
+                self.cache.set_video_info(context.video_id, info)
+            if handoff:
+                handoff.start(info)
+        
         # 다운로드 실행 (내부 progress callback 없이)
-        download_result = self.youtube_downloader.download_legacy(context.url, None)
+        try:
+            download_result = self.youtube_downloader.download_legacy(
+                context.url, None,
+                cancel_token=context.cancel_token,
+                info_callback=on_info,
+                info=cached_info
+            )
+        except BaseException:
+            if handoff:
+                handoff.abort("다운로드 실패")
+            raise
+        
+        if handoff and handoff.started:
+            context.scene_handoff = handoff
         
         context.download_result = download_result
         
@@ -2,7 +2,8 @@
 """메타데이터 처리 스테이지"""
 
 from datetime import datetime
-from core.database.repository import VideoAnalysisDB
+from core.database.repository import get_repository
+from utils.cache_manager import get_cache_manager
 
 from ..pipeline import PipelineStage, PipelineContext
 
@@ -12,7 +13,8 @@ class MetadataStage(PipelineStage):
     
     def __init__(self):
         super().__init__("metadata")
-        self.db = VideoAnalysisDB()
+        self.db = get_repository()
+        self.cache = get_cache_manager()
     
     def can_skip(self, context: PipelineContext) -> bool:
         """캐시 히트 시 스킵"""
@@ -53,5 +55,6 @@ class MetadataStage(PipelineStage):
         }
         
         self.db.save_video_info(video_data)
+        self.cache.set_video_metadata(context.video_id, video_data)
         
         return context
@@ -1,23 +1,37 @@
 # src/pipeline/stages/extraction_stage.py
 """씬 추출 스테이지"""
 
-from core.video.scene_detector import SceneExtractor
+import os
+
+from core.video.scene_detector import SceneExtractor, extract_scenes_worker, unpack_scenes
 from core.video.models import Scene
+from utils.cache_manager import get_cache_manager
 
 from ..pipeline import PipelineStage, PipelineContext
+from ..process_pool import get_process_pool
 
 
 class SceneExtractionStage(PipelineStage):
     """씬 추출"""
     
+    # 프레임 특징 추출/클러스터링은 GIL에 묶이므로 프로세스 풀에서 실행
+    cpu_bound = True
+    
     def __init__(self):
         super().__init__("scene_extraction")
-        self.extractor = SceneExtractor()
+        self.cache = get_cache_manager()
     
     def can_skip(self, context: PipelineContext) -> bool:
         """캐시 히트 시 스킵"""
         return context.stage_results.get("cache_hit", False)
     
+    def checkpoint_valid(self, context: PipelineContext) -> bool:
+        """재개 시 씬 이미지가 모두 남아 있어야 재사용"""
+        if context.stage_results.get("cache_hit", False):
+            return True
+        scenes = context.scenes or []
+        return all(os.path.exists(scene.frame_path) for scene in scenes)
+    
     def execute(self, context: PipelineContext) -> PipelineContext:
         """씬 추출 실행"""
         self.update_progress(0, "🎞️ 장면 추출 시작...", context)
@@ -26,12 +40,46 @@ class SceneExtractionStage(PipelineStage):
         
         # 씬 추출 (내부 progress callback 없이)
         is_short_form = video.metadata.is_short_form if video.metadata else False
-        scenes_result = self.extractor.extract_scenes(
-            video.local_path,
-            video.session_id,
-            progress_callback=None,
-            is_short_form=is_short_form
-        )
+        precision_level = context.settings.precision_level
+        
+        # 같은 정밀도로 추출한 씬 이미지가 아직 남아 있으면 재사용
+        cached_scenes = self._load_cached_scenes(context.video_id, precision_level)
+        if cached_scenes is not None:
+            if context.scene_handoff is not None:
+                context.scene_handoff.abort("캐시된 씬 사용")
+                context.scene_handoff = None
+            video.scenes = cached_scenes
+            context.scenes = video.scenes
+            self.update_progress(100, f"✅ 캐시된 씬 {len(video.scenes)}개 사용", context)
+            return context
+        
+        # 다운로드 중 스트림에서 검출한 전환점 (없거나 실패하면 None → 파일에서 검출)
+        scene_changes = None
+        if context.scene_handoff is not None:
+            scene_changes = context.scene_handoff.result(context.cancel_token)
+            context.scene_handoff = None
+        
+        if get_process_pool() is not None:
+            # 프로세스 풀에서 실행 - 경로/정밀도만 넘기고 씬은 튜플로 돌려받음
+            packed = self.run_cpu_bound(
+                context, extract_scenes_worker,
+                video.local_path, video.session_id, is_short_form, precision_level, scene_changes
+            )
+            scenes_result = {
+                'all_scenes': unpack_scenes(packed['all_scenes']),
+                'grouped_scenes': unpack_scenes(packed['grouped_scenes'])
+            }
+        else:
+            # 추출기는 실행 중 설정을 바꾸므로 작업마다 새로 생성
+            extractor = SceneExtractor(precision_level=precision_level)
+            scenes_result = extractor.extract_scenes(
+                video.local_path,
+                video.session_id,
+                progress_callback=None,
+                is_short_form=is_short_form,
+                cancel_token=context.cancel_token,
+                scene_changes=scene_changes
+            )
         
         # Scene 객체로 변환
         video.scenes = []
@@ -58,7 +106,24 @@ class SceneExtractionStage(PipelineStage):
                     video.scenes.append(scene)
         
         context.scenes = video.scenes
+        if video.scenes:
+            self.cache.set_scene_list(
+                context.video_id, precision_level, [scene.to_dict() for scene in video.scenes]
+            )
         
         self.update_progress(100, f"✅ {len(video.scenes)}개 씬 추출 완료", context)
         
         return context
+    
+    def _load_cached_scenes(self, video_id: str, precision_level: int):
+        """캐시된 씬 목록 (정밀도가 다르거나 이미지가 하나라도 없으면 None)"""
+        cached = self.cache.get_scene_list(video_id)
+        if not cached or cached.get('precision_level') != precision_level:
+            return None
+        
+        scenes = [Scene.from_dict(data) for data in cached.get('scenes', [])]
+        if not scenes or not all(os.path.exists(scene.frame_path) for scene in scenes):
+            return None
+        
+        self.logger.info(f"📦 캐시된 씬 목록 사용: {video_id} ({len(scenes)}개)")
+        return scenes
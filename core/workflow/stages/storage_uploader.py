@@ -2,16 +2,35 @@
 """스토리지 업로드 스테이지 - 배치 업로드 지원"""
 
 import os
+from typing import Dict, List, Tuple
+
+from integrations.storage.content_store import (
+    CONTENT_ADDRESSED, MANIFEST_NAME, plan_session_upload, write_manifest
+)
 from integrations.storage.interface import StorageType, StorageManager
 
 from ..pipeline import PipelineStage, PipelineContext
 
+# 번들(tar 스트림) 업로드 시 취소 여부를 확인하는 단위 (파일 수)
+BUNDLE_CANCEL_CHECK_SIZE = 200
+
+# 이 크기 이하의 파일만 번들로 묶음 (영상 등 큰 파일은 병렬 업로드)
+BUNDLE_MAX_FILE_SIZE = int(os.getenv("SFTP_BUNDLE_MAX_FILE_SIZE", str(8 * 1024 * 1024)))
+
 
 class StorageUploadStage(PipelineStage):
-    """스토리지 업로드"""
+    """스토리지 업로드 (영상, 썸네일, 씬 이미지)"""
     
-    def __init__(self, storage_type: StorageType = None):
-        super().__init__("storage_upload")
+    # 업로드 대상 - "media": 영상/썸네일/씬 이미지, "analysis": 분석 결과 JSON
+    upload_targets = ("media", "analysis")
+    
+    def __init__(self, storage_type: StorageType = None, upload_analysis: bool = True,
+                 name: str = "storage_upload"):
+        super().__init__(name)
+        
+        # AI 분석과 병렬로 실행할 때는 분석 결과를 별도 스테이지(AnalysisUploadStage)에서 업로드
+        if not upload_analysis:
+            self.upload_targets = tuple(t for t in self.upload_targets if t != "analysis")
         
         # 스토리지 타입 결정
         if storage_type is None:
@@ -20,6 +39,14 @@ class StorageUploadStage(PipelineStage):
         
         self.storage_manager = StorageManager(storage_type)
         self.storage_type = storage_type
+        
+        # 씬 이미지 등 작은 파일을 tar 스트림 하나로 업로드 (SFTP 서버에서 tar 실행 필요)
+        self.bundle_upload = os.getenv("SFTP_BUNDLE_UPLOAD", "false").lower() == "true"
+        
+        # 콘텐츠 주소 레이아웃 (STORAGE_LAYOUT=cas) - 링크를 만들 수 있는 SFTP만 지원
+        self.content_addressed = CONTENT_ADDRESSED and storage_type == StorageType.SFTP
+        if CONTENT_ADDRESSED and not self.content_addressed:
+            self.logger.warning(f"⚠️ 콘텐츠 주소 레이아웃은 SFTP 전용 - {storage_type.value}는 파일 그대로 업로드")
     
     def can_skip(self, context: PipelineContext) -> bool:
         """로컬 스토리지이거나 캐시 히트 시 스킵"""
@@ -41,6 +68,158 @@ class StorageUploadStage(PipelineStage):
         
         # 모든 업로드할 파일을 수집
         file_pairs = []
+        if "media" in self.upload_targets:
+            file_pairs.extend(self._collect_media_files(video, remote_base_path))
+        if "analysis" in self.upload_targets:
+            file_pairs.extend(self._collect_analysis_file(video, remote_base_path))
+        
+        if not file_pairs:
+            self.logger.info("업로드할 파일 없음")
+            return context
+        
+        # 파일 개수 통계
+        self.logger.info(f"📊 업로드할 파일 총 {len(file_pairs)}개:")
+        self.logger.info(f"  - 비디오: {sum(1 for p in file_pairs if 'mp4' in p[0] or 'webm' in p[0])}개")
+        self.logger.info(f"  - 이미지: {sum(1 for p in file_pairs if '.jpg' in p[0])}개")
+        self.logger.info(f"  - JSON: {sum(1 for p in file_pairs if '.json' in p[0])}개")
+        
+        # 배치 업로드 실행
+        if self.content_addressed:
+            # 새 내용만 해시 blob으로 올리고 세션 경로에는 링크와 매니페스트
+            results = self._upload_content_addressed(video, file_pairs, remote_base_path, context)
+            self._log_results(results, len(file_pairs))
+        elif self.storage_type == StorageType.SFTP and len(file_pairs) > 1:
+            # SFTP의 경우 배치 업로드 사용
+            self.logger.info(f"🚀 SFTP 배치 업로드 시작 (동시 {os.getenv('SFTP_MAX_CONCURRENT', '5')}개 연결)")
+            results = self._upload_sftp_batch(file_pairs, context)
+            self._log_results(results, len(file_pairs))
+        else:
+            # 로컬 스토리지나 파일이 1개인 경우 순차 처리
+            self.logger.info(f"📤 순차 업로드 시작")
+            uploaded = 0
+            
+            for i, (local_path, remote_path) in enumerate(file_pairs):
+                context.cancel_token.raise_if_cancelled()
+                filename = os.path.basename(local_path)
+                self.logger.info(f"📤 업로드 [{i+1}/{len(file_pairs)}]: {filename}")
+                
+                if self.storage_manager.upload_file(local_path, remote_path):
+                    uploaded += 1
+                    self.logger.info(f"✅ {filename} 업로드 성공")
+                else:
+                    self.logger.error(f"❌ {filename} 업로드 실패")
+                
+                # 진행률 업데이트
+                progress = 85 + int(((i+1) / len(file_pairs)) * 10)
+                self.update_progress(progress, f"📤 업로드 중: {filename}", context)
+            
+            self.logger.info(f"📊 업로드 완료: {uploaded}/{len(file_pairs)}개 파일")
+        
+        self.update_progress(95, "✅ 스토리지 업로드 완료", context)
+        
+        return context
+
+
+    def _upload_sftp_batch(self, file_pairs: List[Tuple[str, str]], context: PipelineContext) -> List[Dict]:
+        """SFTP 배치 업로드 (번들 모드면 작은 파일은 tar 스트림으로, 큰 파일만 병렬 업로드)"""
+        if self.bundle_upload:
+            bundle_pairs = [p for p in file_pairs if os.path.getsize(p[0]) <= BUNDLE_MAX_FILE_SIZE]
+            parallel_pairs = [p for p in file_pairs if os.path.getsize(p[0]) > BUNDLE_MAX_FILE_SIZE]
+        else:
+            bundle_pairs, parallel_pairs = [], file_pairs
+        
+        # 번들은 tar 스트림 하나씩이므로 일정 개수씩 나누어 사이에서 취소 확인
+        results = []
+        for start in range(0, len(bundle_pairs), BUNDLE_CANCEL_CHECK_SIZE):
+            context.cancel_token.raise_if_cancelled()
+            results.extend(self.storage_manager.upload_files_bundle(
+                bundle_pairs[start:start + BUNDLE_CANCEL_CHECK_SIZE]
+            ))
+        
+        # 병렬 업로드는 배치를 나누지 않고 파일별 진행률 콜백에서 취소 확인
+        # (취소되면 남은 파일은 시작 전에, 전송 중인 파일은 다음 블록에서 실패 처리됨)
+        def check_cancelled(*_):
+            context.cancel_token.raise_if_cancelled()
+        
+        if parallel_pairs:
+            context.cancel_token.raise_if_cancelled()
+            results.extend(self.storage_manager.upload_files_batch(
+                parallel_pairs, progress_callback=check_cancelled
+            ))
+            context.cancel_token.raise_if_cancelled()
+        return results
+    
+    def _upload_content_addressed(self, video, file_pairs: List[Tuple[str, str]],
+                                  remote_base_path: str, context: PipelineContext) -> List[Dict]:
+        """콘텐츠 주소 레이아웃 업로드 - 세션 파일별 결과 반환"""
+        plan = plan_session_upload(file_pairs)
+        self.logger.info(f"🧩 콘텐츠 주소 업로드: 파일 {len(file_pairs)}개 → 새 blob {len(plan.blobs)}개 "
+                         f"(중복/업로드됨 {plan.reused_bytes / (1024 * 1024):.1f}MB 생략)")
+        
+        # 1. 새 blob 업로드
+        blob_results = self._upload_sftp_batch(plan.blobs, context) if plan.blobs else []
+        plan.mark_uploaded(r["remote_path"] for r in blob_results if r["success"])
+        blob_errors = {r["remote_path"]: r["error"] or "업로드 실패" for r in blob_results if not r["success"]}
+        
+        # 2. 세션 경로 → blob 링크 (기존 URL 유지)
+        context.cancel_token.raise_if_cancelled()
+        links = [(remote_path, target) for remote_path, target, blob in plan.links if blob not in blob_errors]
+        link_results = {r["remote_path"]: r for r in self.storage_manager.create_links(links)}
+        
+        # 링크가 실패한 blob은 원격에 없을 수 있으므로 인덱스에서 지움 (다음 업로드에서 다시 올림)
+        plan.forget({blob for remote_path, _, blob in plan.links
+                     if remote_path in link_results and not link_results[remote_path]["success"]})
+        
+        results = []
+        for (local_path, remote_path), (_, _, blob) in zip(file_pairs, plan.links):
+            link = link_results.get(remote_path)
+            results.append({
+                "local_path": local_path,
+                "remote_path": remote_path,
+                "success": bool(link and link["success"]),
+                "error": blob_errors.get(blob) or (link["error"] if link else None)
+            })
+        
+        # 링크를 만들 수 없는 서버면 파일 그대로 업로드
+        fallback = [r for r in results if not r["success"] and r["remote_path"] in link_results]
+        if fallback:
+            self.logger.warning(f"⚠️ 링크 대신 파일로 업로드: {len(fallback)}개")
+            retried = self._upload_sftp_batch([(r["local_path"], r["remote_path"]) for r in fallback], context)
+            for result, retry in zip(fallback, retried):
+                result.update(success=retry["success"], error=retry["error"])
+        
+        # 3. 매니페스트 (자신도 blob + 링크로 올려 내용이 바뀌면 항상 교체됨)
+        uploaded_names = {os.path.basename(r["remote_path"]) for r in results if r["success"]}
+        manifest_path = write_manifest(video.session_dir, video.session_id,
+                                       {name: entry for name, entry in plan.files.items() if name in uploaded_names})
+        manifest_plan = plan_session_upload([(manifest_path, f"{remote_base_path}/{MANIFEST_NAME}")])
+        manifest_results = self.storage_manager.upload_files_batch(manifest_plan.blobs) if manifest_plan.blobs else []
+        if all(r["success"] for r in manifest_results):
+            manifest_plan.mark_uploaded(blob for _, blob in manifest_plan.blobs)
+            remote_path, target, blob = manifest_plan.links[0]
+            if not self.storage_manager.create_links([(remote_path, target)])[0]["success"]:
+                manifest_plan.forget([blob])
+                self.storage_manager.upload_file(manifest_path, remote_path)
+        else:
+            self.logger.error("❌ 매니페스트 업로드 실패")
+        
+        return results
+    
+    def _log_results(self, results: List[Dict], total: int):
+        """업로드 결과 요약"""
+        uploaded = sum(1 for r in results if r["success"])
+        failed = [r for r in results if not r["success"]]
+        
+        self.logger.info(f"📊 업로드 완료: {uploaded}/{total}개 파일")
+        
+        if failed:
+            self.logger.warning(f"⚠️ 실패한 파일 {len(failed)}개:")
+            for f in failed:
+                self.logger.error(f"  ❌ {f['local_path']}: {f['error']}")
+    
+    def _collect_media_files(self, video, remote_base_path: str) -> List[Tuple[str, str]]:
+        """비디오·썸네일·씬 이미지 업로드 목록 (로컬 경로, 원격 경로)"""
+        file_pairs = []
         
         # 1. 비디오 파일
         if video.local_path and os.path.exists(video.local_path):
@@ -78,6 +257,12 @@ class StorageUploadStage(PipelineStage):
                 remote_grouped_path = os.path.join(remote_base_path, grouped_file)
                 file_pairs.append((grouped_path, remote_grouped_path))
         
+        return file_pairs
+    
+    def _collect_analysis_file(self, video, remote_base_path: str) -> List[Tuple[str, str]]:
+        """분석 결과 JSON 업로드 목록 (분석 결과가 없으면 빈 목록)"""
+        file_pairs = []
+        
         # 5. 분석 결과
         if video.analysis_result:
             analysis_path = os.path.join(video.session_dir, "analysis_result.json")
@@ -92,50 +277,13 @@ class StorageUploadStage(PipelineStage):
             file_pairs.append((analysis_path, remote_analysis_path))
             self.logger.info(f"📄 분석 결과 파일 추가")
         
-        # 파일 개수 통계
-        self.logger.info(f"📊 업로드할 파일 총 {len(file_pairs)}개:")
-        self.logger.info(f"  - 비디오: {sum(1 for p in file_pairs if 'mp4' in p[0] or 'webm' in p[0])}개")
-        self.logger.info(f"  - 이미지: {sum(1 for p in file_pairs if '.jpg' in p[0])}개")
-        self.logger.info(f"  - JSON: {sum(1 for p in file_pairs if '.json' in p[0])}개")
-        
-        # 배치 업로드 실행
-        if self.storage_type == StorageType.SFTP and len(file_pairs) > 1:
-            # SFTP의 경우 배치 업로드 사용
-            self.logger.info(f"🚀 SFTP 배치 업로드 시작 (동시 {os.getenv('SFTP_MAX_CONCURRENT', '5')}개 연결)")
-            # 진행률 콜백 없이 실행 (현재 버그가 있음)
-            results = self.storage_manager.upload_files_batch(file_pairs)
-            
-            # 결과 분석
-            uploaded = sum(1 for r in results if r["success"])
-            failed = [r for r in results if not r["success"]]
-            
-            self.logger.info(f"📊 업로드 완료: {uploaded}/{len(file_pairs)}개 파일")
-            
-            if failed:
-                self.logger.warning(f"⚠️ 실패한 파일 {len(failed)}개:")
-                for f in failed:
-                    self.logger.error(f"  ❌ {f['local_path']}: {f['error']}")
-        else:
-            # 로컬 스토리지나 파일이 1개인 경우 순차 처리
-            self.logger.info(f"📤 순차 업로드 시작")
-            uploaded = 0
-            
-            for i, (local_path, remote_path) in enumerate(file_pairs):
-                filename = os.path.basename(local_path)
-                self.logger.info(f"📤 업로드 [{i+1}/{len(file_pairs)}]: {filename}")
-                
-                if self.storage_manager.upload_file(local_path, remote_path):
-                    uploaded += 1
-                    self.logger.info(f"✅ {filename} 업로드 성공")
-                else:
-                    self.logger.error(f"❌ {filename} 업로드 실패")
-                
-                # 진행률 업데이트
-                progress = 85 + int(((i+1) / len(file_pairs)) * 10)
-                self.update_progress(progress, f"📤 업로드 중: {filename}", context)
-            
-            self.logger.info(f"📊 업로드 완료: {uploaded}/{len(file_pairs)}개 파일")
-        
-        self.update_progress(95, "✅ 스토리지 업로드 완료", context)
-        
-        return context
+        return file_pairs
+
+
+class AnalysisUploadStage(StorageUploadStage):
+    """분석 결과 JSON 업로드 - AI 분석 완료 후 실행 (미디어 업로드는 StorageUploadStage가 병렬로 처리)"""
+    
+    upload_targets = ("analysis",)
+    
+    def __init__(self, storage_type: StorageType = None):
+        super().__init__(storage_type, name="analysis_upload")
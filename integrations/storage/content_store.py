@@ -0,0 +1,245 @@
+# integrations/storage/content_store.py
+"""
+콘텐츠 주소 기반 원격 저장 레이아웃 (STORAGE_LAYOUT=cas)
+
+파일을 내용 해시(sha256) 이름의 blob으로 한 번만 올리고, 세션 디렉토리에는 blob을 가리키는
+상대 심볼릭 링크와 매니페스트만 둡니다. 그룹 이미지(씬 이미지와 같은 내용)나 재분석으로 다시
+올리는 파일은 blob 업로드 없이 링크만 만들어집니다. 세션 경로의 파일명은 그대로이므로
+`{base_url}/{session_id}/scene_0000.jpg` 형태의 기존 URL은 바뀌지 않습니다.
+
+원격 구조:
+    video_analysis/_blobs/ab/ab12...ef.jpg       - 실제 파일 (내용 해시 이름)
+    video_analysis/<session_id>/scene_0000.jpg   - ../_blobs/ab/ab12...ef.jpg 링크
+    video_analysis/<session_id>/manifest.json    - 파일명 → 해시/크기/blob 경로
+
+로컬 업로드 인덱스(SQLite)는 대상 서버별로 이미 올린 blob과 파일 해시를 기억해
+재분석 시 해시 계산과 원격 확인을 건너뜁니다.
+"""
+
+import json
+import os
+import posixpath
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from config.settings import Settings
+from integrations.storage.resumable import file_sha256
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# "files": 세션 디렉토리에 파일 그대로 (기존), "cas": 해시 blob + 링크 + 매니페스트
+STORAGE_LAYOUT = os.getenv("STORAGE_LAYOUT", "files").lower()
+CONTENT_ADDRESSED = STORAGE_LAYOUT == "cas"
+
+# blob 저장 위치 (세션 디렉토리와 같은 video_analysis 아래)
+BLOB_ROOT = "video_analysis/_blobs"
+
+MANIFEST_NAME = "manifest.json"
+
+# 같은 세션의 매니페스트를 여러 스테이지(미디어/분석 결과 업로드)가 함께 갱신
+_manifest_lock = threading.Lock()
+
+
+def blob_path(digest: str, filename: str) -> str:
+    """내용 해시 → blob 원격 경로 (확장자 유지, 앞 두 글자로 디렉토리 분산)"""
+    extension = os.path.splitext(filename)[1].lower()
+    return f"{BLOB_ROOT}/{digest[:2]}/{digest}{extension}"
+
+
+def link_target(remote_path: str, blob: str) -> str:
+    """세션 파일 경로에서 blob을 가리키는 상대 경로"""
+    return posixpath.relpath(blob, posixpath.dirname(remote_path))
+
+
+def default_target() -> str:
+    """업로드 대상 식별자 (서버/계정/기본 경로가 바뀌면 인덱스를 따로 씀)"""
+    return (f"{os.getenv('SFTP_USER', '')}@{os.getenv('SFTP_HOST', '')}:{os.getenv('SFTP_PORT', '22')}"
+            f"{os.getenv('WEBDAV_ROOT', '/dav/videoRef').rstrip('/')}")
+
+
+class UploadIndex:
+    """이미 올린 blob과 로컬 파일 해시 캐시 (SQLite, 여러 스레드에서 공유)"""
+
+    def __init__(self, db_path: str = None):
+        if db_path is None:
+            db_path = os.path.join(Settings.paths.data_dir, "database", "upload_index.db")
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+
+        with self._lock, self._conn:
+            # 이전 형식(해시 기준, 확장자가 다른 blob을 구분하지 못함)은 캐시일 뿐이므로 버림
+            self._conn.execute("DROP TABLE IF EXISTS blobs")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS uploaded_blobs (
+                    target TEXT NOT NULL,
+                    remote_path TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    uploaded_at REAL NOT NULL,
+                    PRIMARY KEY (target, remote_path)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS file_digests (
+                    path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL
+                )
+            """)
+
+    def digest(self, local_path: str) -> str:
+        """파일 sha256 (크기/수정 시각이 같으면 저장된 값 사용)"""
+        path = os.path.abspath(local_path)
+        file_stat = os.stat(path)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT digest FROM file_digests WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, file_stat.st_size, file_stat.st_mtime_ns)
+            ).fetchone()
+        if row:
+            return row[0]
+
+        digest = file_sha256(path)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO file_digests (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (path, file_stat.st_size, file_stat.st_mtime_ns, digest)
+            )
+        return digest
+
+    def uploaded(self, target: str, blob_paths: Iterable[str]) -> Set[str]:
+        """이 대상에 이미 올린 blob 경로"""
+        blob_paths = list(set(blob_paths))
+        found: Set[str] = set()
+        with self._lock:
+            for start in range(0, len(blob_paths), 500):
+                batch = blob_paths[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                found.update(row[0] for row in self._conn.execute(
+                    f"SELECT remote_path FROM uploaded_blobs WHERE target = ? AND remote_path IN ({placeholders})",
+                    (target, *batch)
+                ))
+        return found
+
+    def mark_uploaded(self, target: str, entries: Iterable[Tuple[str, int, str]]):
+        """업로드한 blob 기록 - entries: (digest, size, remote_path)"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO uploaded_blobs (target, remote_path, digest, size, uploaded_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(target, remote_path, digest, size, now) for digest, size, remote_path in entries]
+            )
+
+    def forget(self, target: str, blob_paths: Iterable[str]):
+        """원격에 없을 수 있는 blob 기록 삭제 (다음 업로드에서 다시 올림)"""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM uploaded_blobs WHERE target = ? AND remote_path = ?",
+                [(target, blob) for blob in blob_paths]
+            )
+
+
+@dataclass
+class SessionUploadPlan:
+    """세션 파일 목록을 blob 업로드/링크/매니페스트로 나눈 결과"""
+    target: str
+    blobs: List[Tuple[str, str]] = field(default_factory=list)             # 올릴 (로컬 경로, blob 경로)
+    links: List[Tuple[str, str, str]] = field(default_factory=list)        # (세션 파일 경로, 링크 대상, blob 경로)
+    files: Dict[str, Dict[str, Any]] = field(default_factory=dict)         # 매니페스트 항목
+    blob_info: Dict[str, Tuple[str, int]] = field(default_factory=dict)    # blob 경로 → (해시, 크기)
+    reused_bytes: int = 0                                                   # 중복/이미 올려서 안 보내는 크기
+
+    def mark_uploaded(self, blob_paths: Iterable[str], index: Optional[UploadIndex] = None):
+        """업로드에 성공한 blob을 인덱스에 기록"""
+        entries = [(*self.blob_info[path], path) for path in blob_paths if path in self.blob_info]
+        if entries:
+            (index or get_upload_index()).mark_uploaded(self.target, entries)
+
+    def forget(self, blob_paths: Iterable[str], index: Optional[UploadIndex] = None):
+        """링크가 실패한 blob 기록 삭제 (원격에서 지워졌을 수 있으므로 다음에 다시 업로드)"""
+        paths = [path for path in blob_paths if path in self.blob_info]
+        if paths:
+            (index or get_upload_index()).forget(self.target, paths)
+
+
+def plan_session_upload(file_pairs: List[Tuple[str, str]], index: Optional[UploadIndex] = None,
+                        target: Optional[str] = None) -> SessionUploadPlan:
+    """
+    (로컬 경로, 세션 원격 경로) 목록 → 업로드 계획
+
+    같은 내용의 파일은 blob 하나로 합치고, 인덱스에 있는 blob은 다시 올리지 않습니다.
+    """
+    index = index or get_upload_index()
+    plan = SessionUploadPlan(target=target or default_target())
+
+    digests = {local_path: index.digest(local_path) for local_path, _ in file_pairs}
+    already = index.uploaded(plan.target, (blob_path(digests[local_path], local_path)
+                                           for local_path, _ in file_pairs))
+
+    for local_path, remote_path in file_pairs:
+        digest = digests[local_path]
+        size = os.path.getsize(local_path)
+        blob = blob_path(digest, local_path)
+
+        if blob in plan.blob_info or blob in already:
+            plan.reused_bytes += size
+        else:
+            plan.blobs.append((local_path, blob))
+        plan.blob_info[blob] = (digest, size)
+
+        plan.links.append((remote_path, link_target(remote_path, blob), blob))
+        plan.files[posixpath.basename(remote_path)] = {"sha256": digest, "size": size, "blob": blob}
+
+    return plan
+
+
+def write_manifest(session_dir: str, session_id: str, files: Dict[str, Dict[str, Any]]) -> str:
+    """
+    세션 매니페스트 갱신 (기존 항목과 합침)
+
+    Returns:
+        로컬 매니페스트 파일 경로
+    """
+    manifest_path = os.path.join(session_dir, MANIFEST_NAME)
+    with _manifest_lock:
+        manifest = {"session_id": session_id, "files": {}}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest["files"].update(json.load(f).get("files", {}))
+        except (OSError, ValueError):
+            pass
+        manifest["files"].update(files)
+        manifest["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+        os.makedirs(session_dir, exist_ok=True)
+        temp_path = f"{manifest_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, manifest_path)
+    return manifest_path
+
+
+# 싱글톤 인스턴스
+_upload_index: Optional[UploadIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_upload_index() -> UploadIndex:
+    """업로드 인덱스 싱글톤 인스턴스 반환"""
+    global _upload_index
+    if _upload_index is None:
+        with _index_lock:
+            if _upload_index is None:
+                _upload_index = UploadIndex(os.getenv("UPLOAD_INDEX_PATH") or None)
+    return _upload_index
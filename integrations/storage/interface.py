@@ -300,4 +300,55 @@ class StorageManager:
                 "remote_path": remote,
                 "success": False,
                 "error": str(e)
-            } for local, remote in file_pairs]
\ No newline at end of file
+            } for local, remote in file_pairs]
+    
+    def upload_files_bundle(self, file_pairs: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        작은 파일 여러 개를 묶어서 업로드 (SFTP는 tar 스트림 하나로 전송)
+        
+        Args:
+            file_pairs: [(local_path, remote_path), ...] 형태의 리스트
+            
+        Returns:
+            각 파일의 업로드 결과 리스트 (번들을 지원하지 않는 스토리지는 배치 업로드 결과)
+        """
+        if self.storage_type != StorageType.SFTP:
+            return self.upload_files_batch(file_pairs)
+        
+        try:
+            self.logger.info(f"📦 SFTP 번들 업로드 시작: {len(file_pairs)}개 파일")
+            from .sftp_batch_wrapper import SFTPBatchUploader
+            return SFTPBatchUploader().upload_bundle(file_pairs)
+        except Exception as e:
+            self.logger.error(f"번들 업로드 실패: {str(e)}")
+            import traceback
+            self.logger.debug(traceback.format_exc())
+            return [{
+                "local_path": local,
+                "remote_path": remote,
+                "success": False,
+                "error": str(e)
+            } for local, remote in file_pairs]
+    
+    def create_links(self, links: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """
+        원격 심볼릭 링크 생성 (SFTP 전용, 콘텐츠 주소 레이아웃에서 사용)
+        
+        Args:
+            links: [(remote_path, target), ...] 형태의 리스트
+            
+        Returns:
+            각 링크의 결과 리스트
+        """
+        if self.storage_type != StorageType.SFTP:
+            self.logger.error(f"링크 생성 미지원 스토리지 타입: {self.storage_type.value}")
+            return [{"remote_path": remote, "target": target, "success": False, "error": "미지원"}
+                    for remote, target in links]
+        
+        try:
+            from .sftp_batch_wrapper import SFTPBatchUploader
+            return SFTPBatchUploader().create_links(links)
+        except Exception as e:
+            self.logger.error(f"링크 생성 실패: {str(e)}")
+            return [{"remote_path": remote, "target": target, "success": False, "error": str(e)}
+                    for remote, target in links]
@@ -0,0 +1,213 @@
+# integrations/storage/resumable.py
+"""
+큰 파일 분할 업로드 지원 - 청크 체크포인트와 체크섬
+
+큰 파일(영상)은 일정 크기의 청크로 나누어 여러 오프셋에 동시에 쓰고, 서버가 확인한
+청크 번호를 로컬 체크포인트 파일에 기록합니다. 업로드가 중간에 실패하면 원격 임시 파일을
+남겨 두고, 재시도(같은 프로세스의 재시도 루프든 다음 실행이든)는 남은 청크만 보냅니다.
+"""
+
+import hashlib
+import json
+import os
+import shlex
+import time
+from typing import Iterator, List, Optional, Set, Tuple
+
+from config.settings import Settings
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 이 크기 이상인 파일만 분할 업로드
+SFTP_RESUMABLE_MIN_SIZE = int(os.getenv("SFTP_RESUMABLE_MIN_SIZE", str(32 * 1024 * 1024)))
+
+# 청크 크기 (체크포인트 단위)
+SFTP_RESUME_CHUNK_SIZE = int(os.getenv("SFTP_RESUME_CHUNK_SIZE", str(4 * 1024 * 1024)))
+
+# 동시에 보내는 청크 수
+SFTP_PARALLEL_WRITES = int(os.getenv("SFTP_PARALLEL_WRITES", "8"))
+
+# 업로드 후 원격 sha256sum으로 내용 검증 (서버에서 명령 실행 필요)
+SFTP_VERIFY_CHECKSUM = os.getenv("SFTP_VERIFY_CHECKSUM", "false").lower() == "true"
+
+# 체크포인트 저장 최소 간격 (초) - 청크마다 디스크에 쓰지 않도록
+CHECKPOINT_SAVE_INTERVAL = 1.0
+
+# 이 시간 동안 갱신되지 않은 체크포인트는 만료 (로컬 기록과 원격 임시 파일 정리)
+CHECKPOINT_MAX_AGE = float(os.getenv("SFTP_CHECKPOINT_MAX_AGE", str(7 * 24 * 3600)))
+
+# 만료 체크포인트 확인 주기 (초) - 배치마다 디렉토리를 훑지 않도록
+CHECKPOINT_PURGE_INTERVAL = 3600.0
+
+CHECKPOINT_DIR = os.path.join(Settings.paths.data_dir, "upload_checkpoints")
+
+_last_purge = 0.0
+
+
+class UploadCheckpoint:
+    """
+    파일 하나의 분할 업로드 진행 상황
+
+    로컬 파일 크기와 내용 지문(첫/마지막 청크 해시), 원격 경로, 청크 크기가 같을 때만
+    이전 기록을 이어서 씁니다. 수정 시각은 복사/재다운로드로 바뀌어도 내용이 같을 수 있어
+    사용하지 않습니다.
+    """
+
+    def __init__(self, local_path: str, remote_path: str, chunk_size: int = SFTP_RESUME_CHUNK_SIZE):
+        file_stat = os.stat(local_path)
+        self.local_path = local_path
+        self.remote_path = remote_path
+        self.chunk_size = chunk_size
+        self.file_size = file_stat.st_size
+        self.total_chunks = max(1, -(-self.file_size // chunk_size))
+        self.done: Set[int] = set()
+
+        fingerprint = content_fingerprint(local_path, self.file_size, chunk_size)
+        key = f"{os.path.abspath(local_path)}|{remote_path}|{self.file_size}|{fingerprint}|{chunk_size}"
+        self.path = os.path.join(CHECKPOINT_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+        self._last_saved = 0.0
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.done = {i for i in data.get("done", []) if 0 <= i < self.total_chunks}
+        except (OSError, ValueError):
+            self.done = set()
+
+    @property
+    def resuming(self) -> bool:
+        return bool(self.done)
+
+    @property
+    def acknowledged_end(self) -> int:
+        """확인된 청크가 차지하는 원격 파일의 최소 크기"""
+        if not self.done:
+            return 0
+        return min((max(self.done) + 1) * self.chunk_size, self.file_size)
+
+    def chunk_range(self, index: int) -> Tuple[int, int]:
+        """청크 번호 → (오프셋, 길이)"""
+        offset = index * self.chunk_size
+        return offset, min(self.chunk_size, self.file_size - offset)
+
+    def pending(self) -> List[int]:
+        return [i for i in range(self.total_chunks) if i not in self.done]
+
+    def read_chunk(self, index: int) -> bytes:
+        offset, length = self.chunk_range(index)
+        with open(self.local_path, "rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def mark(self, *indices: int):
+        """서버가 확인한 청크 기록 (일정 간격으로 저장)"""
+        self.done.update(indices)
+        if time.monotonic() - self._last_saved >= CHECKPOINT_SAVE_INTERVAL:
+            self.save()
+
+    def reset(self):
+        """원격 임시 파일이 없거나 맞지 않으면 처음부터"""
+        self.done = set()
+        self.clear()
+
+    def save(self):
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"local_path": self.local_path, "remote_path": self.remote_path,
+                       "file_size": self.file_size, "chunk_size": self.chunk_size,
+                       "done": sorted(self.done)}, f)
+        os.replace(temp_path, self.path)
+        self._last_saved = time.monotonic()
+
+    def clear(self):
+        """업로드 완료 후 체크포인트 삭제"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def content_fingerprint(path: str, file_size: int, chunk_size: int = SFTP_RESUME_CHUNK_SIZE) -> str:
+    """첫 청크와 마지막 청크의 sha1 (파일 전체를 읽지 않는 내용 지문)"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        digest.update(f.read(chunk_size))
+        if file_size > chunk_size:
+            f.seek(max(chunk_size, file_size - chunk_size))
+            digest.update(f.read(chunk_size))
+    return digest.hexdigest()
+
+
+def purge_expired_checkpoints(max_age: float = CHECKPOINT_MAX_AGE, force: bool = False) -> List[str]:
+    """
+    오래된 체크포인트 삭제 (CHECKPOINT_PURGE_INTERVAL마다 한 번, force면 바로)
+
+    Returns:
+        정리할 원격 임시 파일 경로 (아직 유효한 체크포인트가 가리키는 경로는 제외)
+    """
+    global _last_purge
+    now = time.time()
+    if not force and now - _last_purge < CHECKPOINT_PURGE_INTERVAL:
+        return []
+    _last_purge = now
+
+    try:
+        names = [name for name in os.listdir(CHECKPOINT_DIR) if name.endswith(".json")]
+    except OSError:
+        return []
+
+    expired, active = set(), set()
+    for name in names:
+        path = os.path.join(CHECKPOINT_DIR, name)
+        try:
+            age = now - os.path.getmtime(path)
+            with open(path, "r", encoding="utf-8") as f:
+                remote_path = json.load(f).get("remote_path")
+        except (OSError, ValueError):
+            remote_path, age = None, max_age + 1
+        if age <= max_age:
+            if remote_path:
+                active.add(remote_path)
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        if remote_path:
+            expired.add(remote_path)
+
+    if expired:
+        logger.info(f"만료된 업로드 체크포인트 {len(expired)}개 정리")
+    return sorted(expired - active)
+
+
+def iter_windows(indices: List[int], size: int = SFTP_PARALLEL_WRITES) -> Iterator[List[int]]:
+    """청크 번호를 동시 전송 단위로 나눔"""
+    for start in range(0, len(indices), size):
+        yield indices[start:start + size]
+
+
+def file_sha256(path: str) -> str:
+    """로컬 파일 sha256 (hex)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def sha256sum_command(shell_path: str) -> str:
+    """원격 셸에서 실행할 sha256sum 명령"""
+    return f"sha256sum {shlex.quote(shell_path)}"
+
+
+def parse_sha256sum(output: str) -> Optional[str]:
+    """sha256sum 출력 → hex (형식이 다르면 None)"""
+    parts = output.strip().split()
+    if parts and len(parts[0]) == 64:
+        return parts[0].lower()
+    return None
@@ -4,8 +4,13 @@ import paramiko
 import os
 import time
 import stat  # stat 모듈을 직접 import
-from typing import Optional
+from typing import Dict, Optional
 from config.settings import Settings
+from integrations.storage.resumable import (
+    SFTP_RESUMABLE_MIN_SIZE, SFTP_VERIFY_CHECKSUM, UploadCheckpoint,
+    file_sha256, iter_windows, parse_sha256sum, purge_expired_checkpoints, sha256sum_command
+)
+from integrations.storage.sftp_pool import get_sftp_pool
 from utils.logger import get_logger
 
 class SFTPStorage:
@@ -24,9 +29,15 @@ class SFTPStorage:
         # WebDAV와 동일한 기본 경로 사용
         self.base_path = os.getenv("WEBDAV_ROOT", "/dav/videoRef").rstrip('/')
         
+        # 원격 명령(체크섬 검증) 실행 시 SFTP 경로 앞에 붙일 셸 경로
+        self.exec_root = os.getenv("SFTP_EXEC_ROOT", "").rstrip('/')
+        
         # 설정 검증
         self._validate_config()
         
+        # 파이프라인 실행 사이에 공유하는 연결 풀
+        self.pool = get_sftp_pool(self.host, self.port, self.username, self.password)
+        
     def _validate_config(self):
         """SFTP 설정 검증"""
         missing_configs = []
@@ -51,115 +62,105 @@ class SFTPStorage:
         self.logger.info(f"  - Base Path: {self.base_path}")
         
     def upload_file(self, local_path: str, remote_path: str) -> bool:
-        """SFTP로 파일 업로드 - storage_manager와 호환되는 버전"""
-        transport = None
-        sftp = None
-        
+        """SFTP로 파일 업로드 - storage_manager와 호환되는 버전 (풀의 연결 재사용)"""
         # 재시도 설정
         max_retries = int(os.getenv("SFTP_MAX_RETRIES", "3"))
         retry_delay = int(os.getenv("SFTP_RETRY_DELAY", "2"))
+        skip_existing = os.getenv("SFTP_SKIP_EXISTING", "true").lower() == "true"
+        
+        # remote_path가 전체 경로인 경우 처리
+        if remote_path.startswith('video_analysis/'):
+            # base_path와 결합
+            full_remote_path = f"{self.base_path}/{remote_path}"
+        else:
+            full_remote_path = remote_path
+        
+        # 경로 정규화 (중요!)
+        full_remote_path = full_remote_path.replace('\\', '/')
+        full_remote_path = full_remote_path.replace('//', '/')
+        
+        # 디렉토리와 파일명 분리
+        remote_dir = os.path.dirname(full_remote_path)
+        filename = os.path.basename(full_remote_path)
+        
+        # 파일명이 없는 경우 오류
+        if not filename or '.' not in filename:
+            self.logger.error(f"잘못된 파일 경로: {full_remote_path}")
+            return False
+        
+        temp_remote_path = f"{full_remote_path}.tmp"
         
         for attempt in range(max_retries):
             try:
-                # SSH 연결
-                self.logger.info(f"🔌 SFTP 연결 중: {self.host}:{self.port} (시도 {attempt + 1}/{max_retries})")
-                transport = paramiko.Transport((self.host, self.port))
-                transport.connect(username=self.username, password=self.password)
-                
-                # SFTP 클라이언트 생성
-                sftp = paramiko.SFTPClient.from_transport(transport)
-                
-                # remote_path가 전체 경로인 경우 처리
-                if remote_path.startswith('video_analysis/'):
-                    # base_path와 결합
-                    full_remote_path = f"{self.base_path}/{remote_path}"
-                else:
-                    full_remote_path = remote_path
-                
-                # 경로 정규화 (중요!)
-                full_remote_path = full_remote_path.replace('\\', '/')
-                full_remote_path = full_remote_path.replace('//', '/')
-                
-                # 디렉토리와 파일명 분리
-                remote_dir = os.path.dirname(full_remote_path)
-                filename = os.path.basename(full_remote_path)
-                
-                # 파일명이 없는 경우 오류
-                if not filename or '.' not in filename:
-                    raise ValueError(f"잘못된 파일 경로: {full_remote_path}")
-                
-                # 디렉토리 생성 (재귀적)
-                self._mkdir_p(sftp, remote_dir)
-                
-                # 파일이 이미 존재하는지 확인
-                try:
-                    sftp.stat(full_remote_path)
-                    self.logger.info(f"파일이 이미 존재함: {full_remote_path}")
-                    return True  # storage_manager와 호환을 위해 bool 반환
-                except IOError:
-                    # 파일이 없으면 계속 진행
-                    pass
-                
-                # 임시 파일명으로 먼저 업로드
-                temp_remote_path = f"{full_remote_path}.tmp"
-                
-                # 파일 업로드
-                self.logger.info(f"📤 업로드 시작: {local_path} -> {full_remote_path}")
-                sftp.put(local_path, temp_remote_path)
-                
-                # 업로드 검증
-                local_size = os.path.getsize(local_path)
-                remote_size = sftp.stat(temp_remote_path).st_size
-                
-                if local_size != remote_size:
-                    raise Exception(f"파일 크기 불일치: 로컬 {local_size} != 원격 {remote_size}")
-                
-                # 임시 파일을 최종 파일로 이동
-                try:
-                    # 기존 파일이 있다면 삭제
-                    sftp.remove(full_remote_path)
-                except:
-                    pass
-                
-                sftp.rename(temp_remote_path, full_remote_path)
+                # 풀에서 세션 대여 (연결이 없을 때만 SSH 핸드셰이크)
+                with self.pool.session() as sftp:
+                    checkpoint = None
+                    try:
+                        # 만료된 분할 업로드의 원격 임시 파일 정리 (주기마다 한 번)
+                        self._remove_stale_temp_files(sftp)
+                        
+                        # 디렉토리 생성 (캐시에 있으면 왕복 없음)
+                        self._mkdir_p(sftp, remote_dir)
+                        
+                        # 같은 크기의 파일이 이미 있으면 건너뜀 (디렉토리 목록을 한 번만 읽음)
+                        local_size = os.path.getsize(local_path)
+                        if skip_existing and self._remote_sizes(sftp, remote_dir).get(filename) == local_size:
+                            self.logger.info(f"파일이 이미 존재함 (동일한 크기): {full_remote_path}")
+                            return True  # storage_manager와 호환을 위해 bool 반환
+                        
+                        self.logger.info(f"📤 업로드 시작: {local_path} -> {full_remote_path}")
+                        if local_size >= SFTP_RESUMABLE_MIN_SIZE:
+                            # 큰 파일은 청크 단위로 나누어 보내고, 실패하면 확인된 청크부터 이어서
+                            checkpoint = UploadCheckpoint(local_path, temp_remote_path)
+                            self._put_resumable(sftp, checkpoint)
+                            if SFTP_VERIFY_CHECKSUM:
+                                self._verify_checksum(sftp, checkpoint)
+                        else:
+                            # 임시 파일명으로 먼저 업로드 (confirm: put이 끝에 stat으로 크기 검증)
+                            sftp.put(local_path, temp_remote_path, confirm=True)
+                        
+                        # 임시 파일을 최종 파일로 교체
+                        self._replace(sftp, temp_remote_path, full_remote_path)
+                        self.pool.dir_cache.record_file(full_remote_path, local_size)
+                        if checkpoint:
+                            checkpoint.clear()
+                    except Exception:
+                        # 임시 파일 정리 (연결이 살아 있으면, 이어서 보낼 청크가 없을 때만)
+                        if checkpoint is None or not checkpoint.resuming:
+                            try:
+                                sftp.remove(temp_remote_path)
+                            except Exception:
+                                pass
+                        raise
                 
                 self.logger.info(f"✅ SFTP 업로드 완료: {full_remote_path}")
                 return True  # 성공
                 
             except Exception as e:
-                self.logger.error(f"❌ SFTP 업로드 실패 (시도 {attempt + 1}): {e}")
+                self.logger.error(f"❌ SFTP 업로드 실패 (시도 {attempt + 1}/{max_retries}): {e}")
+                # 디렉토리가 외부에서 지워졌을 수 있으므로 다음 시도는 다시 확인
+                self.pool.dir_cache.forget(remote_dir)
                 
-                # 임시 파일 정리
-                if sftp:
-                    try:
-                        temp_path = f"{full_remote_path}.tmp"
-                        sftp.remove(temp_path)
-                    except:
-                        pass
-                
-                # 마지막 시도가 아니면 재시도
+                # 마지막 시도가 아니면 재시도 (끊어진 연결은 풀이 버리고 새로 연결)
                 if attempt < max_retries - 1:
                     time.sleep(retry_delay)
-                    # 연결 정리
-                    if sftp:
-                        sftp.close()
-                    if transport:
-                        transport.close()
-                    continue
-                else:
-                    return False  # 실패
-                    
-            finally:
-                # 성공한 경우에만 연결 종료
-                if attempt == max_retries - 1 or 'full_remote_path' in locals():
-                    if sftp:
-                        sftp.close()
-                    if transport:
-                        transport.close()
         
         # 모든 재시도 실패
         return False
     
+    def _remove_stale_temp_files(self, sftp):
+        """만료된 분할 업로드 체크포인트가 남긴 원격 임시 파일 삭제"""
+        stale = purge_expired_checkpoints()
+        removed = 0
+        for path in stale:
+            try:
+                sftp.remove(path)
+                removed += 1
+            except IOError:
+                pass
+        if stale:
+            self.logger.info(f"🧹 만료된 원격 임시 파일 정리: {removed}/{len(stale)}개")
+    
     def _mkdir_p(self, sftp, remote_directory):
         """원격 디렉토리 재귀적 생성 - 수정된 버전"""
         if remote_directory == '/' or remote_directory == '':
@@ -169,12 +170,17 @@ class SFTPStorage:
         remote_directory = remote_directory.replace('\\', '/')
         remote_directory = remote_directory.rstrip('/')
         
+        # 이 풀에서 이미 확인/생성한 디렉토리
+        if self.pool.dir_cache.known(remote_directory):
+            return
+        
         # 이미 존재하는지 확인
         try:
             file_attr = sftp.stat(remote_directory)
             # stat 모듈을 직접 사용
             if not stat.S_ISDIR(file_attr.st_mode):
                 raise Exception(f"경로가 파일입니다: {remote_directory}")
+            self.pool.dir_cache.add(remote_directory)
             return
         except IOError:
             # 디렉토리가 없으면 생성 필요
@@ -189,35 +195,115 @@ class SFTPStorage:
         try:
             sftp.mkdir(remote_directory)
             self.logger.info(f"📁 디렉토리 생성: {remote_directory}")
+            # 새로 만든 디렉토리는 비어 있으므로 목록을 읽을 필요 없음
+            self.pool.dir_cache.set_listing(remote_directory, {})
         except IOError as e:
             # 이미 존재하는 경우 무시
             if "File exists" not in str(e) and "Failure" not in str(e):
                 raise
+        self.pool.dir_cache.add(remote_directory)
+    
+    def _remote_sizes(self, sftp, remote_directory) -> Dict[str, int]:
+        """디렉토리의 파일 크기 목록 (캐시가 없거나 오래되었으면 readdir 한 번)"""
+        sizes = self.pool.dir_cache.listing(remote_directory)
+        if sizes is None:
+            sizes = {attr.filename: attr.st_size for attr in sftp.listdir_attr(remote_directory)}
+            self.pool.dir_cache.set_listing(remote_directory, sizes)
+        return sizes
+    
+    def _put_resumable(self, sftp, checkpoint: UploadCheckpoint):
+        """
+        청크 단위 업로드 (체크포인트에 있는 청크는 건너뜀)
+        
+        청크 여러 개를 파이프라인으로 각자의 오프셋에 쓰고, 파일을 닫아 서버 응답을
+        모두 확인한 뒤에 체크포인트에 기록합니다.
+        """
+        temp_path = checkpoint.remote_path
+        if checkpoint.resuming:
+            try:
+                if sftp.stat(temp_path).st_size < checkpoint.acknowledged_end:
+                    checkpoint.reset()
+            except IOError:
+                checkpoint.reset()
+        
+        pending = checkpoint.pending()
+        if checkpoint.resuming:
+            self.logger.info(f"⏩ 이어서 업로드: {checkpoint.total_chunks - len(pending)}/"
+                             f"{checkpoint.total_chunks}개 청크 완료됨")
+        
+        try:
+            for window in iter_windows(pending):
+                with sftp.open(temp_path, "r+" if checkpoint.resuming else "w") as f:
+                    f.set_pipelined(True)
+                    for index in window:
+                        offset, _ = checkpoint.chunk_range(index)
+                        f.seek(offset)
+                        f.write(checkpoint.read_chunk(index))
+                checkpoint.mark(*window)
+        finally:
+            checkpoint.save()
+        
+        remote_size = sftp.stat(temp_path).st_size
+        if remote_size != checkpoint.file_size:
+            checkpoint.reset()
+            raise Exception(f"파일 크기 불일치: 로컬 {checkpoint.file_size} != 원격 {remote_size}")
+    
+    def _verify_checksum(self, sftp, checkpoint: UploadCheckpoint):
+        """원격 sha256sum으로 업로드한 임시 파일 내용 검증 (명령을 실행할 수 없으면 건너뜀)"""
+        remote_digest = None
+        try:
+            channel = sftp.get_channel().get_transport().open_session()
+            try:
+                channel.exec_command(sha256sum_command(f"{self.exec_root}{checkpoint.remote_path}"))
+                channel.shutdown_write()  # 표준 입력 없음
+                output = channel.makefile("rb", -1).read().decode("utf-8", "replace")
+                if channel.recv_exit_status() == 0:
+                    remote_digest = parse_sha256sum(output)
+            finally:
+                channel.close()
+        except (paramiko.SSHException, OSError) as e:
+            self.logger.debug(f"원격 체크섬 명령 실패: {e}")
+        
+        if remote_digest is None:
+            self.logger.warning(f"⚠️ 원격 체크섬을 확인할 수 없어 크기만 검증: {checkpoint.remote_path}")
+            return
+        if remote_digest != file_sha256(checkpoint.local_path):
+            # 어느 청크가 잘못됐는지 알 수 없으므로 처음부터 다시
+            checkpoint.reset()
+            raise Exception(f"체크섬 불일치: {checkpoint.remote_path}")
+        self.logger.info(f"🔒 체크섬 확인: {checkpoint.remote_path}")
+    
+    def _replace(self, sftp, temp_path, remote_path):
+        """임시 파일을 최종 경로로 교체 (posix-rename 한 번, 지원하지 않는 서버는 삭제 후 이름 변경)"""
+        try:
+            sftp.posix_rename(temp_path, remote_path)
+            return
+        except IOError:
+            pass
+        try:
+            # 기존 파일이 있다면 삭제
+            sftp.remove(remote_path)
+        except IOError:
+            pass
+        sftp.rename(temp_path, remote_path)
     
     def test_connection(self) -> bool:
         """SFTP 연결 테스트"""
-        transport = None
-        sftp = None
-        
         try:
             self.logger.info(f"🔌 SFTP 연결 테스트: {self.host}:{self.port}")
             
             # 연결 디버깅을 위한 추가 로깅
             self.logger.debug(f"연결 정보 - Host: {self.host}, Port: {self.port}, User: {self.username}")
             
-            transport = paramiko.Transport((self.host, self.port))
-            transport.connect(username=self.username, password=self.password)
-            
-            sftp = paramiko.SFTPClient.from_transport(transport)
-            
-            # base_path 존재 확인
-            try:
-                sftp.stat(self.base_path)
-                self.logger.info(f"✅ 기본 경로 확인: {self.base_path}")
-            except IOError:
-                self.logger.warning(f"⚠️ 기본 경로가 존재하지 않습니다: {self.base_path}")
-                # 기본 경로 생성 시도
-                self._mkdir_p(sftp, self.base_path)
+            with self.pool.session() as sftp:
+                # base_path 존재 확인
+                try:
+                    sftp.stat(self.base_path)
+                    self.logger.info(f"✅ 기본 경로 확인: {self.base_path}")
+                except IOError:
+                    self.logger.warning(f"⚠️ 기본 경로가 존재하지 않습니다: {self.base_path}")
+                    # 기본 경로 생성 시도
+                    self._mkdir_p(sftp, self.base_path)
             
             self.logger.info("✅ SFTP 연결 테스트 성공")
             return True
@@ -235,9 +321,3 @@ class SFTPStorage:
             import traceback
             self.logger.debug(traceback.format_exc())
             return False
-            
-        finally:
-            if sftp:
-                sftp.close()
-            if transport:
-                transport.close()
\ No newline at end of file
@@ -2,14 +2,30 @@
 """비동기 SFTP 클라이언트 - asyncssh 사용"""
 import asyncio
 import asyncssh
+import io
 import os
+import posixpath
+import shlex
+import tarfile
 import time
-from pathlib import Path
-from typing import List, Tuple, Optional, Dict
+import uuid
+from itertools import groupby
+from typing import Iterable, List, Tuple, Optional, Dict
 from datetime import datetime
 from config.settings import Settings
+from integrations.storage.resumable import (
+    SFTP_PARALLEL_WRITES, SFTP_RESUMABLE_MIN_SIZE, SFTP_VERIFY_CHECKSUM, UploadCheckpoint,
+    file_sha256, parse_sha256sum, purge_expired_checkpoints, sha256sum_command
+)
+from integrations.storage.sftp_pool import (
+    get_async_sftp_pool, is_connection_error, run_on_pool_loop, run_sync
+)
+from utils.cancellation import TaskCancelledError
 from utils.logger import get_logger
 
+# 스트림 전송 후 원격 명령 종료를 기다리는 최대 시간 (초)
+SFTP_EXEC_EXIT_TIMEOUT = 300
+
 
 class AsyncSFTPStorage:
     """비동기 SFTP 스토리지 클라이언트"""
@@ -31,9 +47,23 @@ class AsyncSFTPStorage:
         self.max_concurrent = int(os.getenv("SFTP_MAX_CONCURRENT", "5"))
         self.chunk_size = int(os.getenv("SFTP_CHUNK_SIZE", "32768"))  # 32KB
         
+        # 분할 업로드 파일 재시도 (확인된 청크 이후부터 이어서 보냄)
+        self.max_retries = max(1, int(os.getenv("SFTP_MAX_RETRIES", "3")))
+        self.retry_delay = float(os.getenv("SFTP_RETRY_DELAY", "2"))
+        
+        # 같은 크기의 원격 파일이 있으면 건너뜀 (디렉토리 목록을 한 번만 읽어 비교)
+        self.skip_existing = os.getenv("SFTP_SKIP_EXISTING", "true").lower() == "true"
+        
+        # 원격 명령(번들 업로드, 체크섬 검증) 실행 시 SFTP 경로 앞에 붙일 셸 경로
+        # (예: 시놀로지는 SFTP "/" 가 셸 "/volume1")
+        self.exec_root = os.getenv("SFTP_EXEC_ROOT", "").rstrip('/')
+        
         # 설정 검증
         self._validate_config()
         
+        # 파이프라인 실행 사이에 공유하는 연결 풀
+        self.pool = get_async_sftp_pool(self.host, self.port, self.username, self.password)
+        
     def _validate_config(self):
         """SFTP 설정 검증"""
         missing_configs = []
@@ -58,31 +88,107 @@ class AsyncSFTPStorage:
         self.logger.info(f"  - Base Path: {self.base_path}")
         self.logger.info(f"  - 최대 동시 연결: {self.max_concurrent}")
     
-    async def _create_remote_directory(self, sftp: asyncssh.SFTPClient, remote_path: str):
-        """원격 디렉토리 생성 (재귀적)"""
-        path_parts = Path(remote_path).parts
-        current_path = ""
+    def _full_remote_path(self, remote_path: str) -> str:
+        """원격 경로 → base_path를 포함한 정규화된 전체 경로"""
+        if remote_path.startswith('video_analysis/'):
+            full_remote_path = f"{self.base_path}/{remote_path}"
+        else:
+            full_remote_path = remote_path
+        
+        # 경로 정규화
+        full_remote_path = full_remote_path.replace('\\', '/')
+        return full_remote_path.replace('//', '/')
+    
+    async def _ensure_remote_directories(self, sftp: asyncssh.SFTPClient, directories: Iterable[str]):
+        """
+        원격 디렉토리 생성 (여러 개를 한 번에)
+        
+        캐시에 없는 경로만 stat을 한꺼번에 보내(파이프라인) 확인하고,
+        없는 디렉토리는 깊이별로 mkdir을 한꺼번에 보냅니다.
+        """
+        dir_cache = self.pool.dir_cache
+        missing = dir_cache.missing(directories)
+        if not missing:
+            return
         
-        for part in path_parts:
-            if not part or part == '/':
+        stats = await asyncio.gather(*(sftp.stat(path) for path in missing), return_exceptions=True)
+        to_create = []
+        for path, attrs in zip(missing, stats):
+            if isinstance(attrs, asyncssh.SFTPNoSuchFile):
+                to_create.append(path)
+            elif isinstance(attrs, BaseException):
+                raise attrs
+            else:
+                dir_cache.add(path)
+        
+        for _, group in groupby(to_create, key=lambda path: path.count("/")):
+            group = list(group)
+            created = await asyncio.gather(*(sftp.mkdir(path) for path in group), return_exceptions=True)
+            for path, error in zip(group, created):
+                if error is None:
+                    self.logger.debug(f"📁 디렉토리 생성: {path}")
+                    # 새로 만든 디렉토리는 비어 있으므로 목록을 읽을 필요 없음
+                    dir_cache.set_listing(path, {})
+                elif not isinstance(error, asyncssh.SFTPFailure):
+                    # 이미 존재하는 경우(SFTPFailure)는 무시
+                    raise error
+            dir_cache.add(*group)
+    
+    async def _load_remote_listings(self, sftp: asyncssh.SFTPClient, directories: Iterable[str]):
+        """디렉토리별 파일 크기 목록을 한꺼번에 읽어 캐시 (이미 있는 목록은 건너뜀)"""
+        dir_cache = self.pool.dir_cache
+        stale = [d for d in set(directories) if dir_cache.listing(d) is None]
+        if not stale:
+            return
+        
+        listings = await asyncio.gather(*(sftp.readdir(d) for d in stale), return_exceptions=True)
+        for directory, entries in zip(stale, listings):
+            if isinstance(entries, BaseException):
+                # 파일별로 다시 확인하도록 남겨 둠
+                self.logger.debug(f"디렉토리 목록 읽기 실패 ({directory}): {entries}")
                 continue
-                
-            current_path = f"{current_path}/{part}" if current_path else f"/{part}"
-            
+            dir_cache.set_listing(directory, {
+                entry.filename: entry.attrs.size for entry in entries if entry.attrs.size is not None
+            })
+    
+    async def _remote_sizes(self, sftp: asyncssh.SFTPClient, remote_dir: str) -> Dict[str, int]:
+        """디렉토리의 파일 크기 목록 (캐시가 없거나 오래되었으면 readdir 한 번)"""
+        sizes = self.pool.dir_cache.listing(remote_dir)
+        if sizes is None:
+            await self._load_remote_listings(sftp, [remote_dir])
+            sizes = self.pool.dir_cache.listing(remote_dir) or {}
+        return sizes
+    
+    async def _posix_rename(self, sftp: asyncssh.SFTPClient, temp_path: str, remote_path: str):
+        """임시 파일을 최종 경로로 교체 (posix-rename 한 번, 지원하지 않는 서버는 삭제 후 이름 변경)"""
+        try:
+            await sftp.posix_rename(temp_path, remote_path)
+            return
+        except asyncssh.SFTPOpUnsupported:
+            pass
+        try:
+            await sftp.remove(remote_path)
+        except asyncssh.SFTPNoSuchFile:
+            pass
+        await sftp.rename(temp_path, remote_path)
+    
+    async def _commit_upload(self, sftp: asyncssh.SFTPClient, temp_path: str,
+                             remote_path: str, file_size: int):
+        """임시 파일 크기를 확인한 뒤 일치할 때만 최종 경로로 교체 (불일치면 임시 파일만 삭제)"""
+        attrs = await sftp.stat(temp_path)
+        if attrs.size != file_size:
             try:
-                await sftp.stat(current_path)
-            except asyncssh.SFTPNoSuchFile:
-                try:
-                    await sftp.mkdir(current_path)
-                    self.logger.debug(f"📁 디렉토리 생성: {current_path}")
-                except asyncssh.SFTPFailure:
-                    # 이미 존재하는 경우 무시
-                    pass
+                await sftp.remove(temp_path)
+            except asyncssh.SFTPError:
+                pass
+            raise Exception(f"파일 크기 불일치: 로컬 {file_size} != 원격 {attrs.size}")
+        
+        await self._posix_rename(sftp, temp_path, remote_path)
     
-    async def _upload_single_file(self, conn: asyncssh.SSHClientConnection, 
+    async def _upload_single_file(self, sftp: asyncssh.SFTPClient, 
                                   local_path: str, remote_path: str,
                                   progress_callback=None, task_id: int = 0) -> Dict:
-        """단일 파일 업로드 (비동기)"""
+        """단일 파일 업로드 (비동기, 풀에서 빌린 세션 사용)"""
         start_time = time.time()
         result = {
             "local_path": local_path,
@@ -93,94 +199,208 @@ class AsyncSFTPStorage:
             "duration": 0,
             "task_id": task_id
         }
+        remote_dir = temp_remote_path = checkpoint = None
         
         try:
             # 파일 크기 확인
             file_size = os.path.getsize(local_path)
             result["size"] = file_size
             
-            async with conn.start_sftp_client() as sftp:
-                # 전체 경로 구성
-                if remote_path.startswith('video_analysis/'):
-                    full_remote_path = f"{self.base_path}/{remote_path}"
-                else:
-                    full_remote_path = remote_path
-                
-                # 경로 정규화
-                full_remote_path = full_remote_path.replace('\\', '/')
-                full_remote_path = full_remote_path.replace('//', '/')
-                
-                # 디렉토리 생성
-                remote_dir = os.path.dirname(full_remote_path)
-                await self._create_remote_directory(sftp, remote_dir)
-                
-                # 파일이 이미 존재하는지 확인
-                try:
-                    remote_stat = await sftp.stat(full_remote_path)
-                    if remote_stat.size == file_size:
-                        self.logger.info(f"⏭️  파일이 이미 존재함 (동일한 크기): {full_remote_path}")
-                        result["success"] = True
-                        result["duration"] = time.time() - start_time
-                        return result
-                except asyncssh.SFTPNoSuchFile:
-                    pass
-                
-                # 진행률 콜백을 위한 래퍼 함수
-                bytes_transferred = 0
-                
-                def progress_handler(src_path, dst_path, bytes_so_far, total_bytes):
-                    nonlocal bytes_transferred
-                    bytes_transferred = bytes_so_far
-                    if progress_callback:
-                        progress_callback(local_path, bytes_so_far, total_bytes)
-                
-                # 파일 업로드 (진행률 추적 포함)
-                file_name = os.path.basename(local_path)
-                self.logger.info(f"🔄 [Task-{task_id}] 동시 업로드 시작: {file_name} ({self._format_size(file_size)})")
-                self.logger.debug(f"   └─ 전체 경로: {local_path} -> {full_remote_path}")
-                
-                # 진행률 콜백이 있을 때만 progress_handler 사용
-                if progress_callback:
-                    await sftp.put(local_path, full_remote_path, 
-                                 progress_handler=progress_handler,
-                                 block_size=self.chunk_size)
-                else:
-                    await sftp.put(local_path, full_remote_path, 
-                                 block_size=self.chunk_size)
-                
-                # 업로드 검증
-                remote_stat = await sftp.stat(full_remote_path)
-                if remote_stat.size != file_size:
-                    raise Exception(f"파일 크기 불일치: 로컬 {file_size} != 원격 {remote_stat.size}")
-                
+            # 시작 시점에도 진행률 알림 (콜백에서 예외를 내면 원격 작업 없이 중단)
+            if progress_callback:
+                progress_callback(local_path, 0, file_size)
+            
+            # 전체 경로 구성
+            full_remote_path = self._full_remote_path(remote_path)
+            remote_dir, remote_name = posixpath.split(full_remote_path)
+            temp_remote_path = f"{full_remote_path}.tmp"
+            
+            # 디렉토리 생성 (배치 시작 시 만들었으면 왕복 없음)
+            if not self.pool.dir_cache.known(remote_dir):
+                await self._ensure_remote_directories(sftp, [remote_dir])
+            
+            # 파일이 이미 존재하는지 확인 (디렉토리 목록과 크기 비교)
+            if self.skip_existing and (await self._remote_sizes(sftp, remote_dir)).get(remote_name) == file_size:
+                self.logger.info(f"⏭️  파일이 이미 존재함 (동일한 크기): {full_remote_path}")
                 result["success"] = True
-                elapsed = time.time() - start_time
-                speed = file_size / elapsed if elapsed > 0 else 0
-                self.logger.info(f"✅ [Task-{task_id}] 업로드 완료: {file_name} ({elapsed:.2f}초, {self._format_size(speed)}/s)")
-                
+                result["duration"] = time.time() - start_time
+                return result
+            
+            # 진행률 콜백을 위한 래퍼 함수
+            bytes_transferred = 0
+            
+            def progress_handler(src_path, dst_path, bytes_so_far, total_bytes):
+                nonlocal bytes_transferred
+                bytes_transferred = bytes_so_far
+                if progress_callback:
+                    progress_callback(local_path, bytes_so_far, total_bytes)
+            
+            # 파일 업로드 (진행률 추적 포함)
+            file_name = os.path.basename(local_path)
+            self.logger.info(f"🔄 [Task-{task_id}] 동시 업로드 시작: {file_name} ({self._format_size(file_size)})")
+            self.logger.debug(f"   └─ 전체 경로: {local_path} -> {full_remote_path}")
+            
+            # 임시 파일명으로 업로드 (진행률 콜백이 있을 때만 progress_handler 사용)
+            if file_size >= SFTP_RESUMABLE_MIN_SIZE:
+                # 큰 파일은 청크 여러 개를 동시에 보내고, 실패하면 확인된 청크부터 이어서
+                checkpoint = UploadCheckpoint(local_path, temp_remote_path)
+                await self._put_resumable(sftp, checkpoint, progress_callback)
+                if SFTP_VERIFY_CHECKSUM:
+                    await self._verify_checksum(checkpoint)
+            elif progress_callback:
+                await sftp.put(local_path, temp_remote_path, 
+                             progress_handler=progress_handler,
+                             block_size=self.chunk_size)
+            else:
+                await sftp.put(local_path, temp_remote_path, 
+                             block_size=self.chunk_size)
+            
+            # 업로드 검증 + 최종 파일로 교체
+            await self._commit_upload(sftp, temp_remote_path, full_remote_path, file_size)
+            self.pool.dir_cache.record_file(full_remote_path, file_size)
+            if checkpoint:
+                checkpoint.clear()
+            
+            result["success"] = True
+            elapsed = time.time() - start_time
+            speed = file_size / elapsed if elapsed > 0 else 0
+            self.logger.info(f"✅ [Task-{task_id}] 업로드 완료: {file_name} ({elapsed:.2f}초, {self._format_size(speed)}/s)")
+            
         except Exception as e:
             result["error"] = str(e)
+            result["cancelled"] = isinstance(e, TaskCancelledError)
             self.logger.error(f"❌ 업로드 실패 ({local_path}): {e}")
+            if is_connection_error(e):
+                # 풀이 끊어진 세션을 버리도록 전달 (배치 결과에는 실패로 기록됨)
+                raise
+            # 디렉토리가 외부에서 지워졌을 수 있으므로 다음 업로드는 다시 확인
+            if remote_dir:
+                self.pool.dir_cache.forget(remote_dir)
+            # 이어서 보낼 청크가 있으면 임시 파일을 남겨 둠
+            if temp_remote_path and (checkpoint is None or not checkpoint.resuming):
+                try:
+                    await sftp.remove(temp_remote_path)
+                except asyncssh.SFTPError:
+                    pass
         
         result["duration"] = time.time() - start_time
         return result
     
+    async def _put_resumable(self, sftp: asyncssh.SFTPClient, checkpoint: UploadCheckpoint,
+                             progress_callback=None):
+        """
+        청크 단위 동시 업로드 (체크포인트에 있는 청크는 건너뜀)
+        
+        청크마다 자기 오프셋에 쓰기 요청을 보내고(최대 SFTP_PARALLEL_WRITES개 동시),
+        서버가 확인한 청크를 체크포인트에 기록합니다.
+        """
+        temp_path = checkpoint.remote_path
+        if checkpoint.resuming:
+            try:
+                if (await sftp.stat(temp_path)).size < checkpoint.acknowledged_end:
+                    checkpoint.reset()
+            except asyncssh.SFTPNoSuchFile:
+                checkpoint.reset()
+        
+        pending = checkpoint.pending()
+        if checkpoint.resuming:
+            self.logger.info(f"⏩ 이어서 업로드: {checkpoint.total_chunks - len(pending)}/"
+                             f"{checkpoint.total_chunks}개 청크 완료됨")
+        
+        semaphore = asyncio.Semaphore(SFTP_PARALLEL_WRITES)
+        sent = checkpoint.file_size - sum(checkpoint.chunk_range(i)[1] for i in pending)
+        
+        aborted = False
+        
+        async def write_chunk(f, index: int):
+            nonlocal sent, aborted
+            async with semaphore:
+                # 다른 청크가 실패(또는 진행률 콜백에서 중단)했으면 남은 청크는 보내지 않음
+                if aborted:
+                    return
+                try:
+                    # 파일 읽기는 스레드에서 (풀 루프를 막지 않도록)
+                    data = await asyncio.to_thread(checkpoint.read_chunk, index)
+                    await f.write(data, checkpoint.chunk_range(index)[0])
+                    checkpoint.mark(index)
+                    sent += len(data)
+                    if progress_callback:
+                        progress_callback(checkpoint.local_path, sent, checkpoint.file_size)
+                except BaseException:
+                    aborted = True
+                    raise
+        
+        errors = []
+        try:
+            async with sftp.open(temp_path, "r+b" if checkpoint.resuming else "wb",
+                                 block_size=self.chunk_size) as f:
+                results = await asyncio.gather(*(write_chunk(f, i) for i in pending), return_exceptions=True)
+                errors = [r for r in results if isinstance(r, BaseException)]
+        finally:
+            checkpoint.save()
+        if errors:
+            raise errors[0]
+    
+    async def _verify_checksum(self, checkpoint: UploadCheckpoint):
+        """원격 sha256sum으로 업로드한 임시 파일 내용 검증 (명령을 실행할 수 없으면 건너뜀)"""
+        local_digest, remote_digest = await asyncio.gather(
+            asyncio.to_thread(file_sha256, checkpoint.local_path),
+            self._remote_sha256(checkpoint.remote_path)
+        )
+        if remote_digest is None:
+            self.logger.warning(f"⚠️ 원격 체크섬을 확인할 수 없어 크기만 검증: {checkpoint.remote_path}")
+            return
+        if remote_digest != local_digest:
+            # 어느 청크가 잘못됐는지 알 수 없으므로 처음부터 다시
+            checkpoint.reset()
+            raise Exception(f"체크섬 불일치: {checkpoint.remote_path}")
+        self.logger.info(f"🔒 체크섬 확인: {checkpoint.remote_path}")
+    
+    async def _remote_sha256(self, remote_path: str) -> Optional[str]:
+        try:
+            async with self.pool.connection() as conn:
+                completed = await conn.run(sha256sum_command(f"{self.exec_root}{remote_path}"),
+                                           check=False, stdin=asyncssh.DEVNULL)
+            if completed.exit_status == 0:
+                return parse_sha256sum(completed.stdout or "")
+        except (asyncssh.Error, OSError) as e:
+            self.logger.debug(f"원격 체크섬 명령 실패: {e}")
+        return None
+    
     async def upload_files_batch(self, file_pairs: List[Tuple[str, str]], 
                                 progress_callback=None) -> List[Dict]:
         """
         여러 파일을 동시에 업로드
         
+        풀 연결이 사는 백그라운드 루프에서 실행하므로 어느 이벤트 루프에서 호출해도 됩니다.
+        
         Args:
             file_pairs: [(local_path, remote_path), ...] 형태의 리스트
-            progress_callback: 진행률 콜백 함수 (optional)
+            progress_callback: 진행률 콜백 함수 (optional, 풀 루프 스레드에서 호출됨)
             
         Returns:
             각 파일의 업로드 결과 리스트
         """
+        return await run_on_pool_loop(self._upload_files_batch(file_pairs, progress_callback))
+    
+    async def _upload_files_batch(self, file_pairs: List[Tuple[str, str]],
+                                  progress_callback=None) -> List[Dict]:
         self.logger.info(f"🚀 배치 업로드 시작: {len(file_pairs)}개 파일")
         self.logger.info(f"⚙️  동시 업로드 설정: 최대 {self.max_concurrent}개 연결")
         start_time = time.time()
         
+        # 필요한 디렉토리를 한 번에 만들고 디렉토리별 파일 목록을 한 번씩 읽음
+        remote_dirs = {posixpath.dirname(self._full_remote_path(remote_path)) for _, remote_path in file_pairs}
+        try:
+            async with self.pool.session() as sftp:
+                await self._ensure_remote_directories(sftp, remote_dirs)
+                if self.skip_existing:
+                    await self._load_remote_listings(sftp, remote_dirs)
+                await self._remove_stale_temp_files(sftp)
+        except Exception as e:
+            # 파일별 업로드에서 다시 시도
+            self.logger.warning(f"⚠️ 원격 디렉토리 준비 실패: {e}")
+        
         # 동시 연결 수 제한을 위한 세마포어
         semaphore = asyncio.Semaphore(self.max_concurrent)
         active_tasks = set()  # 현재 활성 태스크 추적
@@ -192,18 +412,7 @@ class AsyncSFTPStorage:
                 self.logger.info(f"🎯 [동시성] 활성 업로드: {active_count}개 (Task-{task_id} 시작)")
                 
                 try:
-                    # 각 업로드마다 새로운 연결 생성 (동시성 문제 방지)
-                    async with asyncssh.connect(
-                        self.host, 
-                        port=self.port,
-                        username=self.username, 
-                        password=self.password,
-                        known_hosts=None  # 호스트 키 검증 비활성화 (필요시 조정)
-                    ) as conn:
-                        result = await self._upload_single_file(
-                            conn, local_path, remote_path, progress_callback, task_id
-                        )
-                        return result
+                    return await self._upload_with_retry(local_path, remote_path, progress_callback, task_id)
                 finally:
                     active_tasks.discard(task_id)
                     remaining = len(active_tasks)
@@ -243,9 +452,217 @@ class AsyncSFTPStorage:
         self.logger.info(f"  - 총 크기: {self._format_size(total_size)}")
         self.logger.info(f"  - 소요 시간: {total_time:.2f}초")
         self.logger.info(f"  - 평균 속도: {self._format_size(total_size / total_time)}/s")
+        self.logger.debug(f"  - 연결 풀: {self.pool.get_stats()}")
         
         return final_results
     
+    async def _upload_with_retry(self, local_path: str, remote_path: str,
+                                 progress_callback=None, task_id: int = 0) -> Dict:
+        """
+        풀 세션으로 파일 하나 업로드
+        
+        분할 업로드 대상(큰 파일)은 실패해도 체크포인트가 남으므로 SFTP_MAX_RETRIES까지
+        확인된 청크 이후부터 다시 보냅니다 (연결이 끊긴 경우 새 세션으로). 작은 파일과
+        취소된 업로드는 재시도하지 않습니다.
+        """
+        try:
+            resumable = os.path.getsize(local_path) >= SFTP_RESUMABLE_MIN_SIZE
+        except OSError:
+            resumable = False
+        attempts = self.max_retries if resumable else 1
+        
+        for attempt in range(1, attempts + 1):
+            try:
+                # 풀의 연결을 재사용 (연결 하나에서 여러 SFTP 세션을 동시에 사용)
+                async with self.pool.session() as sftp:
+                    result = await self._upload_single_file(
+                        sftp, local_path, remote_path, progress_callback, task_id
+                    )
+            except Exception as e:
+                if attempt >= attempts or isinstance(e, TaskCancelledError):
+                    raise
+                error = e
+            else:
+                if result["success"] or result.get("cancelled") or attempt >= attempts:
+                    return result
+                error = result["error"]
+            
+            self.logger.warning(f"🔁 [Task-{task_id}] 이어서 업로드 재시도 ({attempt}/{attempts - 1}): "
+                                f"{os.path.basename(local_path)} - {error}")
+            await asyncio.sleep(self.retry_delay)
+    
+    async def _remove_stale_temp_files(self, sftp: asyncssh.SFTPClient):
+        """만료된 분할 업로드 체크포인트가 남긴 원격 임시 파일 삭제"""
+        stale = purge_expired_checkpoints()
+        if not stale:
+            return
+        removed = await asyncio.gather(*(sftp.remove(path) for path in stale), return_exceptions=True)
+        count = sum(1 for r in removed if not isinstance(r, BaseException))
+        self.logger.info(f"🧹 만료된 원격 임시 파일 정리: {count}/{len(stale)}개")
+    
+    async def upload_bundle(self, file_pairs: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        여러 작은 파일을 tar 스트림 하나로 업로드 (씬 이미지 등)
+        
+        SSH exec 채널 하나로 원격 `tar -x`에 파일을 흘려 보내므로 파일마다 열기/쓰기/닫기
+        왕복이 없습니다. 원격에서 명령을 실행할 수 없으면 배치 업로드로 대신합니다.
+        
+        Args:
+            file_pairs: [(local_path, remote_path), ...] 형태의 리스트
+            
+        Returns:
+            각 파일의 업로드 결과 리스트 (upload_files_batch와 같은 형식)
+        """
+        return await run_on_pool_loop(self._upload_bundle(file_pairs))
+    
+    async def _upload_bundle(self, file_pairs: List[Tuple[str, str]]) -> List[Dict]:
+        start_time = time.time()
+        full_paths = [self._full_remote_path(remote_path) for _, remote_path in file_pairs]
+        remote_dirs = {posixpath.dirname(path) for path in full_paths}
+        bundle_root = posixpath.commonpath(list(remote_dirs)) if remote_dirs else ""
+        if not bundle_root.startswith('/'):
+            # 상대 경로는 셸과 SFTP의 기준 디렉토리가 다를 수 있음
+            return await self._upload_files_batch(file_pairs)
+        
+        results = [{
+            "local_path": local_path,
+            "remote_path": remote_path,
+            "success": False,
+            "error": None,
+            "size": os.path.getsize(local_path) if os.path.exists(local_path) else 0,
+            "duration": 0
+        } for local_path, remote_path in file_pairs]
+        
+        # 같은 크기의 원격 파일은 번들에서 제외 (디렉토리 목록을 한 번씩 읽음)
+        members = []
+        try:
+            async with self.pool.session() as sftp:
+                await self._ensure_remote_directories(sftp, remote_dirs)
+                if self.skip_existing:
+                    await self._load_remote_listings(sftp, remote_dirs)
+        except Exception as e:
+            self.logger.warning(f"⚠️ 원격 디렉토리 준비 실패: {e}")
+        for result, full_path in zip(results, full_paths):
+            if not os.path.exists(result["local_path"]):
+                result["error"] = "로컬 파일이 존재하지 않음"
+                continue
+            remote_dir, remote_name = posixpath.split(full_path)
+            sizes = self.pool.dir_cache.listing(remote_dir) if self.skip_existing else None
+            if sizes is not None and sizes.get(remote_name) == result["size"]:
+                result["success"] = True
+            else:
+                members.append((result, posixpath.relpath(full_path, bundle_root)))
+        
+        if members:
+            self.logger.info(f"📦 번들 업로드 시작: {len(members)}개 파일 -> {bundle_root}")
+            try:
+                await self._stream_tar(bundle_root, members)
+            except Exception as e:
+                # exec 미지원/tar 없음 등 - 남은 파일은 파일별 업로드로
+                self.logger.warning(f"⚠️ 번들 업로드 실패, 배치 업로드로 대체: {e}")
+                pairs = [(r["local_path"], r["remote_path"]) for r, _ in members]
+                for (result, _), retried in zip(members, await self._upload_files_batch(pairs)):
+                    result.update(retried)
+                return results
+            
+            for result, arcname in members:
+                result["success"] = True
+                self.pool.dir_cache.record_file(posixpath.join(bundle_root, arcname), result["size"])
+        
+        total_time = time.time() - start_time
+        total_size = sum(r["size"] for r, _ in members)
+        for result in results:
+            result["duration"] = total_time
+        self.logger.info(f"📊 번들 업로드 완료: {len(members)}개 전송, "
+                         f"{len(file_pairs) - len(members)}개 건너뜀, "
+                         f"{self._format_size(total_size)} ({total_time:.2f}초)")
+        return results
+    
+    async def _stream_tar(self, bundle_root: str, members: List[Tuple[Dict, str]]):
+        """exec 채널로 원격 `tar -x`를 실행하고 tar 스트림을 파일 단위로 전송"""
+        target = shlex.quote(f"{self.exec_root}{bundle_root}")
+        command = f"mkdir -p {target} && tar -xf - -C {target}"
+        
+        async with self.pool.connection() as conn:
+            process = await conn.create_process(command, encoding=None)
+            sink = _TarSink()
+            tar = tarfile.open(fileobj=sink, mode="w|", format=tarfile.GNU_FORMAT)
+            write_error = None
+            try:
+                for result, arcname in members:
+                    # 파일 읽기는 스레드에서 (풀 루프를 막지 않도록)
+                    await asyncio.to_thread(_add_tar_member, tar, result["local_path"], arcname)
+                    process.stdin.write(sink.take())
+                    await process.stdin.drain()
+                tar.close()
+                process.stdin.write(sink.take())
+                process.stdin.write_eof()
+            except (BrokenPipeError, asyncssh.ProtocolError) as e:
+                # 원격 명령이 먼저 끝난 경우 (경로 오류 등) - 연결은 정상이므로 종료 코드로 보고
+                write_error = e
+            except BaseException:
+                process.close()
+                raise
+            
+            completed = await asyncio.wait_for(process.wait(), SFTP_EXEC_EXIT_TIMEOUT)
+            if completed.exit_status != 0 or write_error is not None:
+                stderr = (completed.stderr or b"").decode("utf-8", "replace").strip()
+                raise RuntimeError(f"원격 tar 실패 (종료 코드 {completed.exit_status}): {stderr or write_error}")
+    
+    async def create_links(self, links: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        원격 심볼릭 링크 생성 (기존 파일/링크는 교체)
+        
+        Args:
+            links: [(remote_path, target), ...] - target은 링크에 그대로 기록 (상대 경로 권장)
+            
+        Returns:
+            각 링크의 결과 리스트 ({"remote_path", "target", "success", "error"})
+        """
+        return await run_on_pool_loop(self._create_links(links))
+    
+    async def _create_links(self, links: List[Tuple[str, str]]) -> List[Dict]:
+        results = [{"remote_path": remote_path, "target": target, "success": False, "error": None}
+                   for remote_path, target in links]
+        if not links:
+            return results
+        full_paths = [self._full_remote_path(remote_path) for remote_path, _ in links]
+        suffix = f".{uuid.uuid4().hex[:8]}.lnk"
+        
+        async with self.pool.session() as sftp:
+            await self._ensure_remote_directories(sftp, {posixpath.dirname(path) for path in full_paths})
+            
+            # 임시 이름으로 링크를 만든 뒤 posix-rename으로 교체 (각 단계는 한꺼번에 요청)
+            created = await asyncio.gather(*(
+                sftp.symlink(target, f"{path}{suffix}") for path, (_, target) in zip(full_paths, links)
+            ), return_exceptions=True)
+            pending = []
+            for result, path, error in zip(results, full_paths, created):
+                if isinstance(error, BaseException):
+                    result["error"] = str(error)
+                else:
+                    pending.append((result, path))
+            
+            renamed = await asyncio.gather(*(
+                self._posix_rename(sftp, f"{path}{suffix}", path) for _, path in pending
+            ), return_exceptions=True)
+            for (result, path), error in zip(pending, renamed):
+                if isinstance(error, BaseException):
+                    result["error"] = str(error)
+                    try:
+                        await sftp.remove(f"{path}{suffix}")
+                    except asyncssh.SFTPError:
+                        pass
+                else:
+                    result["success"] = True
+                    # 링크 크기는 대상 파일 크기와 다르므로 목록 캐시에서 제외
+                    self.pool.dir_cache.record_file(path, None)
+        
+        failed = [r for r in results if not r["success"]]
+        if failed:
+            self.logger.warning(f"⚠️ 링크 생성 실패 {len(failed)}/{len(links)}개: {failed[0]['error']}")
+        return results
+    
     async def upload_file(self, local_path: str, remote_path: str) -> bool:
         """
         단일 파일 업로드 (기존 인터페이스와 호환)
@@ -265,22 +682,7 @@ class AsyncSFTPStorage:
         try:
             self.logger.info(f"🔌 비동기 SFTP 연결 테스트: {self.host}:{self.port}")
             
-            async with asyncssh.connect(
-                self.host, 
-                port=self.port,
-                username=self.username, 
-                password=self.password,
-                known_hosts=None
-            ) as conn:
-                async with conn.start_sftp_client() as sftp:
-                    # base_path 존재 확인
-                    try:
-                        await sftp.stat(self.base_path)
-                        self.logger.info(f"✅ 기본 경로 확인: {self.base_path}")
-                    except asyncssh.SFTPNoSuchFile:
-                        self.logger.warning(f"⚠️ 기본 경로가 존재하지 않습니다: {self.base_path}")
-                        # 기본 경로 생성 시도
-                        await self._create_remote_directory(sftp, self.base_path)
+            await run_on_pool_loop(self._check_base_path())
             
             self.logger.info("✅ 비동기 SFTP 연결 테스트 성공")
             return True
@@ -292,6 +694,17 @@ class AsyncSFTPStorage:
             self.logger.error(f"❌ 연결 테스트 실패: {e}")
             return False
     
+    async def _check_base_path(self):
+        async with self.pool.session() as sftp:
+            # base_path 존재 확인
+            try:
+                await sftp.stat(self.base_path)
+                self.logger.info(f"✅ 기본 경로 확인: {self.base_path}")
+            except asyncssh.SFTPNoSuchFile:
+                self.logger.warning(f"⚠️ 기본 경로가 존재하지 않습니다: {self.base_path}")
+                # 기본 경로 생성 시도
+                await self._ensure_remote_directories(sftp, [self.base_path])
+    
     def _format_size(self, size_bytes: int) -> str:
         """바이트를 읽기 쉬운 형식으로 변환"""
         for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
@@ -301,18 +714,47 @@ class AsyncSFTPStorage:
         return f"{size_bytes:.2f} PB"
 
 
+class _TarSink(io.RawIOBase):
+    """tarfile 스트림 출력을 모아 두었다가 채널로 넘기는 버퍼"""
+    
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def take(self) -> bytes:
+        data, self._chunks = b"".join(self._chunks), []
+        return data
+
+
+def _add_tar_member(tar: tarfile.TarFile, local_path: str, arcname: str):
+    """로컬 파일을 tar 항목으로 추가 (소유자 정보 없이)"""
+    info = tar.gettarinfo(local_path, arcname)
+    info.uid = info.gid = 0
+    info.uname = info.gname = ""
+    info.mode = 0o644
+    with open(local_path, "rb") as f:
+        tar.addfile(info, f)
+
+
 # 동기 래퍼 함수들 (기존 코드와의 호환성을 위해)
 def upload_file_sync(storage: AsyncSFTPStorage, local_path: str, remote_path: str) -> bool:
     """동기 방식으로 단일 파일 업로드"""
-    return asyncio.run(storage.upload_file(local_path, remote_path))
+    return run_sync(storage.upload_file(local_path, remote_path))
 
 
 def upload_files_batch_sync(storage: AsyncSFTPStorage, file_pairs: List[Tuple[str, str]], 
                            progress_callback=None) -> List[Dict]:
     """동기 방식으로 배치 업로드"""
-    return asyncio.run(storage.upload_files_batch(file_pairs, progress_callback))
+    return run_sync(storage.upload_files_batch(file_pairs, progress_callback))
 
 
 def test_connection_sync(storage: AsyncSFTPStorage) -> bool:
     """동기 방식으로 연결 테스트"""
-    return asyncio.run(storage.test_connection())
+    return run_sync(storage.test_connection())
@@ -1,8 +1,8 @@
 # integrations/storage/sftp_batch_wrapper.py
 """기존 시스템과 비동기 SFTP를 연결하는 래퍼"""
-import asyncio
 from typing import List, Tuple, Optional, Dict
 from .sftp_async import AsyncSFTPStorage
+from .sftp_pool import run_sync
 from utils.logger import get_logger
 
 
@@ -25,29 +25,16 @@ class SFTPBatchUploader:
         Returns:
             업로드 결과 리스트
         """
-        # 이벤트 루프 처리
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # 이미 실행 중인 루프가 있는 경우 (예: Jupyter, Streamlit)
-                import nest_asyncio
-                nest_asyncio.apply()
-                return loop.run_until_complete(
-                    self.async_storage.upload_files_batch(file_pairs, progress_callback)
-                )
-        except RuntimeError:
-            # 새 이벤트 루프 생성
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        try:
-            return loop.run_until_complete(
-                self.async_storage.upload_files_batch(file_pairs, progress_callback)
-            )
-        finally:
-            # 생성한 루프는 정리
-            if not loop.is_running():
-                loop.close()
+        # 풀 연결이 사는 백그라운드 루프에서 실행 (Streamlit 등 실행 중인 루프와 무관)
+        return run_sync(self.async_storage.upload_files_batch(file_pairs, progress_callback))
+    
+    def upload_bundle(self, file_pairs: List[Tuple[str, str]]) -> List[Dict]:
+        """작은 파일들을 tar 스트림 하나로 업로드 (실패 시 배치 업로드로 대체)"""
+        return run_sync(self.async_storage.upload_bundle(file_pairs))
+    
+    def create_links(self, links: List[Tuple[str, str]]) -> List[Dict]:
+        """원격 심볼릭 링크 생성 - links: [(remote_path, target), ...]"""
+        return run_sync(self.async_storage.create_links(links))
     
     def upload_single(self, local_path: str, remote_path: str) -> bool:
         """단일 파일 업로드 (기존 인터페이스와 호환)"""
@@ -56,21 +43,7 @@ class SFTPBatchUploader:
     
     def test_connection(self) -> bool:
         """연결 테스트"""
-        try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                import nest_asyncio
-                nest_asyncio.apply()
-                return loop.run_until_complete(self.async_storage.test_connection())
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-        try:
-            return loop.run_until_complete(self.async_storage.test_connection())
-        finally:
-            if not loop.is_running():
-                loop.close()
+        return run_sync(self.async_storage.test_connection())
 
 
 # 사용 예제
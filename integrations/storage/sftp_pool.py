@@ -0,0 +1,634 @@
+# integrations/storage/sftp_pool.py
+"""
+SFTP 연결 풀
+SSH 연결(핸드셰이크)은 비싸므로 한 번 연결한 뒤 파이프라인 실행 사이에 재사용하고,
+연결 하나에서 SFTP 세션(채널)을 여러 개 열어 동시에 사용합니다.
+오래 쓰지 않은 연결은 idle timeout 후 닫고, 한동안 쉬었던 연결은 넘겨주기 전에 상태를 확인합니다.
+
+- SFTPConnectionPool: paramiko (동기, SFTPStorage)
+- AsyncSFTPConnectionPool: asyncssh (비동기, AsyncSFTPStorage) - 연결이 이벤트 루프에 묶이므로
+  풀 전용 백그라운드 루프에서 실행 (run_on_pool_loop / run_sync)
+"""
+
+import asyncio
+import os
+import posixpath
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Coroutine, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+try:
+    import paramiko
+    PARAMIKO_AVAILABLE = True
+except ImportError:
+    PARAMIKO_AVAILABLE = False
+
+try:
+    import asyncssh
+    ASYNCSSH_AVAILABLE = True
+except ImportError:
+    ASYNCSSH_AVAILABLE = False
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 풀당 최대 SSH 연결 수 / 연결당 최대 SFTP 세션 수
+SFTP_POOL_SIZE = int(os.getenv("SFTP_POOL_SIZE", "2"))
+SFTP_SESSIONS_PER_CONNECTION = int(os.getenv("SFTP_SESSIONS_PER_CONNECTION", "4"))
+
+# 사용하지 않은 연결을 닫기까지의 시간 (초)
+SFTP_IDLE_TIMEOUT = float(os.getenv("SFTP_IDLE_TIMEOUT", "300"))
+
+# 이 시간(초) 이상 쉬었던 연결은 넘겨주기 전에 상태 확인
+SFTP_HEALTH_CHECK_SECONDS = 30.0
+
+# 빈 세션을 기다리는 최대 시간 (초)
+SFTP_ACQUIRE_TIMEOUT = 60.0
+
+# 원격 디렉토리 파일 목록(이름 → 크기)을 믿는 시간 (초)
+SFTP_LISTING_TTL = float(os.getenv("SFTP_LISTING_TTL", "60"))
+
+# 연결 실패로 보고 세션/연결을 버리는 예외
+# (파일 없음 같은 일반 IOError는 세션을 계속 쓸 수 있으므로 제외)
+_CONNECTION_ERRORS: Tuple[type, ...] = (EOFError, ConnectionError, TimeoutError)
+if PARAMIKO_AVAILABLE:
+    _CONNECTION_ERRORS += (paramiko.SSHException,)
+if ASYNCSSH_AVAILABLE:
+    _CONNECTION_ERRORS += (asyncssh.DisconnectError, asyncssh.ConnectionLost, asyncssh.ChannelOpenError,
+                           asyncssh.SFTPConnectionLost)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """세션/연결을 더 쓸 수 없는 오류인지 (업로드 코드가 직접 처리한 오류를 풀에 알릴 때)"""
+    return isinstance(error, _CONNECTION_ERRORS)
+
+
+class RemoteDirCache:
+    """
+    원격 디렉토리 캐시 (스레드 안전)
+
+    존재가 확인된 디렉토리와 디렉토리별 파일 크기 목록을 기억해, 업로드마다 경로를
+    한 단계씩 stat/mkdir 하거나 파일마다 stat 하지 않게 합니다.
+    디렉토리는 서버 상태이므로 같은 호스트/계정 풀의 연결들이 함께 사용합니다.
+    """
+
+    def __init__(self, listing_ttl: float = SFTP_LISTING_TTL):
+        self.listing_ttl = listing_ttl
+        self._dirs: Set[str] = set()
+        self._listings: Dict[str, Tuple[float, Dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _ancestors(path: str) -> List[str]:
+        """path와 상위 디렉토리 (루트 제외, 얕은 것부터)"""
+        path = posixpath.normpath(path)
+        chain = []
+        while path not in ("/", "", "."):
+            chain.append(path)
+            path = posixpath.dirname(path)
+        return chain[::-1]
+
+    def known(self, path: str) -> bool:
+        with self._lock:
+            return posixpath.normpath(path) in self._dirs
+
+    def missing(self, directories: Iterable[str]) -> List[str]:
+        """존재를 모르는 디렉토리 (상위 포함, 얕은 것부터)"""
+        with self._lock:
+            result = {ancestor for directory in directories
+                      for ancestor in self._ancestors(directory) if ancestor not in self._dirs}
+        return sorted(result, key=lambda d: (d.count("/"), d))
+
+    def add(self, *directories: str):
+        """존재하는 디렉토리로 기록 (상위 디렉토리 포함)"""
+        with self._lock:
+            for directory in directories:
+                self._dirs.update(self._ancestors(directory))
+
+    def forget(self, directory: str):
+        """디렉토리와 하위 정보 삭제 (외부에서 지워졌을 때)"""
+        directory = posixpath.normpath(directory)
+        prefix = directory.rstrip("/") + "/"
+        with self._lock:
+            self._dirs = {d for d in self._dirs if d != directory and not d.startswith(prefix)}
+            for listed in [d for d in self._listings if d == directory or d.startswith(prefix)]:
+                del self._listings[listed]
+
+    def listing(self, directory: str) -> Optional[Dict[str, int]]:
+        """디렉토리의 파일 크기 목록 (없거나 오래되었으면 None)"""
+        with self._lock:
+            entry = self._listings.get(posixpath.normpath(directory))
+        if entry is None or time.monotonic() - entry[0] > self.listing_ttl:
+            return None
+        return entry[1]
+
+    def set_listing(self, directory: str, sizes: Dict[str, int]):
+        with self._lock:
+            self._listings[posixpath.normpath(directory)] = (time.monotonic(), dict(sizes))
+
+    def record_file(self, path: str, size: Optional[int]):
+        """업로드/삭제한 파일을 목록에 반영 (size None이면 삭제)"""
+        directory, name = posixpath.split(posixpath.normpath(path))
+        with self._lock:
+            entry = self._listings.get(directory)
+            if entry is None:
+                return
+            if size is None:
+                entry[1].pop(name, None)
+            else:
+                entry[1][name] = size
+
+
+class _PooledConnection:
+    """풀의 SSH 연결 하나와 그 위의 쉬고 있는 SFTP 세션"""
+
+    def __init__(self, connection: Any):
+        self.connection = connection
+        self.idle_sessions: List[Any] = []
+        self.active = 0  # 사용 중이거나 여는 중인 세션 수
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.broken = False
+
+    @property
+    def sessions(self) -> int:
+        return self.active + len(self.idle_sessions)
+
+
+class _PoolStats:
+    def __init__(self):
+        self.handshakes = 0
+        self.sessions_opened = 0
+        self.reused = 0
+        self.discarded = 0
+
+    def as_dict(self) -> Dict[str, int]:
+        return dict(vars(self))
+
+
+class SFTPConnectionPool:
+    """paramiko SSH 연결 풀 (스레드 안전)"""
+
+    def __init__(self, host: str, port: int, username: str, password: Optional[str],
+                 max_connections: int = SFTP_POOL_SIZE,
+                 sessions_per_connection: int = SFTP_SESSIONS_PER_CONNECTION,
+                 idle_timeout: float = SFTP_IDLE_TIMEOUT):
+        if not PARAMIKO_AVAILABLE:
+            raise RuntimeError("paramiko가 설치되지 않았습니다")
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_connections = max_connections
+        self.sessions_per_connection = sessions_per_connection
+        self.idle_timeout = idle_timeout
+
+        self._connections: List[_PooledConnection] = []
+        self._connecting = 0  # 핸드셰이크 중인 연결 수 (풀 크기 계산에 포함)
+        self.dir_cache = RemoteDirCache()
+        self._cond = threading.Condition()
+        self.stats = _PoolStats()
+
+        self._reaper: Optional[threading.Thread] = None
+
+    @contextmanager
+    def session(self) -> Iterator["paramiko.SFTPClient"]:
+        """
+        SFTP 세션 대여
+
+        블록 안에서 연결 오류가 나면 세션(과 끊어진 연결)을 버리므로,
+        재시도는 새 session() 블록에서 하면 됩니다.
+        """
+        conn, sftp = self._acquire()
+        ok = True
+        try:
+            yield sftp
+        except _CONNECTION_ERRORS:
+            ok = False
+            raise
+        finally:
+            self._release(conn, sftp, ok)
+
+    def _acquire(self) -> Tuple[_PooledConnection, Any]:
+        deadline = time.monotonic() + SFTP_ACQUIRE_TIMEOUT
+        conn = None
+        with self._cond:
+            while True:
+                self._reap_idle()
+
+                # 1. 쉬고 있는 세션 (서버가 채널만 닫은 세션은 버림)
+                for candidate in list(self._connections):
+                    if candidate.idle_sessions and self._is_healthy(candidate):
+                        sftp = candidate.idle_sessions.pop()
+                        if sftp.get_channel().closed:
+                            self.stats.discarded += 1
+                            self._close_quietly(sftp)
+                            continue
+                        candidate.active += 1
+                        self.stats.reused += 1
+                        return candidate, sftp
+
+                # 2. 기존 연결에 새 세션 (채널 열기만 - 핸드셰이크 없음)
+                for candidate in list(self._connections):
+                    if candidate.sessions < self.sessions_per_connection and self._is_healthy(candidate):
+                        candidate.active += 1
+                        conn = candidate
+                        break
+                if conn is not None:
+                    break
+
+                # 3. 새 연결 (잠금 밖에서 핸드셰이크)
+                if len(self._connections) + self._connecting < self.max_connections:
+                    self._connecting += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"SFTP 세션 대기 시간 초과 ({SFTP_ACQUIRE_TIMEOUT:.0f}초)")
+                self._cond.wait(remaining)
+
+        if conn is None:
+            try:
+                transport = self._connect()
+            except BaseException:
+                with self._cond:
+                    self._connecting -= 1
+                    self._cond.notify()
+                raise
+            conn = _PooledConnection(transport)
+            with self._cond:
+                self._connecting -= 1
+                conn.active += 1
+                self._connections.append(conn)
+            self._start_reaper()
+
+        try:
+            sftp = paramiko.SFTPClient.from_transport(conn.connection)
+        except BaseException:
+            self._release(conn, None, ok=False)
+            raise
+        with self._cond:
+            self.stats.sessions_opened += 1
+        return conn, sftp
+
+    def _release(self, conn: _PooledConnection, sftp: Any, ok: bool):
+        with self._cond:
+            conn.active -= 1
+            conn.last_used = time.monotonic()
+            if not ok:
+                conn.broken = conn.broken or not conn.connection.is_active()
+            if sftp is not None and ok and not conn.broken:
+                conn.idle_sessions.append(sftp)
+                sftp = None
+            if conn.broken and conn.active == 0:
+                self._drop(conn)
+            self._cond.notify()
+        if sftp is not None:
+            self.stats.discarded += 1
+            self._close_quietly(sftp)
+
+    def _connect(self) -> "paramiko.Transport":
+        """SSH 핸드셰이크 + 인증"""
+        started = time.monotonic()
+        transport = paramiko.Transport((self.host, self.port))
+        try:
+            transport.connect(username=self.username, password=self.password)
+            # NAS/방화벽이 유휴 연결을 끊지 않도록
+            transport.set_keepalive(int(SFTP_HEALTH_CHECK_SECONDS))
+        except BaseException:
+            transport.close()
+            raise
+        with self._cond:
+            self.stats.handshakes += 1
+        logger.info(f"🔌 SFTP 풀 연결 생성: {self.host}:{self.port} ({time.monotonic() - started:.2f}초)")
+        return transport
+
+    def _is_healthy(self, conn: _PooledConnection) -> bool:
+        """연결 상태 확인 (잠금 보유 상태, 오래 쉬었던 연결만 패킷으로 확인)"""
+        if conn.broken:
+            return False
+        transport = conn.connection
+        if not transport.is_active():
+            conn.broken = True
+        elif time.monotonic() - conn.last_used >= SFTP_HEALTH_CHECK_SECONDS:
+            try:
+                transport.send_ignore()
+            except Exception:
+                conn.broken = True
+        if conn.broken:
+            logger.info(f"SFTP 풀 연결 끊김 감지 - 폐기: {self.host}:{self.port}")
+            if conn.active == 0:
+                self._drop(conn)
+            return False
+        return True
+
+    def _reap_idle(self):
+        """idle timeout이 지난 연결 닫기 (잠금 보유 상태)"""
+        now = time.monotonic()
+        for conn in list(self._connections):
+            if conn.active == 0 and now - conn.last_used >= self.idle_timeout:
+                logger.info(f"SFTP 풀 유휴 연결 종료: {self.host}:{self.port}")
+                self._drop(conn)
+
+    def _drop(self, conn: _PooledConnection):
+        """풀에서 제거 후 닫기 (잠금 보유 상태)"""
+        if conn in self._connections:
+            self._connections.remove(conn)
+        for sftp in conn.idle_sessions:
+            self._close_quietly(sftp)
+        conn.idle_sessions = []
+        self._close_quietly(conn.connection)
+
+    def _start_reaper(self):
+        """사용이 끊겨도 유휴 연결이 닫히도록 주기적으로 정리"""
+        with self._cond:
+            if self._reaper is not None and self._reaper.is_alive():
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, name="SFTPPoolReaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(max(self.idle_timeout / 2, 1.0))
+            with self._cond:
+                self._reap_idle()
+                if not self._connections:
+                    self._reaper = None
+                    return
+
+    def close(self):
+        """모든 연결 종료"""
+        with self._cond:
+            for conn in list(self._connections):
+                self._drop(conn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "connections": len(self._connections),
+                "sessions": sum(conn.sessions for conn in self._connections),
+                "active_sessions": sum(conn.active for conn in self._connections),
+                **self.stats.as_dict(),
+            }
+
+    @staticmethod
+    def _close_quietly(resource: Any):
+        try:
+            resource.close()
+        except Exception:
+            pass
+
+
+class AsyncSFTPConnectionPool:
+    """
+    asyncssh SSH 연결 풀
+
+    풀 전용 이벤트 루프에서만 사용합니다 (다른 루프에서는 run_on_pool_loop로 넘김).
+    """
+
+    def __init__(self, host: str, port: int, username: str, password: Optional[str],
+                 max_connections: int = SFTP_POOL_SIZE,
+                 sessions_per_connection: int = SFTP_SESSIONS_PER_CONNECTION,
+                 idle_timeout: float = SFTP_IDLE_TIMEOUT):
+        if not ASYNCSSH_AVAILABLE:
+            raise RuntimeError("asyncssh가 설치되지 않았습니다")
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.max_connections = max_connections
+        self.sessions_per_connection = sessions_per_connection
+        self.idle_timeout = idle_timeout
+
+        self._connections: List[_PooledConnection] = []
+        self._connecting = 0
+        self.dir_cache = RemoteDirCache()
+        self._cond: Optional[asyncio.Condition] = None  # 풀 루프에서 처음 사용할 때 생성
+        self.stats = _PoolStats()
+        self._reaper: Optional[asyncio.Task] = None
+
+    @asynccontextmanager
+    async def session(self):
+        """SFTP 세션 대여 (연결 오류가 나면 세션과 끊어진 연결을 버림)"""
+        conn, sftp = await self._acquire()
+        ok = True
+        try:
+            yield sftp
+        except _CONNECTION_ERRORS:
+            ok = False
+            raise
+        finally:
+            await self._release(conn, sftp, ok)
+
+    @asynccontextmanager
+    async def connection(self):
+        """
+        SSH 연결 대여 (exec 채널 등 SFTP 외 용도)
+
+        연결의 세션 한 자리를 차지하므로 동시 사용 수 제한은 session()과 같습니다.
+        """
+        conn = await self._reserve()
+        ok = True
+        try:
+            yield conn.connection
+        except _CONNECTION_ERRORS:
+            ok = False
+            raise
+        finally:
+            await self._release(conn, None, ok)
+
+    async def _reserve(self) -> _PooledConnection:
+        """세션 한 자리가 남은 연결 확보 (없으면 새 연결)"""
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            deadline = time.monotonic() + SFTP_ACQUIRE_TIMEOUT
+            while True:
+                self._reap_idle()
+                for conn in list(self._connections):
+                    if conn.sessions < self.sessions_per_connection and self._is_healthy(conn):
+                        conn.active += 1
+                        return conn
+                if len(self._connections) + self._connecting < self.max_connections:
+                    self._connecting += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"SFTP 세션 대기 시간 초과 ({SFTP_ACQUIRE_TIMEOUT:.0f}초)")
+                try:
+                    await asyncio.wait_for(self._cond.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+        try:
+            connection = await self._connect()
+        except BaseException:
+            async with self._cond:
+                self._connecting -= 1
+                self._cond.notify()
+            raise
+        conn = _PooledConnection(connection)
+        async with self._cond:
+            self._connecting -= 1
+            conn.active += 1
+            self._connections.append(conn)
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_loop())
+        return conn
+
+    async def _acquire(self):
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            self._reap_idle()
+            for conn in list(self._connections):
+                if conn.idle_sessions and self._is_healthy(conn):
+                    conn.active += 1
+                    self.stats.reused += 1
+                    return conn, conn.idle_sessions.pop()
+
+        conn = await self._reserve()
+        try:
+            sftp = await conn.connection.start_sftp_client()
+        except BaseException:
+            await self._release(conn, None, ok=False)
+            raise
+        self.stats.sessions_opened += 1
+        return conn, sftp
+
+    async def _release(self, conn: _PooledConnection, sftp: Any, ok: bool):
+        async with self._cond:
+            conn.active -= 1
+            conn.last_used = time.monotonic()
+            if not ok:
+                conn.broken = conn.broken or conn.connection.is_closed()
+            if sftp is not None and ok and not conn.broken:
+                conn.idle_sessions.append(sftp)
+                sftp = None
+            if conn.broken and conn.active == 0:
+                self._drop(conn)
+            self._cond.notify()
+        if sftp is not None:
+            self.stats.discarded += 1
+            sftp.exit()
+
+    async def _connect(self):
+        started = time.monotonic()
+        connection = await asyncssh.connect(
+            self.host,
+            port=self.port,
+            username=self.username,
+            password=self.password,
+            known_hosts=None,  # 호스트 키 검증 비활성화 (필요시 조정)
+            keepalive_interval=SFTP_HEALTH_CHECK_SECONDS,
+        )
+        self.stats.handshakes += 1
+        logger.info(f"🔌 비동기 SFTP 풀 연결 생성: {self.host}:{self.port} ({time.monotonic() - started:.2f}초)")
+        return connection
+
+    def _is_healthy(self, conn: _PooledConnection) -> bool:
+        # asyncssh는 keepalive 실패/연결 종료를 is_closed에 반영
+        if not conn.broken and conn.connection.is_closed():
+            conn.broken = True
+            logger.info(f"비동기 SFTP 풀 연결 끊김 감지 - 폐기: {self.host}:{self.port}")
+            if conn.active == 0:
+                self._drop(conn)
+        return not conn.broken
+
+    def _reap_idle(self):
+        now = time.monotonic()
+        for conn in list(self._connections):
+            if conn.active == 0 and now - conn.last_used >= self.idle_timeout:
+                logger.info(f"비동기 SFTP 풀 유휴 연결 종료: {self.host}:{self.port}")
+                self._drop(conn)
+
+    def _drop(self, conn: _PooledConnection):
+        if conn in self._connections:
+            self._connections.remove(conn)
+        for sftp in conn.idle_sessions:
+            sftp.exit()
+        conn.idle_sessions = []
+        conn.connection.close()
+
+    async def _reap_loop(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 2, 1.0))
+            async with self._cond:
+                self._reap_idle()
+                if not self._connections:
+                    return
+
+    async def close(self):
+        if self._cond is None:
+            return
+        async with self._cond:
+            for conn in list(self._connections):
+                self._drop(conn)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self._connections),
+            "sessions": sum(conn.sessions for conn in self._connections),
+            "active_sessions": sum(conn.active for conn in self._connections),
+            **self.stats.as_dict(),
+        }
+
+
+# ===== 풀 전용 이벤트 루프 =====
+
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_loop_lock = threading.Lock()
+
+
+def get_pool_loop() -> asyncio.AbstractEventLoop:
+    """비동기 풀 연결이 사는 백그라운드 이벤트 루프 (처음 호출 시 스레드 시작)"""
+    global _pool_loop
+    if _pool_loop is None:
+        with _pool_loop_lock:
+            if _pool_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="SFTPPoolLoop", daemon=True).start()
+                _pool_loop = loop
+    return _pool_loop
+
+
+async def run_on_pool_loop(coro: Coroutine) -> Any:
+    """코루틴을 풀 루프에서 실행하고 결과를 현재 루프에서 기다림"""
+    loop = get_pool_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """동기 코드에서 코루틴을 풀 루프에서 실행 (Streamlit 등 실행 중인 루프와 무관)"""
+    return asyncio.run_coroutine_threadsafe(coro, get_pool_loop()).result()
+
+
+# ===== 싱글톤 풀 (호스트/계정별) =====
+
+_pools: Dict[tuple, Any] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sftp_pool(host: str, port: int, username: str, password: Optional[str]) -> SFTPConnectionPool:
+    """paramiko 연결 풀 반환 (같은 호스트/계정이면 공유)"""
+    key = ("paramiko", host, port, username)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = SFTPConnectionPool(host, port, username, password)
+        return pool
+
+
+def get_async_sftp_pool(host: str, port: int, username: str,
+                        password: Optional[str]) -> AsyncSFTPConnectionPool:
+    """asyncssh 연결 풀 반환 (같은 호스트/계정이면 공유, 풀 루프에서 사용)"""
+    key = ("asyncssh", host, port, username)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = AsyncSFTPConnectionPool(host, port, username, password)
+        return pool
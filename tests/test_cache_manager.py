@@ -0,0 +1,126 @@
+"""RedisCache 태그/패턴 무효화와 CacheManager.invalidate_video 테스트 (fakeredis)"""
+import os
+import pickle
+import time
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from utils.cache_manager import CacheManager, DiskCache, HybridCache, RedisCache
+
+VIDEO_ID = "dQw4w9WgXcQ"
+VIDEO_URL = f"https://www.youtube.com/watch?v={VIDEO_ID}"
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_client(server, decode_responses=False):
+    return fakeredis.FakeStrictRedis(server=server, decode_responses=decode_responses)
+
+
+def make_manager(server) -> CacheManager:
+    return CacheManager(cache=HybridCache(redis_client=make_client(server)))
+
+
+def test_clear_pattern_deletes_in_batches(server):
+    client = make_client(server)
+    cache = RedisCache(client=client)
+    for i in range(25):
+        cache.set(f"scenes:{i}", [i])
+    cache.set("analysis:keep", {"ok": True})
+    client.set("other:scenes:0", b"x")  # 다른 prefix는 대상 아님
+    
+    unlink_sizes = []
+    original_unlink = cache._unlink
+    
+    def record_unlink(keys):
+        unlink_sizes.append(len(keys))
+        return original_unlink(keys)
+    
+    cache._unlink = record_unlink
+    assert cache.clear_pattern("scenes:*", batch_size=10) == 25
+    
+    assert unlink_sizes == [10, 10, 5]
+    assert cache.get("scenes:0") is None
+    assert cache.get("analysis:keep") == {"ok": True}
+    assert client.exists("other:scenes:0")
+
+
+@pytest.mark.parametrize("decode_responses", [False, True])
+def test_invalidate_tag_strips_prefix(server, decode_responses):
+    """태그 집합 멤버가 bytes(기본)든 str(decode_responses)든 prefix를 뗀 키를 반환"""
+    cache = RedisCache(client=make_client(server, decode_responses))
+    cache.set("analysis:a", 1, ttl_seconds=60, tags=["video:a"])
+    cache.set("metadata:a", 2, tags=["video:a"])
+    cache.set("analysis:b", 3, tags=["video:b"])
+    
+    keys = cache.invalidate_tag("video:a")
+    
+    assert sorted(keys) == ["analysis:a", "metadata:a"]
+    client = cache.redis_client
+    assert not client.exists(cache._make_key("analysis:a"), cache._make_key("metadata:a"))
+    assert client.exists(cache._make_key("analysis:b"))
+    assert not client.exists(cache._make_tag_key("video:a"))
+    assert cache.invalidate_tag("video:a") == []
+
+
+@pytest.mark.parametrize("identifier", [VIDEO_URL, VIDEO_ID])
+def test_invalidate_video_removes_keys_from_other_process(server, identifier):
+    writer = make_manager(server)
+    writer.set_url_identity(VIDEO_URL, "youtube", VIDEO_ID)
+    writer.set_video_analysis(VIDEO_URL, {"genre": "music"})
+    writer.set_scene_list(VIDEO_ID, 3, [{"timestamp": 1.0}])
+    writer.set_video_info(VIDEO_ID, {"title": "t"})
+    writer.set_video_metadata("https://youtu.be/other", {"title": "other"})
+    
+    # 다른 프로세스의 관리자는 로컬 태그 색인이 비어 있어 Redis 태그 집합으로만 찾음
+    reader = make_manager(server)
+    if identifier == VIDEO_URL:
+        reader.invalidate_video(video_url=identifier)
+    else:
+        reader.invalidate_video(video_id=identifier)
+    
+    assert reader.get_video_analysis(VIDEO_URL) is None
+    assert reader.get_scene_list(VIDEO_ID) is None
+    assert reader.get_video_info(VIDEO_ID) is None
+    assert reader.get_video_metadata("https://youtu.be/other") == {"title": "other"}
+    # URL → ID 대응은 바뀌지 않으므로 유지
+    assert reader.get_url_identity(VIDEO_URL) == {"platform": "youtube", "video_id": VIDEO_ID}
+
+
+def test_redis_hit_backfills_disk_with_remaining_ttl_and_tags(server, tmp_path):
+    writer = HybridCache(redis_client=make_client(server))
+    writer.set("analysis:a", {"genre": "music"}, ttl_seconds=120, tags=["video:a"])
+    
+    reader = HybridCache(redis_client=make_client(server), disk_cache_dir=str(tmp_path))
+    assert reader.get("analysis:a") == {"genre": "music"}
+    
+    with open(reader.disk_cache._path("analysis:a"), "rb") as f:
+        expires_at = DiskCache._read_expiry(f)
+    assert 0 < expires_at - time.time() <= 120
+    
+    # 태그 색인에 등록되어 Redis 없이도 로컬 계층을 태그로 무효화
+    reader.redis_cache.available = False
+    assert reader.invalidate_tag("video:a") == 1
+    assert reader.disk_cache.get("analysis:a") is None
+
+
+def test_disk_cleanup_reads_expiry_from_header(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path))
+    cache._written_bytes = 0  # 첫 저장 때의 백그라운드 정리와 겹치지 않도록
+    cache.set("live", [1])
+    cache.set("expired", [2], ttl_seconds=1)
+    legacy = cache._path("legacy")
+    os.makedirs(os.path.dirname(legacy), exist_ok=True)
+    with open(legacy, "wb") as f:
+        pickle.dump((None, [3]), f)  # 헤더 없는 이전 형식
+    
+    monkeypatch.setattr(time, "time", lambda real=time.time: real() + 5)
+    monkeypatch.setattr(pickle, "load", lambda *_: pytest.fail("cleanup unpickled a value"))
+    
+    assert cache.cleanup() == 2
+    assert os.path.exists(cache._path("live"))
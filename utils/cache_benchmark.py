@@ -0,0 +1,81 @@
+# utils/cache_benchmark.py
+"""
+MemoryCache 마이크로 벤치마크
+가득 찬 캐시(기본 10,000개)에서 조회/저장 처리량을 측정합니다.
+저장은 매번 LRU 제거가 일어나는 상태에서, 조회는 적중/미스가 섞인 키로 측정합니다.
+
+사용법:
+    python -m utils.cache_benchmark
+    python -m utils.cache_benchmark --entries 10000 --ops 20000 --ttl 3600
+"""
+
+import argparse
+import random
+import time
+
+from utils.cache_manager import MemoryCache
+
+
+def _make_value(i: int) -> dict:
+    """캐시에 넣는 값 - 영상 메타데이터 크기의 딕셔너리"""
+    return {
+        "video_id": f"video_{i}",
+        "title": f"Reference video {i}",
+        "duration": 120.0 + i % 600,
+        "tags": [f"tag{j}" for j in range(8)],
+        "scenes": [{"timestamp": j * 3.5, "path": f"/data/{i}/scene_{j:04d}.jpg"} for j in range(10)],
+    }
+
+
+def run_benchmark(entries: int, ops: int, ttl_seconds: int = 0, seed: int = 42) -> dict:
+    """채우기 → 저장(제거 발생) → 조회 순으로 초당 처리량 측정"""
+    rng = random.Random(seed)
+    cache = MemoryCache(max_size_mb=1024, max_entries=entries)
+    values = [_make_value(i) for i in range(256)]
+    ttl = ttl_seconds or None
+
+    started = time.perf_counter()
+    for i in range(entries):
+        cache.set(f"key:{i}", values[i % len(values)], ttl)
+    fill_seconds = time.perf_counter() - started
+
+    # 가득 찬 상태에서 새 키 저장 → 매번 LRU 제거
+    started = time.perf_counter()
+    for i in range(entries, entries + ops):
+        cache.set(f"key:{i}", values[i % len(values)], ttl)
+    set_seconds = time.perf_counter() - started
+
+    # 최근 키(적중)와 제거된 키(미스)를 섞어 조회
+    upper = entries + ops
+    keys = [f"key:{rng.randrange(upper - 2 * entries, upper)}" for _ in range(ops)]
+    started = time.perf_counter()
+    for key in keys:
+        cache.get(key)
+    get_seconds = time.perf_counter() - started
+
+    stats = cache.get_stats()
+    return {
+        "fill_ops_per_sec": entries / fill_seconds,
+        "set_ops_per_sec": ops / set_seconds,
+        "get_ops_per_sec": ops / get_seconds,
+        "hit_rate": stats["hit_rate"],
+        "evictions": stats["evictions"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MemoryCache 조회/저장 처리량 측정")
+    parser.add_argument("--entries", type=int, default=10000, help="캐시 최대 엔트리 수 (가득 채운 상태로 측정)")
+    parser.add_argument("--ops", type=int, default=20000, help="조회/저장 각각의 반복 횟수")
+    parser.add_argument("--ttl", type=int, default=0, help="엔트리 TTL (초, 0이면 만료 없음)")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.entries, args.ops, args.ttl)
+    print(f"엔트리 {args.entries:,}개, 반복 {args.ops:,}회, TTL {args.ttl or '없음'}")
+    print(f"  채우기: {result['fill_ops_per_sec']:>12,.0f} ops/s")
+    print(f"  저장:   {result['set_ops_per_sec']:>12,.0f} ops/s (제거 {result['evictions']:,}회)")
+    print(f"  조회:   {result['get_ops_per_sec']:>12,.0f} ops/s (적중률 {result['hit_rate'] * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
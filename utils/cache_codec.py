@@ -0,0 +1,233 @@
+# utils/cache_codec.py
+"""
+캐시 값 직렬화/압축 코덱
+Redis에 저장하는 값을 msgpack(없으면 orjson) 으로 직렬화하고, 일정 크기 이상이면
+zstd(없으면 lz4, zlib)로 압축합니다. 앞에 붙는 헤더로 형식과 스키마 버전을 구분하므로
+배포 후 예전 형식(pickle 등)이나 예전 스키마로 저장된 값은 읽지 않고 미스로 처리합니다.
+
+헤더 (3 bytes):
+    [형식 버전][스키마 버전][직렬화 방식 << 4 | 압축 방식]
+"""
+
+import os
+import pickle
+import threading
+import zlib
+from typing import Any, Optional, Tuple
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+try:
+    import lz4.frame
+    LZ4_AVAILABLE = True
+except ImportError:
+    LZ4_AVAILABLE = False
+
+# 헤더 레이아웃이 바뀌면 올림
+CODEC_FORMAT_VERSION = 1
+
+# 캐시에 넣는 값의 구조(분석 결과/메타데이터 필드 등)가 호환되지 않게 바뀌면 올림
+CACHE_SCHEMA_VERSION = int(os.getenv("CACHE_SCHEMA_VERSION", "1"))
+
+# 이 크기(bytes) 이상인 직렬화 결과만 압축
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))
+
+# "auto"면 설치된 라이브러리 중 가장 빠른 것 사용
+CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "auto").lower()
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "auto").lower()
+
+HEADER_SIZE = 3
+
+# 직렬화 방식 ID (헤더에 기록되므로 값을 바꾸면 안 됨)
+SERIALIZER_MSGPACK = 1
+SERIALIZER_ORJSON = 2
+SERIALIZER_PICKLE = 3
+
+# 압축 방식 ID
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+COMPRESSION_ZLIB = 3
+
+_SERIALIZER_NAMES = {"msgpack": SERIALIZER_MSGPACK, "orjson": SERIALIZER_ORJSON, "pickle": SERIALIZER_PICKLE}
+_COMPRESSION_NAMES = {"none": COMPRESSION_NONE, "zstd": COMPRESSION_ZSTD,
+                      "lz4": COMPRESSION_LZ4, "zlib": COMPRESSION_ZLIB}
+
+# orjson이 기본으로 문자열로 바꾸는 타입은 pickle로 넘겨 원래 타입을 유지
+_ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                   if ORJSON_AVAILABLE else 0)
+
+
+class CodecError(Exception):
+    """디코딩할 수 없는 캐시 값 (손상되었거나 필요한 라이브러리 없음)"""
+
+
+class StaleCacheValue(CodecError):
+    """다른 형식/스키마 버전으로 저장된 캐시 값"""
+
+
+def _available_serializer(name: str) -> int:
+    """설정 이름 → 설치된 직렬화 방식 (없으면 다음 후보)"""
+    if name in ("msgpack", "auto") and MSGPACK_AVAILABLE:
+        return SERIALIZER_MSGPACK
+    if name in ("msgpack", "orjson", "auto") and ORJSON_AVAILABLE:
+        return SERIALIZER_ORJSON
+    return SERIALIZER_PICKLE
+
+
+def _available_compression(name: str) -> int:
+    """설정 이름 → 설치된 압축 방식 (없으면 다음 후보)"""
+    if name == "none":
+        return COMPRESSION_NONE
+    if name == "zlib":
+        return COMPRESSION_ZLIB
+    if name in ("zstd", "auto") and ZSTD_AVAILABLE:
+        return COMPRESSION_ZSTD
+    if name in ("lz4", "zstd", "auto") and LZ4_AVAILABLE:
+        return COMPRESSION_LZ4
+    return COMPRESSION_ZLIB
+
+
+def _reject(value: Any):
+    raise TypeError(f"직렬화할 수 없는 타입: {type(value).__name__}")
+
+
+class CacheCodec:
+    """
+    캐시 값 인코더/디코더
+
+    구조화 직렬화(msgpack/orjson)가 처리하지 못하는 값(사용자 객체, 문자열이 아닌
+    딕셔너리 키 등)은 pickle로 저장해 원래 타입을 유지합니다. 튜플은 리스트로 돌아옵니다.
+    디코딩은 현재 설정과 관계없이 헤더에 기록된 방식으로 합니다.
+    """
+
+    def __init__(self, serializer: str = CACHE_SERIALIZER, compression: str = CACHE_COMPRESSION,
+                 compress_min_bytes: int = CACHE_COMPRESS_MIN_BYTES,
+                 schema_version: int = CACHE_SCHEMA_VERSION, zstd_level: int = 3):
+        self.serializer = _available_serializer(serializer)
+        self.compression = _available_compression(compression)
+        self.compress_min_bytes = compress_min_bytes
+        self.schema_version = schema_version
+        self.zstd_level = zstd_level
+        self._local = threading.local()  # zstd 컨텍스트는 스레드 간 공유 불가
+
+    @property
+    def description(self) -> str:
+        serializer = {v: k for k, v in _SERIALIZER_NAMES.items()}[self.serializer]
+        compression = {v: k for k, v in _COMPRESSION_NAMES.items()}[self.compression]
+        return f"{serializer}+{compression}"
+
+    # ===== 인코딩 =====
+
+    def encode(self, value: Any) -> bytes:
+        """값 → 헤더 + (압축된) 직렬화 bytes"""
+        serializer, payload = self._serialize(value)
+
+        compression = COMPRESSION_NONE
+        if self.compression != COMPRESSION_NONE and len(payload) >= self.compress_min_bytes:
+            compressed = self._compress(self.compression, payload)
+            # 압축 효과가 없으면 (이미 압축된 이미지 bytes 등) 원본 저장
+            if len(compressed) < len(payload):
+                compression, payload = self.compression, compressed
+
+        header = bytes((CODEC_FORMAT_VERSION, self.schema_version, serializer << 4 | compression))
+        return header + payload
+
+    def _serialize(self, value: Any) -> Tuple[int, bytes]:
+        try:
+            if self.serializer == SERIALIZER_MSGPACK:
+                return SERIALIZER_MSGPACK, msgpack.packb(value, use_bin_type=True, default=_reject)
+            if self.serializer == SERIALIZER_ORJSON:
+                return SERIALIZER_ORJSON, orjson.dumps(value, default=_reject, option=_ORJSON_OPTIONS)
+        except (TypeError, ValueError, OverflowError):
+            pass
+        return SERIALIZER_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _compress(self, compression: int, payload: bytes) -> bytes:
+        if compression == COMPRESSION_ZSTD:
+            compressor = getattr(self._local, "zstd_compressor", None)
+            if compressor is None:
+                compressor = self._local.zstd_compressor = zstandard.ZstdCompressor(level=self.zstd_level)
+            return compressor.compress(payload)
+        if compression == COMPRESSION_LZ4:
+            return lz4.frame.compress(payload)
+        return zlib.compress(payload, 6)
+
+    # ===== 디코딩 =====
+
+    def decode(self, data: bytes) -> Any:
+        """
+        헤더 + 직렬화 bytes → 값
+
+        Raises:
+            StaleCacheValue: 다른 형식/스키마 버전 (헤더 없는 예전 pickle 값 포함)
+            CodecError: 손상되었거나 필요한 라이브러리가 없음
+        """
+        if len(data) < HEADER_SIZE or data[0] != CODEC_FORMAT_VERSION:
+            raise StaleCacheValue("알 수 없는 캐시 값 형식")
+        if data[1] != self.schema_version:
+            raise StaleCacheValue(f"스키마 버전 불일치 (저장 {data[1]}, 현재 {self.schema_version})")
+
+        serializer, compression = data[2] >> 4, data[2] & 0x0F
+        if ((serializer == SERIALIZER_MSGPACK and not MSGPACK_AVAILABLE)
+                or (serializer == SERIALIZER_ORJSON and not ORJSON_AVAILABLE)
+                or (compression == COMPRESSION_ZSTD and not ZSTD_AVAILABLE)
+                or (compression == COMPRESSION_LZ4 and not LZ4_AVAILABLE)):
+            raise CodecError(f"캐시 값을 읽을 라이브러리가 없음 (방식 {serializer}/{compression})")
+        try:
+            payload = self._decompress(compression, memoryview(data)[HEADER_SIZE:])
+            if serializer == SERIALIZER_MSGPACK:
+                return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+            if serializer == SERIALIZER_ORJSON:
+                return orjson.loads(payload)
+            if serializer == SERIALIZER_PICKLE:
+                return pickle.loads(payload)
+        except Exception as e:
+            raise CodecError(f"캐시 값 디코딩 실패: {e}") from e
+        raise CodecError(f"알 수 없는 직렬화 방식: {serializer}")
+
+    def _decompress(self, compression: int, payload: memoryview):
+        if compression == COMPRESSION_NONE:
+            return payload
+        if compression == COMPRESSION_ZSTD:
+            decompressor = getattr(self._local, "zstd_decompressor", None)
+            if decompressor is None:
+                decompressor = self._local.zstd_decompressor = zstandard.ZstdDecompressor()
+            # 프레임에 원본 크기가 기록되어 있으므로 한 번에 해제
+            return decompressor.decompress(payload)
+        if compression == COMPRESSION_LZ4:
+            return lz4.frame.decompress(payload)
+        if compression == COMPRESSION_ZLIB:
+            return zlib.decompress(payload)
+        raise CodecError(f"알 수 없는 압축 방식: {compression}")
+
+
+# 싱글톤 인스턴스
+_default_codec: Optional[CacheCodec] = None
+_codec_lock = threading.Lock()
+
+
+def get_cache_codec() -> CacheCodec:
+    """기본 캐시 코덱 싱글톤 인스턴스 반환"""
+    global _default_codec
+    if _default_codec is None:
+        with _codec_lock:
+            if _default_codec is None:
+                _default_codec = CacheCodec()
+    return _default_codec
@@ -5,13 +5,17 @@ Redis + 로컬 메모리 캐시 하이브리드
 """
 
 import os
+import sys
 import json
+import heapq
 import pickle
+import struct
 import hashlib
+import itertools
 import threading
 import time
-from typing import Any, Optional, Dict, List, Callable
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from typing import Any, Optional, Dict, Iterable, List, Callable, Set, Tuple
 from dataclasses import dataclass
 from functools import wraps
 
@@ -22,54 +26,113 @@ except ImportError:
     REDIS_AVAILABLE = False
 
 from utils.logger import get_logger
+from utils.cache_codec import CacheCodec, CodecError, StaleCacheValue, get_cache_codec
+from utils.single_flight import SingleFlight
+from utils.video_url import parse_video_url
 
 logger = get_logger(__name__)
 
 
+# 크기 추정 시 컨테이너마다 직접 재는 최대 항목 수
+SIZER_SAMPLE_ITEMS = 100
+
+# Redis SCAN/삭제 한 번에 처리하는 키 수 (서버를 오래 막지 않도록 나눠서 처리)
+REDIS_SCAN_BATCH = 500
+
+# 태그 집합 보관 시간 (초) - 태그를 붙여 저장할 때마다 갱신, 만료된 멤버는 무효화 시 함께 정리
+REDIS_TAG_TTL_SECONDS = 30 * 24 * 3600
+
+# HybridCache가 프로세스 안에서 기억하는 태그 수 (넘으면 오래된 태그부터 잊음)
+LOCAL_TAG_INDEX_SIZE = 10000
+
+# 디스크 캐시 파일 헤더 (형식 표시, 만료 시각 - 0이면 만료 없음) - 정리할 때 값을 역직렬화하지 않음
+DISK_CACHE_HEADER = struct.Struct("!4sd")
+DISK_CACHE_MAGIC = b"VRC1"
+
+# Redis 값을 하위 계층에 복사할 때의 최대 보관 시간 (초)
+REDIS_BACKFILL_TTL_SECONDS = 3600
+
+# 디스크 캐시에 한도의 이 비율만큼 새로 쓸 때마다 크기 정리 (디렉토리 전체를 훑으므로 저장마다 하지 않음)
+DISK_CACHE_CLEANUP_FRACTION = 0.1
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    값의 대략적인 메모리 크기 (bytes)
+    
+    직렬화하지 않고 sys.getsizeof로 컨테이너를 얕게(최대 2단계, 100개 항목까지) 훑어
+    나머지는 표본 평균으로 추정합니다.
+    """
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    
+    size = sys.getsizeof(value)
+    if _depth >= 2:
+        return size
+    
+    if isinstance(value, dict):
+        items = list(itertools.islice(value.items(), SIZER_SAMPLE_ITEMS))
+        sampled = sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in items)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = list(itertools.islice(value, SIZER_SAMPLE_ITEMS))
+        sampled = sum(estimate_size(item, _depth + 1) for item in items)
+    elif hasattr(value, '__dict__'):
+        return size + estimate_size(vars(value), _depth + 1)
+    else:
+        return size
+    
+    if not items:
+        return size
+    return size + sampled * len(value) // len(items)
+
+
 @dataclass
 class CacheEntry:
-    """캐시 엔트리"""
+    """캐시 엔트리 (시각은 time.time() 기준 초)"""
     key: str
     value: Any
-    created_at: datetime
-    expires_at: Optional[datetime] = None
+    created_at: float
+    expires_at: Optional[float] = None
     access_count: int = 0
-    last_accessed: datetime = None
+    last_accessed: Optional[float] = None
     size_bytes: int = 0
     
     def __post_init__(self):
         if self.last_accessed is None:
             self.last_accessed = self.created_at
-        if isinstance(self.value, (str, bytes)):
-            self.size_bytes = len(self.value)
-        else:
-            # 대략적인 크기 계산
-            try:
-                self.size_bytes = len(pickle.dumps(self.value))
-            except:
-                self.size_bytes = 1000  # 기본값
     
-    def is_expired(self) -> bool:
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """만료 여부 확인"""
         if self.expires_at is None:
             return False
-        return datetime.now() > self.expires_at
+        return (now if now is not None else time.time()) > self.expires_at
     
-    def access(self):
+    def access(self, now: Optional[float] = None):
         """접근 기록"""
         self.access_count += 1
-        self.last_accessed = datetime.now()
+        self.last_accessed = now if now is not None else time.time()
 
 
 class MemoryCache:
-    """메모리 기반 캐시"""
+    """
+    메모리 기반 캐시
+    
+    OrderedDict 순서가 곧 LRU 순서(앞쪽이 가장 오래 전 접근)이고, 전체 크기는
+    누적 카운터로, TTL 만료는 만료 시각 min-heap으로 관리하므로 조회/저장/삭제가
+    엔트리 수와 관계없이 O(1) (만료 처리는 O(log n))입니다.
+    """
     
-    def __init__(self, max_size_mb: int = 100, max_entries: int = 1000):
+    def __init__(self, max_size_mb: int = 100, max_entries: int = 1000,
+                 sizer: Optional[Callable[[Any], int]] = None):
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.max_entries = max_entries
-        self.cache: Dict[str, CacheEntry] = {}
+        self.sizer = sizer or estimate_size
+        self.cache: "OrderedDict[str, CacheEntry]" = OrderedDict()
         self.lock = threading.RLock()
         
+        # (만료 시각, 키) - 덮어쓰기/삭제된 엔트리는 꺼낼 때 건너뜀
+        self._expiry_heap: List[tuple] = []
+        
         # 통계
         self.stats = {
             "hits": 0,
@@ -83,63 +146,66 @@ class MemoryCache:
     def get(self, key: str) -> Optional[Any]:
         """캐시에서 값 조회"""
         with self.lock:
-            if key not in self.cache:
+            entry = self.cache.get(key)
+            if entry is None:
                 self.stats["misses"] += 1
                 return None
             
-            entry = self.cache[key]
-            
             # 만료 확인
-            if entry.is_expired():
-                del self.cache[key]
+            now = time.time()
+            if entry.is_expired(now):
+                self._remove(key)
                 self.stats["misses"] += 1
-                self._update_total_size()
                 return None
             
-            # 접근 기록
-            entry.access()
+            # 접근 기록 (LRU 순서 갱신)
+            entry.access(now)
+            self.cache.move_to_end(key)
             self.stats["hits"] += 1
             
             return entry.value
     
     def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
         """캐시에 값 저장"""
+        # 크기 추정은 락 밖에서 (값을 훑는 동안 다른 조회를 막지 않음)
+        size_bytes = self.sizer(value)
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        
+        entry = CacheEntry(
+            key=key,
+            value=value,
+            created_at=now,
+            expires_at=expires_at,
+            size_bytes=size_bytes
+        )
+        
         with self.lock:
-            # 만료 시간 계산
-            expires_at = None
-            if ttl_seconds:
-                expires_at = datetime.now() + timedelta(seconds=ttl_seconds)
-            
-            # 엔트리 생성
-            entry = CacheEntry(
-                key=key,
-                value=value,
-                created_at=datetime.now(),
-                expires_at=expires_at
-            )
+            # 덮어쓰기면 기존 엔트리 크기부터 제외
+            self._remove(key)
             
             # 크기 확인 및 정리
-            self._ensure_space(entry.size_bytes)
+            self._ensure_space(size_bytes, now)
             
             # 저장
             self.cache[key] = entry
-            self._update_total_size()
+            self.stats["total_size_bytes"] += size_bytes
+            if expires_at is not None:
+                heapq.heappush(self._expiry_heap, (expires_at, key))
+                self._compact_expiry_heap()
             
-            logger.debug(f"캐시 저장: {key} ({entry.size_bytes} bytes)")
+            logger.debug(f"캐시 저장: {key} ({size_bytes} bytes)")
     
     def delete(self, key: str) -> bool:
         """캐시에서 값 삭제"""
         with self.lock:
-            if key in self.cache:
-                del self.cache[key]
-                self._update_total_size()
-                return True
-            return False
+            return self._remove(key)
     
     def clear(self):
         """캐시 전체 삭제"""
         with self.lock:
             self.cache.clear()
+            self._expiry_heap.clear()
             self.stats["total_size_bytes"] = 0
             logger.info("메모리 캐시 전체 삭제")
     
@@ -159,56 +225,78 @@ class MemoryCache:
                 "hit_rate": hit_rate
             }
     
-    def _ensure_space(self, required_bytes: int):
+    def _remove(self, key: str) -> bool:
+        """엔트리 제거 및 크기 카운터 반영 (self.lock 보유 상태)"""
+        entry = self.cache.pop(key, None)
+        if entry is None:
+            return False
+        self.stats["total_size_bytes"] -= entry.size_bytes
+        return True
+    
+    def _ensure_space(self, required_bytes: int, now: float):
         """공간 확보 (LRU 기반 정리)"""
         # 만료된 엔트리 먼저 정리
-        self._cleanup_expired()
+        self._cleanup_expired(now)
         
-        # 크기 확인
-        while (self.stats["total_size_bytes"] + required_bytes > self.max_size_bytes or
-               len(self.cache) >= self.max_entries):
-            
-            if not self.cache:
-                break
-            
-            # LRU 정책: 가장 오래 전에 접근된 항목 제거
-            lru_key = min(self.cache.keys(), 
-                         key=lambda k: self.cache[k].last_accessed)
-            
-            del self.cache[lru_key]
+        # 크기 확인 - 가장 오래 전에 접근된 항목(맨 앞)부터 제거
+        while self.cache and (
+            self.stats["total_size_bytes"] + required_bytes > self.max_size_bytes or
+            len(self.cache) >= self.max_entries
+        ):
+            _, entry = self.cache.popitem(last=False)
+            self.stats["total_size_bytes"] -= entry.size_bytes
             self.stats["evictions"] += 1
-            
-        self._update_total_size()
     
-    def _cleanup_expired(self):
-        """만료된 엔트리 정리"""
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if entry.is_expired()
-        ]
+    def _cleanup_expired(self, now: float):
+        """만료 시각이 지난 엔트리 정리 (heap 앞쪽만 확인)"""
+        expired = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self.cache.get(key)
+            # 이후 덮어쓴 엔트리는 만료 시각이 달라 건너뜀
+            if entry is not None and entry.expires_at == expires_at:
+                self._remove(key)
+                expired += 1
         
-        for key in expired_keys:
-            del self.cache[key]
-        
-        if expired_keys:
-            logger.debug(f"만료된 캐시 엔트리 {len(expired_keys)}개 정리")
+        if expired:
+            logger.debug(f"만료된 캐시 엔트리 {expired}개 정리")
     
-    def _update_total_size(self):
-        """전체 크기 업데이트"""
-        self.stats["total_size_bytes"] = sum(
-            entry.size_bytes for entry in self.cache.values()
-        )
+    def _compact_expiry_heap(self):
+        """덮어쓰기/삭제로 쌓인 지난 heap 항목이 많으면 재구성"""
+        if len(self._expiry_heap) <= 2 * len(self.cache) + 64:
+            return
+        self._expiry_heap = [
+            (entry.expires_at, key) for key, entry in self.cache.items()
+            if entry.expires_at is not None
+        ]
+        heapq.heapify(self._expiry_heap)
 
 
 class RedisCache:
-    """Redis 기반 캐시"""
+    """
+    Redis 기반 캐시
+    
+    값은 CacheCodec으로 직렬화/압축하며, 다른 형식이나 스키마 버전으로 저장된 값은
+    미스로 처리하고 삭제합니다.
+    태그를 붙여 저장한 키는 태그 집합({prefix}tag:{태그})에 모아 두므로, 태그 단위 무효화는
+    전체 키를 훑지 않고 그 태그의 키만 지웁니다.
+    """
     
     def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0, 
-                 password: Optional[str] = None, prefix: str = "video_ref:"):
+                 password: Optional[str] = None, prefix: str = "video_ref:",
+                 codec: Optional[CacheCodec] = None, client: Optional[Any] = None):
         self.prefix = prefix
+        self.codec = codec or get_cache_codec()
         self.redis_client = None
         self.available = False
         
+        if client is not None:
+            # 이미 만든 클라이언트 사용 (fakeredis 등)
+            self.redis_client = client
+            self.available = True
+            return
+        
         if not REDIS_AVAILABLE:
             logger.info("Redis 라이브러리가 설치되지 않음 - 메모리 캐시만 사용")
             return
@@ -225,7 +313,7 @@ class RedisCache:
             # 연결 테스트
             self.redis_client.ping()
             self.available = True
-            logger.info(f"Redis 캐시 연결 성공: {host}:{port}")
+            logger.info(f"Redis 캐시 연결 성공: {host}:{port} (코덱 {self.codec.description})")
             
         except Exception as e:
             logger.warning(f"Redis 연결 실패: {e} - 로컬 캐시만 사용")
@@ -235,6 +323,13 @@ class RedisCache:
         """키에 prefix 추가"""
         return f"{self.prefix}{key}"
     
+    def _make_tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+    
+    def _make_key_tags_key(self, key: str) -> str:
+        """키에 붙은 태그 집합 (하위 계층에 복사할 때 태그도 함께 옮기기 위함)"""
+        return f"{self.prefix}keytags:{key}"
+    
     def get(self, key: str) -> Optional[Any]:
         """Redis에서 값 조회"""
         if not self.available:
@@ -243,30 +338,81 @@ class RedisCache:
         try:
             redis_key = self._make_key(key)
             data = self.redis_client.get(redis_key)
-            
-            if data is None:
-                return None
-            
-            # 역직렬화
-            return pickle.loads(data)
-            
         except Exception as e:
             logger.error(f"Redis GET 오류: {e}")
             return None
+        return self._decode(key, data)
     
-    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
-        """Redis에 값 저장"""
+    def get_entry(self, key: str) -> Tuple[Optional[Any], Optional[float], List[str]]:
+        """
+        값과 남은 TTL, 태그를 한 번에 조회 (하위 계층 복사용)
+        
+        Returns:
+            (값, 남은 초 - 만료 없으면 None, 태그 목록)
+        """
+        if not self.available:
+            return None, None, []
+        
+        try:
+            redis_key = self._make_key(key)
+            pipe = self.redis_client.pipeline(transaction=False)
+            pipe.get(redis_key)
+            pipe.pttl(redis_key)
+            pipe.smembers(self._make_key_tags_key(key))
+            data, pttl, tags = pipe.execute()
+        except Exception as e:
+            logger.error(f"Redis GET 오류: {e}")
+            return None, None, []
+        
+        value = self._decode(key, data)
+        if value is None:
+            return None, None, []
+        ttl = pttl / 1000 if pttl and pttl > 0 else None
+        return value, ttl, [t.decode() if isinstance(t, bytes) else t for t in tags]
+    
+    def _decode(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        """저장된 값 역직렬화 (이전 형식이면 삭제 후 None)"""
+        if data is None:
+            return None
+        try:
+            return self.codec.decode(data)
+        except StaleCacheValue as e:
+            # 배포 전 형식/스키마로 저장된 값 - 다시 계산해 덮어쓰도록 삭제
+            logger.debug(f"Redis 이전 형식 값 삭제 ({key}): {e}")
+            self.delete(key)
+            return None
+        except CodecError as e:
+            logger.warning(f"Redis 값 디코딩 실패 ({key}): {e}")
+            return None
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None,
+            tags: Iterable[str] = ()):
+        """Redis에 값 저장 (태그가 있으면 같은 파이프라인으로 태그 집합에 추가)"""
         if not self.available:
             return
         
         try:
             redis_key = self._make_key(key)
-            data = pickle.dumps(value)
+            data = self.codec.encode(value)
             
+            tags = tuple(tags)
+            key_tags_key = self._make_key_tags_key(key)
+            
+            pipe = self.redis_client.pipeline(transaction=False)
             if ttl_seconds:
-                self.redis_client.setex(redis_key, ttl_seconds, data)
+                pipe.setex(redis_key, ttl_seconds, data)
             else:
-                self.redis_client.set(redis_key, data)
+                pipe.set(redis_key, data)
+            pipe.delete(key_tags_key)
+            if tags:
+                pipe.sadd(key_tags_key, *tags)
+                if ttl_seconds:
+                    pipe.expire(key_tags_key, ttl_seconds)
+            for tag in tags:
+                tag_key = self._make_tag_key(tag)
+                pipe.sadd(tag_key, redis_key)
+                pipe.expire(tag_key, max(REDIS_TAG_TTL_SECONDS, ttl_seconds or 0))
+            pipe.execute()
                 
         except Exception as e:
             logger.error(f"Redis SET 오류: {e}")
@@ -278,90 +424,393 @@ class RedisCache:
         
         try:
             redis_key = self._make_key(key)
-            result = self.redis_client.delete(redis_key)
+            result = self.redis_client.delete(redis_key, self._make_key_tags_key(key))
             return result > 0
             
         except Exception as e:
             logger.error(f"Redis DELETE 오류: {e}")
             return False
     
-    def clear_pattern(self, pattern: str = "*"):
-        """패턴 매칭으로 키 삭제"""
+    def clear_pattern(self, pattern: str = "*", batch_size: int = REDIS_SCAN_BATCH) -> int:
+        """
+        패턴 매칭으로 키 삭제
+        
+        KEYS 대신 SCAN으로 batch_size개씩 훑고 UNLINK로 지워 큰 키 공간에서도 서버를
+        막지 않습니다. SCAN 도중 추가된 키는 남을 수 있습니다.
+        
+        Returns:
+            삭제한 키 수
+        """
         if not self.available:
-            return
+            return 0
         
+        deleted = 0
         try:
             redis_pattern = self._make_key(pattern)
-            keys = self.redis_client.keys(redis_pattern)
+            batch = []
+            for redis_key in self.redis_client.scan_iter(match=redis_pattern, count=batch_size):
+                batch.append(redis_key)
+                if len(batch) >= batch_size:
+                    deleted += self._unlink(batch)
+                    batch = []
+            if batch:
+                deleted += self._unlink(batch)
             
-            if keys:
-                self.redis_client.delete(*keys)
-                logger.info(f"Redis 패턴 삭제: {pattern} ({len(keys)}개 키)")
+            if deleted:
+                logger.info(f"Redis 패턴 삭제: {pattern} ({deleted}개 키)")
                 
         except Exception as e:
             logger.error(f"Redis 패턴 삭제 오류: {e}")
+        return deleted
+    
+    def invalidate_tag(self, tag: str) -> List[str]:
+        """
+        태그가 붙은 키와 태그 집합 삭제
+        
+        Returns:
+            삭제 대상이었던 키 목록 (prefix 제외) - 다른 계층에서도 지우는 데 사용
+        """
+        if not self.available:
+            return []
+        
+        try:
+            tag_key = self._make_tag_key(tag)
+            members = list(self.redis_client.sscan_iter(tag_key, count=REDIS_SCAN_BATCH))
+            
+            prefix = self.prefix.encode()
+            keys = []
+            for member in members:
+                if isinstance(member, bytes):
+                    member = member[len(prefix):] if member.startswith(prefix) else member
+                    member = member.decode()
+                elif member.startswith(self.prefix):
+                    member = member[len(self.prefix):]
+                keys.append(member)
+            
+            # 값과 키별 태그 집합을 함께 삭제
+            redis_keys = members + [self._make_key_tags_key(key) for key in keys]
+            for start in range(0, len(redis_keys), REDIS_SCAN_BATCH):
+                self._unlink(redis_keys[start:start + REDIS_SCAN_BATCH])
+            self.redis_client.delete(tag_key)
+            return keys
+            
+        except Exception as e:
+            logger.error(f"Redis 태그 무효화 오류 ({tag}): {e}")
+            return []
+    
+    def _unlink(self, redis_keys: List[Any]) -> int:
+        """키 묶음 삭제 (UNLINK - 메모리 해제는 서버 백그라운드에서)"""
+        try:
+            return self.redis_client.unlink(*redis_keys)
+        except Exception:
+            # UNLINK가 없는 이전 Redis 서버
+            return self.redis_client.delete(*redis_keys)
+
+
+class DiskCache:
+    """
+    로컬 디스크 캐시
+    
+    같은 호스트의 프로세스(앱, 워커)와 재시작 사이에 공유되며, Redis가 없을 때는
+    메모리 다음 계층을 대신합니다. 키는 해시 파일명으로 저장하고 쓰기는 임시 파일을
+    rename해 원자적으로 교체합니다. 파일 앞의 고정 헤더에 만료 시각을 두어 정리할 때
+    값을 역직렬화하지 않습니다.
+    """
+    
+    def __init__(self, cache_dir: str, max_size_mb: int = 500):
+        self.cache_dir = cache_dir
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.available = False
+        
+        # 크기 한도는 저장할 때 백그라운드 정리로 유지 (시작 후 첫 저장 때 한 번 정리)
+        self._cleanup_threshold = max(1, int(self.max_size_bytes * DISK_CACHE_CLEANUP_FRACTION))
+        self._written_bytes = self._cleanup_threshold
+        self._cleanup_running = False
+        self._cleanup_lock = threading.Lock()
+        
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            self.available = True
+            logger.info(f"디스크 캐시 사용: {cache_dir}")
+        except OSError as e:
+            logger.warning(f"디스크 캐시 디렉토리 생성 실패: {e} - 디스크 캐시 비활성화")
+    
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.pkl")
+    
+    def get(self, key: str) -> Optional[Any]:
+        """디스크에서 값 조회 (만료된 파일은 삭제)"""
+        if not self.available:
+            return None
+        
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                expired = self._is_expired(self._read_expiry(f))
+                value = None if expired else pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"디스크 캐시 읽기 실패 ({key}): {e}")
+            return None
+        
+        if expired:
+            self._unlink(path)
+        return value
+    
+    @staticmethod
+    def _read_expiry(f) -> float:
+        """파일 헤더에서 만료 시각 읽기 (0이면 만료 없음, 형식이 다르면 ValueError)"""
+        header = f.read(DISK_CACHE_HEADER.size)
+        if len(header) != DISK_CACHE_HEADER.size:
+            raise ValueError("헤더 없음")
+        magic, expires_at = DISK_CACHE_HEADER.unpack(header)
+        if magic != DISK_CACHE_MAGIC:
+            raise ValueError("알 수 없는 캐시 파일 형식")
+        return expires_at
+    
+    @staticmethod
+    def _is_expired(expires_at: float, now: Optional[float] = None) -> bool:
+        return expires_at > 0 and (now or time.time()) > expires_at
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        """디스크에 값 저장"""
+        if not self.available:
+            return
+        
+        path = self._path(key)
+        expires_at = time.time() + ttl_seconds if ttl_seconds else 0.0
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(DISK_CACHE_HEADER.pack(DISK_CACHE_MAGIC, expires_at))
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+                written = f.tell()
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self._unlink(tmp_path)
+            logger.error(f"디스크 캐시 저장 오류: {e}")
+            return
+        
+        self._schedule_cleanup(written)
+    
+    def _schedule_cleanup(self, written: int):
+        """새로 쓴 크기가 정리 단위를 넘으면 백그라운드 스레드에서 cleanup 실행"""
+        with self._cleanup_lock:
+            self._written_bytes += written
+            if self._cleanup_running or self._written_bytes < self._cleanup_threshold:
+                return
+            self._written_bytes = 0
+            self._cleanup_running = True
+        
+        def run():
+            try:
+                self.cleanup()
+            except Exception as e:
+                logger.error(f"디스크 캐시 정리 오류: {e}")
+            finally:
+                with self._cleanup_lock:
+                    self._cleanup_running = False
+        
+        threading.Thread(target=run, name="disk-cache-cleanup", daemon=True).start()
+    
+    def delete(self, key: str) -> bool:
+        """디스크에서 값 삭제"""
+        if not self.available:
+            return False
+        return self._unlink(self._path(key))
+    
+    def clear(self):
+        """디스크 캐시 전체 삭제"""
+        for path in self._iter_files():
+            self._unlink(path)
+    
+    def cleanup(self) -> int:
+        """
+        만료된 파일 삭제 후 전체 크기가 한도를 넘으면 오래된 파일부터 삭제
+        
+        만료 여부는 헤더만 읽어 판단하며, 헤더가 없는 이전 형식 파일은 삭제합니다.
+        """
+        removed = 0
+        files = []
+        now = time.time()
+        
+        for path in self._iter_files():
+            try:
+                with open(path, 'rb') as f:
+                    expires_at = self._read_expiry(f)
+                if self._is_expired(expires_at, now):
+                    removed += self._unlink(path)
+                    continue
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+            except Exception:
+                removed += self._unlink(path)
+        
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_size_bytes:
+                break
+            removed += self._unlink(path)
+            total -= size
+        
+        if removed:
+            logger.info(f"디스크 캐시 정리: {removed}개 파일 삭제")
+        return removed
+    
+    def _iter_files(self):
+        if not self.available:
+            return
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                if name.endswith('.pkl'):
+                    yield os.path.join(root, name)
+    
+    @staticmethod
+    def _unlink(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
 
 
 class HybridCache:
-    """메모리 + Redis 하이브리드 캐시"""
+    """메모리 → 로컬 디스크 → Redis 다계층 캐시"""
+    
+    # 메모리 계층은 프로세스별이라 다른 프로세스의 갱신/무효화를 모르므로 짧게 보관 (초)
+    MEMORY_TTL_SECONDS = 300
     
     def __init__(self, 
                  memory_cache_mb: int = 50,
                  redis_host: str = "localhost",
                  redis_port: int = 6379,
-                 redis_password: Optional[str] = None):
+                 redis_password: Optional[str] = None,
+                 disk_cache_dir: Optional[str] = None,
+                 disk_cache_mb: int = 500,
+                 redis_client: Optional[Any] = None):
         
         # 레벨 1: 메모리 캐시 (빠름)
         self.memory_cache = MemoryCache(max_size_mb=memory_cache_mb)
         
-        # 레벨 2: Redis 캐시 (지속성)
+        # 레벨 2: 로컬 디스크 캐시 (같은 호스트 프로세스 간 공유, Redis 대체)
+        self.disk_cache = DiskCache(disk_cache_dir, max_size_mb=disk_cache_mb) if disk_cache_dir else None
+        
+        # 레벨 3: Redis 캐시 (지속성, 호스트 간 공유)
         self.redis_cache = RedisCache(
             host=redis_host, 
             port=redis_port, 
-            password=redis_password
+            password=redis_password,
+            client=redis_client
         )
         
+        # 이 프로세스에서 저장한 태그 → 키 (Redis가 없어도 메모리/디스크 계층을 태그로 무효화)
+        self._tag_index: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self._tag_lock = threading.Lock()
+        
         logger.info("HybridCache 초기화 완료")
     
+    def _memory_ttl(self, ttl_seconds: Optional[int]) -> int:
+        return min(ttl_seconds, self.MEMORY_TTL_SECONDS) if ttl_seconds else self.MEMORY_TTL_SECONDS
+    
     def get(self, key: str) -> Optional[Any]:
-        """캐시에서 값 조회 (메모리 -> Redis 순)"""
+        """캐시에서 값 조회 (메모리 -> 디스크 -> Redis 순, 찾으면 위 계층에 복사)"""
         # 1. 메모리 캐시 확인
         value = self.memory_cache.get(key)
         if value is not None:
             return value
         
-        # 2. Redis 캐시 확인
-        value = self.redis_cache.get(key)
+        # 2. 디스크 캐시 확인
+        if self.disk_cache is not None:
+            value = self.disk_cache.get(key)
+            if value is not None:
+                self.memory_cache.set(key, value, ttl_seconds=self.MEMORY_TTL_SECONDS)
+                return value
+        
+        # 3. Redis 캐시 확인
+        value, remaining, tags = self.redis_cache.get_entry(key)
         if value is not None:
-            # 메모리 캐시에 복사 (자주 사용되는 데이터)
-            self.memory_cache.set(key, value, ttl_seconds=300)  # 5분
+            # 위 계층에 복사 - Redis 값보다 오래 남지 않게 하고 태그 무효화 대상에도 등록
+            ttl_seconds = REDIS_BACKFILL_TTL_SECONDS
+            if remaining is not None:
+                ttl_seconds = max(1, min(ttl_seconds, int(remaining)))
+            self._index_tags(key, tags)
+            self.memory_cache.set(key, value, self._memory_ttl(ttl_seconds))
+            if self.disk_cache is not None:
+                self.disk_cache.set(key, value, ttl_seconds=ttl_seconds)
             return value
         
         return None
     
-    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
-        """캐시에 값 저장 (양쪽 모두)"""
+    def _index_tags(self, key: str, tags: Iterable[str]):
+        """이 프로세스의 태그 색인에 키 등록"""
+        if not tags:
+            return
+        with self._tag_lock:
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+                self._tag_index.move_to_end(tag)
+            while len(self._tag_index) > LOCAL_TAG_INDEX_SIZE:
+                self._tag_index.popitem(last=False)
+    
+    def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None,
+            tags: Iterable[str] = ()):
+        """캐시에 값 저장 (모든 계층, 태그가 있으면 태그 단위로 무효화 가능)"""
+        tags = tuple(tags)
+        self._index_tags(key, tags)
+        
         # 메모리 캐시에 저장
-        self.memory_cache.set(key, value, ttl_seconds)
+        self.memory_cache.set(key, value, self._memory_ttl(ttl_seconds))
+        
+        # 디스크 캐시에 저장
+        if self.disk_cache is not None:
+            self.disk_cache.set(key, value, ttl_seconds)
         
         # Redis 캐시에 저장
-        self.redis_cache.set(key, value, ttl_seconds)
+        self.redis_cache.set(key, value, ttl_seconds, tags=tags)
     
     def delete(self, key: str) -> bool:
-        """캐시에서 값 삭제"""
+        """캐시에서 값 삭제 (모든 계층)"""
         mem_deleted = self.memory_cache.delete(key)
+        disk_deleted = self.disk_cache.delete(key) if self.disk_cache is not None else False
         redis_deleted = self.redis_cache.delete(key)
-        return mem_deleted or redis_deleted
+        return mem_deleted or disk_deleted or redis_deleted
+    
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        태그가 붙은 키를 모든 계층에서 삭제
+        
+        다른 프로세스가 저장한 키는 Redis 태그 집합으로 찾습니다.
+        
+        Returns:
+            삭제 대상 키 수
+        """
+        with self._tag_lock:
+            keys = self._tag_index.pop(tag, set())
+        keys.update(self.redis_cache.invalidate_tag(tag))
+        
+        for key in keys:
+            self.memory_cache.delete(key)
+            if self.disk_cache is not None:
+                self.disk_cache.delete(key)
+        return len(keys)
     
     def clear(self):
         """전체 캐시 삭제"""
         self.memory_cache.clear()
+        if self.disk_cache is not None:
+            self.disk_cache.clear()
+        with self._tag_lock:
+            self._tag_index.clear()
         self.redis_cache.clear_pattern("*")
     
     def get_stats(self) -> Dict[str, Any]:
         """캐시 통계"""
         return {
             "memory_cache": self.memory_cache.get_stats(),
+            "disk_available": self.disk_cache is not None and self.disk_cache.available,
             "redis_available": self.redis_cache.available
         }
 
@@ -369,17 +818,30 @@ class HybridCache:
 class CacheManager:
     """캐시 관리자"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[HybridCache] = None):
+        if cache is not None:
+            # 이미 구성한 캐시 사용 (fakeredis 등)
+            self.cache = cache
+            return
+        
         # Redis 설정 (환경변수에서)
         redis_host = os.getenv("REDIS_HOST", "localhost")
         redis_port = int(os.getenv("REDIS_PORT", "6379"))
         redis_password = os.getenv("REDIS_PASSWORD")
         
+        # 디스크 캐시 (DISK_CACHE_ENABLED=false로 끔)
+        disk_cache_dir = None
+        if os.getenv("DISK_CACHE_ENABLED", "true").lower() == "true":
+            from config.settings import Settings
+            disk_cache_dir = os.path.join(Settings.paths.cache_dir, "artifacts")
+        
         self.cache = HybridCache(
             memory_cache_mb=50,
             redis_host=redis_host,
             redis_port=redis_port,
-            redis_password=redis_password
+            redis_password=redis_password,
+            disk_cache_dir=disk_cache_dir,
+            disk_cache_mb=int(os.getenv("DISK_CACHE_MAX_MB", "500"))
         )
         
         logger.info("CacheManager 초기화 완료")
@@ -392,8 +854,45 @@ class CacheManager:
         
         return f"{prefix}:{identifier}"
     
+    # 비디오별 캐시 키 prefix (URL 또는 비디오 ID로 저장될 수 있음)
+    VIDEO_KEY_PREFIXES = ("analysis", "metadata", "scenes", "scene_list", "ytdlp_info")
+    
+    @staticmethod
+    def _video_tag(identifier: str) -> str:
+        """비디오 태그 (URL이면 비디오 ID를 추출해 URL 형식과 관계없이 같은 태그)"""
+        try:
+            _, identifier = parse_video_url(identifier)
+        except ValueError:
+            pass  # 이미 비디오 ID
+        return f"video:{identifier}"
+    
+    def get_url_identity(self, video_url: str) -> Optional[Dict[str, str]]:
+        """URL → 플랫폼/비디오 ID 캐시 조회"""
+        key = self._make_cache_key("url", video_url)
+        return self.cache.get(key)
+    
+    def set_url_identity(self, video_url: str, platform: str, video_id: str,
+                         ttl_hours: int = 720):  # 30일 (URL과 ID의 대응은 바뀌지 않음)
+        """URL → 플랫폼/비디오 ID 캐시 저장"""
+        key = self._make_cache_key("url", video_url)
+        self.cache.set(key, {"platform": platform, "video_id": video_id}, ttl_hours * 3600)
+    
+    def get_video_info(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """yt-dlp 정보 딕셔너리 캐시 조회"""
+        key = self._make_cache_key("ytdlp_info", video_id)
+        return self.cache.get(key)
+    
+    def set_video_info(self, video_id: str, info: Dict[str, Any], ttl_minutes: int = 60):
+        """
+        yt-dlp 정보 딕셔너리 캐시 저장
+        
+        정보에 포함된 스트림 URL은 서명이 만료되므로 짧게 보관합니다.
+        """
+        key = self._make_cache_key("ytdlp_info", video_id)
+        self.cache.set(key, info, ttl_minutes * 60, tags=[self._video_tag(video_id)])
+    
     def get_video_analysis(self, video_url: str) -> Optional[Dict[str, Any]]:
-        """비디오 분석 결과 캐시 조회"""
+        """비디오 분석 결과 캐시 조회 (video_url 대신 비디오 ID도 가능)"""
         key = self._make_cache_key("analysis", video_url)
         return self.cache.get(key)
     
@@ -402,11 +901,11 @@ class CacheManager:
         """비디오 분석 결과 캐시 저장"""
         key = self._make_cache_key("analysis", video_url)
         ttl_seconds = ttl_hours * 3600
-        self.cache.set(key, analysis_result, ttl_seconds)
+        self.cache.set(key, analysis_result, ttl_seconds, tags=[self._video_tag(video_url)])
         logger.info(f"분석 결과 캐시됨: {video_url}")
     
     def get_video_metadata(self, video_url: str) -> Optional[Dict[str, Any]]:
-        """비디오 메타데이터 캐시 조회"""
+        """비디오 메타데이터 캐시 조회 (video_url 대신 비디오 ID도 가능)"""
         key = self._make_cache_key("metadata", video_url)
         return self.cache.get(key)
     
@@ -415,7 +914,7 @@ class CacheManager:
         """비디오 메타데이터 캐시 저장"""
         key = self._make_cache_key("metadata", video_url)
         ttl_seconds = ttl_hours * 3600
-        self.cache.set(key, metadata, ttl_seconds)
+        self.cache.set(key, metadata, ttl_seconds, tags=[self._video_tag(video_url)])
     
     def get_scene_images(self, video_id: str) -> Optional[List[str]]:
         """씬 이미지 경로 캐시 조회"""
@@ -427,22 +926,41 @@ class CacheManager:
         """씬 이미지 경로 캐시 저장"""
         key = self._make_cache_key("scenes", video_id)
         ttl_seconds = ttl_hours * 3600
-        self.cache.set(key, image_paths, ttl_seconds)
+        self.cache.set(key, image_paths, ttl_seconds, tags=[self._video_tag(video_id)])
     
-    def invalidate_video(self, video_url: str):
-        """특정 비디오 관련 캐시 무효화"""
-        video_id = hashlib.md5(video_url.encode()).hexdigest()
+    def get_scene_list(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """씬 추출 결과 캐시 조회 ({"precision_level", "scenes": [Scene 딕셔너리]})"""
+        key = self._make_cache_key("scene_list", video_id)
+        return self.cache.get(key)
+    
+    def set_scene_list(self, video_id: str, precision_level: int, scenes: List[Dict[str, Any]],
+                       ttl_hours: int = 72):  # 3일
+        """씬 추출 결과 캐시 저장"""
+        key = self._make_cache_key("scene_list", video_id)
+        self.cache.set(key, {"precision_level": precision_level, "scenes": scenes}, ttl_hours * 3600,
+                       tags=[self._video_tag(video_id)])
+    
+    def invalidate_video(self, video_url: Optional[str] = None, video_id: Optional[str] = None):
+        """
+        특정 비디오 관련 캐시 무효화
         
-        keys_to_delete = [
-            self._make_cache_key("analysis", video_url),
-            self._make_cache_key("metadata", video_url),
-            self._make_cache_key("scenes", video_id)
-        ]
+        비디오 태그가 붙은 키(다른 프로세스가 저장한 키 포함)를 지우고, 태그 없이 저장된
+        이전 키도 남지 않도록 URL/비디오 ID로 만든 키를 함께 지웁니다.
+        URL → ID 대응은 바뀌지 않으므로 남겨 둡니다.
+        """
+        if video_id is None and video_url:
+            identity = self.get_url_identity(video_url)
+            video_id = identity["video_id"] if identity else None
+        
+        identifiers = [identifier for identifier in (video_url, video_id) if identifier]
+        tags = {self._video_tag(identifier) for identifier in identifiers}
         
-        for key in keys_to_delete:
-            self.cache.delete(key)
+        deleted = sum(self.cache.invalidate_tag(tag) for tag in tags)
+        for identifier in identifiers:
+            for prefix in self.VIDEO_KEY_PREFIXES:
+                self.cache.delete(self._make_cache_key(prefix, identifier))
         
-        logger.info(f"비디오 캐시 무효화: {video_url}")
+        logger.info(f"비디오 캐시 무효화: {video_id or video_url} (태그 키 {deleted}개)")
     
     def get_stats(self) -> Dict[str, Any]:
         """캐시 통계"""
@@ -451,7 +969,8 @@ class CacheManager:
     def cleanup(self):
         """캐시 정리"""
         # 메모리 캐시의 만료된 항목 정리는 자동으로 수행됨
-        pass
+        if self.cache.disk_cache is not None:
+            self.cache.disk_cache.cleanup()
 
 
 # 싱글톤 인스턴스
@@ -469,6 +988,9 @@ def get_cache_manager() -> CacheManager:
     return _cache_manager
 
 
+_cached_flights = SingleFlight("cached")
+
+
 def cached(ttl_seconds: int = 3600, key_func: Optional[Callable] = None):
     """함수 결과 캐싱 데코레이터"""
     def decorator(func):
@@ -494,14 +1016,22 @@ def cached(ttl_seconds: int = 3600, key_func: Optional[Callable] = None):
                 logger.debug(f"캐시 히트: {func.__name__}")
                 return cached_result
             
-            # 함수 실행
-            result = func(*args, **kwargs)
-            
-            # 결과 캐싱
-            cache.cache.set(cache_key, result, ttl_seconds)
-            logger.debug(f"함수 결과 캐시됨: {func.__name__}")
+            def compute():
+                # 앞선 리더가 방금 저장했을 수 있으므로 한 번 더 확인
+                result = cache.cache.get(cache_key)
+                if result is not None:
+                    return result
+                
+                # 함수 실행
+                result = func(*args, **kwargs)
+                
+                # 결과 캐싱
+                cache.cache.set(cache_key, result, ttl_seconds)
+                logger.debug(f"함수 결과 캐시됨: {func.__name__}")
+                return result
             
-            return result
+            # 같은 키의 동시 미스는 한 번만 실행 (캐시 스탬피드 방지)
+            return _cached_flights.do(cache_key, compute)
         
         return wrapper
     return decorator
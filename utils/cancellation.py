@@ -0,0 +1,170 @@
+# utils/cancellation.py
+"""
+협력적 작업 취소
+작업 큐 → 파이프라인 → 다운로드/씬 추출/업로드까지 같은 토큰을 전달하고,
+긴 루프는 주기적으로 토큰을 확인하며, 외부 프로세스(ffmpeg 등)는 취소 시 종료합니다.
+"""
+
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Set
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class TaskCancelledError(Exception):
+    """작업이 취소되었을 때 발생"""
+    pass
+
+
+class CancellationToken:
+    """작업 취소 토큰 (스레드 안전)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: Set[subprocess.Popen] = set()
+        self.reason: Optional[str] = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "사용자 취소"):
+        """취소 요청 - 등록된 자식 프로세스도 종료"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            processes = list(self._processes)
+
+        for process in processes:
+            self._kill(process)
+
+        logger.info(f"작업 취소 요청: {reason} (종료한 프로세스 {len(processes)}개)")
+
+    def raise_if_cancelled(self):
+        """취소되었으면 TaskCancelledError 발생"""
+        if self._event.is_set():
+            raise TaskCancelledError(self.reason or "작업 취소됨")
+
+    def wait(self, timeout: float) -> bool:
+        """취소되거나 timeout이 지날 때까지 대기 (취소 여부 반환)"""
+        return self._event.wait(timeout)
+
+    @contextmanager
+    def track_process(self, process: subprocess.Popen):
+        """자식 프로세스 등록 (취소 시 종료 대상)"""
+        with self._lock:
+            cancelled = self._event.is_set()
+            if not cancelled:
+                self._processes.add(process)
+
+        if cancelled:
+            self._kill(process)
+
+        try:
+            yield process
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+    @staticmethod
+    def _kill(process: subprocess.Popen):
+        """프로세스 종료 (terminate 후 응답 없으면 kill)"""
+        if process.poll() is not None:
+            return
+        try:
+            process.terminate()
+            try:
+                process.wait(timeout=3)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        except Exception as e:
+            logger.warning(f"자식 프로세스 종료 실패 (pid={process.pid}): {e}")
+
+
+def check_cancelled(cancel_token: Optional[CancellationToken]):
+    """토큰이 있고 취소되었으면 TaskCancelledError 발생"""
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+
+@contextmanager
+def watch_cancel_file(path: Optional[str], interval: float = 0.5) -> Iterator[CancellationToken]:
+    """
+    파일이 생기면 취소되는 토큰 (다른 프로세스에서 보낸 취소 신호용)
+
+    프로세스 풀 워커처럼 토큰을 직접 받을 수 없는 곳에서 사용합니다. 요청한 쪽이
+    path에 파일을 만들면 interval 안에 토큰이 취소되고 등록된 자식 프로세스도 종료됩니다.
+    """
+    token = CancellationToken()
+    if not path:
+        yield token
+        return
+
+    stopped = threading.Event()
+
+    def poll():
+        while not stopped.wait(interval):
+            if os.path.exists(path):
+                token.cancel("취소 신호 파일 감지")
+                return
+
+    watcher = threading.Thread(target=poll, name="cancel-file-watcher", daemon=True)
+    watcher.start()
+    try:
+        yield token
+    finally:
+        stopped.set()
+
+
+def run_process(cmd, cancel_token: Optional[CancellationToken] = None,
+                **kwargs) -> subprocess.CompletedProcess:
+    """
+    취소 가능한 subprocess.run
+
+    토큰이 없으면 subprocess.run과 동일하게 동작하고, 토큰이 있으면
+    실행 중인 프로세스를 토큰에 등록해 취소 시 즉시 종료합니다.
+    """
+    if cancel_token is None:
+        return subprocess.run(cmd, **kwargs)
+
+    cancel_token.raise_if_cancelled()
+
+    check = kwargs.pop("check", False)
+    input_data = kwargs.pop("input", None)
+    if input_data is not None:
+        # subprocess.run과 같이 input이 있으면 stdin 파이프 연결
+        kwargs["stdin"] = subprocess.PIPE
+    timeout = kwargs.pop("timeout", None)
+    if kwargs.pop("capture_output", False):
+        kwargs["stdout"] = subprocess.PIPE
+        kwargs["stderr"] = subprocess.PIPE
+
+    with subprocess.Popen(cmd, **kwargs) as process:
+        with cancel_token.track_process(process):
+            try:
+                stdout, stderr = process.communicate(input_data, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+
+    cancel_token.raise_if_cancelled()
+
+    if check and process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, cmd, stdout, stderr)
+    return subprocess.CompletedProcess(cmd, process.returncode, stdout, stderr)
+
+
+def ytdlp_cancel_hook(cancel_token: Optional[CancellationToken]):
+    """yt-dlp progress_hooks 용 훅 - 청크마다 취소 여부 확인"""
+    def hook(_status):
+        check_cancelled(cancel_token)
+    return hook
@@ -0,0 +1,127 @@
+# utils/codec_benchmark.py
+"""
+캐시 코덱 벤치마크
+분석 결과/영상 메타데이터/씬 목록 값을 직렬화 방식과 압축 방식 조합별로
+인코딩/디코딩해 크기와 처리 시간을 비교합니다. 기준(pickle+none)은 이전 RedisCache 방식입니다.
+
+--db 로 TinyDB 파일(data/video_analysis.json)을 지정하면 실제 저장된 분석/영상 레코드를 사용합니다.
+
+사용법:
+    python -m utils.codec_benchmark
+    python -m utils.codec_benchmark --db data/video_analysis.json --rounds 200
+"""
+
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from utils.cache_codec import (
+    CacheCodec, LZ4_AVAILABLE, MSGPACK_AVAILABLE, ORJSON_AVAILABLE, ZSTD_AVAILABLE
+)
+
+
+def _sample_payloads() -> Dict[str, List[Any]]:
+    """파이프라인이 캐시에 넣는 값과 같은 구조의 예시 값"""
+    analysis = {
+        "genre": "뷰티/코스메틱",
+        "reasoning": "제품 클로즈업과 사용 전후 비교 장면이 반복되며, 밝은 톤의 조명과 "
+                     "빠른 컷 전환으로 제품의 질감을 강조하는 전형적인 뷰티 광고 구성입니다. " * 4,
+        "features": "1. 제품 클로즈업 2. 모델 사용 장면 3. 자막으로 핵심 성분 강조 " * 3,
+        "tags": ["뷰티", "스킨케어", "광고", "클로즈업", "밝은톤", "모델", "제품소개", "감성"],
+        "expression_style": "실사",
+        "mood_tone": "밝고 산뜻한",
+        "target_audience": "20-30대 여성",
+        "analyzed_scenes": [f"scene_{i:04d}.jpg" for i in range(10)],
+        "token_usage": {"prompt_tokens": 12840, "completion_tokens": 912},
+        "model_used": "openai:gpt-4o",
+        "analysis_date": "2025-01-01T12:00:00",
+    }
+    metadata = {
+        "video_id": "dQw4w9WgXcQ",
+        "platform": "youtube",
+        "title": "브랜드 캠페인 영상 - 15초 버전",
+        "uploader": "Brand Official",
+        "duration": 15.0,
+        "view_count": 1234567,
+        "description": "캠페인 설명 문구와 해시태그 #뷰티 #스킨케어 " * 10,
+        "tags": [f"tag{i}" for i in range(20)],
+        "thumbnail": "https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg",
+        "upload_date": "20250101",
+    }
+    scenes = {
+        "precision_level": 5,
+        "scenes": [{"timestamp": i * 0.5, "frame_path": f"data/temp/dQw4w9WgXcQ/scene_{i:04d}.jpg",
+                    "scene_type": "mid", "grouped": i % 3 == 0} for i in range(60)],
+    }
+    return {"analysis": [analysis], "metadata": [metadata], "scene_list": [scenes]}
+
+
+def _load_db_payloads(db_path: str) -> Dict[str, List[Any]]:
+    """TinyDB JSON 파일에서 분석/영상 레코드 로드"""
+    with open(db_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        "analysis": list(data.get("analyses", {}).values()),
+        "metadata": list(data.get("videos", {}).values()),
+    }
+
+
+def _codecs() -> Dict[str, CacheCodec]:
+    """설치된 라이브러리로 만들 수 있는 조합"""
+    serializers = ["pickle"] + (["msgpack"] if MSGPACK_AVAILABLE else []) + (["orjson"] if ORJSON_AVAILABLE else [])
+    compressions = ["none", "zlib"] + (["zstd"] if ZSTD_AVAILABLE else []) + (["lz4"] if LZ4_AVAILABLE else [])
+    return {f"{s}+{c}": CacheCodec(serializer=s, compression=c)
+            for s in serializers for c in compressions}
+
+
+def run_benchmark(payloads: Dict[str, List[Any]], rounds: int) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """값 종류 × 코덱별 평균 크기(bytes), 인코딩/디코딩 시간(µs)"""
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for kind, values in payloads.items():
+        if not values:
+            continue
+        results[kind] = {}
+        for name, codec in _codecs().items():
+            encoded = [codec.encode(value) for value in values]
+
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for value in values:
+                    codec.encode(value)
+            encode_us = (time.perf_counter() - started) / (rounds * len(values)) * 1e6
+
+            started = time.perf_counter()
+            for _ in range(rounds):
+                for data in encoded:
+                    codec.decode(data)
+            decode_us = (time.perf_counter() - started) / (rounds * len(values)) * 1e6
+
+            results[kind][name] = {
+                "bytes": sum(len(data) for data in encoded) / len(encoded),
+                "encode_us": encode_us,
+                "decode_us": decode_us,
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="캐시 코덱 크기/속도 비교")
+    parser.add_argument("--db", help="TinyDB 파일 경로 (지정하면 실제 분석/영상 레코드 사용)")
+    parser.add_argument("--rounds", type=int, default=500, help="값마다 반복 횟수")
+    args = parser.parse_args()
+
+    payloads = _load_db_payloads(args.db) if args.db else _sample_payloads()
+    results = run_benchmark(payloads, args.rounds)
+
+    for kind, by_codec in results.items():
+        baseline = by_codec["pickle+none"]
+        print(f"\n[{kind}] 값 {len(payloads[kind])}개, 반복 {args.rounds}회 (기준: pickle+none)")
+        print(f"  {'코덱':<16}{'크기(B)':>10}{'비율':>8}{'인코딩(µs)':>14}{'디코딩(µs)':>14}")
+        for name, r in sorted(by_codec.items(), key=lambda item: item[1]["bytes"]):
+            print(f"  {name:<16}{r['bytes']:>10,.0f}{r['bytes'] / baseline['bytes']:>8.2f}"
+                  f"{r['encode_us']:>14.1f}{r['decode_us']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,70 @@
 # utils/logger.py
+import contextvars
 import logging
 import os
-from datetime import datetime
-import streamlit as st
-from typing import Optional
 import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator, Optional
 
-class StreamlitLogHandler(logging.Handler):
-    """Streamlit 세션에 로그를 저장하는 핸들러"""
+# 스트림별 최근 INFO 로그 수 (deque.append는 원자적이라 추가에는 락 불필요)
+LOG_BUFFER_SIZE = 50
+
+# 보관하는 작업 스트림 수 (넘으면 가장 먼저 만든 스트림부터 버림)
+LOG_STREAM_LIMIT = 256
+
+# 현재 실행 중인 작업의 로그 스트림 (None이면 작업 밖의 프로세스 로그)
+_log_stream: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("log_stream", default=None)
+_log_buffers: "OrderedDict[Optional[str], deque]" = OrderedDict()
+_log_buffers_lock = threading.Lock()
+
+
+def _get_log_buffer(stream: Optional[str]) -> deque:
+    """스트림의 링 버퍼 (없으면 생성)"""
+    buffer = _log_buffers.get(stream)
+    if buffer is not None:
+        return buffer
+    with _log_buffers_lock:
+        buffer = _log_buffers.get(stream)
+        if buffer is None:
+            buffer = _log_buffers[stream] = deque(maxlen=LOG_BUFFER_SIZE)
+            while len(_log_buffers) > LOG_STREAM_LIMIT:
+                oldest = next(key for key in _log_buffers if key is not None)
+                del _log_buffers[oldest]
+        return buffer
+
+
+@contextmanager
+def log_stream(stream: Optional[str]) -> Iterator[None]:
+    """
+    이 블록(과 copy_context로 넘긴 스레드)의 로그를 stream 버퍼에 모음
     
-    def __init__(self):
-        super().__init__()
-        self._lock = threading.Lock()
+    작업 ID를 키로 쓰므로 진행 버스처럼 세션마다 자기 작업의 로그만 보게 됩니다.
+    """
+    token = _log_stream.set(stream)
+    try:
+        yield
+    finally:
+        _log_stream.reset(token)
+
+
+class StreamlitLogHandler(logging.Handler):
+    """UI 표시용 최근 로그를 작업 스트림별 링 버퍼에 저장하는 핸들러
+
+    워커 스레드에서 st.session_state에 쓰지 않으며, 화면은 get_recent_logs로 읽습니다.
+    """
     
     def emit(self, record):
-        """로그 레코드를 Streamlit 세션 상태에 추가"""
+        """INFO 레코드의 메시지만 현재 스트림 버퍼에 추가 (포맷팅 없음)"""
+        if record.levelno != logging.INFO:
+            return
         try:
-            # Streamlit 세션이 있는지 확인
-            if hasattr(st, 'session_state'):
-                with self._lock:
-                    # 로그 버퍼가 없으면 생성
-                    if 'log_buffer' not in st.session_state:
-                        st.session_state.log_buffer = []
-                    
-                    # 로그 메시지 포맷팅
-                    msg = self.format(record)
-                    
-                    # INFO 레벨만 저장하고, 메시지 부분만 추출
-                    if record.levelname == 'INFO':
-                        # 메시지에서 INFO 이후 부분만 추출
-                        parts = msg.split(' - ')
-                        if len(parts) >= 4:
-                            clean_msg = parts[3]  # 실제 메시지 부분
-                            
-                            # 로그 버퍼에 추가 (최대 50개 유지)
-                            st.session_state.log_buffer.append({
-                                'time': datetime.now(),
-                                'message': clean_msg,
-                                'level': record.levelname
-                            })
-                            
-                            # 버퍼 크기 제한
-                            if len(st.session_state.log_buffer) > 50:
-                                st.session_state.log_buffer.pop(0)
+            _get_log_buffer(_log_stream.get()).append({
+                'time': datetime.fromtimestamp(record.created),
+                'message': record.getMessage(),
+                'level': record.levelname
+            })
         except Exception:
             # 로깅 중 오류는 무시
             pass
@@ -87,7 +109,6 @@ def get_logger(name: str) -> logging.Logger:
     )
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
-    streamlit_handler.setFormatter(formatter)
     
     # 핸들러 추가
     logger.addHandler(file_handler)
@@ -97,14 +118,13 @@ def get_logger(name: str) -> logging.Logger:
     return logger
 
 
-def get_recent_logs(count: int = 10) -> list:
-    """최근 로그 메시지 가져오기"""
-    if hasattr(st, 'session_state') and 'log_buffer' in st.session_state:
-        return st.session_state.log_buffer[-count:]
-    return []
+def get_recent_logs(count: int = 10, stream: Optional[str] = None) -> list:
+    """최근 로그 메시지 가져오기 (stream: 작업 ID, None이면 작업 밖의 로그)"""
+    buffer = _log_buffers.get(stream)
+    return list(buffer)[-count:] if buffer else []
 
 
-def clear_log_buffer():
+def clear_log_buffer(stream: Optional[str] = None):
     """로그 버퍼 초기화"""
-    if hasattr(st, 'session_state') and 'log_buffer' in st.session_state:
-        st.session_state.log_buffer = []
\ No newline at end of file
+    with _log_buffers_lock:
+        _log_buffers.pop(stream, None)
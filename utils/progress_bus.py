@@ -0,0 +1,165 @@
+# utils/progress_bus.py
+"""
+작업 진행 이벤트 버스
+워커 스레드는 작업별 고정 크기 링 버퍼에 진행 이벤트를 추가하고,
+UI(Streamlit 재실행)는 자신이 읽은 위치(offset) 이후의 이벤트만 가져갑니다.
+워커가 st.session_state나 위젯을 직접 건드리지 않으므로 스레드 간 경합이 없고,
+같은 스테이지의 잦은 진행률 갱신은 합쳐져(coalescing) 버퍼를 덮어쓰지 않습니다.
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# 작업당 보관 이벤트 수 (넘으면 가장 오래된 이벤트부터 덮어씀)
+PROGRESS_BUFFER_SIZE = int(os.getenv("PROGRESS_BUFFER_SIZE", "256"))
+
+# 같은 스테이지의 진행률만 바뀐 이벤트는 이 간격(초) 안에서 하나로 합침
+PROGRESS_COALESCE_SECONDS = float(os.getenv("PROGRESS_COALESCE_SECONDS", "0.25"))
+
+# 종료된 작업 스트림 보관 시간 (초)
+PROGRESS_STREAM_TTL = 600
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """진행 이벤트 (불변)"""
+    seq: int
+    timestamp: float
+    stage: str
+    progress: int
+    message: str
+    detail: Optional[str] = None
+
+
+class ProgressStream:
+    """
+    작업 하나의 이벤트 링 버퍼
+
+    쓰기는 짧은 작업별 락으로 순번 부여와 슬롯 기록만 하고,
+    읽기는 락 없이 슬롯을 훑어 순번이 맞는 이벤트만 돌려줍니다.
+    """
+
+    def __init__(self, capacity: int = PROGRESS_BUFFER_SIZE):
+        self.capacity = capacity
+        self._slots: List[Optional[ProgressEvent]] = [None] * capacity
+        self._next_seq = 0  # 다음에 기록할 순번 (= 지금까지 기록된 이벤트 수)
+        self._write_lock = threading.Condition(threading.Lock())
+
+        # 합쳐진 갱신까지 반영한 최신 상태 (읽기 전용 스냅샷으로 교체)
+        self.latest: Optional[ProgressEvent] = None
+        self._last_emitted: Dict[str, Tuple[float, str]] = {}  # stage → (시각, 메시지)
+
+        self.closed = False
+        self.closed_at: Optional[float] = None
+
+    def publish(self, stage: str, progress: int, message: str, detail: Optional[str] = None):
+        """이벤트 추가 (여러 워커 스레드에서 호출 가능)"""
+        now = time.time()
+        with self._write_lock:
+            event = ProgressEvent(self._next_seq, now, stage, int(progress), message, detail)
+            self.latest = event
+
+            # 같은 스테이지에서 메시지 없이 진행률만 조금씩 바뀌면 최신 상태만 갱신
+            last = self._last_emitted.get(stage)
+            if (last is not None and last[1] == message and 0 < event.progress < 100
+                    and now - last[0] < PROGRESS_COALESCE_SECONDS):
+                return
+
+            self._slots[event.seq % self.capacity] = event
+            self._next_seq = event.seq + 1
+            self._last_emitted[stage] = (now, message)
+            self._write_lock.notify_all()
+
+    def read(self, offset: int = 0) -> Tuple[List[ProgressEvent], int]:
+        """
+        offset 이후 이벤트와 다음 offset 반환 (락 없음)
+
+        읽는 속도가 느려 버퍼가 한 바퀴 넘게 돌았으면 남아 있는 이벤트부터 반환합니다.
+        """
+        head = self._next_seq
+        start = max(offset, head - self.capacity)
+        events = []
+        for seq in range(start, head):
+            event = self._slots[seq % self.capacity]
+            # 읽는 사이 덮어쓴 슬롯은 건너뜀
+            if event is not None and event.seq == seq:
+                events.append(event)
+        return events, head
+
+    def wait(self, offset: int, timeout: float) -> bool:
+        """offset 이후 이벤트가 생기거나 스트림이 닫힐 때까지 대기"""
+        with self._write_lock:
+            return self._write_lock.wait_for(
+                lambda: self._next_seq > offset or self.closed, timeout
+            )
+
+    def close(self):
+        with self._write_lock:
+            self.closed = True
+            self.closed_at = time.time()
+            self._write_lock.notify_all()
+
+
+class ProgressBus:
+    """작업 ID별 진행 스트림 레지스트리"""
+
+    def __init__(self):
+        self._streams: Dict[str, ProgressStream] = {}
+        self._lock = threading.Lock()  # 스트림 생성/정리 전용 (이벤트 경로에는 없음)
+
+    def stream(self, job_id: str) -> ProgressStream:
+        """작업 스트림 (없으면 생성)"""
+        stream = self._streams.get(job_id)
+        if stream is not None:
+            return stream
+        with self._lock:
+            stream = self._streams.get(job_id)
+            if stream is None:
+                self._evict_closed()
+                stream = self._streams[job_id] = ProgressStream()
+            return stream
+
+    def publish(self, job_id: str, stage: str, progress: int, message: str,
+                detail: Optional[str] = None):
+        self.stream(job_id).publish(stage, progress, message, detail)
+
+    def read(self, job_id: str, offset: int = 0) -> Tuple[List[ProgressEvent], int]:
+        stream = self._streams.get(job_id)
+        if stream is None:
+            return [], offset
+        return stream.read(offset)
+
+    def latest(self, job_id: str) -> Optional[ProgressEvent]:
+        stream = self._streams.get(job_id)
+        return stream.latest if stream is not None else None
+
+    def close(self, job_id: str):
+        stream = self._streams.get(job_id)
+        if stream is not None:
+            stream.close()
+
+    def _evict_closed(self):
+        """보관 시간이 지난 종료 스트림 정리 (self._lock 보유 상태)"""
+        cutoff = time.time() - PROGRESS_STREAM_TTL
+        expired = [job_id for job_id, stream in self._streams.items()
+                   if stream.closed and stream.closed_at < cutoff]
+        for job_id in expired:
+            del self._streams[job_id]
+
+
+# 싱글톤 인스턴스
+_progress_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_progress_bus() -> ProgressBus:
+    """진행 이벤트 버스 싱글톤 인스턴스 반환"""
+    global _progress_bus
+    if _progress_bus is None:
+        with _bus_lock:
+            if _progress_bus is None:
+                _progress_bus = ProgressBus()
+    return _progress_bus
@@ -0,0 +1,277 @@
+# utils/resource_monitor.py
+"""
+시스템 리소스 샘플러 및 작업 허용(admission) 제어
+백그라운드 스레드가 주기적으로 CPU/메모리/디스크/I/O를 측정해 최근 구간을 보관하므로,
+작업 시작 판단이나 UI 재실행은 측정을 기다리지 않고 마지막 값만 읽습니다.
+허용 판단은 순간값 대신 평활값(EWMA)과 스테이지별 예상 비용을 사용해
+잠깐 튀는 부하에 작업 시작이 흔들리지 않게 합니다.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Iterable, Optional, Tuple
+
+import psutil
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 샘플링 주기 (초) / 보관할 샘플 수
+RESOURCE_SAMPLE_INTERVAL = float(os.getenv("RESOURCE_SAMPLE_INTERVAL", "1.0"))
+RESOURCE_SAMPLE_WINDOW = int(os.getenv("RESOURCE_SAMPLE_WINDOW", "60"))
+
+# 평활 계수 (클수록 최근 값 비중이 큼)
+RESOURCE_EWMA_ALPHA = 0.2
+
+# 허용한 작업의 부하가 측정값에 반영되기까지 예약으로 잡아두는 시간 (초)
+ADMISSION_SETTLE_SECONDS = float(os.getenv("ADMISSION_SETTLE_SECONDS", "15"))
+
+# 한 번 거부하면 한도보다 이만큼(%p) 내려가야 다시 허용 (경계에서 허용/거부 반복 방지)
+ADMISSION_HYSTERESIS = 5.0
+
+
+@dataclass(frozen=True)
+class StageCost:
+    """스테이지 실행 중 예상 점유량"""
+    cpu_cores: float
+    memory_mb: float
+
+
+# 스테이지별 예상 비용 - 다운로드는 네트워크/디스크 대기, FFmpeg는 CPU, AI는 응답 대기가 대부분
+STAGE_COSTS: Dict[str, StageCost] = {
+    "download": StageCost(cpu_cores=0.3, memory_mb=150),
+    "scene_extraction": StageCost(cpu_cores=2.0, memory_mb=400),
+    "ai_analysis": StageCost(cpu_cores=0.2, memory_mb=300),
+    "storage_upload": StageCost(cpu_cores=0.2, memory_mb=100),
+}
+
+# 영상 분석 작업 전체에 쓰는 스테이지
+VIDEO_ANALYSIS_STAGES = ("download", "scene_extraction", "ai_analysis", "storage_upload")
+
+
+@dataclass
+class ResourceSample:
+    """한 번의 측정값"""
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    available_memory_mb: float
+    disk_percent: float
+    disk_read_mbps: float
+    disk_write_mbps: float
+
+
+class ResourceSampler:
+    """백그라운드 리소스 샘플러"""
+
+    def __init__(self, interval: float = RESOURCE_SAMPLE_INTERVAL,
+                 window: int = RESOURCE_SAMPLE_WINDOW, disk_path: str = "/"):
+        self.interval = interval
+        self.disk_path = disk_path
+        self.samples: Deque[ResourceSample] = deque(maxlen=window)
+
+        # 평활값 (샘플러 스레드만 갱신, 읽기는 딕셔너리 교체로 원자적)
+        self.smoothed: Dict[str, float] = {}
+
+        self._last_io: Optional[Tuple[float, Any]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """샘플러 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            # 첫 cpu_percent(interval=None)는 기준점만 잡으므로 미리 호출
+            psutil.cpu_percent(interval=None)
+            self._stop_event.clear()
+            self._sample()
+            self._thread = threading.Thread(target=self._run, name="ResourceSampler", daemon=True)
+            self._thread.start()
+            logger.info(f"리소스 샘플러 시작 (주기 {self.interval}초, 구간 {self.samples.maxlen}개)")
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:
+                logger.debug(f"리소스 샘플링 실패: {e}")
+
+    def _sample(self):
+        now = time.monotonic()
+        memory = psutil.virtual_memory()
+
+        read_mbps = write_mbps = 0.0
+        io = psutil.disk_io_counters()
+        if io is not None:
+            if self._last_io is not None:
+                elapsed = max(now - self._last_io[0], 1e-6)
+                read_mbps = (io.read_bytes - self._last_io[1].read_bytes) / elapsed / (1024 * 1024)
+                write_mbps = (io.write_bytes - self._last_io[1].write_bytes) / elapsed / (1024 * 1024)
+            self._last_io = (now, io)
+
+        sample = ResourceSample(
+            timestamp=time.time(),
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            available_memory_mb=memory.available / (1024 * 1024),
+            disk_percent=psutil.disk_usage(self.disk_path).percent,
+            disk_read_mbps=max(read_mbps, 0.0),
+            disk_write_mbps=max(write_mbps, 0.0),
+        )
+        self.samples.append(sample)
+
+        values = {
+            "cpu_percent": sample.cpu_percent,
+            "memory_percent": sample.memory_percent,
+            "disk_read_mbps": sample.disk_read_mbps,
+            "disk_write_mbps": sample.disk_write_mbps,
+        }
+        previous = self.smoothed
+        self.smoothed = {
+            key: value if key not in previous
+            else previous[key] + RESOURCE_EWMA_ALPHA * (value - previous[key])
+            for key, value in values.items()
+        }
+
+    def latest(self) -> Optional[ResourceSample]:
+        """마지막 측정값 (측정 대기 없음)"""
+        try:
+            return self.samples[-1]
+        except IndexError:
+            return None
+
+    def snapshot(self) -> Dict[str, float]:
+        """현재 사용률 (마지막 측정값 + 평활값)"""
+        if self._thread is None:
+            self.start()
+        sample = self.latest()
+        if sample is None:
+            return {}
+        smoothed = self.smoothed
+        return {
+            "cpu_percent": sample.cpu_percent,
+            "memory_percent": sample.memory_percent,
+            "disk_percent": sample.disk_percent,
+            "available_memory_mb": sample.available_memory_mb,
+            "disk_read_mbps": sample.disk_read_mbps,
+            "disk_write_mbps": sample.disk_write_mbps,
+            "cpu_percent_smoothed": smoothed.get("cpu_percent", sample.cpu_percent),
+            "memory_percent_smoothed": smoothed.get("memory_percent", sample.memory_percent),
+            "sampled_at": sample.timestamp,
+        }
+
+
+class AdmissionController:
+    """평활값과 스테이지 비용으로 새 작업 시작 여부 판단"""
+
+    def __init__(self, sampler: ResourceSampler, max_cpu_percent: float = 70.0,
+                 max_memory_percent: float = 80.0):
+        self.sampler = sampler
+        self.max_cpu_percent = max_cpu_percent
+        self.max_memory_percent = max_memory_percent
+        self.cpu_count = psutil.cpu_count() or 1
+        self.total_memory_mb = psutil.virtual_memory().total / (1024 * 1024)
+
+        # 아직 측정값에 반영되지 않았을 수 있는 최근 허용 작업 (허용 시각, 비용)
+        self._recent: Deque[Tuple[float, StageCost]] = deque()
+        self._throttled = False
+        self._lock = threading.Lock()
+
+    def estimate_cost(self, stages: Iterable[str] = VIDEO_ANALYSIS_STAGES) -> StageCost:
+        """작업의 예상 최대 점유량 (스테이지 중 가장 무거운 값)"""
+        costs = [STAGE_COSTS[stage] for stage in stages if stage in STAGE_COSTS]
+        if not costs:
+            return StageCost(cpu_cores=0.0, memory_mb=0.0)
+        return StageCost(
+            cpu_cores=max(cost.cpu_cores for cost in costs),
+            memory_mb=max(cost.memory_mb for cost in costs),
+        )
+
+    def initial_cost(self, stages: Iterable[str] = VIDEO_ANALYSIS_STAGES) -> StageCost:
+        """
+        허용 직후 예약할 점유량 (첫 스테이지 비용)
+
+        예약은 ADMISSION_SETTLE_SECONDS 동안만 유지되고 그 사이 실행되는 것은 첫 스테이지(다운로드)
+        이므로, 이후 무거운 스테이지의 부하는 예약 대신 측정값으로 반영됩니다.
+        """
+        for stage in stages:
+            if stage in STAGE_COSTS:
+                return STAGE_COSTS[stage]
+        return StageCost(cpu_cores=0.0, memory_mb=0.0)
+
+    def projected_usage(self, cost: Optional[StageCost] = None) -> Tuple[float, float]:
+        """측정 부하 + 최근 허용 작업 예약 (+ 새 작업 비용) 기준 예상 CPU/메모리 사용률 (%)"""
+        with self._lock:
+            return self._projected_usage(cost)
+
+    def _projected_usage(self, cost: Optional[StageCost] = None) -> Tuple[float, float]:
+        """projected_usage 본체 (lock 보유 상태에서 호출)"""
+        usage = self.sampler.snapshot()
+        now = time.monotonic()
+        while self._recent and now - self._recent[0][0] > ADMISSION_SETTLE_SECONDS:
+            self._recent.popleft()
+
+        costs = [c for _, c in self._recent] + ([cost] if cost is not None else [])
+        cpu_cores = sum(c.cpu_cores for c in costs)
+        memory_mb = sum(c.memory_mb for c in costs)
+
+        cpu = usage.get("cpu_percent_smoothed", 0.0) + cpu_cores / self.cpu_count * 100
+        memory = usage.get("memory_percent_smoothed", 0.0) + memory_mb / self.total_memory_mb * 100
+        return min(cpu, 100.0), min(memory, 100.0)
+
+    def try_admit(self, stages: Iterable[str] = VIDEO_ANALYSIS_STAGES) -> bool:
+        """작업 시작 허용 여부 (허용하면 첫 스테이지 비용을 예약)"""
+        cost = self.initial_cost(stages)
+        with self._lock:
+            cpu, memory = self._projected_usage(cost)
+
+            # 다른 부하가 없으면 작업 비용만으로는 거부하지 않음 (코어 수가 적은 서버에서도 최소 1개는 진행)
+            if not self._recent:
+                idle_cpu, idle_memory = self._projected_usage()
+                if idle_cpu <= self.max_cpu_percent and idle_memory <= self.max_memory_percent:
+                    cpu, memory = min(cpu, self.max_cpu_percent), min(memory, self.max_memory_percent)
+
+            margin = ADMISSION_HYSTERESIS if self._throttled else 0.0
+            if cpu > self.max_cpu_percent - margin:
+                self._set_throttled(f"CPU 사용률 과부하 (예상 {cpu:.1f}%)")
+                return False
+            if memory > self.max_memory_percent - margin:
+                self._set_throttled(f"메모리 사용률 과부하 (예상 {memory:.1f}%)")
+                return False
+
+            if self._throttled:
+                logger.info(f"리소스 여유 회복 - 작업 허용 재개 (예상 CPU {cpu:.1f}%, 메모리 {memory:.1f}%)")
+            self._throttled = False
+            self._recent.append((time.monotonic(), cost))
+            return True
+
+    def _set_throttled(self, reason: str):
+        # 거부 상태로 바뀔 때만 경고 (계속 거부 중이면 로그 생략)
+        if not self._throttled:
+            logger.warning(reason)
+        self._throttled = True
+
+
+# 싱글톤 인스턴스
+_resource_sampler = None
+_sampler_lock = threading.Lock()
+
+
+def get_resource_sampler() -> ResourceSampler:
+    """리소스 샘플러 싱글톤 인스턴스 반환 (처음 호출 시 스레드 시작)"""
+    global _resource_sampler
+    if _resource_sampler is None:
+        with _sampler_lock:
+            if _resource_sampler is None:
+                _resource_sampler = ResourceSampler()
+                _resource_sampler.start()
+    return _resource_sampler
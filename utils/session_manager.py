@@ -13,10 +13,10 @@ from datetime import datetime, timedelta
 import streamlit as st
 from dataclasses import dataclass
 from pathlib import Path
-import psutil
 import time
 
 from utils.logger import get_logger
+from utils.resource_monitor import AdmissionController, get_resource_sampler
 from config.settings import Settings
 
 logger = get_logger(__name__)
@@ -224,28 +224,20 @@ class SessionManager:
 
 
 class SystemResourceMonitor:
-    """시스템 리소스 모니터링"""
+    """시스템 리소스 모니터링 (백그라운드 샘플러 값을 읽으므로 호출이 블로킹되지 않음)"""
     
     def __init__(self, max_cpu_percent: float = 70.0, max_memory_percent: float = 80.0):
         self.max_cpu_percent = max_cpu_percent
         self.max_memory_percent = max_memory_percent
+        self.sampler = get_resource_sampler()
+        self.admission = AdmissionController(
+            self.sampler, max_cpu_percent=max_cpu_percent, max_memory_percent=max_memory_percent
+        )
     
     def can_start_new_task(self) -> bool:
         """새 작업 시작 가능 여부"""
         try:
-            # CPU 사용률 체크
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            if cpu_percent > self.max_cpu_percent:
-                logger.warning(f"CPU 사용률 과부하: {cpu_percent:.1f}%")
-                return False
-            
-            # 메모리 사용률 체크
-            memory = psutil.virtual_memory()
-            if memory.percent > self.max_memory_percent:
-                logger.warning(f"메모리 사용률 과부하: {memory.percent:.1f}%")
-                return False
-            
-            return True
+            return self.admission.try_admit()
         except Exception as e:
             logger.error(f"시스템 리소스 모니터링 오류: {e}")
             return True  # 모니터링 실패 시 작업 허용
@@ -253,16 +245,7 @@ class SystemResourceMonitor:
     def get_current_usage(self) -> Dict[str, float]:
         """현재 시스템 사용률"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            
-            return {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "disk_percent": disk.percent,
-                "available_memory_mb": memory.available / (1024 * 1024)
-            }
+            return self.sampler.snapshot()
         except Exception as e:
             logger.error(f"시스템 사용률 조회 오류: {e}")
             return {"error": str(e)}
@@ -0,0 +1,93 @@
+# utils/single_flight.py
+"""
+요청 합치기 (single-flight)
+같은 키로 동시에 들어온 요청 중 첫 번째(리더)만 실제로 실행하고,
+나머지(팔로워)는 리더가 끝날 때까지 기다렸다가 같은 결과(또는 예외)를 받습니다.
+"""
+
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FlightCall:
+    """진행 중인 호출 하나 (리더가 완료하면 팔로워가 결과를 받음)"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.id = uuid.uuid4().hex  # 같은 키라도 호출마다 다름 (진행 스트림 구분용)
+        self.followers = 0
+        self._done = threading.Event()
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def result(self) -> Any:
+        """리더의 결과 반환 (리더가 실패했으면 같은 예외 발생, 완료 전이면 대기)"""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class SingleFlight:
+    """키별 진행 중 호출 레지스트리"""
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._calls: Dict[str, FlightCall] = {}
+        self._lock = threading.Lock()
+
+    def begin(self, key: str) -> Tuple[FlightCall, bool]:
+        """
+        호출 참여
+
+        Returns:
+            (호출, 리더 여부) - 리더는 실행 후 반드시 finish를 호출해야 함
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.followers += 1
+                return call, False
+            call = self._calls[key] = FlightCall(key)
+            return call, True
+
+    def finish(self, call: FlightCall, result: Any = None, error: Optional[BaseException] = None):
+        """리더의 실행 결과를 팔로워에게 전달하고 키를 비움 (이후 요청은 새로 실행)"""
+        with self._lock:
+            if self._calls.get(call.key) is call:
+                del self._calls[call.key]
+        call._result = result
+        call._error = error
+        call._done.set()
+        if call.followers:
+            logger.info(f"[{self.name}] 중복 요청 {call.followers}개가 결과를 공유함: {call.key}")
+
+    def do(self, key: str, func: Callable[[], Any]) -> Any:
+        """같은 키의 동시 호출은 한 번만 실행"""
+        call, is_leader = self.begin(key)
+        if not is_leader:
+            return call.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            self.finish(call, error=e)
+            raise
+        self.finish(call, result=result)
+        return result
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._calls
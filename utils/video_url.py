@@ -0,0 +1,43 @@
+# utils/video_url.py
+"""영상 URL에서 플랫폼/비디오 ID 추출 (무거운 다운로더 모듈 없이 쓸 수 있도록 분리)"""
+
+import re
+from typing import Optional, Tuple
+
+_YOUTUBE_PATTERNS = [
+    r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
+    r'youtu\.be\/([0-9A-Za-z_-]{11})',
+    r'youtube\.com\/embed\/([0-9A-Za-z_-]{11})',
+    r'youtube\.com\/v\/([0-9A-Za-z_-]{11})'
+]
+
+_VIMEO_PATTERNS = [
+    r'vimeo\.com\/(\d+)',
+    r'player\.vimeo\.com\/video\/(\d+)'
+]
+
+
+def parse_video_url(url: str) -> Tuple[str, str]:
+    """URL에서 플랫폼과 비디오 ID 추출 (지원하지 않는 형식이면 ValueError)"""
+    if 'youtube.com' in url or 'youtu.be' in url:
+        for pattern in _YOUTUBE_PATTERNS:
+            match = re.search(pattern, url)
+            if match:
+                return 'youtube', match.group(1)
+
+    elif 'vimeo.com' in url:
+        for pattern in _VIMEO_PATTERNS:
+            match = re.search(pattern, url)
+            if match:
+                return 'vimeo', match.group(1)
+
+    raise ValueError(f"지원하지 않는 비디오 URL 형식입니다: {url}")
+
+
+def video_key(url: str) -> Optional[str]:
+    """URL 형식과 관계없이 같은 영상이면 같은 키 ("platform:video_id"), 알 수 없으면 None"""
+    try:
+        platform, video_id = parse_video_url(url)
+    except ValueError:
+        return None
+    return f"{platform}:{video_id}"
@@ -9,7 +9,7 @@ Database 탭의 삭제 기능 관리 모듈
 import streamlit as st
 import time
 from typing import Optional, Tuple
-from core.database.repository import VideoAnalysisDB as VideoDatabase
+from core.database.repository import get_repository
 from utils.logger import get_logger
 import os
 import shutil
@@ -109,8 +109,12 @@ class DeleteManager:
     def _delete_from_db(self, video_id: str) -> bool:
         """DB에서 삭제"""
         try:
-            db = VideoDatabase()
-            return db.delete_video(video_id)
+            db = get_repository()
+            deleted = db.delete_video(video_id)
+            if deleted:
+                from utils.cache_manager import get_cache_manager
+                get_cache_manager().invalidate_video(video_id=video_id)
+            return deleted
         except Exception as e:
             self.logger.error(f"DB 삭제 오류: {str(e)}")
             return False
@@ -5,7 +5,8 @@ Database 탭의 편집 관련 기능
 
 import streamlit as st
 from typing import Dict, Any
-from core.database.repository import VideoAnalysisDB as VideoDatabase
+from core.database.repository import get_repository
+from utils.cache_manager import get_cache_manager
 from utils.logger import get_logger
 from utils.constants import GENRES
 
@@ -160,7 +161,7 @@ def save_edited_data(video_id: str) -> bool:
         return False
     
     try:
-        db = VideoDatabase()
+        db = get_repository()
         
         # 현재 비디오 데이터 가져오기
         current_video = db.get_video_info(video_id)
@@ -177,7 +178,9 @@ def save_edited_data(video_id: str) -> bool:
         updated_video['uploader'] = edited_data.get('uploader', current_video.get('uploader', ''))
         
         # 비디오 정보 업데이트
+        cache_manager = get_cache_manager()
         db.save_video_info(updated_video)
+        cache_manager.invalidate_video(video_url=current_video.get('url'), video_id=video_id)
         
         # 분석 결과 업데이트
         if edited_data.get('genre') is not None:
@@ -191,6 +194,7 @@ def save_edited_data(video_id: str) -> bool:
             
             # 분석 결과 저장
             db.save_analysis_result(video_id, updated_analysis)
+            cache_manager.invalidate_video(video_url=current_video.get('url'), video_id=video_id)
         
         success = True  # 저장 성공
         
@@ -6,7 +6,7 @@ Database 탭의 무드보드 컴포넌트
 import streamlit as st
 import os
 from typing import Dict, Any, List, Set, Optional
-from core.database.repository import VideoAnalysisDB as VideoDatabase
+from core.database.repository import get_repository
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -45,7 +45,7 @@ def render_inline_moodboard(video_id: str):
 
 def get_video_with_scenes(video_id: str) -> Optional[Dict[str, Any]]:
     """비디오 정보와 씬 정보 가져오기"""
-    db = VideoDatabase()
+    db = get_repository()
     
     try:
         # 비디오 정보 가져오기
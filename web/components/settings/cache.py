@@ -34,6 +34,10 @@ def render_cache_management():
     # 캐시 통계 표시
     render_cache_statistics(cache_info)
     
+    # 저장소 조회 캐시 통계
+    st.markdown("---")
+    render_repository_cache_statistics()
+    
     # 캐시 상세 정보
     st.markdown("---")
     render_cache_details(cache_info)
@@ -183,6 +187,33 @@ def render_cache_statistics(cache_info: Dict):
                 st.metric(label, f"{count}개")
 
 
+def render_repository_cache_statistics():
+    """저장소 조회 캐시 (DB 읽기 캐시) 통계 표시"""
+    st.markdown("### 🗄️ DB 조회 캐시")
+    
+    try:
+        from core.database import get_repository
+        stats = get_repository().get_cache_stats()
+    except Exception as e:
+        logger.error(f"DB 조회 캐시 통계 조회 실패: {e}")
+        st.info("DB 조회 캐시 통계를 불러올 수 없습니다.")
+        return
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric("적중률", f"{stats['hit_rate'] * 100:.1f}%")
+    
+    with col2:
+        st.metric("적중 / 미스", f"{stats['hits']:,} / {stats['misses']:,}")
+    
+    with col3:
+        st.metric("무효화", f"{stats['invalidations']:,}회")
+    
+    with col4:
+        st.metric("캐시 엔트리", f"{stats['entries_count']}개")
+
+
 def render_cache_details(cache_info: Dict):
     """캐시 상세 정보"""
     with st.expander("📋 세션별 상세 정보"):
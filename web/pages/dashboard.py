@@ -11,13 +11,14 @@ import pandas as pd
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Any
-import psutil
 import os
 
 from utils.session_manager import get_session_manager
 from core.queue.task_queue import get_task_queue
 from utils.cache_manager import get_cache_manager
+from utils.resource_monitor import get_resource_sampler
 from core.database.concurrent_db import get_database
+from core.database.repository import get_repository
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -51,6 +52,9 @@ def render_dashboard_tab():
         render_queue_status_chart()
         render_performance_metrics()
     
+    # 데이터베이스 커넥션 풀 / 쿼리 지연시간
+    render_database_metrics()
+    
     # 자동 새로고침
     if st.sidebar.button("🔄 수동 새로고침"):
         st.rerun()
@@ -140,10 +144,10 @@ def render_system_resources_chart():
     """시스템 리소스 사용률 차트"""
     st.markdown("### 💻 시스템 리소스")
     
-    # CPU와 메모리 사용률 가져오기
-    cpu_percent = psutil.cpu_percent(interval=1)
-    memory = psutil.virtual_memory()
-    memory_percent = memory.percent
+    # CPU와 메모리 사용률 가져오기 (백그라운드 샘플러의 마지막 측정값)
+    usage = get_resource_sampler().snapshot()
+    cpu_percent = usage.get('cpu_percent', 0.0)
+    memory_percent = usage.get('memory_percent', 0.0)
     
     # 게이지 차트 생성
     fig = make_subplots(
@@ -260,22 +264,21 @@ def render_analysis_timeline():
     """분석 타임라인 차트"""
     st.markdown("### 📈 분석 처리량 (최근 24시간)")
     
-    # 모의 데이터 생성 (실제로는 DB에서 가져와야 함)
-    hours = list(range(24))
-    current_hour = datetime.now().hour
-    
-    # 현실적인 패턴의 모의 데이터
-    import random
-    analysis_counts = []
-    for hour in hours:
-        # 업무시간에 더 많은 활동
-        if 9 <= hour <= 18:
-            count = random.randint(3, 12)
-        elif 19 <= hour <= 23 or 7 <= hour <= 8:
-            count = random.randint(1, 6)
-        else:
-            count = random.randint(0, 3)
-        analysis_counts.append(count)
+    # 분석 저장 시 갱신되는 리포지토리 시간대별 집계에서 최근 24시간 조회 (전체 스캔 없음)
+    now = datetime.now()
+    hour_keys = [
+        (now - timedelta(hours=offset)).strftime("%Y-%m-%dT%H")
+        for offset in range(23, -1, -1)
+    ]
+    
+    try:
+        hourly_counts = get_repository().get_statistics().get('hourly_analyses', {})
+    except Exception as e:
+        logger.error(f"시간대별 집계 조회 실패: {e}")
+        hourly_counts = {}
+    
+    hours = [key[-2:] for key in hour_keys]
+    analysis_counts = [hourly_counts.get(key, 0) for key in hour_keys]
     
     fig = go.Figure()
     
@@ -338,13 +341,91 @@ def render_performance_metrics():
     st.plotly_chart(fig, use_container_width=True)
 
 
+def render_database_metrics():
+    """데이터베이스 커넥션 풀 및 쿼리 지연시간"""
+    st.markdown("### 🗄️ 데이터베이스 커넥션 풀")
+    
+    try:
+        pool_stats = get_database().get_pool_stats()
+    except Exception as e:
+        logger.error(f"커넥션 풀 통계 조회 실패: {e}")
+        st.info("커넥션 풀 통계를 불러올 수 없습니다")
+        return
+    
+    read_pool = pool_stats['pools']['read']
+    write_pool = pool_stats['pools']['write']
+    query_time = pool_stats['query_time']
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric(
+            "읽기 커넥션",
+            f"{read_pool['in_use']}/{read_pool['created']}/{read_pool['max_connections']}",
+            help="사용중/생성됨/상한"
+        )
+        st.caption(f"최대 동시 사용 {read_pool['peak_in_use']} · 제안 크기 {pool_stats['suggested_read_pool_size']}")
+    with col2:
+        st.metric(
+            "커넥션 대기 p95",
+            f"{pool_stats['wait_time']['read']['p95_ms']:.0f}ms",
+            help="읽기 풀 커넥션 획득 대기 시간"
+        )
+        st.caption(f"쓰기 대기 p95 {pool_stats['wait_time']['write']['p95_ms']:.0f}ms · 타임아웃 {read_pool['timeouts'] + write_pool['timeouts']}")
+    with col3:
+        st.metric("쿼리 p95", f"{query_time['p95_ms']:.0f}ms")
+        st.caption(f"평균 {query_time['avg_ms']:.1f}ms · 최대 {query_time['max_ms']:.0f}ms")
+    with col4:
+        st.metric("느린 쿼리", pool_stats['slow_query_count'])
+        st.caption(f"기준 {pool_stats['slow_query_threshold_ms']:.0f}ms · 총 {pool_stats['query_count']}건")
+    
+    # 쿼리 실행 / 커넥션 대기 히스토그램
+    labels = list(query_time['buckets'].keys())
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=labels,
+        y=list(query_time['buckets'].values()),
+        name='쿼리 실행',
+        marker_color='#4ecdc4'
+    ))
+    fig.add_trace(go.Bar(
+        x=labels,
+        y=list(pool_stats['wait_time']['read']['buckets'].values()),
+        name='읽기 대기',
+        marker_color='#45b7d1'
+    ))
+    fig.add_trace(go.Bar(
+        x=labels,
+        y=list(pool_stats['wait_time']['write']['buckets'].values()),
+        name='쓰기 대기',
+        marker_color='#ff6b6b'
+    ))
+    fig.update_layout(
+        height=300,
+        barmode='group',
+        yaxis_title="쿼리 수",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font={'color': 'white'},
+        xaxis=dict(gridcolor='rgba(255,255,255,0.1)'),
+        yaxis=dict(gridcolor='rgba(255,255,255,0.1)')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    if pool_stats['recent_slow_queries']:
+        with st.expander("🐢 최근 느린 쿼리"):
+            st.dataframe(
+                pd.DataFrame(list(reversed(pool_stats['recent_slow_queries']))),
+                use_container_width=True
+            )
+
+
 def get_today_analysis_count() -> int:
     """오늘 분석 완료 건수 조회"""
     try:
-        db = get_database()
-        # 실제로는 오늘 날짜 필터링된 쿼리 필요
-        return 23  # 모의 데이터
-    except:
+        today = datetime.now().strftime("%Y-%m-%d")
+        return get_repository().get_statistics().get('daily_analyses', {}).get(today, 0)
+    except Exception as e:
+        logger.error(f"오늘 분석 건수 조회 실패: {e}")
         return 0
 
 
@@ -5,7 +5,7 @@ Database 탭 - 영상 데이터베이스 관리 (리팩토링)
 
 import streamlit as st
 from typing import List, Dict, Any
-from core.database.repository import VideoAnalysisDB as VideoDatabase
+from core.database.repository import get_repository
 from utils.logger import get_logger
 
 from web.components.database.video_card import render_video_cards_section
@@ -61,7 +61,7 @@ def render_search_section():
 
 
 def get_filtered_videos() -> List[Dict[str, Any]]:
-    db = VideoDatabase()
+    db = get_repository()
     
     try:
         # 모든 비디오 가져오기